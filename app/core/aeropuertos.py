@@ -0,0 +1,44 @@
+# app/core/aeropuertos.py
+"""Normalización de los textos de aeropuerto que llegan en los vuelos.
+
+Los vuelos históricamente guardan el origen/destino como texto libre
+("Ibagué (IBG)", "BOG", "bogotá"). Cada texto se reduce a una clave estable:
+el código IATA si aparece entre paréntesis, o el texto sin tildes en
+mayúsculas. Así "bog", "BOG" y "Bogotá (BOG)" son el mismo aeropuerto.
+
+Una palabra suelta de tres letras ("BOG", pero también "Ica") no se da por
+código: coincide con el aeropuerto de ese código solo si ya está en la tabla
+`aeropuertos` (su clave es el código); si no, es un nombre más.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+_PATRON_CODIGO_FINAL = re.compile(r"\(\s*([A-Za-z]{3})\s*\)\s*$")
+
+
+def normalizar(texto: str) -> str:
+    """Sin tildes, en mayúsculas y con espacios simples: "  Bogotá d.c." → "BOGOTA D.C."."""
+    sin_tildes = "".join(c for c in unicodedata.normalize("NFKD", texto or "") if not unicodedata.combining(c))
+    return " ".join(sin_tildes.upper().split())
+
+
+def codigo_iata(texto: str) -> Optional[str]:
+    """Código IATA explícito ("Ibagué (IBG)" → "IBG"), o None si no tiene."""
+    coincidencia = _PATRON_CODIGO_FINAL.search((texto or "").strip())
+    return coincidencia.group(1).upper() if coincidencia else None
+
+
+def clave_aeropuerto(texto: str) -> str:
+    """Clave única (máx. 100 caracteres) con la que se identifica el aeropuerto."""
+    codigo = codigo_iata(texto)
+    if codigo:
+        return codigo
+    return normalizar(texto)[:100]
+
+
+def ciudad_aeropuerto(texto: str) -> str:
+    """Nombre legible sin el código: "Ibagué (IBG)" → "Ibagué"."""
+    texto = (texto or "").strip()
+    return _PATRON_CODIGO_FINAL.sub("", texto).strip() or texto.upper()
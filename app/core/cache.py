@@ -0,0 +1,105 @@
+# app/core/cache.py
+"""Caché en memoria con expiración (TTL) y desalojo LRU.
+
+Pensada para datos que se leen mucho más de lo que cambian (catálogo de
+vuelos). Cada instancia publica sus aciertos, fallos y desalojos en las
+métricas de Prometheus que ya expone `/metrics`.
+
+La caché es local al proceso: con varios workers cada uno mantiene su copia
+y la obsolescencia máxima entre procesos queda acotada por el TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from prometheus_client import Counter
+
+cache_hits = Counter(
+    'flyblue_cache_hits_total',
+    'Lecturas resueltas desde la caché en memoria',
+    ['cache']
+)
+cache_misses = Counter(
+    'flyblue_cache_misses_total',
+    'Lecturas que no encontraron la clave en la caché en memoria',
+    ['cache']
+)
+cache_evictions = Counter(
+    'flyblue_cache_evictions_total',
+    'Entradas desalojadas de la caché en memoria',
+    ['cache', 'motivo']
+)
+
+_AUSENTE = object()
+
+
+class CacheTTL:
+    """Caché clave → valor con TTL por entrada y capacidad máxima LRU.
+
+    Parámetros:
+    - nombre: etiqueta usada en las métricas de Prometheus.
+    - maxsize: número máximo de entradas; al superarlo se desaloja la menos usada.
+    - ttl: segundos de vida de cada entrada desde que se guardó.
+    - reloj: función de tiempo monotónico (inyectable en pruebas).
+    """
+
+    def __init__(self, nombre: str, maxsize: int = 1024, ttl: float = 60.0,
+                 reloj: Callable[[], float] = time.monotonic):
+        self.nombre = nombre
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._reloj = reloj
+        self._datos: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Se incrementa en cada invalidación; permite descartar valores
+        # leídos de la BD antes de una escritura concurrente.
+        self.version = 0
+
+    def obtener(self, clave: Hashable, defecto: Any = None) -> Any:
+        """Devuelve el valor cacheado o `defecto` si no existe o expiró."""
+        with self._lock:
+            entrada = self._datos.get(clave, _AUSENTE)
+            if entrada is not _AUSENTE:
+                expira, valor = entrada
+                if expira > self._reloj():
+                    self._datos.move_to_end(clave)
+                    cache_hits.labels(cache=self.nombre).inc()
+                    return valor
+                del self._datos[clave]
+                cache_evictions.labels(cache=self.nombre, motivo="ttl").inc()
+        cache_misses.labels(cache=self.nombre).inc()
+        return defecto
+
+    def guardar(self, clave: Hashable, valor: Any, version: int = None) -> None:
+        """Guarda `valor`; si se indica `version` y hubo una invalidación desde
+        entonces, el valor se descarta porque puede estar obsoleto."""
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._datos[clave] = (self._reloj() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+                cache_evictions.labels(cache=self.nombre, motivo="lru").inc()
+
+    def invalidar(self, clave: Hashable) -> None:
+        with self._lock:
+            self.version += 1
+            self._datos.pop(clave, None)
+
+    def invalidar_donde(self, predicado: Callable[[Hashable, Any], bool]) -> None:
+        """Elimina las entradas para las que `predicado(clave, valor)` es verdadero."""
+        with self._lock:
+            self.version += 1
+            for clave in [c for c, (_, v) in self._datos.items() if predicado(c, v)]:
+                del self._datos[clave]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
@@ -0,0 +1,71 @@
+# app/core/concurrencia.py
+"""Control de concurrencia optimista con ETag / If-Match.
+
+`Vuelo`, `Reserva` y `Servicio` tienen una columna `version` (`version_id_col`
+del ORM) que aumenta con cada UPDATE, incluidos los UPDATE de Core de los
+repositorios, que la incrementan explícitamente. Los GET y PUT la devuelven
+como `ETag`; un PUT con `If-Match` solo se aplica si la versión sigue siendo
+la que el cliente leyó. La comprobación va en el propio UPDATE
+(`WHERE version = :leida`), así que no se mantiene ningún bloqueo entre la
+lectura y la escritura.
+
+Los repositorios señalan el conflicto con `StaleDataError`, la misma
+excepción que lanza el ORM cuando un flush no encuentra la versión esperada.
+Con `If-Match` se responde 412; sin él, el manejador global de `main.py`
+responde 409.
+"""
+
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm.exc import StaleDataError
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def version_esperada(if_match: Optional[str]) -> Optional[int]:
+    """Versión pedida en `If-Match`; None si no se envió o es `*`.
+
+    Un valor que no es un ETag de este servicio nunca puede coincidir: 412.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    valor = if_match.strip()
+    if not (len(valor) > 2 and valor[0] == valor[-1] == '"' and valor[1:-1].isdigit()):
+        raise precondicion_fallida()
+    return int(valor[1:-1])
+
+
+def coincide_if_none_match(if_none_match: Optional[str], actual: str) -> bool:
+    """True si `If-None-Match` (`*` o una lista de ETags separados por comas) incluye `actual`.
+
+    Comparación débil, como pide HTTP para If-None-Match: se ignora el prefijo `W/`.
+    """
+    if if_none_match is None:
+        return False
+    etags = [e.strip() for e in if_none_match.split(",")]
+    if "*" in etags:
+        return True
+    return actual.removeprefix("W/") in {e.removeprefix("W/") for e in etags}
+
+
+def precondicion_fallida() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="El recurso cambió desde que lo consultaste; vuelve a obtenerlo",
+    )
+
+
+@contextmanager
+def escritura_condicional(db, version: Optional[int]):
+    """Traduce un conflicto de versión a 412 cuando el cliente envió `If-Match`."""
+    try:
+        yield
+    except StaleDataError:
+        db.rollback()
+        if version is not None:
+            raise precondicion_fallida()
+        raise
@@ -0,0 +1,85 @@
+# app/core/importacion.py
+"""Lectura incremental de archivos de importación (CSV o NDJSON).
+
+El cuerpo de la petición llega en trozos de bytes de tamaño arbitrario:
+`LectorFilas.alimentar` los decodifica, corta por saltos de línea y devuelve
+las filas completas como diccionarios, sin cargar el archivo entero en memoria.
+
+En CSV la primera línea es la cabecera con los nombres de columna y cada
+registro ocupa una sola línea. En NDJSON cada línea es un objeto JSON.
+"""
+
+import codecs
+import csv
+import json
+from typing import Optional
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+_TIPOS_CONTENIDO = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+
+def formato_desde_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Formato según la cabecera Content-Type (ignora parámetros como charset)."""
+    tipo = (content_type or "").split(";")[0].strip().lower()
+    return _TIPOS_CONTENIDO.get(tipo)
+
+
+class LectorFilas:
+    """Parser incremental: bytes → [(número de línea, dict | mensaje de error)]."""
+
+    def __init__(self, formato: str):
+        if formato not in (CSV, NDJSON):
+            raise ValueError(f"Formato no soportado: {formato}")
+        self.formato = formato
+        self._decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+        self._pendiente = ""
+        self._linea = 0
+        self._cabecera: Optional[list[str]] = None
+
+    def alimentar(self, trozo: bytes) -> list[tuple[int, object]]:
+        texto = self._pendiente + self._decodificador.decode(trozo)
+        lineas = texto.split("\n")
+        # La última puede estar incompleta: se guarda para el siguiente trozo
+        self._pendiente = lineas.pop()
+        return self._procesar(lineas)
+
+    def terminar(self) -> list[tuple[int, object]]:
+        resto = self._pendiente + self._decodificador.decode(b"", final=True)
+        self._pendiente = ""
+        return self._procesar([resto]) if resto else []
+
+    def _procesar(self, lineas: list[str]) -> list[tuple[int, object]]:
+        filas = []
+        for linea in lineas:
+            self._linea += 1
+            linea = linea.rstrip("\r")
+            if not linea.strip():
+                continue
+            if self.formato == NDJSON:
+                filas.append((self._linea, self._json(linea)))
+            elif self._cabecera is None:
+                self._cabecera = [c.strip() for c in next(csv.reader([linea]))]
+            else:
+                filas.append((self._linea, self._csv(linea)))
+        return filas
+
+    def _json(self, linea: str):
+        try:
+            valor = json.loads(linea)
+        except json.JSONDecodeError as e:
+            return f"JSON inválido: {e.msg}"
+        return valor if isinstance(valor, dict) else "Se esperaba un objeto JSON"
+
+    def _csv(self, linea: str):
+        valores = next(csv.reader([linea]))
+        if len(valores) != len(self._cabecera):
+            return f"Se esperaban {len(self._cabecera)} columnas y hay {len(valores)}"
+        return dict(zip(self._cabecera, valores))
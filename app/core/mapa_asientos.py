@@ -0,0 +1,115 @@
+# app/core/mapa_asientos.py
+"""Representación compacta de la ocupación de asientos de un vuelo.
+
+La cabina se describe con un número de filas y una disposición de letras
+por fila, donde "-" marca un pasillo (ej. "ABC-DEF"). Cada asiento tiene un
+índice fijo `(fila - 1) * ancho + columna` y la ocupación se guarda como un
+bitmap (1 bit por asiento): un A320 de 30 filas ocupa 23 bytes.
+
+Las operaciones trabajan sobre el bitmap como entero de Python, así que
+comprobar un asiento es O(1) y encontrar el siguiente libre de un tipo es
+una operación de bits sobre máscaras precalculadas (ventana, pasillo).
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+VENTANA = "ventana"
+PASILLO = "pasillo"
+CENTRO = "centro"
+
+_PATRON_DISPOSICION = re.compile(r"^[A-Z]+(-[A-Z]+)*$")
+_PATRON_ASIENTO = re.compile(r"^(\d{1,3})([A-Z])$")
+
+
+class DisposicionCabina:
+    """Geometría de la cabina: traduce códigos de asiento a índices de bit."""
+
+    def __init__(self, filas: int, disposicion: str):
+        if filas < 1 or not _PATRON_DISPOSICION.match(disposicion or ""):
+            raise ValueError("Disposición de cabina inválida")
+        letras = disposicion.replace("-", "")
+        if len(set(letras)) != len(letras):
+            raise ValueError("Disposición de cabina inválida")
+
+        self.filas = filas
+        self.disposicion = disposicion
+        self.letras = letras
+        self.ancho = len(letras)
+        self.capacidad = filas * self.ancho
+        self._columna = {letra: i for i, letra in enumerate(letras)}
+
+        tipos = {}
+        bloques = disposicion.split("-")
+        for n, bloque in enumerate(bloques):
+            for i, letra in enumerate(bloque):
+                if (n == 0 and i == 0) or (n == len(bloques) - 1 and i == len(bloque) - 1):
+                    tipos[letra] = VENTANA
+                elif (i == 0 and n > 0) or (i == len(bloque) - 1 and n < len(bloques) - 1):
+                    tipos[letra] = PASILLO
+                else:
+                    tipos[letra] = CENTRO
+        self.tipos = tipos
+
+        # Máscara de bits por tipo de asiento (una fila replicada en todas)
+        mascaras = {VENTANA: 0, PASILLO: 0, CENTRO: 0}
+        for letra, tipo in tipos.items():
+            columna = self._columna[letra]
+            for fila in range(filas):
+                mascaras[tipo] |= 1 << (fila * self.ancho + columna)
+        self.mascaras = mascaras
+        self.mascara_total = (1 << self.capacidad) - 1
+
+    @property
+    def bytes_bitmap(self) -> int:
+        return (self.capacidad + 7) // 8
+
+    def indice(self, asiento: str) -> int:
+        """Índice de bit del asiento (ej. "12A"); ValueError si no existe."""
+        coincidencia = _PATRON_ASIENTO.match((asiento or "").strip().upper())
+        if not coincidencia:
+            raise ValueError(f"Asiento inválido: {asiento}")
+        fila, letra = int(coincidencia.group(1)), coincidencia.group(2)
+        if not 1 <= fila <= self.filas or letra not in self._columna:
+            raise ValueError(f"Asiento inválido: {asiento}")
+        return (fila - 1) * self.ancho + self._columna[letra]
+
+    def codigo(self, indice: int) -> str:
+        fila, columna = divmod(indice, self.ancho)
+        return f"{fila + 1}{self.letras[columna]}"
+
+    def siguiente_libre(self, ocupados: int, preferencia: Optional[str] = None) -> Optional[int]:
+        """Índice del primer asiento libre (del tipo preferido si lo hay)."""
+        libres = self.mascara_total & ~ocupados
+        if preferencia in self.mascaras and libres & self.mascaras[preferencia]:
+            libres &= self.mascaras[preferencia]
+        if not libres:
+            return None
+        return (libres & -libres).bit_length() - 1
+
+    def codigos_ocupados(self, ocupados: int) -> list[str]:
+        codigos = []
+        while ocupados:
+            bit = ocupados & -ocupados
+            codigos.append(self.codigo(bit.bit_length() - 1))
+            ocupados ^= bit
+        return codigos
+
+
+@lru_cache(maxsize=64)
+def obtener_disposicion(filas: int, disposicion: str) -> DisposicionCabina:
+    """Las disposiciones son pocas y repetidas entre vuelos: se reutilizan."""
+    return DisposicionCabina(filas, disposicion)
+
+
+def bitmap_a_entero(bitmap: Optional[bytes]) -> int:
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def entero_a_bitmap(ocupados: int, longitud: int) -> bytes:
+    return ocupados.to_bytes(longitud, "little")
+
+
+def esta_ocupado(ocupados: int, indice: int) -> bool:
+    return bool(ocupados >> indice & 1)
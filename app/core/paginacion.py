@@ -0,0 +1,103 @@
+# app/core/paginacion.py
+"""Utilidades de paginación por cursor (keyset).
+
+En lugar de OFFSET, cada página continúa a partir de la clave de la última
+fila entregada (`WHERE (col1, col2) > (:v1, :v2) ORDER BY col1, col2 LIMIT n`),
+por lo que una página profunda cuesta lo mismo que la primera y la memoria
+por request queda acotada por `limit`.
+
+El cursor es opaco para el cliente: JSON con los valores de la clave de orden
+codificado en base64 url-safe.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, tuple_
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 200
+
+
+class ResultadoPaginado(list):
+    """Lista de resultados que además conoce el cursor de la siguiente página.
+
+    Se comporta como una lista normal (los llamadores existentes no cambian)
+    y expone `next_cursor`, que es None cuando no hay más resultados.
+    """
+
+    def __init__(self, items=(), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def codificar_cursor(valores: Sequence) -> str:
+    """Codifica los valores de la clave de orden como un cursor opaco."""
+    crudo = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in valores],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, columnas: Sequence) -> list:
+    """Decodifica un cursor y convierte cada valor al tipo de su columna.
+
+    Lanza `HTTPException(400)` si el cursor está corrupto o no corresponde
+    a la clave de orden del listado.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(columnas):
+            raise ValueError("cursor con forma inesperada")
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) and v is not None else v
+            for col, v in zip(columnas, valores)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def paginar(query, columnas: Sequence, limit: Optional[int] = None,
+            cursor: Optional[str] = None, descendente: bool = False) -> ResultadoPaginado:
+    """Aplica paginación keyset a `query` ordenando por `columnas`.
+
+    Parámetros:
+    - columnas: atributos del modelo que forman una clave única de orden
+      (la última debe ser la clave primaria para desempatar).
+    - limit: tamaño de página; None devuelve todos los resultados.
+    - cursor: valor `next_cursor` devuelto por la página anterior.
+    - descendente: recorre la clave de mayor a menor.
+    """
+    if cursor:
+        valores = decodificar_cursor(cursor, columnas)
+        if len(columnas) == 1:
+            izquierda, derecha = columnas[0], valores[0]
+        else:
+            izquierda, derecha = tuple_(*columnas), tuple_(*valores)
+        query = query.filter(izquierda < derecha if descendente else izquierda > derecha)
+
+    query = query.order_by(*[c.desc() if descendente else c.asc() for c in columnas])
+
+    if limit is None:
+        return ResultadoPaginado(query.all())
+
+    # Se pide una fila extra solo para saber si existe una página siguiente
+    filas = query.limit(limit + 1).all()
+    if len(filas) <= limit:
+        return ResultadoPaginado(filas)
+
+    filas = filas[:limit]
+    ultima = filas[-1]
+    siguiente = codificar_cursor([getattr(ultima, c.key) for c in columnas])
+    return ResultadoPaginado(filas, siguiente)
+
+
+def como_pagina(resultado: ResultadoPaginado) -> dict:
+    """Adapta un `ResultadoPaginado` al contrato de respuesta `Pagina`."""
+    return {"items": list(resultado), "next_cursor": resultado.next_cursor}
@@ -0,0 +1,24 @@
+# app/core/tareas.py
+"""Tareas periódicas en segundo plano.
+
+Cada tarea es una función síncrona que abre su propia sesión; se ejecuta
+en el pool de hilos para no bloquear el event loop. Un fallo se registra
+en el log y la tarea sigue con la siguiente pasada.
+"""
+
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def repetir(nombre: str, intervalo: float, trabajo) -> None:
+    """Ejecuta `trabajo()` cada `intervalo` segundos hasta que se cancele la tarea."""
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            await run_in_threadpool(trabajo)
+        except Exception:
+            logger.exception("Falló la tarea periódica %s", nombre)
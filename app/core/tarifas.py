@@ -0,0 +1,27 @@
+# app/core/tarifas.py
+"""Clases tarifarias de cabina y su normalización.
+
+Las reservas guardan la clase tal como la envía el cliente ("económica",
+"Business", ...); para los cupos por clase se usa siempre la forma canónica.
+"""
+
+import unicodedata
+from typing import Optional
+
+CLASES = ("economica", "ejecutiva", "primera")
+
+_SINONIMOS = {
+    "economica": "economica",
+    "economy": "economica",
+    "turista": "economica",
+    "ejecutiva": "ejecutiva",
+    "business": "ejecutiva",
+    "primera": "primera",
+    "first": "primera",
+}
+
+
+def normalizar_clase(clase: Optional[str]) -> Optional[str]:
+    """Devuelve la clase canónica ("económica" → "economica") o None si no se reconoce."""
+    sin_tildes = unicodedata.normalize("NFKD", clase or "").encode("ascii", "ignore").decode()
+    return _SINONIMOS.get(sin_tildes.strip().lower())
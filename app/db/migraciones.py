@@ -0,0 +1,150 @@
+# app/db/migraciones.py
+"""Migraciones de esquema idempotentes que se aplican al arrancar.
+
+`Base.metadata.create_all` crea las tablas que faltan pero no modifica las
+existentes. Cada paso aquí comprueba el esquema actual antes de actuar, así
+que ejecutarlo de nuevo sobre una BD ya migrada no hace nada.
+"""
+
+from sqlalchemy import Engine, inspect, text
+
+from app.models.aeropuerto import ids_para_textos
+from app.models.tarifa_diaria import TarifaDiaria
+
+
+def _aeropuertos_en_vuelos(conexion) -> None:
+    """Agrega vuelos.origen_id/destino_id, los rellena a partir del texto y
+    rehace ix_vuelos_ruta_salida sobre las claves enteras."""
+    inspector = inspect(conexion)
+    if "vuelos" not in inspector.get_table_names():
+        return
+
+    columnas = {c["name"] for c in inspector.get_columns("vuelos")}
+    for campo in ("origen", "destino"):
+        if f"{campo}_id" not in columnas:
+            conexion.execute(text(f"ALTER TABLE vuelos ADD COLUMN {campo}_id INTEGER REFERENCES aeropuertos(id)"))
+
+    # Un UPDATE por texto distinto (hay pocos aeropuertos, muchos vuelos)
+    for campo in ("origen", "destino"):
+        textos = [t for (t,) in conexion.execute(
+            text(f"SELECT DISTINCT {campo} FROM vuelos WHERE {campo}_id IS NULL")
+        )]
+        if textos:
+            ids = ids_para_textos(conexion, textos)
+            conexion.execute(
+                text(f"UPDATE vuelos SET {campo}_id = :id WHERE {campo} = :texto AND {campo}_id IS NULL"),
+                [{"id": ids[t], "texto": t} for t in textos],
+            )
+        if conexion.dialect.name == "postgresql":
+            conexion.execute(text(f"ALTER TABLE vuelos ALTER COLUMN {campo}_id SET NOT NULL"))
+
+    indices = {i["name"]: i["column_names"] for i in inspector.get_indexes("vuelos")}
+    if indices.get("ix_vuelos_ruta_salida") != ["origen_id", "destino_id", "salida"]:
+        if "ix_vuelos_ruta_salida" in indices:
+            conexion.execute(text("DROP INDEX ix_vuelos_ruta_salida"))
+        conexion.execute(text("CREATE INDEX ix_vuelos_ruta_salida ON vuelos (origen_id, destino_id, salida)"))
+
+
+def _tarifas_diarias_por_id(conexion) -> None:
+    """El calendario pasó de claves de texto a ids: es un resumen derivado, así
+    que se recrea vacío y `tarifa_diaria_repo.reconstruir` lo vuelve a llenar."""
+    inspector = inspect(conexion)
+    if "tarifas_diarias" not in inspector.get_table_names():
+        return
+    if "origen_id" not in {c["name"] for c in inspector.get_columns("tarifas_diarias")}:
+        conexion.execute(text("DROP TABLE tarifas_diarias"))
+        TarifaDiaria.__table__.create(conexion)
+
+
+def _indice_salida(conexion) -> None:
+    """Índice sobre vuelos.salida para el archivado de vuelos salidos."""
+    inspector = inspect(conexion)
+    if "vuelos" not in inspector.get_table_names():
+        return
+    if "ix_vuelos_salida" not in {i["name"] for i in inspector.get_indexes("vuelos")}:
+        conexion.execute(text("CREATE INDEX ix_vuelos_salida ON vuelos (salida)"))
+
+
+def _programacion_en_vuelos(conexion) -> None:
+    """Agrega vuelos.programacion_id y su restricción única con salida."""
+    inspector = inspect(conexion)
+    if "vuelos" not in inspector.get_table_names():
+        return
+    if "programacion_id" not in {c["name"] for c in inspector.get_columns("vuelos")}:
+        conexion.execute(text(
+            "ALTER TABLE vuelos ADD COLUMN programacion_id INTEGER REFERENCES programaciones_vuelo(id)"
+        ))
+    if "uq_vuelos_programacion_salida" not in {i["name"] for i in inspector.get_indexes("vuelos")} | {
+        u["name"] for u in inspector.get_unique_constraints("vuelos")
+    }:
+        conexion.execute(text(
+            "CREATE UNIQUE INDEX uq_vuelos_programacion_salida ON vuelos (programacion_id, salida)"
+        ))
+
+
+def _sin_indice_asientos(conexion) -> None:
+    """Elimina ix_vuelos_asientos_disponibles: poco selectivo y caro en cada reserva o cancelación."""
+    inspector = inspect(conexion)
+    if "vuelos" not in inspector.get_table_names():
+        return
+    if "ix_vuelos_asientos_disponibles" in {i["name"] for i in inspector.get_indexes("vuelos")}:
+        conexion.execute(text("DROP INDEX ix_vuelos_asientos_disponibles"))
+
+
+def _indice_servicios_reserva(conexion) -> None:
+    """Índice sobre reserva_servicio.reserva_id para cargar los servicios de cada página de reservas."""
+    inspector = inspect(conexion)
+    if "reserva_servicio" not in inspector.get_table_names():
+        return
+    if "ix_reserva_servicio_reserva_id" not in {i["name"] for i in inspector.get_indexes("reserva_servicio")}:
+        conexion.execute(text("CREATE INDEX ix_reserva_servicio_reserva_id ON reserva_servicio (reserva_id)"))
+
+
+def _indices_reservas(conexion) -> None:
+    """Índices de la búsqueda de reservas: (estado, fecha_reserva), vuelo_id y usuario_id."""
+    inspector = inspect(conexion)
+    if "reservas" not in inspector.get_table_names():
+        return
+    existentes = {i["name"] for i in inspector.get_indexes("reservas")}
+    indices = {
+        "ix_reservas_estado_fecha_reserva": "estado, fecha_reserva",
+        "ix_reservas_vuelo_id": "vuelo_id",
+        "ix_reservas_usuario_id": "usuario_id",
+    }
+    for nombre, columnas in indices.items():
+        if nombre not in existentes:
+            conexion.execute(text(f"CREATE INDEX {nombre} ON reservas ({columnas})"))
+
+
+def _indice_notificaciones(conexion) -> None:
+    """Rellena las fechas nulas de notificaciones y crea el índice (usuario_id, fecha, id) de sus listados."""
+    inspector = inspect(conexion)
+    if "notificaciones" not in inspector.get_table_names():
+        return
+    conexion.execute(text("UPDATE notificaciones SET fecha = CURRENT_TIMESTAMP WHERE fecha IS NULL"))
+    if "ix_notificaciones_usuario_fecha_id" not in {i["name"] for i in inspector.get_indexes("notificaciones")}:
+        conexion.execute(text(
+            "CREATE INDEX ix_notificaciones_usuario_fecha_id ON notificaciones (usuario_id, fecha, id)"
+        ))
+
+
+def _columnas_version(conexion) -> None:
+    """Agrega la columna `version` de concurrencia optimista a vuelos, reservas y servicios."""
+    inspector = inspect(conexion)
+    tablas = set(inspector.get_table_names())
+    for tabla in ("vuelos", "reservas", "servicios"):
+        if tabla in tablas and "version" not in {c["name"] for c in inspector.get_columns(tabla)}:
+            conexion.execute(text(f"ALTER TABLE {tabla} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+
+def aplicar(engine: Engine) -> None:
+    with engine.begin() as conexion:
+        _aeropuertos_en_vuelos(conexion)
+        _tarifas_diarias_por_id(conexion)
+        _indice_salida(conexion)
+        _programacion_en_vuelos(conexion)
+        _sin_indice_asientos(conexion)
+        _indice_servicios_reserva(conexion)
+        _columnas_version(conexion)
+        _indices_reservas(conexion)
+        _indice_notificaciones(conexion)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class AeropuertoCreate(BaseModel):
+    codigo: str = Field(pattern=r"^[A-Za-z]{3}$")  # IATA
+    ciudad: str
+    pais: Optional[str] = None
+
+class AeropuertoUpdate(BaseModel):
+    ciudad: Optional[str] = None
+    pais: Optional[str] = None
+
+class AeropuertoRead(BaseModel):
+    id: int
+    clave: str
+    codigo: Optional[str] = None
+    ciudad: str
+    pais: Optional[str] = None
+
+    class Config:
+        from_attributes = True
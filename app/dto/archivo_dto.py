@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from datetime import datetime
+from app.dto.vuelo_dto import VueloBase
+
+class VueloArchivoRead(VueloBase):
+    archivado_en: datetime
+
+    class Config:
+        from_attributes = True
+
+class ServicioArchivadoRead(BaseModel):
+    servicio_id: int
+    cantidad: int | None = None
+    subtotal: float | None = None
+
+class PagoArchivadoRead(BaseModel):
+    id: int
+    metodo: str
+    monto: float
+    moneda: str | None = None
+    fecha: datetime | None = None
+    estado: str | None = None
+    referencia: str | None = None
+
+class DetalleArchivadoRead(BaseModel):
+    servicios: list[ServicioArchivadoRead] = []
+    pago: PagoArchivadoRead | None = None
+
+class ReservaArchivoRead(BaseModel):
+    id: int
+    usuario_id: int
+    vuelo_id: int
+    fecha_reserva: datetime | None = None
+    estado: str | None = None
+    clase: str | None = None
+    asiento: str | None = None
+    total: float
+    detalle: DetalleArchivadoRead
+    archivado_en: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import date
+
+class TarifaDiariaRead(BaseModel):
+    dia: date
+    precio_min: float
+    asientos: int
+    vuelos: int
+
+    class Config:
+        from_attributes = True
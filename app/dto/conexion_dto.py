@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class TramoRead(BaseModel):
+    id: int
+    origen: str
+    destino: str
+    salida: datetime
+    llegada: datetime
+    precio_base: float
+
+class ItinerarioRead(BaseModel):
+    tramos: list[TramoRead]
+    salida: datetime
+    llegada: datetime
+    duracion_horas: float
+    escalas: int
+    precio_total: float
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from app.dto.reserva_servicio_dto import ReservaServicioCreate
+
+class CotizacionCreate(BaseModel):
+    vuelo_id: int
+    clase: str
+    servicios: list[ReservaServicioCreate] = Field(default_factory=list, max_length=50)
+
+class LineaCotizacion(BaseModel):
+    servicio_id: int
+    cantidad: int
+    precio_unitario: float
+    subtotal: float
+
+class CotizacionRead(BaseModel):
+    vuelo_id: int
+    clase: str
+    # Precio del asiento: precio_base × multiplicador de la clase
+    tarifa: float
+    servicios: list[LineaCotizacion]
+    total: float
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class ErrorImportacion(BaseModel):
+    linea: int
+    error: str
+
+class ImportacionRead(BaseModel):
+    total: int
+    importados: int
+    errores: list[ErrorImportacion]
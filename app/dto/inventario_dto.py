@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+class InventarioServicioCreate(BaseModel):
+    servicio_id: int
+    capacidad: int = Field(ge=0)
+
+class InventarioServicioRead(BaseModel):
+    servicio_id: int
+    capacidad: int
+    disponibles: int
+
+    class Config:
+        from_attributes = True
+
+class MenuServicioRead(BaseModel):
+    servicio_id: int
+    nombre: str
+    precio: float
+    # None: el servicio no tiene límite en este vuelo
+    capacidad: int | None = None
+    disponibles: int | None = None
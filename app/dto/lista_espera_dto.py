@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class ListaEsperaCreate(BaseModel):
+    vuelo_id: int
+    clase: str
+    # Ignorado, como ReservaBase.total: se cotiza al apuntarse y al promover
+    total: float | None = None
+
+class ListaEsperaRead(BaseModel):
+    id: int
+    vuelo_id: int
+    usuario_id: int
+    clase: str
+    total: float
+    creada_en: datetime
+    # Puesto en la cola (1 = el siguiente en recibir asiento)
+    posicion: int | None = None
+
+    class Config:
+        orm_mode = True
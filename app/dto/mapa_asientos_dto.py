@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+class MapaAsientosCreate(BaseModel):
+    filas: int = Field(ge=1, le=150)
+    disposicion: str = Field(pattern=r"^[A-Z]+(-[A-Z]+)*$", max_length=20)
+
+class MapaAsientosRead(BaseModel):
+    vuelo_id: int
+    filas: int
+    disposicion: str
+    capacidad: int
+    libres: int
+    ocupados: list[str]
@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import date, time
+from typing import Optional
+
+class ProgramacionCreate(BaseModel):
+    origen: str
+    destino: str
+    # 0 = lunes ... 6 = domingo
+    dias_semana: list[int] = Field(min_length=1)
+    hora_salida: time
+    duracion: float = Field(gt=0)  # horas
+    precio_base: float = Field(ge=0)
+    capacidad: int = Field(ge=1)
+    desde: date
+    hasta: date
+
+    @field_validator("dias_semana")
+    @classmethod
+    def validar_dias(cls, dias):
+        if any(d < 0 or d > 6 for d in dias):
+            raise ValueError("Los días de la semana van de 0 (lunes) a 6 (domingo)")
+        return sorted(set(dias))
+
+class ProgramacionExtender(BaseModel):
+    hasta: date
+
+class ProgramacionRead(BaseModel):
+    id: int
+    origen: str
+    destino: str
+    dias_semana: list[int]
+    hora_salida: time
+    duracion: float
+    precio_base: float
+    capacidad: int
+    desde: date
+    hasta: date
+    materializado_hasta: Optional[date] = None
+
+    @field_validator("dias_semana", mode="before")
+    @classmethod
+    def dias_desde_texto(cls, dias):
+        # En la BD se guardan como dígitos, ej. "024"
+        return [int(d) for d in dias] if isinstance(dias, str) else dias
+
+    class Config:
+        from_attributes = True
+
+class MaterializacionRead(BaseModel):
+    programacion: ProgramacionRead
+    vuelos_creados: int
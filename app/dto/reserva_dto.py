@@ -1,16 +1,33 @@
 from pydantic import BaseModel
 from pydantic import Field
 from datetime import datetime
+from typing import Literal
 from app.dto.reserva_servicio_dto import ReservaServicioRead
 
 class ReservaBase(BaseModel):
     vuelo_id: int
     clase: str
     asiento: str | None = None
-    total: float
+    # Se acepta por compatibilidad pero se ignora: el total lo calcula
+    # el servidor (ver services/cotizacion_service.py)
+    total: float | None = None
 
 class ReservaCreate(ReservaBase):
-    pass
+    # Si el vuelo tiene mapa de asientos y no se indica `asiento`,
+    # se asigna el siguiente libre de este tipo.
+    preferencia_asiento: Literal["ventana", "pasillo"] | None = None
+
+class PasajeroGrupo(BaseModel):
+    asiento: str | None = None
+    preferencia_asiento: Literal["ventana", "pasillo"] | None = None
+    # Ignorado, como ReservaBase.total
+    total: float | None = None
+
+class ReservaGrupoCreate(BaseModel):
+    # Una reserva por pasajero, todas en el mismo vuelo y clase
+    vuelo_id: int
+    clase: str
+    pasajeros: list[PasajeroGrupo] = Field(min_length=1, max_length=50)
 
 class ReservaUpdate(BaseModel):
     estado: str | None = None
@@ -24,9 +41,14 @@ class ReservaRead(BaseModel):
     fecha_reserva: datetime
     estado: str
     clase: str
-    asiento: str
+    # Sin asiento en reservas de grupo o en vuelos sin mapa de asientos
+    asiento: str | None = None
     total: float
+    version: int
     servicios: list[ReservaServicioRead] = Field(default_factory=list, alias="servicios_reserva")
 
     class Config:
         orm_mode = True
+
+class ReservaGrupoRead(BaseModel):
+    reservas: list[ReservaRead]
@@ -1,8 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ReservaServicioCreate(BaseModel):
     servicio_id: int
-    cantidad: int = 1
+    cantidad: int = Field(1, ge=1)
+
+class ReservaServiciosLote(BaseModel):
+    # Primero se quitan (por servicio_id) y luego se agregan, en una transacción
+    agregar: list[ReservaServicioCreate] = Field(default_factory=list, max_length=50)
+    quitar: list[int] = Field(default_factory=list, max_length=50)
 
 class ReservaServicioRead(BaseModel):
     id: int
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Literal
+
+class RetencionCreate(BaseModel):
+    vuelo_id: int
+    clase: str
+    asiento: str | None = None
+    preferencia_asiento: Literal["ventana", "pasillo"] | None = None
+    # Si no se indica, RETENCION_MINUTOS
+    minutos: int | None = Field(None, ge=1, le=30)
+
+class RetencionConfirmar(BaseModel):
+    # Ignorado, como ReservaBase.total: la reserva se cotiza en el servidor
+    total: float | None = None
+
+class RetencionRead(BaseModel):
+    id: int
+    usuario_id: int
+    vuelo_id: int
+    clase: str
+    asiento: str | None = None
+    creada_en: datetime
+    expira_en: datetime
+
+    class Config:
+        orm_mode = True
@@ -16,6 +16,7 @@ class ServicioUpdate(BaseModel):
 
 class ServicioRead(ServicioBase):
     id: int
+    version: int
 
     class Config:
         from_attributes = True
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class TableroItemRead(BaseModel):
+    vuelo_id: int
+    origen: str
+    destino: str
+    salida: datetime
+    llegada: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+class TarifaClaseCreate(BaseModel):
+    clase: str
+    capacidad: int = Field(ge=0)
+    multiplicador: float = Field(1.0, gt=0)
+
+class TarifaClaseRead(BaseModel):
+    clase: str
+    capacidad: int
+    disponibles: int
+    multiplicador: float
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class VueloBase(BaseModel):
     id: int
@@ -17,8 +18,19 @@ class VueloCreate(VueloBase):
 class VueloUpdate(VueloBase):
     pass
 
+class VueloPatch(BaseModel):
+    # Actualización parcial: solo se escriben los campos enviados
+    origen: Optional[str] = None
+    destino: Optional[str] = None
+    salida: Optional[datetime] = None
+    llegada: Optional[datetime] = None
+    duracion: Optional[float] = None
+    precio_base: Optional[float] = None
+    asientos_disponibles: Optional[int] = None
+
 class VueloRead(VueloBase):
-    pass
+    # También se envía como ETag en GET/PUT /vuelos/{id}
+    version: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
@@ -1,7 +1,9 @@
 from fastapi.openapi.utils import get_openapi
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import Base, engine
+from app.db.database import Base, engine, SessionLocal
 from app.routes import auth_routes
 from app.routes import usuario_routes
 from app.routes import vuelo_routes
@@ -9,16 +11,65 @@ from app.routes import reserva_routes
 from app.routes import servicio_routes
 from app.routes import pago_routes
 from app.routes import notificacion_routes
+from app.routes import aeropuerto_routes
+from app.routes import programacion_routes
+from app.routes import retencion_routes
+from app.routes import lista_espera_routes
+from app.db import migraciones
+from app.services import archivo_service, idempotencia_service, retencion_service, vuelo_service
+from app.core import tareas
 
 # Prometheus
 from prometheus_client import make_asgi_app, Counter, Histogram, Gauge
+import asyncio
 import time
 
 # Crear tablas automáticamente
 Base.metadata.create_all(bind=engine)
+# Cambios sobre tablas ya existentes (idempotente)
+migraciones.aplicar(engine)
+
+# Primera carga del calendario de tarifas (luego se mantiene desde vuelo_repo)
+from app.repositories import tarifa_diaria_repo
+with SessionLocal() as _db:
+    if tarifa_diaria_repo.esta_vacio(_db):
+        tarifa_diaria_repo.reconstruir(_db)
 
 app = FastAPI(title="FlyBlue API", version="1.0.0")
 
+@app.exception_handler(StaleDataError)
+async def conflicto_de_version(request: Request, exc: StaleDataError):
+    # Otra petición modificó el registro entre la lectura y la escritura
+    # (ver app/core/concurrencia.py); con If-Match el servicio responde 412.
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "El recurso fue modificado por otra petición; vuelve a intentarlo"},
+    )
+
+# Tareas periódicas en segundo plano (ver app/core/tareas.py); intervalo 0 = desactivada
+_tareas_fondo = []
+
+@app.on_event("startup")
+async def iniciar_tareas_fondo():
+    periodicas = [
+        ("archivado", archivo_service.ARCHIVO_INTERVALO, lambda: archivo_service.pasada_archivado(SessionLocal)),
+        ("purga_idempotencia", idempotencia_service.IDEMPOTENCIA_PURGA_INTERVALO,
+         lambda: idempotencia_service.purgar_vencidas(SessionLocal)),
+        ("barrido_retenciones", retencion_service.RETENCION_BARRIDO_INTERVALO,
+         lambda: retencion_service.pasada_barrido(SessionLocal)),
+        ("calendario_tarifas", vuelo_service.CALENDARIO_REFRESCO_INTERVALO,
+         lambda: vuelo_service.pasada_calendario(SessionLocal)),
+    ]
+    for nombre, intervalo, trabajo in periodicas:
+        if intervalo > 0:
+            _tareas_fondo.append(asyncio.create_task(tareas.repetir(nombre, intervalo, trabajo)))
+
+@app.on_event("shutdown")
+async def detener_tareas_fondo():
+    for tarea in _tareas_fondo:
+        tarea.cancel()
+    _tareas_fondo.clear()
+
 # Endpoint de métricas para Prometheus
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
@@ -141,6 +192,10 @@ app.include_router(reserva_routes.router)
 app.include_router(servicio_routes.router)
 app.include_router(pago_routes.router)
 app.include_router(notificacion_routes.router)
+app.include_router(aeropuerto_routes.router)
+app.include_router(programacion_routes.router)
+app.include_router(retencion_routes.router)
+app.include_router(lista_espera_routes.router)
 
 
 @app.get("/")
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, select, insert
+from app.db.database import Base
+from app.core.aeropuertos import clave_aeropuerto, codigo_iata, ciudad_aeropuerto
+
+class Aeropuerto(Base):
+    __tablename__ = "aeropuertos"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Código IATA o, si el texto no lo trae, el nombre normalizado (ver app/core/aeropuertos.py)
+    clave = Column(String(100), nullable=False, unique=True)
+    codigo = Column(String(3), nullable=True)
+    ciudad = Column(String(100), nullable=False)
+    pais = Column(String(100), nullable=True)
+
+
+def _insertar_si_no_existe(conexion, valores: list[dict]):
+    # INSERT ... ON CONFLICT DO NOTHING: dos transacciones que dan de alta el
+    # mismo aeropuerto a la vez no fallan por la restricción única.
+    if conexion.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+    elif conexion.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+    else:
+        insert_dialecto = insert
+    sentencia = insert_dialecto(Aeropuerto.__table__)
+    if hasattr(sentencia, "on_conflict_do_nothing"):
+        sentencia = sentencia.on_conflict_do_nothing(index_elements=["clave"])
+    conexion.execute(sentencia, valores)
+
+
+def ids_para_textos(conexion, textos) -> dict:
+    """Texto de origen/destino → id de aeropuerto, creando los que falten.
+
+    Recibe una conexión (no una sesión) para poder usarse también desde los
+    eventos de flush del ORM. Dos consultas como máximo, más el INSERT de los nuevos.
+    """
+    claves = {texto: clave_aeropuerto(texto) for texto in set(textos)}
+    tabla = Aeropuerto.__table__
+
+    def _buscar(valores):
+        filas = conexion.execute(select(tabla.c.id, tabla.c.clave).where(tabla.c.clave.in_(valores)))
+        return {clave: id_ for id_, clave in filas}
+
+    # Un código conocido tiene clave = código: "bog" encuentra aquí a BOG. Lo
+    # que no aparece es un nombre, aunque tenga tres letras ("Ica"), así que
+    # solo se guarda el código que venga explícito entre paréntesis.
+    ids = _buscar(set(claves.values()))
+    faltantes = {}
+    for texto, clave in claves.items():
+        if clave not in ids and clave not in faltantes:
+            faltantes[clave] = {"clave": clave, "codigo": codigo_iata(texto), "ciudad": ciudad_aeropuerto(texto)[:100]}
+    if faltantes:
+        _insertar_si_no_existe(conexion, list(faltantes.values()))
+        ids.update(_buscar(set(faltantes)))
+    return {texto: ids[clave] for texto, clave in claves.items()}
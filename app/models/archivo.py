@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Index
+from datetime import datetime
+from app.db.database import Base
+
+class VueloArchivo(Base):
+    """Vuelo ya salido, movido desde `vuelos` por el archivado periódico.
+
+    Mismas columnas que `vuelos`, sin claves foráneas ni relaciones: la tabla
+    solo se escribe al archivar y se lee por la ruta de históricos.
+    """
+    __tablename__ = "vuelos_archivo"
+    __table_args__ = (
+        Index("ix_vuelos_archivo_ruta_salida", "origen_id", "destino_id", "salida"),
+        Index("ix_vuelos_archivo_salida", "salida"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    origen = Column(String(100), nullable=False)
+    destino = Column(String(100), nullable=False)
+    origen_id = Column(Integer, nullable=False)
+    destino_id = Column(Integer, nullable=False)
+    salida = Column(DateTime, nullable=False)
+    llegada = Column(DateTime, nullable=False)
+    duracion = Column(Float, nullable=False)
+    precio_base = Column(Float, nullable=False)
+    asientos_disponibles = Column(Integer, nullable=False)
+    archivado_en = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ReservaArchivo(Base):
+    """Reserva de un vuelo archivado; servicios y pago van desnormalizados en `detalle`."""
+    __tablename__ = "reservas_archivo"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    usuario_id = Column(Integer, nullable=False, index=True)
+    vuelo_id = Column(Integer, nullable=False, index=True)
+    fecha_reserva = Column(DateTime)
+    estado = Column(String(20))
+    clase = Column(String(20))
+    asiento = Column(String(10))
+    total = Column(Float, nullable=False)
+    # {"servicios": [{servicio_id, cantidad, subtotal}], "pago": {...} | None}
+    detalle = Column(JSON, nullable=False)
+    archivado_en = Column(DateTime, nullable=False, default=datetime.utcnow)
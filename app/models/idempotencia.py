@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from app.db.database import Base
+
+class ClaveIdempotencia(Base):
+    """Resultado de un POST enviado con cabecera `Idempotency-Key`.
+
+    La clave es única por usuario y ruta. Mientras la primera petición se
+    procesa la fila queda `en_proceso`; al terminar guarda el código y el
+    cuerpo JSON de la respuesta, que se devuelven tal cual a los reintentos.
+    """
+    __tablename__ = "claves_idempotencia"
+    __table_args__ = (
+        Index("ix_claves_idempotencia_expira_en", "expira_en"),
+    )
+
+    usuario_id = Column(Integer, primary_key=True, autoincrement=False)
+    ruta = Column(String(50), primary_key=True)
+    clave = Column(String(100), primary_key=True)
+    # sha256 del cuerpo de la petición: la misma clave con otro cuerpo es un error del cliente
+    huella = Column(String(64), nullable=False)
+    estado = Column(String(20), nullable=False, default="en_proceso")  # en_proceso | completada
+    codigo_estado = Column(Integer, nullable=True)
+    respuesta = Column(Text, nullable=True)
+    creada_en = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expira_en = Column(DateTime, nullable=False)
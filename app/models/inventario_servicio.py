@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from app.db.database import Base
+
+class InventarioServicio(Base):
+    """Existencias limitadas de un servicio en un vuelo (comidas, asientos XL, salas VIP).
+
+    Un servicio sin fila para el vuelo no tiene límite. `disponibles` se
+    descuenta con un UPDATE condicional al agregarlo a una reserva y se
+    devuelve al quitarlo o cancelar la reserva.
+    """
+    __tablename__ = "inventario_servicios"
+    __table_args__ = (
+        # También resuelve el menú completo de un vuelo (prefijo vuelo_id)
+        UniqueConstraint("vuelo_id", "servicio_id", name="uq_inventario_servicios_vuelo_servicio"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id", ondelete="CASCADE"), nullable=False)
+    servicio_id = Column(Integer, ForeignKey("servicios.id", ondelete="CASCADE"), nullable=False)
+    capacidad = Column(Integer, nullable=False)
+    disponibles = Column(Integer, nullable=False)
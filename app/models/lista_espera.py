@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+from app.db.database import Base
+
+class EntradaListaEspera(Base):
+    """Usuario en espera de un asiento en un vuelo agotado.
+
+    La cola es FIFO por vuelo y clase (canónica, ver `app/core/tarifas.py`);
+    el orden lo da el id autoincremental.
+    """
+    __tablename__ = "lista_espera"
+    __table_args__ = (
+        UniqueConstraint("vuelo_id", "usuario_id", name="uq_lista_espera_vuelo_usuario"),
+        # La cabeza de cada cola es la primera entrada de este índice
+        Index("ix_lista_espera_cola", "vuelo_id", "clase", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id"), nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
+    clase = Column(String(20), nullable=False)
+    # Importe de la reserva que se creará al promoverla
+    total = Column(Float, nullable=False)
+    creada_en = Column(DateTime, nullable=False, default=datetime.utcnow)
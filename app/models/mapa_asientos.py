@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+class MapaAsientos(Base):
+    __tablename__ = "mapas_asientos"
+
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id", ondelete="CASCADE"), primary_key=True)
+    filas = Column(Integer, nullable=False)
+    # Letras por fila; "-" marca un pasillo (ej. "ABC-DEF")
+    disposicion = Column(String(20), nullable=False)
+    # Bitmap de ocupación, 1 bit por asiento (ver app/core/mapa_asientos.py)
+    ocupados = Column(LargeBinary, nullable=False)
+
+    vuelo = relationship("Vuelo", back_populates="mapa_asientos")
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
 
 class Notificacion(Base):
     __tablename__ = "notificaciones"
+    __table_args__ = (
+        # Listados paginados por usuario en orden (fecha, id) sin ordenar en memoria
+        Index("ix_notificaciones_usuario_fecha_id", "usuario_id", "fecha", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
@@ -13,6 +17,7 @@ class Notificacion(Base):
     mensaje = Column(Text, nullable=False)
     tipo = Column(String(50), default="info")
     leido = Column(Boolean, default=False)
-    fecha = Column(DateTime, default=datetime.utcnow)
+    # No nula: una fecha NULL quedaría fuera de la comparación (fecha, id) del cursor
+    fecha = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     usuario = relationship("Usuario", back_populates="notificaciones")
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Time
+from app.db.database import Base
+
+class ProgramacionVuelo(Base):
+    """Plantilla de un vuelo recurrente: misma ruta y hora ciertos días de la semana.
+
+    `materializado_hasta` es la marca de agua de la generación: los días
+    hasta esa fecha ya tienen su fila en `vuelos`, así extender la
+    programación solo genera los días posteriores.
+    """
+    __tablename__ = "programaciones_vuelo"
+
+    id = Column(Integer, primary_key=True, index=True)
+    origen = Column(String(100), nullable=False)
+    destino = Column(String(100), nullable=False)
+    # Días de la semana como dígitos (0 = lunes ... 6 = domingo), ej. "024"
+    dias_semana = Column(String(7), nullable=False)
+    hora_salida = Column(Time, nullable=False)
+    duracion = Column(Float, nullable=False)
+    precio_base = Column(Float, nullable=False)
+    capacidad = Column(Integer, nullable=False)
+    desde = Column(Date, nullable=False)
+    hasta = Column(Date, nullable=False)
+    materializado_hasta = Column(Date, nullable=True)
@@ -1,19 +1,27 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
 
 class Reserva(Base):
     __tablename__ = "reservas"
+    __table_args__ = (
+        # Búsqueda de administración: estado por igualdad y rango de fecha_reserva
+        Index("ix_reservas_estado_fecha_reserva", "estado", "fecha_reserva"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
-    vuelo_id = Column(Integer, ForeignKey("vuelos.id"), nullable=False)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False, index=True)
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id"), nullable=False, index=True)
     fecha_reserva = Column(DateTime, default=datetime.utcnow)
     estado = Column(String(20), default="pendiente")
     clase = Column(String(20))
     asiento = Column(String(10))
     total = Column(Float, nullable=False)
+    # Concurrencia optimista (ver app/core/concurrencia.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Relaciones
     usuario = relationship("Usuario", back_populates="reservas")
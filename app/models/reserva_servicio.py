@@ -6,7 +6,7 @@ class ReservaServicio(Base):
     __tablename__ = "reserva_servicio"
 
     id = Column(Integer, primary_key=True, index=True)
-    reserva_id = Column(Integer, ForeignKey("reservas.id", ondelete="CASCADE"), nullable=False)
+    reserva_id = Column(Integer, ForeignKey("reservas.id", ondelete="CASCADE"), nullable=False, index=True)
     servicio_id = Column(Integer, ForeignKey("servicios.id", ondelete="CASCADE"), nullable=False)
 
     cantidad = Column(Integer, default=1)
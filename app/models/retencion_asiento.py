@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db.database import Base
+
+class RetencionAsiento(Base):
+    """Asiento apartado temporalmente mientras el usuario paga.
+
+    Mientras existe, el asiento ya está descontado de `asientos_disponibles`,
+    del cupo de su clase y del mapa. Al convertirla en reserva se borra sin
+    tocar los contadores; si vence, el barrido la borra y los devuelve.
+    """
+    __tablename__ = "retenciones_asiento"
+    __table_args__ = (
+        # El barrido recorre solo el rango de vencidas, por orden de vencimiento
+        Index("ix_retenciones_asiento_expira_en", "expira_en"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id"), nullable=False, index=True)
+    clase = Column(String(20), nullable=False)
+    asiento = Column(String(10), nullable=True)
+    creada_en = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expira_en = Column(DateTime, nullable=False)
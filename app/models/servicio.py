@@ -9,5 +9,9 @@ class Servicio(Base):
     nombre = Column(String(100), nullable=False)
     descripcion = Column(Text, nullable=True)
     precio = Column(Numeric(10, 2), nullable=False)
+    # Concurrencia optimista (ver app/core/concurrencia.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
     
     reservas = relationship("ReservaServicio", back_populates="servicio")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+class TarifaClase(Base):
+    __tablename__ = "tarifas_clase"
+    __table_args__ = (
+        UniqueConstraint("vuelo_id", "clase", name="uq_tarifas_clase_vuelo_clase"),
+        # "Vuelos con cupo en clase X": rango sobre (clase, disponibles > 0)
+        Index("ix_tarifas_clase_disponibles", "clase", "disponibles", "vuelo_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    vuelo_id = Column(Integer, ForeignKey("vuelos.id", ondelete="CASCADE"), nullable=False)
+    # Clase normalizada: economica | ejecutiva | primera
+    clase = Column(String(20), nullable=False)
+    capacidad = Column(Integer, nullable=False)
+    disponibles = Column(Integer, nullable=False)
+    multiplicador = Column(Float, nullable=False, default=1.0)
+
+    vuelo = relationship("Vuelo", back_populates="tarifas")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.db.database import Base
+
+class TarifaDiaria(Base):
+    """Resumen materializado por ruta y día para el calendario de tarifas.
+
+    Se mantiene desde `vuelo_repo` en la misma transacción que el cambio del
+    vuelo; la clave primaria (origen_id, destino_id, dia) sirve el rango de un mes.
+    Las reservas solo lo recalculan cuando un vuelo se agota o vuelve a la venta.
+    """
+    __tablename__ = "tarifas_diarias"
+
+    origen_id = Column(Integer, ForeignKey("aeropuertos.id"), primary_key=True)
+    destino_id = Column(Integer, ForeignKey("aeropuertos.id"), primary_key=True)
+    dia = Column(Date, primary_key=True)
+    # Mínimo entre los vuelos con asientos (entre todos si el día está agotado)
+    precio_min = Column(Float, nullable=False)
+    # Suma de asientos_disponibles de los vuelos del día; la refresca
+    # vuelo_service.pasada_calendario
+    asientos = Column(Integer, nullable=False)
+    vuelos = Column(Integer, nullable=False)
@@ -1,17 +1,52 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, UniqueConstraint, event, inspect
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.models.aeropuerto import ids_para_textos
 
 class Vuelo(Base):
     __tablename__ = "vuelos"
+    __table_args__ = (
+        # Búsqueda por ruta y rango de fechas sobre claves enteras: (origen_id, destino_id, salida)
+        Index("ix_vuelos_ruta_salida", "origen_id", "destino_id", "salida"),
+        # Búsquedas por fecha sin ruta y selección de los vuelos a archivar
+        Index("ix_vuelos_salida", "salida"),
+        # Un vuelo por día y hora de cada programación: repetir la generación no duplica
+        UniqueConstraint("programacion_id", "salida", name="uq_vuelos_programacion_salida"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=False)
+    # Texto tal como lo envía el cliente (se conserva para las respuestas)
     origen = Column(String(100), nullable=False)
     destino = Column(String(100), nullable=False)
+    # Aeropuerto normalizado; se asigna solo a partir del texto al guardar
+    origen_id = Column(Integer, ForeignKey("aeropuertos.id"), nullable=False)
+    destino_id = Column(Integer, ForeignKey("aeropuertos.id"), nullable=False)
     salida = Column(DateTime, nullable=False)
     llegada = Column(DateTime, nullable=False)
     duracion = Column(Float, nullable=False)
     precio_base = Column(Float, nullable=False)
     asientos_disponibles = Column(Integer, nullable=False, default=100)
+    # Programación recurrente que generó el vuelo (None si se creó a mano)
+    programacion_id = Column(Integer, ForeignKey("programaciones_vuelo.id"), nullable=True)
+    # Concurrencia optimista (ver app/core/concurrencia.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
     
     reservas = relationship("Reserva", back_populates="vuelo", cascade="all, delete-orphan")
+    tarifas = relationship("TarifaClase", back_populates="vuelo", cascade="all, delete-orphan")
+    mapa_asientos = relationship("MapaAsientos", back_populates="vuelo", uselist=False, cascade="all, delete-orphan")
+    aeropuerto_origen = relationship("Aeropuerto", foreign_keys=[origen_id], lazy="raise")
+    aeropuerto_destino = relationship("Aeropuerto", foreign_keys=[destino_id], lazy="raise")
+
+
+@event.listens_for(Vuelo, "before_insert")
+@event.listens_for(Vuelo, "before_update")
+def _asignar_aeropuertos(mapper, conexion, vuelo):
+    # Las altas masivas (INSERT multi-fila / COPY) no pasan por aquí: resuelven
+    # los ids por lote en vuelo_repo.insertar_lote.
+    estado = inspect(vuelo)
+    cambio = estado.attrs.origen.history.has_changes() or estado.attrs.destino.history.has_changes()
+    if cambio or vuelo.origen_id is None or vuelo.destino_id is None:
+        ids = ids_para_textos(conexion, [vuelo.origen, vuelo.destino])
+        vuelo.origen_id, vuelo.destino_id = ids[vuelo.origen], ids[vuelo.destino]
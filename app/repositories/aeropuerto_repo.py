@@ -0,0 +1,42 @@
+from sqlalchemy.orm import Session
+from app.core.aeropuertos import clave_aeropuerto
+from app.core.paginacion import paginar
+from app.models.aeropuerto import Aeropuerto, ids_para_textos
+from app.dto.aeropuerto_dto import AeropuertoCreate, AeropuertoUpdate
+
+def listar_aeropuertos(db: Session, limit: int = None, cursor: str = None):
+    return paginar(db.query(Aeropuerto), [Aeropuerto.id], limit, cursor)
+
+def obtener_aeropuerto(db: Session, aeropuerto_id: int):
+    return db.query(Aeropuerto).filter(Aeropuerto.id == aeropuerto_id).first()
+
+def obtener_por_clave(db: Session, clave: str):
+    return db.query(Aeropuerto).filter(Aeropuerto.clave == clave).first()
+
+def buscar_ids(db: Session, textos) -> dict:
+    # Solo lectura: texto → id de los aeropuertos que existen (una consulta)
+    claves = {texto: clave_aeropuerto(texto) for texto in textos}
+    filas = db.query(Aeropuerto.id, Aeropuerto.clave).filter(Aeropuerto.clave.in_(set(claves.values()))).all()
+    ids = {clave: id_ for id_, clave in filas}
+    return {texto: ids[clave] for texto, clave in claves.items() if clave in ids}
+
+def obtener_o_crear_ids(db: Session, textos) -> dict:
+    # Sin commit: los aeropuertos nuevos van en la transacción del llamador
+    return ids_para_textos(db.connection(), textos)
+
+def crear_aeropuerto(db: Session, datos: AeropuertoCreate):
+    aeropuerto = Aeropuerto(clave=datos.codigo.upper(), codigo=datos.codigo.upper(), ciudad=datos.ciudad, pais=datos.pais)
+    db.add(aeropuerto)
+    db.commit()
+    db.refresh(aeropuerto)
+    return aeropuerto
+
+def actualizar_aeropuerto(db: Session, aeropuerto_id: int, datos: AeropuertoUpdate):
+    aeropuerto = obtener_aeropuerto(db, aeropuerto_id)
+    if not aeropuerto:
+        return None
+    for k, v in datos.dict(exclude_unset=True).items():
+        setattr(aeropuerto, k, v)
+    db.commit()
+    db.refresh(aeropuerto)
+    return aeropuerto
@@ -0,0 +1,118 @@
+from datetime import datetime
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
+from app.models.archivo import VueloArchivo, ReservaArchivo
+from app.models.vuelo import Vuelo
+from app.models.reserva import Reserva
+from app.models.reserva_servicio import ReservaServicio
+from app.models.pago import Pago
+from app.models.tarifa_clase import TarifaClase
+from app.models.mapa_asientos import MapaAsientos
+from app.models.retencion_asiento import RetencionAsiento
+from app.models.inventario_servicio import InventarioServicio
+from app.repositories import tarifa_diaria_repo
+
+_COLUMNAS_VUELO = (
+    "id", "origen", "destino", "origen_id", "destino_id",
+    "salida", "llegada", "duracion", "precio_base", "asientos_disponibles",
+)
+
+def _numero(valor):
+    return float(valor) if valor is not None else None
+
+def _detalles_reservas(db: Session, reserva_ids) -> dict:
+    # Servicios y pago de cada reserva en dos consultas, listos para JSON
+    detalles = {rid: {"servicios": [], "pago": None} for rid in reserva_ids}
+    for rs in db.execute(select(ReservaServicio).where(ReservaServicio.reserva_id.in_(reserva_ids))).scalars():
+        detalles[rs.reserva_id]["servicios"].append(
+            {"servicio_id": rs.servicio_id, "cantidad": rs.cantidad, "subtotal": _numero(rs.subtotal)}
+        )
+    for p in db.execute(select(Pago).where(Pago.reserva_id.in_(reserva_ids))).scalars():
+        detalles[p.reserva_id]["pago"] = {
+            "id": p.id, "metodo": p.metodo, "monto": _numero(p.monto), "moneda": p.moneda,
+            "fecha": p.fecha.isoformat() if p.fecha else None, "estado": p.estado, "referencia": p.referencia,
+        }
+    return detalles
+
+def vuelos_a_archivar(db: Session, corte: datetime, lote: int) -> list[int]:
+    # Hasta `lote` vuelos con salida anterior a `corte`, sobre ix_vuelos_salida
+    return list(db.execute(
+        select(Vuelo.id).where(Vuelo.salida < corte).order_by(Vuelo.salida, Vuelo.id).limit(lote)
+    ).scalars())
+
+def archivar_lote(db: Session, vuelo_ids: list[int]) -> int:
+    """Mueve los vuelos `vuelo_ids` y sus reservas a las tablas de archivo.
+
+    Copia vuelos y reservas con INSERT ... SELECT / multi-fila y borra de las
+    tablas activas las filas dependientes (pagos, servicios, tarifas, mapa,
+    retenciones, inventario de servicios). La lista de espera la vacía antes
+    el servicio, que avisa a cada usuario. El calendario de tarifas se
+    recalcula para cada ruta y día afectados.
+    Sin commit. Retorna el nº de reservas archivadas.
+    """
+    dias = {
+        (origen_id, destino_id, salida.date())
+        for origen_id, destino_id, salida in db.execute(
+            select(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida).where(Vuelo.id.in_(vuelo_ids))
+        )
+    }
+
+    columnas = [Vuelo.__table__.c[c] for c in _COLUMNAS_VUELO]
+    db.execute(
+        insert(VueloArchivo).from_select(list(_COLUMNAS_VUELO), select(*columnas).where(Vuelo.id.in_(vuelo_ids)))
+    )
+
+    reservas = db.execute(select(*Reserva.__table__.c).where(Reserva.vuelo_id.in_(vuelo_ids))).all()
+    reserva_ids = [r.id for r in reservas]
+    if reserva_ids:
+        detalles = _detalles_reservas(db, reserva_ids)
+        db.execute(insert(ReservaArchivo), [
+            {
+                "id": r.id, "usuario_id": r.usuario_id, "vuelo_id": r.vuelo_id,
+                "fecha_reserva": r.fecha_reserva, "estado": r.estado, "clase": r.clase,
+                "asiento": r.asiento, "total": r.total, "detalle": detalles[r.id],
+            }
+            for r in reservas
+        ])
+        db.execute(delete(Pago).where(Pago.reserva_id.in_(reserva_ids)))
+        db.execute(delete(ReservaServicio).where(ReservaServicio.reserva_id.in_(reserva_ids)))
+        db.execute(delete(Reserva).where(Reserva.id.in_(reserva_ids)))
+
+    db.execute(delete(TarifaClase).where(TarifaClase.vuelo_id.in_(vuelo_ids)))
+    db.execute(delete(MapaAsientos).where(MapaAsientos.vuelo_id.in_(vuelo_ids)))
+    db.execute(delete(RetencionAsiento).where(RetencionAsiento.vuelo_id.in_(vuelo_ids)))
+    db.execute(delete(InventarioServicio).where(InventarioServicio.vuelo_id.in_(vuelo_ids)))
+    db.execute(delete(Vuelo).where(Vuelo.id.in_(vuelo_ids)))
+    for origen_id, destino_id, dia in dias:
+        tarifa_diaria_repo.recalcular(db, origen_id, destino_id, dia)
+    return len(reserva_ids)
+
+def obtener_vuelo(db: Session, vuelo_id: int):
+    return db.get(VueloArchivo, vuelo_id)
+
+def listar_vuelos(
+    db: Session,
+    origen_id: int = None,
+    destino_id: int = None,
+    salida_desde: datetime = None,
+    salida_hasta: datetime = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    query = db.query(VueloArchivo)
+    if origen_id is not None:
+        query = query.filter(VueloArchivo.origen_id == origen_id)
+    if destino_id is not None:
+        query = query.filter(VueloArchivo.destino_id == destino_id)
+    if salida_desde is not None:
+        query = query.filter(VueloArchivo.salida >= salida_desde)
+    if salida_hasta is not None:
+        query = query.filter(VueloArchivo.salida <= salida_hasta)
+    return paginar(query, [VueloArchivo.salida, VueloArchivo.id], limit, cursor)
+
+def listar_reservas(db: Session, usuario_id: int = None, limit: int = None, cursor: str = None):
+    query = db.query(ReservaArchivo)
+    if usuario_id:
+        query = query.filter(ReservaArchivo.usuario_id == usuario_id)
+    return paginar(query, [ReservaArchivo.id], limit, cursor)
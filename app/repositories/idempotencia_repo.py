@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.idempotencia import ClaveIdempotencia
+
+_COLUMNAS = (
+    ClaveIdempotencia.huella, ClaveIdempotencia.estado, ClaveIdempotencia.codigo_estado,
+    ClaveIdempotencia.respuesta, ClaveIdempotencia.expira_en,
+)
+
+def _donde(usuario_id: int, ruta: str, clave: str):
+    return (
+        ClaveIdempotencia.usuario_id == usuario_id,
+        ClaveIdempotencia.ruta == ruta,
+        ClaveIdempotencia.clave == clave,
+    )
+
+def obtener(db: Session, usuario_id: int, ruta: str, clave: str):
+    # Lectura por clave primaria; devuelve la fila (no la entidad) para no
+    # quedarse con una copia vieja en el mapa de identidad mientras se espera
+    return db.execute(select(*_COLUMNAS).where(*_donde(usuario_id, ruta, clave))).first()
+
+def reclamar(db: Session, usuario_id: int, ruta: str, clave: str, huella: str, expira_en: datetime) -> bool:
+    """Registra la clave `en_proceso` y confirma. False si otra petición la registró antes."""
+    try:
+        db.execute(insert(ClaveIdempotencia).values(
+            usuario_id=usuario_id, ruta=ruta, clave=clave, huella=huella,
+            estado="en_proceso", creada_en=datetime.utcnow(), expira_en=expira_en,
+        ))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+def completar(db: Session, usuario_id: int, ruta: str, clave: str, codigo_estado: int, respuesta: str):
+    db.execute(
+        update(ClaveIdempotencia)
+        .where(*_donde(usuario_id, ruta, clave))
+        .values(estado="completada", codigo_estado=codigo_estado, respuesta=respuesta)
+    )
+    db.commit()
+
+def eliminar(db: Session, usuario_id: int, ruta: str, clave: str):
+    db.execute(delete(ClaveIdempotencia).where(*_donde(usuario_id, ruta, clave)))
+    db.commit()
+
+def eliminar_vencidas(db: Session, ahora: datetime) -> int:
+    # Rango sobre ix_claves_idempotencia_expira_en
+    resultado = db.execute(delete(ClaveIdempotencia).where(ClaveIdempotencia.expira_en <= ahora))
+    db.commit()
+    return resultado.rowcount
@@ -0,0 +1,87 @@
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.orm import Session
+from app.models.inventario_servicio import InventarioServicio
+from app.models.reserva import Reserva
+from app.models.reserva_servicio import ReservaServicio
+from app.models.servicio import Servicio
+
+def listar(db: Session, vuelo_id: int):
+    return (
+        db.query(InventarioServicio)
+        .filter(InventarioServicio.vuelo_id == vuelo_id)
+        .order_by(InventarioServicio.servicio_id)
+        .all()
+    )
+
+def menu(db: Session, vuelo_id: int):
+    # Todo el catálogo con las existencias del vuelo en una consulta
+    # (LEFT JOIN: capacidad/disponibles None = sin límite)
+    return db.execute(
+        select(Servicio.id, Servicio.nombre, Servicio.precio,
+               InventarioServicio.capacidad, InventarioServicio.disponibles)
+        .outerjoin(InventarioServicio, and_(
+            InventarioServicio.servicio_id == Servicio.id,
+            InventarioServicio.vuelo_id == vuelo_id,
+        ))
+        .order_by(Servicio.id)
+    ).all()
+
+def _pedido(cantidades: dict):
+    return case(cantidades, value=InventarioServicio.servicio_id)
+
+def descontar(db: Session, vuelo_id: int, cantidades: dict) -> set:
+    # Igual que tarifa_repo.descontar_cupo: UPDATE condicional sin commit, pero
+    # todos los servicios del pedido en una sentencia. Retorna los servicio_id
+    # descontados; los que tienen fila y no aparecen se quedaron sin existencias.
+    if not cantidades:
+        return set()
+    pedido = _pedido(cantidades)
+    return set(db.execute(
+        update(InventarioServicio)
+        .where(
+            InventarioServicio.vuelo_id == vuelo_id,
+            InventarioServicio.servicio_id.in_(list(cantidades)),
+            InventarioServicio.disponibles >= pedido,
+        )
+        .values(disponibles=InventarioServicio.disponibles - pedido)
+        .returning(InventarioServicio.servicio_id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+
+def con_inventario(db: Session, vuelo_id: int, servicio_ids) -> set:
+    return set(db.execute(
+        select(InventarioServicio.servicio_id).where(
+            InventarioServicio.vuelo_id == vuelo_id,
+            InventarioServicio.servicio_id.in_(list(servicio_ids)),
+        )
+    ).scalars())
+
+def liberar(db: Session, vuelo_id: int, cantidades: dict):
+    if not cantidades:
+        return
+    devuelto = InventarioServicio.disponibles + _pedido(cantidades)
+    db.execute(
+        update(InventarioServicio)
+        .where(InventarioServicio.vuelo_id == vuelo_id, InventarioServicio.servicio_id.in_(list(cantidades)))
+        .values(disponibles=case(
+            (devuelto > InventarioServicio.capacidad, InventarioServicio.capacidad),
+            else_=devuelto,
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+def vendidos(db: Session, vuelo_id: int) -> dict:
+    filas = (
+        db.query(ReservaServicio.servicio_id, func.sum(ReservaServicio.cantidad))
+        .join(Reserva, Reserva.id == ReservaServicio.reserva_id)
+        .filter(Reserva.vuelo_id == vuelo_id)
+        .group_by(ReservaServicio.servicio_id)
+        .all()
+    )
+    return {servicio_id: total for servicio_id, total in filas}
+
+def reemplazar(db: Session, vuelo_id: int, inventario: list[InventarioServicio]):
+    db.query(InventarioServicio).filter(InventarioServicio.vuelo_id == vuelo_id).delete(synchronize_session=False)
+    db.add_all(inventario)
+    db.flush()
+    return inventario
@@ -0,0 +1,61 @@
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
+from app.models.lista_espera import EntradaListaEspera
+
+def obtener(db: Session, entrada_id: int):
+    return db.get(EntradaListaEspera, entrada_id)
+
+def listar_de_usuario(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    query = db.query(EntradaListaEspera).filter(EntradaListaEspera.usuario_id == usuario_id)
+    return paginar(query, [EntradaListaEspera.id], limit, cursor)
+
+def crear(db: Session, vuelo_id: int, usuario_id: int, clase: str, total: float):
+    entrada = EntradaListaEspera(vuelo_id=vuelo_id, usuario_id=usuario_id, clase=clase, total=total)
+    db.add(entrada)
+    db.commit()
+    db.refresh(entrada)
+    return entrada
+
+def posicion(db: Session, entrada) -> int:
+    # Rango sobre ix_lista_espera_cola
+    return db.execute(
+        select(func.count()).where(
+            EntradaListaEspera.vuelo_id == entrada.vuelo_id,
+            EntradaListaEspera.clase == entrada.clase,
+            EntradaListaEspera.id <= entrada.id,
+        )
+    ).scalar_one()
+
+def eliminar(db: Session, entrada_id: int) -> bool:
+    resultado = db.execute(delete(EntradaListaEspera).where(EntradaListaEspera.id == entrada_id))
+    db.commit()
+    return resultado.rowcount == 1
+
+def eliminar_de_vuelos(db: Session, vuelo_ids, clase: str = None):
+    """Vacía las colas de los vuelos (o solo la de `clase`) y devuelve las entradas borradas. Sin commit."""
+    condiciones = [EntradaListaEspera.vuelo_id.in_(vuelo_ids)]
+    if clase is not None:
+        condiciones.append(EntradaListaEspera.clase == clase)
+    return db.execute(
+        delete(EntradaListaEspera).where(*condiciones).returning(*EntradaListaEspera.__table__.c)
+    ).all()
+
+def tomar_primera(db: Session, vuelo_id: int, clase: str):
+    """Saca la cabeza de la cola y devuelve su fila, o None si está vacía. Sin commit.
+
+    Una sola sentencia sobre el índice de la cola. En PostgreSQL, SKIP LOCKED
+    hace que dos cancelaciones simultáneas tomen entradas distintas en lugar
+    de esperar por la misma; SQLite serializa las escrituras y lo omite.
+    """
+    cabeza = (
+        select(EntradaListaEspera.id)
+        .where(EntradaListaEspera.vuelo_id == vuelo_id, EntradaListaEspera.clase == clase)
+        .order_by(EntradaListaEspera.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return db.execute(
+        delete(EntradaListaEspera).where(EntradaListaEspera.id == cabeza).returning(*EntradaListaEspera.__table__.c)
+    ).first()
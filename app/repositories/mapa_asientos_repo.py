@@ -0,0 +1,29 @@
+from sqlalchemy.orm import Session
+from app.models.mapa_asientos import MapaAsientos
+from app.models.reserva import Reserva
+
+def obtener_mapa(db: Session, vuelo_id: int, bloquear: bool = False):
+    query = db.query(MapaAsientos).filter(MapaAsientos.vuelo_id == vuelo_id)
+    if bloquear:
+        # SELECT ... FOR UPDATE: serializa la asignación de asientos del vuelo
+        query = query.with_for_update().populate_existing()
+    return query.first()
+
+def guardar_mapa(db: Session, vuelo_id: int, filas: int, disposicion: str, ocupados: bytes):
+    mapa = obtener_mapa(db, vuelo_id, bloquear=True)
+    if not mapa:
+        mapa = MapaAsientos(vuelo_id=vuelo_id)
+        db.add(mapa)
+    mapa.filas = filas
+    mapa.disposicion = disposicion
+    mapa.ocupados = ocupados
+    db.commit()
+    db.refresh(mapa)
+    return mapa
+
+def asientos_reservados(db: Session, vuelo_id: int):
+    filas = db.query(Reserva.asiento).filter(
+        Reserva.vuelo_id == vuelo_id,
+        Reserva.asiento.isnot(None)
+    ).all()
+    return [f.asiento for f in filas]
@@ -1,28 +1,41 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
 from app.models.notificacion import Notificacion
 from app.dto.notificacion_dto import NotificacionCreate
 
-def listar_notificaciones(db: Session, usuario_id: int):
-    return db.query(Notificacion).filter(
+def listar_notificaciones(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    query = db.query(Notificacion).filter(
         Notificacion.usuario_id == usuario_id
-    ).order_by(Notificacion.fecha.desc()).all()
+    )
+    return paginar(query, [Notificacion.fecha, Notificacion.id], limit, cursor, descendente=True)
 
-def listar_no_leidas(db: Session, usuario_id: int):
-    return db.query(Notificacion).filter(
+def listar_no_leidas(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    query = db.query(Notificacion).filter(
         Notificacion.usuario_id == usuario_id,
         Notificacion.leido == False
-    ).order_by(Notificacion.fecha.desc()).all()
+    )
+    return paginar(query, [Notificacion.fecha, Notificacion.id], limit, cursor, descendente=True)
 
 def obtener_notificacion(db: Session, notificacion_id: int):
     return db.query(Notificacion).filter(Notificacion.id == notificacion_id).first()
 
-def crear_notificacion(db: Session, datos: NotificacionCreate):
+def crear_notificacion(db: Session, datos: NotificacionCreate, commit: bool = True):
     nueva = Notificacion(**datos.dict())
     db.add(nueva)
+    if not commit:
+        # El llamador confirma la transacción junto con otros cambios
+        db.flush()
+        return nueva
     db.commit()
     db.refresh(nueva)
     return nueva
 
+def crear_notificaciones(db: Session, lista: list[NotificacionCreate]):
+    # INSERT de varias filas sin commit: el llamador confirma junto con sus cambios
+    if lista:
+        db.execute(insert(Notificacion), [datos.dict() for datos in lista])
+
 def marcar_leida(db: Session, notificacion_id: int, usuario_id: int):
     notif = db.query(Notificacion).filter(
         Notificacion.id == notificacion_id,
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
 from app.models.reserva import Reserva
 from app.models.pago import Pago
 from app.dto.pago_dto import PagoCreate
@@ -16,10 +17,10 @@ def obtener_pago(db: Session, pago_id: int):
 def obtener_pago_por_reserva(db: Session, reserva_id: int):
     return db.query(Pago).filter(Pago.reserva_id == reserva_id).first()
 
-def listar_pagos_por_usuario(db: Session, usuario_id: int):
-    return (
+def listar_pagos_por_usuario(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    query = (
         db.query(Pago)
         .join(Pago.reserva)
         .filter(Reserva.usuario_id == usuario_id)
-        .all()
     )
+    return paginar(query, [Pago.id], limit, cursor)
@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
+from app.models.programacion_vuelo import ProgramacionVuelo
+
+def listar_programaciones(db: Session, limit: int = None, cursor: str = None):
+    return paginar(db.query(ProgramacionVuelo), [ProgramacionVuelo.id], limit, cursor)
+
+def obtener_programacion(db: Session, programacion_id: int, bloquear: bool = False):
+    query = db.query(ProgramacionVuelo).filter(ProgramacionVuelo.id == programacion_id)
+    if bloquear:
+        # Dos extensiones simultáneas de la misma programación se serializan aquí
+        query = query.with_for_update()
+    return query.first()
+
+def crear_programacion(db: Session, datos: dict):
+    # Sin commit: la programación y sus primeros vuelos van en la misma transacción
+    programacion = ProgramacionVuelo(**datos)
+    db.add(programacion)
+    db.flush()
+    return programacion
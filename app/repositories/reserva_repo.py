@@ -1,41 +1,115 @@
+from datetime import datetime
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import subqueryload
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.paginacion import paginar
 from app.models.reserva import Reserva
 from app.models.reserva_servicio import ReservaServicio
 from app.dto.reserva_dto import ReservaCreate, ReservaUpdate
 
-def listar_reservas(db: Session, usuario_id: int = None):
+def listar_reservas(db: Session, usuario_id: int = None, limit: int = None, cursor: str = None):
+    # ReservaRead serializa los servicios: se cargan con un SELECT ... IN por
+    # página (en bloques de 500 ids si no hay límite) en vez de uno por reserva
+    query = db.query(Reserva).options(selectinload(Reserva.servicios_reserva))
     if usuario_id:
-        return db.query(Reserva).filter(Reserva.usuario_id == usuario_id).all()
-    return db.query(Reserva).all()
+        query = query.filter(Reserva.usuario_id == usuario_id)
+    return paginar(query, [Reserva.id], limit, cursor)
+
+def buscar_reservas(
+    db: Session,
+    estado: str = None,
+    desde: datetime = None,
+    hasta: datetime = None,
+    vuelo_id: int = None,
+    usuario_id: int = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    # Con estado y rango de fechas se recorre solo ese tramo de
+    # ix_reservas_estado_fecha_reserva, ya en el orden de la paginación
+    query = db.query(Reserva).options(selectinload(Reserva.servicios_reserva))
+    if estado is not None:
+        query = query.filter(Reserva.estado == estado)
+    if desde is not None:
+        query = query.filter(Reserva.fecha_reserva >= desde)
+    if hasta is not None:
+        query = query.filter(Reserva.fecha_reserva <= hasta)
+    if vuelo_id is not None:
+        query = query.filter(Reserva.vuelo_id == vuelo_id)
+    if usuario_id is not None:
+        query = query.filter(Reserva.usuario_id == usuario_id)
+    return paginar(query, [Reserva.fecha_reserva, Reserva.id], limit, cursor)
 
 def obtener_reserva(db: Session, reserva_id: int):
     reserva = (
         db.query(Reserva)
         .options(
-            subqueryload(Reserva.servicios_reserva).subqueryload(ReservaServicio.servicio)
+            selectinload(Reserva.servicios_reserva).selectinload(ReservaServicio.servicio)
         )
         .filter(Reserva.id == reserva_id)
         .first()
     )
     return reserva
 
-def crear_reserva(db: Session, datos: ReservaCreate, usuario_id: int):
-    nueva = Reserva(usuario_id=usuario_id, **datos.dict())
+def crear_reserva(db: Session, datos: ReservaCreate, usuario_id: int, commit: bool = True):
+    nueva = Reserva(usuario_id=usuario_id, **datos.dict(exclude={"preferencia_asiento"}))
     db.add(nueva)
+    if not commit:
+        # El llamador confirma la transacción junto con otros cambios
+        db.flush()
+        return nueva
     db.commit()
     db.refresh(nueva)
     return nueva
 
-def actualizar_reserva(db: Session, reserva_id: int, datos: ReservaUpdate):
-    reserva = obtener_reserva(db, reserva_id)
-    if not reserva:
-        return None
-    for k, v in datos.dict(exclude_unset=True).items():
-        setattr(reserva, k, v)
+def crear_reservas_lote(db: Session, usuario_id: int, filas: list[dict]):
+    # Un INSERT de varias filas con RETURNING y sin commit. Devuelve filas (no
+    # objetos del ORM): no hay nada que refrescar después. RETURNING no garantiza
+    # el orden, pero los ids se asignan en el orden de VALUES.
+    # (sort_by_parameter_order haría que SQLite insertara fila a fila.)
+    creadas = db.execute(
+        insert(Reserva).returning(*Reserva.__table__.c),
+        [{"usuario_id": usuario_id, **fila} for fila in filas],
+    ).all()
+    return sorted(creadas, key=lambda fila: fila.id)
+
+def actualizar_reserva(db: Session, reserva_id: int, datos: ReservaUpdate, version: int = None,
+                       total: float = None):
+    # UPDATE solo con los campos enviados y RETURNING: sin SELECT previo ni refresh.
+    # Si la reserva ya está en la sesión, el ORM le aplica los mismos valores.
+    # Con `version`, solo se aplica sobre esa versión; si no, StaleDataError (sin commit).
+    # `total` lo calcula el servicio (no forma parte de ReservaUpdate).
+    cambios = datos.dict(exclude_unset=True)
+    if total is not None:
+        cambios["total"] = total
+    if not cambios:
+        reserva = obtener_reserva(db, reserva_id)
+        if reserva is not None and version is not None and reserva.version != version:
+            raise StaleDataError(f"Reserva {reserva_id}: la versión {version} ya no es la actual")
+        return reserva
+
+    condiciones = [Reserva.id == reserva_id]
+    if version is not None:
+        condiciones.append(Reserva.version == version)
+    fila = db.execute(
+        update(Reserva).where(*condiciones).values(**cambios, version=Reserva.version + 1)
+        .returning(*Reserva.__table__.c)
+    ).first()
+    if fila is None and version is not None:
+        if db.execute(select(Reserva.id).where(Reserva.id == reserva_id)).first() is not None:
+            raise StaleDataError(f"Reserva {reserva_id}: la versión {version} ya no es la actual")
     db.commit()
-    db.refresh(reserva)
-    return reserva
+    return fila
+
+def ajustar_total(db: Session, reserva_id: int, importe: float):
+    # Suma `importe` (negativo al quitar servicios) al total, sin commit: va en
+    # la transacción del llamador. Cambia la versión como cualquier escritura.
+    db.execute(
+        update(Reserva)
+        .where(Reserva.id == reserva_id)
+        .values(total=Reserva.total + importe, version=Reserva.version + 1)
+    )
 
 def eliminar_reserva(db: Session, reserva_id: int):
     reserva = obtener_reserva(db, reserva_id)
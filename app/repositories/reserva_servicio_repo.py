@@ -1,30 +1,37 @@
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 from app.models.reserva_servicio import ReservaServicio
-from app.models.servicio import Servicio
 from app.repositories import reserva_repo
 
-def agregar_servicio(db: Session, reserva_id: int, servicio_id: int, cantidad: int):
-    servicio = db.query(Servicio).filter(Servicio.id == servicio_id).first()
-    if not servicio:
-        return None
-
-    subtotal = float(servicio.precio) * cantidad
-
+def agregar_servicio(db: Session, reserva_id: int, servicio_id: int, cantidad: int, subtotal: float):
+    # El subtotal llega cotizado; el total de la reserva se ajusta en la misma transacción
     nuevo = ReservaServicio(
         reserva_id=reserva_id,
         servicio_id=servicio_id,
         cantidad=cantidad,
         subtotal=subtotal
     )
-    
-        
-    
-
     db.add(nuevo)
+    db.flush()
+    reserva_repo.ajustar_total(db, reserva_id, subtotal)
     db.commit()
     db.refresh(nuevo)
     return nuevo
 
+def agregar_servicios_lote(db: Session, reserva_id: int, filas: list[dict]):
+    # Un INSERT de varias filas (servicio_id, cantidad, subtotal), sin commit
+    if filas:
+        db.execute(insert(ReservaServicio), [{"reserva_id": reserva_id, **fila} for fila in filas])
+
+def quitar_servicios(db: Session, reserva_id: int, servicio_ids) -> list:
+    # Solo las filas de esta reserva; RETURNING da lo necesario para ajustar
+    # el total sin leerlas antes. Sin commit.
+    return db.execute(
+        delete(ReservaServicio)
+        .where(ReservaServicio.reserva_id == reserva_id, ReservaServicio.servicio_id.in_(list(servicio_ids)))
+        .returning(ReservaServicio.servicio_id, ReservaServicio.cantidad, ReservaServicio.subtotal)
+    ).all()
+
 def obtener_servicios_de_reserva(db: Session, reserva_id: int):
     return db.query(ReservaServicio).filter(ReservaServicio.reserva_id == reserva_id).all()
 
@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.models.retencion_asiento import RetencionAsiento
+
+def obtener(db: Session, retencion_id: int):
+    return db.get(RetencionAsiento, retencion_id)
+
+def crear(db: Session, usuario_id: int, vuelo_id: int, clase: str, asiento, expira_en: datetime):
+    # Sin commit: va en la misma transacción que el descuento del asiento
+    retencion = RetencionAsiento(
+        usuario_id=usuario_id, vuelo_id=vuelo_id, clase=clase, asiento=asiento, expira_en=expira_en
+    )
+    db.add(retencion)
+    db.flush()
+    return retencion
+
+def tomar(db: Session, retencion_id: int, vigente_en: datetime = None):
+    """Borra la retención y devuelve su fila, o None si ya no existe.
+
+    El DELETE ... RETURNING es el que decide entre peticiones concurrentes
+    (convertir, liberar y el barrido): solo una recibe la fila. Con
+    `vigente_en` solo la toma si aún no ha vencido. Sin commit.
+    """
+    condiciones = [RetencionAsiento.id == retencion_id]
+    if vigente_en is not None:
+        condiciones.append(RetencionAsiento.expira_en > vigente_en)
+    return db.execute(
+        delete(RetencionAsiento).where(*condiciones).returning(*RetencionAsiento.__table__.c)
+    ).first()
+
+def tomar_vencidas(db: Session, ahora: datetime, lote: int):
+    # Rango sobre ix_retenciones_asiento_expira_en: nunca recorre las vigentes
+    ids = select(RetencionAsiento.id).where(RetencionAsiento.expira_en <= ahora).order_by(
+        RetencionAsiento.expira_en
+    ).limit(lote)
+    return db.execute(
+        delete(RetencionAsiento).where(RetencionAsiento.id.in_(ids)).returning(*RetencionAsiento.__table__.c)
+    ).all()
@@ -1,9 +1,22 @@
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.paginacion import paginar
 from app.models.servicio import Servicio
 from app.dto.servicio_dto import ServicioCreate, ServicioUpdate
 
-def listar_servicios(db: Session):
-    return db.query(Servicio).all()
+def listar_servicios(db: Session, limit: int = None, cursor: str = None):
+    return paginar(db.query(Servicio), [Servicio.id], limit, cursor)
+
+def precios(db: Session) -> dict:
+    # Catálogo completo {id: precio} para la instantánea de cotización
+    return {id_: float(precio) for id_, precio in db.execute(select(Servicio.id, Servicio.precio))}
+
+def precios_de(db: Session, ids) -> dict:
+    # {id: precio} de los servicios pedidos que existen, en una sola consulta
+    return {id_: float(precio) for id_, precio in db.execute(
+        select(Servicio.id, Servicio.precio).where(Servicio.id.in_(ids))
+    )}
 
 def obtener_servicio(db: Session, servicio_id: int):
     return db.query(Servicio).filter(Servicio.id == servicio_id).first()
@@ -15,16 +28,27 @@ def crear_servicio(db: Session, datos: ServicioCreate):
     db.refresh(servicio)
     return servicio
 
-def actualizar_servicio(db: Session, servicio_id: int, datos: ServicioUpdate):
-    servicio = obtener_servicio(db, servicio_id)
-    if not servicio:
-        return None
-
-    for k, v in datos.dict(exclude_unset=True).items():
-        setattr(servicio, k, v)
-
+def actualizar_servicio(db: Session, servicio_id: int, datos: ServicioUpdate, version: int = None):
+    # UPDATE solo con los campos enviados y RETURNING: sin SELECT previo ni refresh.
+    # Con `version`, solo se aplica sobre esa versión; si no, StaleDataError.
+    cambios = datos.dict(exclude_unset=True)
+    if not cambios:
+        servicio = obtener_servicio(db, servicio_id)
+        if servicio is not None and version is not None and servicio.version != version:
+            raise StaleDataError(f"Servicio {servicio_id}: la versión {version} ya no es la actual")
+        return servicio
+
+    condiciones = [Servicio.id == servicio_id]
+    if version is not None:
+        condiciones.append(Servicio.version == version)
+    servicio = db.execute(
+        update(Servicio).where(*condiciones).values(**cambios, version=Servicio.version + 1)
+        .returning(*Servicio.__table__.c)
+    ).first()
+    if servicio is None and version is not None:
+        if db.execute(select(Servicio.id).where(Servicio.id == servicio_id)).first() is not None:
+            raise StaleDataError(f"Servicio {servicio_id}: la versión {version} ya no es la actual")
     db.commit()
-    db.refresh(servicio)
     return servicio
 
 def eliminar_servicio(db: Session, servicio_id: int):
@@ -0,0 +1,147 @@
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import update, bindparam, func, case, tuple_
+from sqlalchemy.orm import Session
+from app.models.tarifa_diaria import TarifaDiaria
+from app.models.vuelo import Vuelo
+
+def _sumar(actual, precio: float, asientos: int):
+    # Agrega un vuelo a (precio_min, asientos, vuelos). El precio mínimo es el
+    # de los vuelos con asientos; solo si todos están agotados, el de todos.
+    if actual is None:
+        return (precio, asientos, 1)
+    minimo, total, vuelos = actual
+    if asientos > 0 and total == 0:
+        minimo = precio
+    elif asientos > 0 or total == 0:
+        minimo = min(minimo, precio)
+    return (minimo, total + asientos, vuelos + 1)
+
+def recalcular(db: Session, origen_id: int, destino_id: int, dia: date):
+    # Una agregación sobre ix_vuelos_ruta_salida (solo los vuelos de esa ruta y día).
+    # Sin commit: va en la transacción del cambio del vuelo.
+    db.flush()
+    desde = datetime.combine(dia, time.min)
+    precio_min, asientos, vuelos = (
+        db.query(
+            func.coalesce(
+                func.min(case((Vuelo.asientos_disponibles > 0, Vuelo.precio_base))),
+                func.min(Vuelo.precio_base),
+            ),
+            func.sum(Vuelo.asientos_disponibles),
+            func.count(Vuelo.id),
+        )
+        .filter(
+            Vuelo.origen_id == origen_id,
+            Vuelo.destino_id == destino_id,
+            Vuelo.salida >= desde,
+            Vuelo.salida < desde + timedelta(days=1),
+        )
+        .one()
+    )
+    fila = db.get(TarifaDiaria, (origen_id, destino_id, dia))
+    if not vuelos:
+        if fila is not None:
+            db.delete(fila)
+        return None
+    if fila is None:
+        fila = TarifaDiaria(origen_id=origen_id, destino_id=destino_id, dia=dia)
+        db.add(fila)
+    fila.precio_min = precio_min
+    fila.asientos = asientos
+    fila.vuelos = vuelos
+    return fila
+
+def recalcular_vuelo(db: Session, vuelo):
+    db.flush()  # un vuelo nuevo recibe origen_id/destino_id al guardarse
+    return recalcular(db, vuelo.origen_id, vuelo.destino_id, vuelo.salida.date())
+
+def agrupar_por_dia(filas: list[dict]) -> dict:
+    # Filas de vuelos nuevos (dicts) → {(origen_id, destino_id, dia): (precio_min, asientos, vuelos)}
+    grupos = {}
+    for f in filas:
+        clave = (f["origen_id"], f["destino_id"], f["salida"].date())
+        grupos[clave] = _sumar(grupos.get(clave), f["precio_base"], f["asientos_disponibles"])
+    return grupos
+
+def acumular(db: Session, grupos: dict):
+    # Solo para altas: los días nuevos de {(origen_id, destino_id, dia): (precio_min, asientos, vuelos)}
+    # se insertan sin releer los vuelos (una lectura por lote). Los que ya tenían
+    # vuelos se recalculan: sus asientos pueden ir por detrás de las reservas.
+    claves = list(grupos)
+    existentes = set(
+        db.query(TarifaDiaria.origen_id, TarifaDiaria.destino_id, TarifaDiaria.dia).filter(
+            tuple_(TarifaDiaria.origen_id, TarifaDiaria.destino_id, TarifaDiaria.dia).in_(claves)
+        ).all()
+    )
+    for clave, (precio_min, asientos, vuelos) in grupos.items():
+        if clave in existentes:
+            recalcular(db, *clave)
+        else:
+            origen_id, destino_id, dia = clave
+            db.add(TarifaDiaria(origen_id=origen_id, destino_id=destino_id, dia=dia,
+                                precio_min=precio_min, asientos=asientos, vuelos=vuelos))
+
+def listar_rango(db: Session, origen_id: int, destino_id: int, desde: date, hasta: date):
+    # Rango sobre la clave primaria (origen_id, destino_id, dia): una sola lectura indexada
+    return (
+        db.query(TarifaDiaria)
+        .filter(
+            TarifaDiaria.origen_id == origen_id,
+            TarifaDiaria.destino_id == destino_id,
+            TarifaDiaria.dia >= desde,
+            TarifaDiaria.dia < hasta,
+        )
+        .order_by(TarifaDiaria.dia)
+        .all()
+    )
+
+def esta_vacio(db: Session) -> bool:
+    return db.query(TarifaDiaria.dia).first() is None
+
+def reconstruir(db: Session):
+    # Carga inicial (vuelos creados antes de existir el resumen): una pasada
+    # sobre las columnas necesarias y un INSERT por lotes.
+    grupos = {}
+    filas = db.query(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida, Vuelo.precio_base, Vuelo.asientos_disponibles)
+    for origen_id, destino_id, salida, precio, asientos in filas:
+        clave = (origen_id, destino_id, salida.date())
+        grupos[clave] = _sumar(grupos.get(clave), precio, asientos)
+    db.query(TarifaDiaria).delete(synchronize_session=False)
+    if grupos:
+        db.execute(TarifaDiaria.__table__.insert(), [
+            {"origen_id": o, "destino_id": d, "dia": dia, "precio_min": p, "asientos": a, "vuelos": n}
+            for (o, d, dia), (p, a, n) in grupos.items()
+        ])
+    db.commit()
+    return len(grupos)
+
+def refrescar_asientos(db: Session, desde: date) -> int:
+    # Pasada periódica: las reservas no tocan el resumen salvo al agotarse o
+    # reabrir un vuelo, así que aquí se ponen al día los asientos de los días
+    # desde `desde`. Solo se escriben las filas que cambiaron; con commit.
+    reales = {}
+    filas = db.query(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida, Vuelo.asientos_disponibles).filter(
+        Vuelo.salida >= datetime.combine(desde, time.min)
+    )
+    for origen_id, destino_id, salida, asientos in filas:
+        clave = (origen_id, destino_id, salida.date())
+        reales[clave] = reales.get(clave, 0) + asientos
+    cambios = []
+    resumen = db.query(TarifaDiaria.origen_id, TarifaDiaria.destino_id, TarifaDiaria.dia, TarifaDiaria.asientos)
+    for origen_id, destino_id, dia, asientos in resumen.filter(TarifaDiaria.dia >= desde):
+        real = reales.get((origen_id, destino_id, dia))
+        if real is not None and real != asientos:
+            cambios.append({"b_origen": origen_id, "b_destino": destino_id, "b_dia": dia, "b_asientos": real})
+    if cambios:
+        db.execute(
+            update(TarifaDiaria.__table__)
+            .where(
+                TarifaDiaria.origen_id == bindparam("b_origen"),
+                TarifaDiaria.destino_id == bindparam("b_destino"),
+                TarifaDiaria.dia == bindparam("b_dia"),
+            )
+            .values(asientos=bindparam("b_asientos")),
+            cambios,
+        )
+    db.commit()
+    return len(cambios)
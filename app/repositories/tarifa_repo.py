@@ -0,0 +1,53 @@
+from sqlalchemy import update, func, case
+from sqlalchemy.orm import Session
+from app.models.tarifa_clase import TarifaClase
+from app.models.reserva import Reserva
+
+def listar_tarifas(db: Session, vuelo_id: int):
+    return db.query(TarifaClase).filter(TarifaClase.vuelo_id == vuelo_id).order_by(TarifaClase.id).all()
+
+def tiene_tarifas(db: Session, vuelo_id: int) -> bool:
+    return db.query(TarifaClase.id).filter(TarifaClase.vuelo_id == vuelo_id).first() is not None
+
+def multiplicadores(db: Session, vuelo_id: int) -> dict:
+    filas = db.query(TarifaClase.clase, TarifaClase.multiplicador).filter(TarifaClase.vuelo_id == vuelo_id)
+    return {clase: multiplicador for clase, multiplicador in filas}
+
+def descontar_cupo(db: Session, vuelo_id: int, clase: str, cantidad: int = 1) -> bool:
+    # Igual que vuelo_repo.descontar_asientos: UPDATE condicional sin commit
+    resultado = db.execute(
+        update(TarifaClase)
+        .where(
+            TarifaClase.vuelo_id == vuelo_id,
+            TarifaClase.clase == clase,
+            TarifaClase.disponibles >= cantidad,
+        )
+        .values(disponibles=TarifaClase.disponibles - cantidad)
+    )
+    return resultado.rowcount == 1
+
+def liberar_cupo(db: Session, vuelo_id: int, clase: str, cantidad: int = 1) -> bool:
+    resultado = db.execute(
+        update(TarifaClase)
+        .where(TarifaClase.vuelo_id == vuelo_id, TarifaClase.clase == clase)
+        .values(disponibles=case(
+            (TarifaClase.disponibles + cantidad > TarifaClase.capacidad, TarifaClase.capacidad),
+            else_=TarifaClase.disponibles + cantidad,
+        ))
+    )
+    return resultado.rowcount == 1
+
+def reservas_por_clase(db: Session, vuelo_id: int):
+    filas = (
+        db.query(Reserva.clase, func.count(Reserva.id))
+        .filter(Reserva.vuelo_id == vuelo_id)
+        .group_by(Reserva.clase)
+        .all()
+    )
+    return {clase: total for clase, total in filas}
+
+def reemplazar_tarifas(db: Session, vuelo_id: int, tarifas: list[TarifaClase]):
+    db.query(TarifaClase).filter(TarifaClase.vuelo_id == vuelo_id).delete(synchronize_session=False)
+    db.add_all(tarifas)
+    db.flush()
+    return tarifas
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.core.paginacion import paginar
 from app.models.usuario import Usuario
 from app.dto.usuario_dto import UsuarioCreate
 from passlib.context import CryptContext
@@ -25,5 +26,5 @@ def crear_usuario(db: Session, usuario: UsuarioCreate):
 def obtener_usuario_por_email(db: Session, email: str):
     return db.query(Usuario).filter(Usuario.email == email).first()
 
-def listar_usuarios(db: Session):
-    return db.query(Usuario).all()
+def listar_usuarios(db: Session, limit: int = None, cursor: str = None):
+    return paginar(db.query(Usuario), [Usuario.id], limit, cursor)
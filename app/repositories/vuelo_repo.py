@@ -1,37 +1,234 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.paginacion import paginar
 from app.models.vuelo import Vuelo
-from app.dto.vuelo_dto import VueloCreate, VueloUpdate
+from app.models.archivo import VueloArchivo
+from app.models.tarifa_clase import TarifaClase
+from app.models.retencion_asiento import RetencionAsiento
+from app.repositories import aeropuerto_repo, tarifa_diaria_repo
+from app.dto.vuelo_dto import VueloCreate, VueloUpdate, VueloPatch
 
-def listar_vuelos(db: Session):
-    return db.query(Vuelo).all()
+def listar_vuelos(db: Session, limit: int = None, cursor: str = None):
+    return paginar(db.query(Vuelo), [Vuelo.id], limit, cursor)
 
 def obtener_vuelo(db: Session, vuelo_id: int):
     return db.query(Vuelo).filter(Vuelo.id == vuelo_id).first()
 
-def buscar_vuelos_disponibles(db: Session):
-    return db.query(Vuelo).filter(Vuelo.asientos_disponibles > 0).all()
+def version_actual(db: Session, vuelo_id: int):
+    return db.execute(select(Vuelo.version).where(Vuelo.id == vuelo_id)).scalar()
+
+def buscar_vuelos_disponibles(db: Session, limit: int = None, cursor: str = None, clase: str = None):
+    # Los vuelos ya salidos (aún sin archivar) no se pueden reservar
+    query = db.query(Vuelo).filter(Vuelo.asientos_disponibles > 0, Vuelo.salida > datetime.utcnow())
+    if clase:
+        # Resuelto con ix_tarifas_clase_disponibles sin recorrer todos los vuelos
+        query = query.join(TarifaClase, TarifaClase.vuelo_id == Vuelo.id).filter(
+            TarifaClase.clase == clase,
+            TarifaClase.disponibles > 0,
+        )
+    return paginar(query, [Vuelo.id], limit, cursor)
+
+def buscar_vuelos(
+    db: Session,
+    origen_id: int = None,
+    destino_id: int = None,
+    salida_desde: datetime = None,
+    salida_hasta: datetime = None,
+    asientos_min: int = None,
+    precio_max: float = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    # Los filtros de igualdad van primero para aprovechar ix_vuelos_ruta_salida
+    query = db.query(Vuelo)
+    if origen_id is not None:
+        query = query.filter(Vuelo.origen_id == origen_id)
+    if destino_id is not None:
+        query = query.filter(Vuelo.destino_id == destino_id)
+    if salida_desde is not None:
+        query = query.filter(Vuelo.salida >= salida_desde)
+    if salida_hasta is not None:
+        query = query.filter(Vuelo.salida <= salida_hasta)
+    if asientos_min is not None:
+        query = query.filter(Vuelo.asientos_disponibles >= asientos_min)
+    if precio_max is not None:
+        query = query.filter(Vuelo.precio_base <= precio_max)
+    return paginar(query, [Vuelo.salida, Vuelo.id], limit, cursor)
+
+def descontar_asientos(db: Session, vuelo_id: int, cantidad: int = 1) -> bool:
+    # UPDATE condicional: la comprobación y el descuento ocurren en la misma
+    # sentencia, así dos reservas concurrentes no pueden sobrevender.
+    # No hace commit: forma parte de la transacción del llamador.
+    # RETURNING trae la ruta y el saldo para el calendario sin otra lectura:
+    # solo se toca tarifas_diarias si el vuelo se agota (cambia el precio
+    # mínimo del día); el resto de asientos lo actualiza una pasada periódica.
+    ruta = db.execute(
+        update(Vuelo)
+        .where(Vuelo.id == vuelo_id, Vuelo.asientos_disponibles >= cantidad)
+        .values(asientos_disponibles=Vuelo.asientos_disponibles - cantidad, version=Vuelo.version + 1)
+        .returning(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida, Vuelo.asientos_disponibles)
+    ).first()
+    if ruta is None:
+        return False
+    if ruta.asientos_disponibles == 0:
+        tarifa_diaria_repo.recalcular(db, ruta.origen_id, ruta.destino_id, ruta.salida.date())
+    return True
+
+def liberar_asientos(db: Session, vuelo_id: int, cantidad: int = 1) -> bool:
+    # Incremento atómico (sin leer-modificar-escribir en Python); sin commit.
+    # Como en descontar_asientos, el calendario solo se recalcula si el
+    # vuelo estaba agotado y vuelve a la venta.
+    ruta = db.execute(
+        update(Vuelo)
+        .where(Vuelo.id == vuelo_id)
+        .values(asientos_disponibles=Vuelo.asientos_disponibles + cantidad, version=Vuelo.version + 1)
+        .returning(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida, Vuelo.asientos_disponibles)
+    ).first()
+    if ruta is None:
+        return False
+    if ruta.asientos_disponibles == cantidad:
+        tarifa_diaria_repo.recalcular(db, ruta.origen_id, ruta.destino_id, ruta.salida.date())
+    return True
+
+def listar_tramos_futuros(db: Session, desde: datetime):
+    # Solo las columnas que necesita el índice de conexiones
+    return db.query(
+        Vuelo.id, Vuelo.origen, Vuelo.destino, Vuelo.origen_id, Vuelo.destino_id,
+        Vuelo.salida, Vuelo.llegada, Vuelo.precio_base,
+    ).filter(Vuelo.salida >= desde).all()
+
+def ids_con_asientos(db: Session, ids):
+    filas = db.query(Vuelo.id).filter(Vuelo.id.in_(ids), Vuelo.asientos_disponibles > 0).all()
+    return {f.id for f in filas}
+
+def ids_existentes(db: Session, ids):
+    # Incluye los archivados: reutilizar su id haría chocar el archivado en vuelos_archivo
+    activos = db.query(Vuelo.id).filter(Vuelo.id.in_(ids))
+    archivados = db.query(VueloArchivo.id).filter(VueloArchivo.id.in_(ids))
+    return {f.id for f in activos.union(archivados).all()}
+
+def siguiente_id(db: Session) -> int:
+    # Los ids archivados tampoco se reutilizan: al archivar chocarían en vuelos_archivo
+    activos = db.query(func.max(Vuelo.id)).scalar() or 0
+    archivados = db.query(func.max(VueloArchivo.id)).scalar() or 0
+    return max(activos, archivados) + 1
+
+_COLUMNAS_LOTE = (
+    "id", "origen", "destino", "origen_id", "destino_id",
+    "salida", "llegada", "duracion", "precio_base", "asientos_disponibles", "programacion_id",
+)
+
+def insertar_lote(db: Session, filas: list[dict]):
+    # Alta masiva sin commit ni refresh: COPY en PostgreSQL (psycopg2) y
+    # INSERT multi-fila (executemany) en el resto de motores. Como no pasa
+    # por los eventos del ORM, asigna aquí origen_id/destino_id a cada fila.
+    ids = aeropuerto_repo.obtener_o_crear_ids(db, {f["origen"] for f in filas} | {f["destino"] for f in filas})
+    for fila in filas:
+        fila["origen_id"], fila["destino_id"] = ids[fila["origen"]], ids[fila["destino"]]
+    if db.get_bind().dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            # Un campo vacío sin comillas es NULL en COPY ... (FORMAT csv)
+            escritor.writerow([fila.get(c) for c in _COLUMNAS_LOTE])
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(f"COPY vuelos ({', '.join(_COLUMNAS_LOTE)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        db.execute(insert(Vuelo), filas)
 
 def crear_vuelo(db: Session, datos: VueloCreate):
     nuevo_vuelo = Vuelo(**datos.dict())
     db.add(nuevo_vuelo)
+    tarifa_diaria_repo.recalcular_vuelo(db, nuevo_vuelo)
     db.commit()
     db.refresh(nuevo_vuelo)
     return nuevo_vuelo
 
-def actualizar_vuelo(db: Session, vuelo_id: int, datos: VueloUpdate):
+def _version_distinta(vuelo_id: int, version: int) -> StaleDataError:
+    return StaleDataError(f"Vuelo {vuelo_id}: la versión {version} ya no es la actual")
+
+def actualizar_vuelo(db: Session, vuelo_id: int, datos: VueloUpdate, version: int = None):
+    # Con `version`, lanza StaleDataError si no es la actual. El flush del ORM
+    # añade `WHERE version = :leida` (version_id_col), así que un cambio
+    # concurrente entre la lectura y el commit también se detecta.
     vuelo = obtener_vuelo(db, vuelo_id)
     if not vuelo:
         return None
+    if version is not None and vuelo.version != version:
+        raise _version_distinta(vuelo_id, version)
+    anterior = (vuelo.origen_id, vuelo.destino_id, vuelo.salida.date())
     for key, value in datos.dict().items():
         setattr(vuelo, key, value)
+    # El calendario se recalcula para el grupo nuevo y, si cambió, también el anterior
+    tarifa_diaria_repo.recalcular_vuelo(db, vuelo)
+    if anterior != (vuelo.origen_id, vuelo.destino_id, vuelo.salida.date()):
+        tarifa_diaria_repo.recalcular(db, *anterior)
     db.commit()
     db.refresh(vuelo)
     return vuelo
 
+_CLAVE_CALENDARIO = {"origen_id", "destino_id", "salida"}
+_COLUMNAS_CALENDARIO = _CLAVE_CALENDARIO | {"precio_base", "asientos_disponibles"}
+
+def parchear_vuelo(db: Session, vuelo_id: int, datos: VueloPatch, version: int = None):
+    # UPDATE solo con las columnas enviadas y RETURNING de la fila resultante:
+    # sin SELECT previo ni refresh posterior. Retorna la fila (no la entidad).
+    # Con `version`, el UPDATE solo se aplica sobre esa versión (StaleDataError si no).
+    cambios = datos.dict(exclude_unset=True, exclude_none=True)
+    if not cambios:
+        fila = db.execute(select(*Vuelo.__table__.c).where(Vuelo.id == vuelo_id)).first()
+        if fila is not None and version is not None and fila.version != version:
+            raise _version_distinta(vuelo_id, version)
+        return fila
+
+    if "origen" in cambios or "destino" in cambios:
+        # Core UPDATE: no pasa por los eventos del ORM que asignan los aeropuertos
+        ids = aeropuerto_repo.obtener_o_crear_ids(db, [cambios[c] for c in ("origen", "destino") if c in cambios])
+        for campo in ("origen", "destino"):
+            if campo in cambios:
+                cambios[f"{campo}_id"] = ids[cambios[campo]]
+
+    anterior = None
+    if cambios.keys() & _CLAVE_CALENDARIO:
+        # Solo si el vuelo cambia de ruta o día hace falta recalcular el día anterior
+        anterior = db.execute(
+            select(Vuelo.origen_id, Vuelo.destino_id, Vuelo.salida).where(Vuelo.id == vuelo_id).with_for_update()
+        ).first()
+        if anterior is None:
+            return None
+
+    condiciones = [Vuelo.id == vuelo_id]
+    if version is not None:
+        condiciones.append(Vuelo.version == version)
+    fila = db.execute(
+        update(Vuelo).where(*condiciones).values(**cambios, version=Vuelo.version + 1).returning(*Vuelo.__table__.c)
+    ).first()
+    if fila is None:
+        db.rollback()
+        if version is not None and obtener_vuelo(db, vuelo_id) is not None:
+            raise _version_distinta(vuelo_id, version)
+        return None
+    if cambios.keys() & _COLUMNAS_CALENDARIO:
+        tarifa_diaria_repo.recalcular(db, fila.origen_id, fila.destino_id, fila.salida.date())
+        if anterior is not None and (anterior.origen_id, anterior.destino_id, anterior.salida.date()) != (
+            fila.origen_id, fila.destino_id, fila.salida.date()
+        ):
+            tarifa_diaria_repo.recalcular(db, anterior.origen_id, anterior.destino_id, anterior.salida.date())
+    db.commit()
+    return fila
+
 def eliminar_vuelo(db: Session, vuelo_id: int):
     vuelo = obtener_vuelo(db, vuelo_id)
     if not vuelo:
         return None
+    # Sin cascada en el ORM: como en archivo_repo.archivar_lote, se borran antes que el vuelo
+    db.execute(delete(RetencionAsiento).where(RetencionAsiento.vuelo_id == vuelo_id))
     db.delete(vuelo)
+    tarifa_diaria_repo.recalcular_vuelo(db, vuelo)
     db.commit()
     return vuelo
@@ -0,0 +1,87 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.core.auth import require_admin
+from app.core.concurrencia import coincide_if_none_match
+from app.services import aeropuerto_service, autocompletado_service, tablero_service
+from app.dto.aeropuerto_dto import AeropuertoCreate, AeropuertoUpdate, AeropuertoRead
+from app.dto.tablero_dto import TableroItemRead
+from app.dto.paginacion_dto import Pagina
+
+router = APIRouter(prefix="/aeropuertos", tags=["Aeropuertos"])
+
+# === GET /aeropuertos/ ===
+@router.get("/", response_model=Pagina[AeropuertoRead])
+def listar_aeropuertos(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Listar los aeropuertos paginados por cursor."""
+    return como_pagina(aeropuerto_service.listar_aeropuertos(db, limit, cursor))
+
+# === GET /aeropuertos/autocompletar ===
+@router.get("/autocompletar", response_model=list[AeropuertoRead])
+def autocompletar(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Sugerir aeropuertos por prefijo del código o de la ciudad (sin distinguir tildes ni mayúsculas)."""
+    return autocompletado_service.autocompletar(db, q, limit)
+
+def _tablero(tipo: str, id: int, limit: int, if_none_match: Optional[str], response: Response, db: Session):
+    items, etag = tablero_service.proximos(db, tipo, id, limit)
+    if coincide_if_none_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return items
+
+# === GET /aeropuertos/{id}/salidas ===
+@router.get("/{id}/salidas", response_model=list[TableroItemRead])
+def tablero_salidas(
+    id: int,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Próximas salidas del aeropuerto; responde 304 si no cambiaron desde el ETag enviado."""
+    return _tablero(tablero_service.SALIDAS, id, limit, if_none_match, response, db)
+
+# === GET /aeropuertos/{id}/llegadas ===
+@router.get("/{id}/llegadas", response_model=list[TableroItemRead])
+def tablero_llegadas(
+    id: int,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Próximas llegadas al aeropuerto; responde 304 si no cambiaron desde el ETag enviado."""
+    return _tablero(tablero_service.LLEGADAS, id, limit, if_none_match, response, db)
+
+# === POST /aeropuertos/ ===
+@router.post("/", response_model=AeropuertoRead, status_code=status.HTTP_201_CREATED)
+def crear_aeropuerto(
+    datos: AeropuertoCreate,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Registrar un aeropuerto por su código IATA (solo administradores)."""
+    return aeropuerto_service.crear_aeropuerto(db, datos)
+
+# === PUT /aeropuertos/{id} ===
+@router.put("/{id}", response_model=AeropuertoRead)
+def actualizar_aeropuerto(
+    id: int,
+    datos: AeropuertoUpdate,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Actualizar ciudad o país de un aeropuerto (solo administradores)."""
+    return aeropuerto_service.actualizar_aeropuerto(db, id, datos)
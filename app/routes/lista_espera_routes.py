@@ -0,0 +1,53 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.core.auth import get_current_user
+from app.services import lista_espera_service
+from app.dto.lista_espera_dto import ListaEsperaCreate, ListaEsperaRead
+from app.dto.paginacion_dto import Pagina
+from app.models.usuario import Usuario
+
+router = APIRouter(prefix="/lista-espera", tags=["Lista de espera"])
+
+# === GET /lista-espera/ ===
+@router.get("/", response_model=Pagina[ListaEsperaRead])
+def listar_lista_espera(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Vuelos en los que el usuario autenticado está esperando asiento."""
+    return como_pagina(lista_espera_service.listar(db, current_user.id, limit, cursor))
+
+# === GET /lista-espera/{id} ===
+@router.get("/{id}", response_model=ListaEsperaRead)
+def obtener_entrada(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Entrada de la lista de espera con su posición actual en la cola."""
+    return lista_espera_service.obtener(db, id, current_user)
+
+# === POST /lista-espera/ ===
+@router.post("/", response_model=ListaEsperaRead, status_code=status.HTTP_201_CREATED)
+def unirse_lista_espera(
+    datos: ListaEsperaCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Apuntarse a un vuelo agotado; al liberarse un asiento se crea la reserva y se notifica."""
+    return lista_espera_service.unirse(db, datos, current_user.id)
+
+# === DELETE /lista-espera/{id} ===
+@router.delete("/{id}")
+def abandonar_lista_espera(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    return lista_espera_service.abandonar(db, id, current_user)
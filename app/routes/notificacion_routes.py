@@ -1,28 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
 from app.core.auth import get_current_user, require_admin
 from app.dto.notificacion_dto import NotificacionCreate, NotificacionRead
+from app.dto.paginacion_dto import Pagina
 from app.models.usuario import Usuario
 from app.services import notificacion_service
 
 router = APIRouter(prefix="/notificaciones", tags=["Notificaciones"])
 
 # === GET /notificaciones/ ===
-@router.get("/", response_model=list[NotificacionRead])
+@router.get("/", response_model=Pagina[NotificacionRead])
 def listar_notificaciones(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return notificacion_service.listar_notificaciones(db, current_user)
+    return como_pagina(notificacion_service.listar_notificaciones(db, current_user, limit, cursor))
 
 # === GET /notificaciones/nuevas ===
-@router.get("/nuevas", response_model=list[NotificacionRead])
+@router.get("/nuevas", response_model=Pagina[NotificacionRead])
 def listar_no_leidas(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return notificacion_service.listar_no_leidas(db, current_user)
+    return como_pagina(notificacion_service.listar_no_leidas(db, current_user, limit, cursor))
 
 # === GET /notificaciones/{id} ===
 @router.get("/{id}", response_model=NotificacionRead)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.services import pago_service
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.dto.paginacion_dto import Pagina
+from app.services import pago_service, idempotencia_service
 from app.dto.pago_dto import PagoCreate, PagoRead
 from app.core.auth import get_current_user, require_admin
 from app.models.usuario import Usuario
@@ -13,10 +16,16 @@ router = APIRouter(prefix="/pagos", tags=["Pagos"])
 @router.post("/", response_model=PagoRead)
 def crear_pago(
     datos: PagoCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=100),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return pago_service.crear_pago(db, datos, current_user)
+    """Con `Idempotency-Key`, un reintento devuelve el pago original sin registrar otro."""
+    return idempotencia_service.ejecutar(
+        db, current_user.id, "POST /pagos/", idempotency_key, datos,
+        lambda: pago_service.crear_pago(db, datos, current_user),
+        PagoRead,
+    )
 
 
 @router.get("/{id}", response_model=PagoRead)
@@ -37,10 +46,12 @@ def obtener_pago_de_reserva(
     return pago_service.obtener_pago_de_reserva(db, id, current_user)
 
 
-@router.get("/usuario/{id}", response_model=list[PagoRead])
+@router.get("/usuario/{id}", response_model=Pagina[PagoRead])
 def listar_pagos_usuario(
     id: int,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
-    return pago_service.listar_pagos_usuario(db, id)
+    return como_pagina(pago_service.listar_pagos_usuario(db, id, limit, cursor))
@@ -0,0 +1,53 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.core.auth import require_admin
+from app.services import programacion_service
+from app.dto.programacion_dto import ProgramacionCreate, ProgramacionExtender, ProgramacionRead, MaterializacionRead
+from app.dto.paginacion_dto import Pagina
+
+router = APIRouter(prefix="/programaciones", tags=["Programaciones"])
+
+# === GET /programaciones/ === (solo admin)
+@router.get("/", response_model=Pagina[ProgramacionRead])
+def listar_programaciones(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)
+):
+    """Listar las programaciones de vuelos recurrentes paginadas por cursor."""
+    return como_pagina(programacion_service.listar_programaciones(db, limit, cursor))
+
+# === GET /programaciones/{id} === (solo admin)
+@router.get("/{id}", response_model=ProgramacionRead)
+def obtener_programacion(
+    id: int,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)
+):
+    return programacion_service.obtener_programacion(db, id)
+
+# === POST /programaciones/ === (solo admin)
+@router.post("/", response_model=MaterializacionRead, status_code=status.HTTP_201_CREATED)
+def crear_programacion(
+    datos: ProgramacionCreate,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)
+):
+    """Registrar una programación y generar sus vuelos de todo el rango."""
+    return programacion_service.crear_programacion(db, datos)
+
+# === POST /programaciones/{id}/extender === (solo admin)
+@router.post("/{id}/extender", response_model=MaterializacionRead)
+def extender_programacion(
+    id: int,
+    datos: ProgramacionExtender,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)
+):
+    """Ampliar la fecha final; solo se generan los vuelos de los días nuevos."""
+    return programacion_service.extender_programacion(db, id, datos)
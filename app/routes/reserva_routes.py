@@ -1,52 +1,137 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
 from app.core.auth import get_current_user, require_admin
-from app.services import reserva_service
-from app.dto.reserva_dto import ReservaCreate, ReservaUpdate, ReservaRead
+from app.core.concurrencia import etag, version_esperada
+from app.services import reserva_service, archivo_service, idempotencia_service
+from app.dto.reserva_dto import ReservaCreate, ReservaUpdate, ReservaRead, ReservaGrupoCreate, ReservaGrupoRead
 from app.dto.servicio_dto import ServicioRead
-from app.dto.reserva_servicio_dto import ReservaServicioRead
+from app.dto.reserva_servicio_dto import ReservaServicioRead, ReservaServiciosLote
+from app.dto.paginacion_dto import Pagina
+from app.dto.archivo_dto import ReservaArchivoRead
+from app.dto.cotizacion_dto import CotizacionCreate, CotizacionRead
 from app.models.usuario import Usuario
 
 router = APIRouter(prefix="/reservas", tags=["Reservas"])
 
 # === GET /reservas/ ===
-@router.get("/", response_model=list[ReservaRead])
+@router.get("/", response_model=Pagina[ReservaRead])
 def listar_reservas(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
     if current_user.rol == "admin":
-        return reserva_service.listar_reservas(db)
-    return reserva_service.listar_reservas(db, current_user.id)
+        return como_pagina(reserva_service.listar_reservas(db, limit=limit, cursor=cursor))
+    return como_pagina(reserva_service.listar_reservas(db, current_user.id, limit=limit, cursor=cursor))
+
+# === GET /reservas/buscar === (solo admin)
+@router.get("/buscar", response_model=Pagina[ReservaRead])
+def buscar_reservas(
+    estado: Optional[str] = None,
+    desde: Optional[datetime] = Query(None, description="fecha_reserva mínima"),
+    hasta: Optional[datetime] = Query(None, description="fecha_reserva máxima"),
+    vuelo_id: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)
+):
+    """Buscar reservas por estado, rango de fecha de reserva, vuelo y usuario, ordenadas por fecha."""
+    return como_pagina(reserva_service.buscar_reservas(
+        db,
+        estado=estado,
+        desde=desde,
+        hasta=hasta,
+        vuelo_id=vuelo_id,
+        usuario_id=usuario_id,
+        limit=limit,
+        cursor=cursor,
+    ))
+
+# === POST /reservas/cotizar ===
+@router.post("/cotizar", response_model=CotizacionRead)
+def cotizar(
+    datos: CotizacionCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Calcular el total de un asiento en una clase más servicios, sin reservar."""
+    return reserva_service.cotizar(db, datos)
+
+# === GET /reservas/historico ===
+@router.get("/historico", response_model=Pagina[ReservaArchivoRead])
+def listar_reservas_historicas(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Reservas de vuelos ya archivados (las propias; todas para administradores)."""
+    usuario_id = None if current_user.rol == "admin" else current_user.id
+    return como_pagina(archivo_service.listar_reservas_historicas(db, usuario_id, limit, cursor))
 
 # === GET /reservas/{id} ===
 @router.get("/{id}", response_model=ReservaRead)
 def obtener_reserva(
     id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return reserva_service.obtener_reserva(db, id, current_user)
+    reserva = reserva_service.obtener_reserva(db, id, current_user)
+    response.headers["ETag"] = etag(reserva.version)
+    return reserva
 
 # === POST /reservas/ ===
 @router.post("/", response_model=ReservaRead, status_code=status.HTTP_201_CREATED)
 def crear_reserva(
     datos: ReservaCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=100),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Con `Idempotency-Key`, un reintento devuelve la respuesta original sin crear otra reserva."""
+    return idempotencia_service.ejecutar(
+        db, current_user.id, "POST /reservas/", idempotency_key, datos,
+        lambda: reserva_service.crear_reserva(db, datos, current_user.id),
+        ReservaRead, status.HTTP_201_CREATED,
+    )
+
+# === POST /reservas/grupo ===
+@router.post("/grupo", response_model=ReservaGrupoRead, status_code=status.HTTP_201_CREATED)
+def crear_reserva_grupo(
+    datos: ReservaGrupoCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=100),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return reserva_service.crear_reserva(db, datos, current_user.id)
+    """Reserva varios pasajeros en un vuelo en una sola transacción: se crean todas o ninguna."""
+    return idempotencia_service.ejecutar(
+        db, current_user.id, "POST /reservas/grupo", idempotency_key, datos,
+        lambda: reserva_service.crear_reserva_grupo(db, datos, current_user.id),
+        ReservaGrupoRead, status.HTTP_201_CREATED,
+    )
 
 # === PUT /reservas/{id} ===
 @router.put("/{id}", response_model=ReservaRead)
 def actualizar_reserva(
     id: int,
     datos: ReservaUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    return reserva_service.actualizar_reserva(db, id, datos, current_user)
+    """Con `If-Match` (el ETag del GET) responde 412 si otra petición la modificó antes."""
+    reserva = reserva_service.actualizar_reserva(db, id, datos, current_user, version_esperada(if_match))
+    response.headers["ETag"] = etag(reserva.version)
+    return reserva
 
 @router.post("/{id}/agregar-servicio", response_model=ReservaServicioRead)
 def agregar_servicio_a_reserva(
@@ -66,6 +151,16 @@ def obtener_servicios_de_reserva(
 ):
     return reserva_service.obtener_servicios_de_reserva(db, id, current_user)
 
+@router.post("/{id}/servicios", response_model=ReservaRead)
+def actualizar_servicios_de_reserva(
+    id: int,
+    datos: ReservaServiciosLote,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Quitar (`quitar`: ids de servicio) y agregar (`agregar`) varios servicios en una transacción."""
+    return reserva_service.actualizar_servicios_de_reserva(db, id, datos, current_user)
+
 @router.delete("/{id}/eliminar-servicio")
 def eliminar_servicio_de_reserva(
     id: int,
@@ -89,6 +184,7 @@ def confirmar_reserva(
 def eliminar_reserva(
     id: int,
     db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user),
     _: bool = Depends(require_admin)
 ):
-    return reserva_service.eliminar_reserva(db, id)
+    return reserva_service.eliminar_reserva(db, id, current_user)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.core.auth import get_current_user
+from app.services import retencion_service
+from app.dto.retencion_dto import RetencionCreate, RetencionConfirmar, RetencionRead
+from app.dto.reserva_dto import ReservaRead
+from app.models.usuario import Usuario
+
+router = APIRouter(prefix="/retenciones", tags=["Retenciones"])
+
+# === POST /retenciones/ ===
+@router.post("/", response_model=RetencionRead, status_code=status.HTTP_201_CREATED)
+def crear_retencion(
+    datos: RetencionCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Apartar un asiento durante unos minutos mientras se completa el pago."""
+    return retencion_service.crear_retencion(db, datos, current_user.id)
+
+# === POST /retenciones/{id}/confirmar ===
+@router.post("/{id}/confirmar", response_model=ReservaRead, status_code=status.HTTP_201_CREATED)
+def confirmar_retencion(
+    id: int,
+    datos: RetencionConfirmar = RetencionConfirmar(),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Convertir la retención en reserva; 410 si ya venció."""
+    return retencion_service.confirmar_retencion(db, id, datos, current_user)
+
+# === DELETE /retenciones/{id} ===
+@router.delete("/{id}")
+def liberar_retencion(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Liberar el asiento apartado."""
+    return retencion_service.liberar_retencion(db, id, current_user)
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.dto.paginacion_dto import Pagina
 from app.core.auth import require_admin
+from app.core.concurrencia import etag, version_esperada
 from app.services import servicio_service
 from app.dto.servicio_dto import ServicioCreate, ServicioUpdate, ServicioRead
 
 router = APIRouter(prefix="/servicios", tags=["Servicios"])
 
 # === GET /servicios/ ===
-@router.get("/", response_model=list[ServicioRead])
-def listar_servicios(db: Session = Depends(get_db),):
-    return servicio_service.listar_servicios(db)
+@router.get("/", response_model=Pagina[ServicioRead])
+def listar_servicios(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    return como_pagina(servicio_service.listar_servicios(db, limit, cursor))
 
 # === GET /servicios/{id} ===
 @router.get("/{id}", response_model=ServicioRead)
-def obtener_servicio(id: int, db: Session = Depends(get_db)):
-    return servicio_service.obtener_servicio(db, id)
+def obtener_servicio(id: int, response: Response, db: Session = Depends(get_db)):
+    servicio = servicio_service.obtener_servicio(db, id)
+    response.headers["ETag"] = etag(servicio.version)
+    return servicio
 
 # === POST /servicios/ === (solo admin)
 @router.post("/", response_model=ServicioRead, status_code=status.HTTP_201_CREATED)
@@ -32,10 +42,15 @@ def crear_servicio(
 def actualizar_servicio(
     id: int,
     datos: ServicioUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     _: bool = Depends(require_admin)
 ):
-    return servicio_service.actualizar_servicio(db, id, datos)
+    """Con `If-Match` (el ETag del GET) responde 412 si otra petición lo modificó antes."""
+    servicio = servicio_service.actualizar_servicio(db, id, datos, version_esperada(if_match))
+    response.headers["ETag"] = etag(servicio.version)
+    return servicio
 
 # === DELETE /servicios/{id} === (solo admin)
 @router.delete("/{id}")
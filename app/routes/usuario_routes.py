@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
+from app.dto.paginacion_dto import Pagina
 from app.dto.usuario_dto import UsuarioRead, UsuarioBase
 from app.models.usuario import Usuario
 from app.core.auth import get_current_user, require_admin
@@ -10,15 +13,17 @@ from app.services import usuario_service
 router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
 
 # === GET /usuarios/ ===
-@router.get("/", response_model=list[UsuarioRead])
+@router.get("/", response_model=Pagina[UsuarioRead])
 def listar_usuarios(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     _: bool = Depends(require_admin)  # solo admin
 ):
     """
-    Listar todos los usuarios (solo para administradores)
+    Listar los usuarios paginados por cursor (solo para administradores)
     """
-    return usuario_service.listar_usuarios(db)
+    return como_pagina(usuario_service.listar_usuarios(db, limit, cursor))
 
 
 # === GET /usuarios/{id} ===
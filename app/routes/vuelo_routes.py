@@ -1,30 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.core.paginacion import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, como_pagina
 from app.core.auth import require_admin
-from app.services import vuelo_service
-from app.dto.vuelo_dto import VueloRead, VueloCreate, VueloUpdate
+from app.core.concurrencia import etag, version_esperada
+from app.services import vuelo_service, mapa_asientos_service, tarifa_service, conexion_service, importacion_service, archivo_service, inventario_service
+from app.dto.vuelo_dto import VueloRead, VueloCreate, VueloUpdate, VueloPatch
+from app.dto.paginacion_dto import Pagina
+from app.dto.mapa_asientos_dto import MapaAsientosCreate, MapaAsientosRead
+from app.dto.tarifa_dto import TarifaClaseCreate, TarifaClaseRead
+from app.dto.conexion_dto import ItinerarioRead
+from app.dto.calendario_dto import TarifaDiariaRead
+from app.dto.importacion_dto import ImportacionRead
+from app.dto.archivo_dto import VueloArchivoRead
+from app.dto.inventario_dto import InventarioServicioCreate, InventarioServicioRead, MenuServicioRead
 
 router = APIRouter(prefix="/vuelos", tags=["Vuelos"])
 
 # === GET /vuelos/ ===
-@router.get("/", response_model=list[VueloRead])
-def listar_vuelos(db: Session = Depends(get_db)):
-    """Listar todos los vuelos."""
-    return vuelo_service.listar_vuelos(db)
+@router.get("/", response_model=Pagina[VueloRead])
+def listar_vuelos(
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Listar los vuelos paginados por cursor."""
+    return como_pagina(vuelo_service.listar_vuelos(db, limit, cursor))
 
 # === GET /vuelos/disponibles ===
-@router.get("/disponibles", response_model=list[VueloRead])
-def vuelos_disponibles(db: Session = Depends(get_db)):
-    """Listar vuelos con asientos disponibles."""
-    return vuelo_service.vuelos_disponibles(db)
+@router.get("/disponibles", response_model=Pagina[VueloRead])
+def vuelos_disponibles(
+    clase: Optional[str] = None,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Listar vuelos con asientos disponibles (opcionalmente en una clase), paginados por cursor."""
+    return como_pagina(vuelo_service.vuelos_disponibles(db, limit, cursor, clase))
+
+# === GET /vuelos/buscar ===
+@router.get("/buscar", response_model=Pagina[VueloRead])
+def buscar_vuelos(
+    origen: Optional[str] = None,
+    destino: Optional[str] = None,
+    salida_desde: Optional[datetime] = None,
+    salida_hasta: Optional[datetime] = None,
+    asientos_min: Optional[int] = Query(None, ge=1),
+    precio_max: Optional[float] = Query(None, ge=0),
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Buscar vuelos por ruta, rango de salida, asientos libres y precio máximo."""
+    return como_pagina(vuelo_service.buscar_vuelos(
+        db,
+        origen=origen,
+        destino=destino,
+        salida_desde=salida_desde,
+        salida_hasta=salida_hasta,
+        asientos_min=asientos_min,
+        precio_max=precio_max,
+        limit=limit,
+        cursor=cursor,
+    ))
+
+# === GET /vuelos/conexiones ===
+@router.get("/conexiones", response_model=list[ItinerarioRead])
+def buscar_conexiones(
+    origen: str,
+    destino: str,
+    fecha: date,
+    escala_min: int = Query(45, ge=0, description="Minutos mínimos entre tramos"),
+    escala_max: int = Query(360, ge=0, le=1440, description="Minutos máximos entre tramos"),
+    max_tramos: int = Query(3, ge=1, le=4),
+    k: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """Buscar itinerarios directos o con escalas, ordenados por hora de llegada."""
+    return conexion_service.buscar_conexiones(db, origen, destino, fecha, escala_min, escala_max, max_tramos, k)
+
+# === GET /vuelos/calendario ===
+@router.get("/calendario", response_model=list[TarifaDiariaRead])
+def calendario_tarifas(
+    origen: str,
+    destino: str,
+    anio: int = Query(..., ge=2000, le=2100),
+    mes: int = Query(..., ge=1, le=12),
+    db: Session = Depends(get_db)
+):
+    """Tarifa más baja y asientos por día de un mes para una ruta."""
+    return vuelo_service.calendario_tarifas(db, origen, destino, anio, mes)
+
+# === GET /vuelos/historico ===
+@router.get("/historico", response_model=Pagina[VueloArchivoRead])
+def listar_vuelos_historicos(
+    origen: Optional[str] = None,
+    destino: Optional[str] = None,
+    salida_desde: Optional[datetime] = None,
+    salida_hasta: Optional[datetime] = None,
+    limit: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Buscar vuelos ya archivados por ruta y rango de salida."""
+    return como_pagina(archivo_service.listar_vuelos_historicos(
+        db, origen, destino, salida_desde, salida_hasta, limit, cursor
+    ))
+
+# === GET /vuelos/historico/{id} ===
+@router.get("/historico/{id}", response_model=VueloArchivoRead)
+def obtener_vuelo_historico(id: int, db: Session = Depends(get_db)):
+    """Obtener un vuelo archivado por su código."""
+    return archivo_service.obtener_vuelo_historico(db, id)
+
+# === POST /vuelos/archivar ===
+@router.post("/archivar")
+def archivar_vuelos(
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Mover ya mismo los vuelos salidos a las tablas de archivo (solo administradores)."""
+    resultado = archivo_service.archivar_vuelos_salidos(db)
+    return {"vuelos": resultado["vuelos"], "reservas": resultado["reservas"]}
 
 # === GET /vuelos/{id} ===
 @router.get("/{id}", response_model=VueloRead)
-def obtener_vuelo(id: int, db: Session = Depends(get_db)):
+def obtener_vuelo(id: int, response: Response, db: Session = Depends(get_db)):
     """Obtener detalles de un vuelo específico."""
-    return vuelo_service.obtener_vuelo(db, id)
+    vuelo = vuelo_service.obtener_vuelo_vigente(db, id)
+    response.headers["ETag"] = etag(vuelo.version)
+    return vuelo
 
 # === POST /vuelos/ ===
 @router.post("/", response_model=VueloRead, status_code=status.HTTP_201_CREATED)
@@ -36,16 +144,51 @@ def crear_vuelo(
     """Crear un nuevo vuelo (solo administradores)."""
     return vuelo_service.crear_vuelo(db, datos)
 
+# === POST /vuelos/importar ===
+@router.post("/importar", response_model=ImportacionRead)
+async def importar_vuelos(
+    request: Request,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Importar vuelos en bloque desde CSV (text/csv) o NDJSON (application/x-ndjson).
+
+    Devuelve cuántas filas se importaron y el error de cada fila rechazada.
+    """
+    return await importacion_service.importar_vuelos(db, request.headers.get("content-type"), request.stream())
+
 # === PUT /vuelos/{id} ===
 @router.put("/{id}", response_model=VueloRead)
 def actualizar_vuelo(
     id: int,
     datos: VueloUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     _: bool = Depends(require_admin)  # Solo admin
 ):
-    """Actualizar información de un vuelo (solo administradores)."""
-    return vuelo_service.actualizar_vuelo(db, id, datos)
+    """Actualizar información de un vuelo (solo administradores).
+
+    Con `If-Match` (el ETag del GET) responde 412 si el vuelo cambió desde entonces.
+    """
+    vuelo = vuelo_service.actualizar_vuelo(db, id, datos, version_esperada(if_match))
+    response.headers["ETag"] = etag(vuelo.version)
+    return vuelo
+
+# === PATCH /vuelos/{id} ===
+@router.patch("/{id}", response_model=VueloRead)
+def parchear_vuelo(
+    id: int,
+    datos: VueloPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Actualizar solo algunos campos de un vuelo (solo administradores). Admite `If-Match` como PUT."""
+    vuelo = vuelo_service.parchear_vuelo(db, id, datos, version_esperada(if_match))
+    response.headers["ETag"] = etag(vuelo.version)
+    return vuelo
 
 # === DELETE /vuelos/{id} ===
 @router.delete("/{id}")
@@ -56,3 +199,55 @@ def eliminar_vuelo(
 ):
     """Eliminar un vuelo (solo administradores)."""
     return vuelo_service.eliminar_vuelo(db, id)
+
+
+# === GET /vuelos/{id}/asientos ===
+@router.get("/{id}/asientos", response_model=MapaAsientosRead)
+def obtener_mapa_asientos(id: int, db: Session = Depends(get_db)):
+    """Consultar el mapa de asientos (ocupados y libres) de un vuelo."""
+    return mapa_asientos_service.obtener_mapa(db, id)
+
+# === PUT /vuelos/{id}/asientos ===
+@router.put("/{id}/asientos", response_model=MapaAsientosRead)
+def configurar_mapa_asientos(
+    id: int,
+    datos: MapaAsientosCreate,
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Definir la cabina (filas y disposición) de un vuelo (solo administradores)."""
+    return mapa_asientos_service.configurar_mapa(db, id, datos)
+
+# === GET /vuelos/{id}/tarifas ===
+@router.get("/{id}/tarifas", response_model=list[TarifaClaseRead])
+def listar_tarifas(id: int, db: Session = Depends(get_db)):
+    """Consultar los cupos y multiplicadores de precio por clase de un vuelo."""
+    return tarifa_service.listar_tarifas(db, id)
+
+# === PUT /vuelos/{id}/tarifas ===
+@router.put("/{id}/tarifas", response_model=list[TarifaClaseRead])
+def configurar_tarifas(
+    id: int,
+    tarifas: list[TarifaClaseCreate],
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Definir los cupos por clase (económica, ejecutiva, primera) de un vuelo (solo administradores)."""
+    return tarifa_service.configurar_tarifas(db, id, tarifas)
+
+# === GET /vuelos/{id}/servicios ===
+@router.get("/{id}/servicios", response_model=list[MenuServicioRead])
+def menu_servicios(id: int, db: Session = Depends(get_db)):
+    """Consultar los servicios del vuelo con sus existencias (None = sin límite)."""
+    return inventario_service.menu(db, id)
+
+# === PUT /vuelos/{id}/servicios ===
+@router.put("/{id}/servicios", response_model=list[InventarioServicioRead])
+def configurar_inventario(
+    id: int,
+    inventario: list[InventarioServicioCreate],
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_admin)  # Solo admin
+):
+    """Definir las existencias de los servicios limitados de un vuelo (solo administradores)."""
+    return inventario_service.configurar(db, id, inventario)
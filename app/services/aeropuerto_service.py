@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.repositories import aeropuerto_repo
+from app.services import autocompletado_service
+from app.dto.aeropuerto_dto import AeropuertoCreate, AeropuertoUpdate
+
+def listar_aeropuertos(db: Session, limit: int = None, cursor: str = None):
+    return aeropuerto_repo.listar_aeropuertos(db, limit, cursor)
+
+def crear_aeropuerto(db: Session, datos: AeropuertoCreate):
+    if aeropuerto_repo.obtener_por_clave(db, datos.codigo.upper()):
+        raise HTTPException(status_code=400, detail="Ya existe un aeropuerto con este código")
+    aeropuerto = aeropuerto_repo.crear_aeropuerto(db, datos)
+    autocompletado_service.marcar_obsoleto()
+    return aeropuerto
+
+def actualizar_aeropuerto(db: Session, aeropuerto_id: int, datos: AeropuertoUpdate):
+    aeropuerto = aeropuerto_repo.actualizar_aeropuerto(db, aeropuerto_id, datos)
+    if not aeropuerto:
+        raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
+    autocompletado_service.marcar_obsoleto()
+    return aeropuerto
@@ -0,0 +1,100 @@
+"""Archivado de vuelos ya salidos fuera de las tablas activas.
+
+`vuelos` y `reservas` solo crecen; los vuelos que ya salieron no se pueden
+reservar pero siguen pesando en cada listado y búsqueda del catálogo. Un
+trabajo periódico los mueve, con sus reservas, a `vuelos_archivo` y
+`reservas_archivo` por lotes de `ARCHIVO_LOTE` (un commit por lote), así las
+consultas calientes solo recorren vuelos futuros o recién salidos.
+
+Se archivan los vuelos cuya salida es anterior a ahora menos
+`ARCHIVO_RETENCION_HORAS` (los tableros de llegadas aún muestran los del día).
+Los históricos se consultan por las rutas `/vuelos/historico` y
+`/reservas/historico`.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.paginacion import ResultadoPaginado
+from app.repositories import archivo_repo, aeropuerto_repo
+from app.services import lista_espera_service, vuelo_service
+
+ARCHIVO_RETENCION_HORAS = float(os.getenv("ARCHIVO_RETENCION_HORAS", "24"))
+ARCHIVO_LOTE = int(os.getenv("ARCHIVO_LOTE", "1000"))
+# Segundos entre pasadas del trabajo en segundo plano; 0 lo desactiva
+ARCHIVO_INTERVALO = float(os.getenv("ARCHIVO_INTERVALO", "3600"))
+
+logger = logging.getLogger(__name__)
+
+
+def archivar_vuelos_salidos(db: Session, ahora: datetime = None, lote: int = None) -> dict:
+    """Archiva todos los vuelos salidos antes del corte, lote a lote.
+
+    Cada lote es una transacción: si uno falla, los anteriores quedan archivados
+    y la siguiente pasada continúa donde se quedó.
+    """
+    corte = (ahora or datetime.utcnow()) - timedelta(hours=ARCHIVO_RETENCION_HORAS)
+    lote = lote or ARCHIVO_LOTE
+    vuelos = reservas = 0
+    while True:
+        try:
+            ids = archivo_repo.vuelos_a_archivar(db, corte, lote)
+            n_reservas = 0
+            if ids:
+                lista_espera_service.cerrar_colas(db, ids)
+                n_reservas = archivo_repo.archivar_lote(db, ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for vuelo_id in ids:
+            vuelo_service.invalidar_cache_vuelo(vuelo_id)
+        vuelos += len(ids)
+        reservas += n_reservas
+        if len(ids) < lote:
+            break
+    if vuelos:
+        vuelo_service.invalidar_catalogo()
+    return {"vuelos": vuelos, "reservas": reservas, "corte": corte}
+
+
+def pasada_archivado(fabrica_sesiones) -> None:
+    """Una pasada del trabajo periódico (ver `app/core/tareas.py`)."""
+    with fabrica_sesiones() as db:
+        resultado = archivar_vuelos_salidos(db)
+    if resultado["vuelos"]:
+        logger.info("Archivados %(vuelos)s vuelos y %(reservas)s reservas", resultado)
+
+
+# === Lecturas históricas ===
+
+def obtener_vuelo_historico(db: Session, vuelo_id: int):
+    vuelo = archivo_repo.obtener_vuelo(db, vuelo_id)
+    if not vuelo:
+        raise HTTPException(status_code=404, detail="Vuelo archivado no encontrado")
+    return vuelo
+
+
+def listar_vuelos_historicos(
+    db: Session,
+    origen: str = None,
+    destino: str = None,
+    salida_desde: datetime = None,
+    salida_hasta: datetime = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    ids = aeropuerto_repo.buscar_ids(db, [t for t in (origen, destino) if t]) if origen or destino else {}
+    if (origen and origen not in ids) or (destino and destino not in ids):
+        return ResultadoPaginado()
+    return archivo_repo.listar_vuelos(
+        db, ids.get(origen), ids.get(destino), salida_desde, salida_hasta, limit, cursor
+    )
+
+
+def listar_reservas_historicas(db: Session, usuario_id: int = None, limit: int = None, cursor: str = None):
+    return archivo_repo.listar_reservas(db, usuario_id, limit, cursor)
@@ -0,0 +1,100 @@
+"""Autocompletado de ciudades y aeropuertos servido desde memoria.
+
+Los términos buscables (código IATA, nombre completo de la ciudad y cada una
+de sus palabras) se guardan normalizados (sin tildes, en mayúsculas) en una
+lista ordenada; un prefijo se resuelve con dos bisecciones, sin consultar
+la BD en cada pulsación.
+
+El índice se carga con la primera consulta y se marca para recarga cuando
+aparece un aeropuerto nuevo (alta de vuelo, importación o administración).
+Como cada proceso tiene su copia, se recarga también cada
+`AUTOCOMPLETADO_TTL` segundos para recoger cambios de otros workers.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.aeropuertos import normalizar
+from app.models.aeropuerto import Aeropuerto
+
+AUTOCOMPLETADO_TTL = float(os.getenv("AUTOCOMPLETADO_TTL", "300"))
+
+
+class IndiceAutocompletado:
+    """Lista ordenada de (término, id) más la ficha de cada aeropuerto."""
+
+    def __init__(self):
+        self._terminos: list[tuple[str, int]] = []
+        self._fichas: dict[int, dict] = {}
+        self._cargado_en: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def vigente(self) -> bool:
+        return self._cargado_en is not None and time.monotonic() - self._cargado_en < AUTOCOMPLETADO_TTL
+
+    def contiene(self, aeropuerto_id: int) -> bool:
+        return aeropuerto_id in self._fichas
+
+    def cargar(self, aeropuertos) -> None:
+        terminos, fichas = [], {}
+        for a in aeropuertos:
+            fichas[a.id] = {"id": a.id, "clave": a.clave, "codigo": a.codigo, "ciudad": a.ciudad, "pais": a.pais}
+            claves = {normalizar(a.ciudad)}
+            claves.update(normalizar(a.ciudad).split())
+            if a.codigo:
+                claves.add(a.codigo.upper())
+            terminos.extend((clave, a.id) for clave in claves if clave)
+        terminos.sort()
+        with self._lock:
+            self._terminos, self._fichas = terminos, fichas
+            self._cargado_en = time.monotonic()
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._terminos, self._fichas = [], {}
+            self._cargado_en = None
+
+    def buscar(self, prefijo: str, limite: int) -> list[dict]:
+        prefijo = normalizar(prefijo)
+        if not prefijo:
+            return []
+        with self._lock:
+            terminos, fichas = self._terminos, self._fichas
+        # Todos los términos que empiezan por `prefijo` están contiguos
+        i = bisect_left(terminos, (prefijo,))
+        fin = bisect_right(terminos, (prefijo + "\uffff",))
+        resultados, vistos = [], set()
+        while i < fin and len(resultados) < limite:
+            aeropuerto_id = terminos[i][1]
+            if aeropuerto_id not in vistos:
+                vistos.add(aeropuerto_id)
+                resultados.append(fichas[aeropuerto_id])
+            i += 1
+        return resultados
+
+
+indice = IndiceAutocompletado()
+
+
+def marcar_obsoleto() -> None:
+    """La próxima consulta recarga el índice desde la BD."""
+    indice.limpiar()
+
+
+def vuelo_modificado(vuelo) -> None:
+    # Solo hace falta recargar si el vuelo usa un aeropuerto que el índice no conoce
+    if indice.vigente and not (indice.contiene(vuelo.origen_id) and indice.contiene(vuelo.destino_id)):
+        marcar_obsoleto()
+
+
+def autocompletar(db: Session, q: str, limit: int = 10) -> list[dict]:
+    """Aeropuertos cuyo código, ciudad o alguna palabra de la ciudad empieza por `q`."""
+    if not indice.vigente:
+        indice.cargar(db.query(Aeropuerto).all())
+    return indice.buscar(q, limit)
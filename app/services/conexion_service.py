@@ -0,0 +1,202 @@
+"""Búsqueda de itinerarios con escalas sobre el grafo de vuelos.
+
+Mantiene en memoria un índice de adyacencia: para cada aeropuerto de origen
+(por su id entero), sus vuelos futuros ordenados por salida. Las salidas compatibles con una escala
+(llegada + mínimo .. llegada + máximo) se obtienen por bisección, sin
+consultar la BD en cada paso de la búsqueda.
+
+El índice se carga la primera vez que se usa y después se actualiza de forma
+incremental desde `vuelo_service` al crear, modificar o eliminar vuelos.
+Como cada proceso tiene su copia, se recarga completo cada
+`CONEXIONES_INDICE_TTL` segundos para recoger cambios hechos por otros workers.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import datetime, timedelta, date
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.aeropuertos import clave_aeropuerto
+from app.repositories import vuelo_repo, aeropuerto_repo
+
+CONEXIONES_INDICE_TTL = float(os.getenv("CONEXIONES_INDICE_TTL", "300"))
+# Tope de itinerarios parciales explorados por búsqueda (acota la CPU)
+MAX_EXPANSIONES = 20000
+
+Tramo = namedtuple("Tramo", "id origen destino origen_id destino_id salida llegada precio_base")
+
+
+class IndiceConexiones:
+    """Índice origen_id → [(salida, id)] ordenado, más el detalle de cada tramo."""
+
+    def __init__(self):
+        self._salidas: dict[int, list[tuple[datetime, int]]] = {}
+        self._tramos: dict[int, Tramo] = {}
+        self._cargado_en: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @property
+    def vigente(self) -> bool:
+        return self._cargado_en is not None and time.monotonic() - self._cargado_en < CONEXIONES_INDICE_TTL
+
+    def cargar(self, vuelos) -> None:
+        salidas: dict[int, list[tuple[datetime, int]]] = {}
+        tramos: dict[int, Tramo] = {}
+        for v in vuelos:
+            tramo = _tramo(v)
+            tramos[tramo.id] = tramo
+            salidas.setdefault(tramo.origen_id, []).append((tramo.salida, tramo.id))
+        for lista in salidas.values():
+            lista.sort()
+        with self._lock:
+            self._salidas, self._tramos = salidas, tramos
+            self._cargado_en = time.monotonic()
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._salidas, self._tramos = {}, {}
+            self._cargado_en = None
+
+    def agregar(self, vuelo) -> None:
+        with self._lock:
+            if self._cargado_en is None:
+                return  # se cargará completo en la próxima búsqueda
+            self._quitar(vuelo.id)
+            tramo = _tramo(vuelo)
+            self._tramos[tramo.id] = tramo
+            insort(self._salidas.setdefault(tramo.origen_id, []), (tramo.salida, tramo.id))
+
+    def eliminar(self, vuelo_id: int) -> None:
+        with self._lock:
+            self._quitar(vuelo_id)
+
+    def _quitar(self, vuelo_id: int) -> None:
+        tramo = self._tramos.pop(vuelo_id, None)
+        if tramo is None:
+            return
+        lista = self._salidas.get(tramo.origen_id, [])
+        i = bisect_left(lista, (tramo.salida, tramo.id))
+        if i < len(lista) and lista[i] == (tramo.salida, tramo.id):
+            del lista[i]
+
+    def _salidas_entre(self, origen_id: int, desde: datetime, hasta: datetime):
+        lista = self._salidas.get(origen_id, [])
+        i = bisect_left(lista, (desde, -1))
+        while i < len(lista) and lista[i][0] <= hasta:
+            yield self._tramos[lista[i][1]]
+            i += 1
+
+    def buscar(self, origen_id: int, destino_id: int, desde: datetime, hasta: datetime,
+               escala_min: timedelta, escala_max: timedelta, max_tramos: int, k: int) -> list[tuple[Tramo, ...]]:
+        """Devuelve hasta `k` itinerarios ordenados por hora de llegada (y precio).
+
+        Búsqueda best-first por hora de llegada: como cada tramo llega después
+        que el anterior, el primer itinerario que alcanza `destino_id` es el que
+        llega antes, el segundo es el siguiente, etc.
+        """
+        contador = itertools.count()
+        with self._lock:
+            frontera = [
+                (t.llegada, t.precio_base, next(contador), (t,))
+                for t in self._salidas_entre(origen_id, desde, hasta)
+            ]
+            heapq.heapify(frontera)
+            resultados = []
+            expansiones = 0
+            while frontera and len(resultados) < k and expansiones < MAX_EXPANSIONES:
+                llegada, precio, _, ruta = heapq.heappop(frontera)
+                ultimo = ruta[-1]
+                if ultimo.destino_id == destino_id:
+                    resultados.append(ruta)
+                    continue
+                if len(ruta) >= max_tramos:
+                    continue
+                expansiones += 1
+                visitados = {t.origen_id for t in ruta}
+                visitados.add(ultimo.destino_id)
+                for siguiente in self._salidas_entre(ultimo.destino_id, llegada + escala_min, llegada + escala_max):
+                    if siguiente.destino_id in visitados:
+                        continue
+                    heapq.heappush(frontera, (
+                        siguiente.llegada, precio + siguiente.precio_base, next(contador), ruta + (siguiente,)
+                    ))
+            return resultados
+
+
+def _tramo(v) -> Tramo:
+    return Tramo(v.id, v.origen, v.destino, v.origen_id, v.destino_id, v.salida, v.llegada, v.precio_base)
+
+
+indice = IndiceConexiones()
+
+
+def _asegurar_indice(db: Session) -> None:
+    if not indice.vigente:
+        # Los vuelos que ya salieron no pueden formar parte de un itinerario
+        indice.cargar(vuelo_repo.listar_tramos_futuros(db, datetime.utcnow() - timedelta(days=1)))
+
+
+def vuelo_modificado(vuelo_id: int, vuelo=None) -> None:
+    """Refleja en el índice el alta/cambio (`vuelo`) o la baja (`vuelo=None`) de un vuelo."""
+    indice.eliminar(vuelo_id)
+    if vuelo is not None:
+        indice.agregar(vuelo)
+
+
+def buscar_conexiones(
+    db: Session,
+    origen: str,
+    destino: str,
+    fecha: date,
+    escala_min: int = 45,
+    escala_max: int = 360,
+    max_tramos: int = 3,
+    k: int = 5,
+):
+    """Busca los `k` itinerarios que llegan antes, saliendo de `origen` el día `fecha`.
+
+    `escala_min`/`escala_max` son los minutos permitidos entre la llegada de
+    un tramo y la salida del siguiente. Solo se devuelven itinerarios cuyos
+    tramos tienen asientos disponibles (una única consulta por búsqueda).
+    """
+    if clave_aeropuerto(origen) == clave_aeropuerto(destino):
+        raise HTTPException(status_code=400, detail="El origen y el destino deben ser distintos")
+    if escala_min > escala_max:
+        raise HTTPException(status_code=400, detail="La escala mínima no puede superar la máxima")
+
+    ids = aeropuerto_repo.buscar_ids(db, [origen, destino])
+    if origen not in ids or destino not in ids:
+        return []
+
+    _asegurar_indice(db)
+    desde = datetime.combine(fecha, datetime.min.time())
+    candidatos = indice.buscar(
+        ids[origen], ids[destino], desde, desde + timedelta(days=1) - timedelta(microseconds=1),
+        timedelta(minutes=escala_min), timedelta(minutes=escala_max), max_tramos, k * 3
+    )
+
+    ids = {t.id for ruta in candidatos for t in ruta}
+    con_asientos = vuelo_repo.ids_con_asientos(db, ids) if ids else set()
+
+    itinerarios = []
+    for ruta in candidatos:
+        if all(t.id in con_asientos for t in ruta):
+            itinerarios.append({
+                "tramos": [t._asdict() for t in ruta],
+                "salida": ruta[0].salida,
+                "llegada": ruta[-1].llegada,
+                "duracion_horas": round((ruta[-1].llegada - ruta[0].salida).total_seconds() / 3600, 2),
+                "escalas": len(ruta) - 1,
+                "precio_total": sum(t.precio_base for t in ruta),
+            })
+            if len(itinerarios) == k:
+                break
+    return itinerarios
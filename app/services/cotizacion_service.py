@@ -0,0 +1,133 @@
+"""Cotización de reservas en el servidor.
+
+El total de una reserva es `precio_base` del vuelo × multiplicador de la
+clase (1.0 si el vuelo no tiene tarifas por clase) más `precio` × `cantidad`
+de cada servicio. El precio base y los multiplicadores se leen de una
+instantánea por vuelo y los de los servicios de un único catálogo
+compartido, ambos cacheados (`PRECIOS_CACHE_TTL`): cotizar un carrito es una
+búsqueda en la caché, sin consultas por artículo. Los cambios de vuelo o
+tarifas invalidan la instantánea del vuelo y los de servicios solo el
+catálogo (ver `invalidar_vuelo` e `invalidar_servicios`).
+
+Al escribir en una reserva, `precios_servicios(..., vigentes=True)` lee los
+precios de la BD con un solo SELECT: así un servicio recién borrado da 404 y
+no un error de clave foránea.
+"""
+
+import os
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheTTL
+from app.core.tarifas import CLASES, normalizar_clase
+from app.repositories import servicio_repo, tarifa_repo, vuelo_repo
+
+PRECIOS_CACHE_TTL = float(os.getenv("PRECIOS_CACHE_TTL", "300"))
+PRECIOS_CACHE_MAX = int(os.getenv("PRECIOS_CACHE_MAX", "2048"))
+
+# Valor: {"precio_base", "multiplicadores": {clase: m}}
+_cache_precios = CacheTTL("precios", maxsize=PRECIOS_CACHE_MAX, ttl=PRECIOS_CACHE_TTL)
+# Una sola entrada (`_CATALOGO`): {servicio_id: precio}
+_cache_servicios = CacheTTL("precios_servicios", maxsize=1, ttl=PRECIOS_CACHE_TTL)
+_CATALOGO = "catalogo"
+
+
+def invalidar_vuelo(vuelo_id: int):
+    _cache_precios.invalidar(vuelo_id)
+
+
+def invalidar_servicios():
+    _cache_servicios.invalidar(_CATALOGO)
+
+
+def limpiar_cache():
+    _cache_precios.limpiar()
+    _cache_servicios.limpiar()
+
+
+def precios(db: Session, vuelo_id: int, recargar: bool = False) -> dict:
+    """Instantánea de precios del vuelo; 404 si no existe."""
+    if not recargar:
+        cacheada = _cache_precios.obtener(vuelo_id)
+        if cacheada is not None:
+            return cacheada
+
+    version = _cache_precios.version
+    vuelo = vuelo_repo.obtener_vuelo(db, vuelo_id)
+    if not vuelo:
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    instantanea = {
+        "precio_base": vuelo.precio_base,
+        "multiplicadores": tarifa_repo.multiplicadores(db, vuelo_id),
+    }
+    _cache_precios.guardar(vuelo_id, instantanea, version=version)
+    return instantanea
+
+
+def tarifa(instantanea: dict, clase: str) -> float:
+    """Precio del asiento en la clase; 400 si el vuelo no la vende."""
+    multiplicadores = instantanea["multiplicadores"]
+    if not multiplicadores:
+        return round(instantanea["precio_base"], 2)
+    normalizada = normalizar_clase(clase)
+    if not normalizada:
+        raise HTTPException(status_code=400, detail=f"Clase inválida. Valores permitidos: {', '.join(CLASES)}")
+    if normalizada not in multiplicadores:
+        raise HTTPException(status_code=400, detail=f"El vuelo no tiene clase {normalizada}")
+    return round(instantanea["precio_base"] * multiplicadores[normalizada], 2)
+
+
+def _catalogo(db: Session, recargar: bool = False) -> dict:
+    if not recargar:
+        cacheado = _cache_servicios.obtener(_CATALOGO)
+        if cacheado is not None:
+            return cacheado
+    version = _cache_servicios.version
+    catalogo = servicio_repo.precios(db)
+    _cache_servicios.guardar(_CATALOGO, catalogo, version=version)
+    return catalogo
+
+
+def precios_servicios(db: Session, servicio_ids, vigentes: bool = False) -> dict:
+    """Precio unitario de cada servicio pedido; 404 si alguno no existe.
+
+    Sin `vigentes` usa el catálogo cacheado; un id ausente puede ser un
+    servicio creado en otro proceso, así que se recarga una vez antes de
+    darlo por inexistente. Con `vigentes` (altas en reservas) los lee de la BD.
+    """
+    ids = set(servicio_ids)
+    if not ids:
+        return {}
+    if vigentes:
+        encontrados = servicio_repo.precios_de(db, ids)
+    else:
+        encontrados = _catalogo(db)
+        if not ids <= encontrados.keys():
+            encontrados = _catalogo(db, recargar=True)
+    faltantes = sorted(ids - encontrados.keys())
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Servicio no encontrado: {', '.join(map(str, faltantes))}")
+    return {servicio_id: encontrados[servicio_id] for servicio_id in ids}
+
+
+def cotizar(db: Session, vuelo_id: int, clase: str, servicios: list = ()) -> dict:
+    """Total de un asiento en `clase` más los servicios (`servicio_id`, `cantidad`)."""
+    precio_asiento = tarifa(precios(db, vuelo_id), clase)
+    unitarios = precios_servicios(db, [s.servicio_id for s in servicios])
+    lineas = [
+        {
+            "servicio_id": s.servicio_id,
+            "cantidad": s.cantidad,
+            "precio_unitario": unitarios[s.servicio_id],
+            "subtotal": round(unitarios[s.servicio_id] * s.cantidad, 2),
+        }
+        for s in servicios
+    ]
+    return {
+        "vuelo_id": vuelo_id,
+        "clase": clase,
+        "tarifa": precio_asiento,
+        "servicios": lineas,
+        "total": round(precio_asiento + sum(l["subtotal"] for l in lineas), 2),
+    }
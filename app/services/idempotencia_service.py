@@ -0,0 +1,157 @@
+"""Claves de idempotencia para los POST que crean reservas y pagos.
+
+Un cliente que reintenta tras un timeout envía la misma cabecera
+`Idempotency-Key`. La primera petición registra la clave (`en_proceso`),
+ejecuta la operación y guarda el código y el cuerpo JSON de la respuesta.
+Los reintentos reciben esa respuesta con una lectura por clave primaria,
+sin repetir el trabajo; un duplicado que llega mientras la primera sigue en
+curso espera a que termine (hasta `IDEMPOTENCIA_ESPERA` segundos).
+
+Las claves son por usuario y ruta, y caducan a las `IDEMPOTENCIA_TTL_HORAS`.
+Los errores 4xx también se guardan (el reintento obtiene el mismo error);
+ante un error del servidor la clave se libera para que el cliente reintente,
+salvo que la operación ya se haya confirmado (p. ej. falla la serialización
+de la respuesta): entonces se guarda un 500 y el reintento no la repite.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.repositories import idempotencia_repo
+
+IDEMPOTENCIA_TTL_HORAS = float(os.getenv("IDEMPOTENCIA_TTL_HORAS", "24"))
+IDEMPOTENCIA_ESPERA = float(os.getenv("IDEMPOTENCIA_ESPERA", "10"))
+# Segundos entre purgas de claves caducadas; 0 desactiva la tarea
+IDEMPOTENCIA_PURGA_INTERVALO = float(os.getenv("IDEMPOTENCIA_PURGA_INTERVALO", "3600"))
+# Entre procesos no hay aviso: el duplicado consulta la BD cada `_SONDEO` segundos
+_SONDEO = 0.05
+
+# Peticiones en curso en este proceso: los duplicados despiertan al terminar
+_en_curso: dict[tuple, threading.Event] = {}
+_lock = threading.Lock()
+
+
+def huella(datos: BaseModel) -> str:
+    crudo = json.dumps(datos.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(crudo.encode()).hexdigest()
+
+
+def _respuesta(codigo_estado: int, cuerpo, repetida: bool) -> JSONResponse:
+    return JSONResponse(
+        status_code=codigo_estado,
+        content=cuerpo,
+        headers={"Idempotent-Replayed": "true"} if repetida else None,
+    )
+
+
+def _esperar(db: Session, usuario_id: int, ruta: str, clave: str):
+    limite = time.monotonic() + IDEMPOTENCIA_ESPERA
+    while True:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            raise HTTPException(status_code=409, detail="La petición original con esta Idempotency-Key sigue en proceso")
+        with _lock:
+            evento = _en_curso.get((usuario_id, ruta, clave))
+        if evento is not None:
+            evento.wait(restante)
+        else:
+            time.sleep(min(_SONDEO, restante))
+        db.rollback()  # nueva instantánea para ver lo que confirmó la otra petición
+        fila = idempotencia_repo.obtener(db, usuario_id, ruta, clave)
+        if fila is None:
+            raise HTTPException(status_code=409, detail="La petición original falló; puede reintentar")
+        if fila.estado == "completada":
+            return fila
+
+
+def _procesar(db: Session, usuario_id: int, ruta: str, clave: str, operacion, modelo_respuesta, codigo_estado: int):
+    evento = threading.Event()
+    with _lock:
+        _en_curso[(usuario_id, ruta, clave)] = evento
+    guardada = aplicada = False
+    try:
+        try:
+            resultado = operacion()
+            aplicada = True
+        except HTTPException as e:
+            if e.status_code >= 500:
+                raise
+            idempotencia_repo.completar(db, usuario_id, ruta, clave, e.status_code, json.dumps({"detail": e.detail}))
+            guardada = True
+            raise
+        cuerpo = jsonable_encoder(modelo_respuesta.model_validate(resultado, from_attributes=True), by_alias=True)
+        idempotencia_repo.completar(db, usuario_id, ruta, clave, codigo_estado, json.dumps(cuerpo))
+        guardada = True
+        return _respuesta(codigo_estado, cuerpo, repetida=False)
+    except BaseException:
+        if not guardada:
+            db.rollback()
+            if aplicada:
+                # Liberar la clave haría que el reintento repitiera una operación ya confirmada
+                idempotencia_repo.completar(db, usuario_id, ruta, clave, 500, json.dumps(
+                    {"detail": "La operación se aplicó, pero no se pudo generar la respuesta"}
+                ))
+            else:
+                idempotencia_repo.eliminar(db, usuario_id, ruta, clave)
+        raise
+    finally:
+        evento.set()
+        with _lock:
+            _en_curso.pop((usuario_id, ruta, clave), None)
+
+
+def ejecutar(
+    db: Session,
+    usuario_id: int,
+    ruta: str,
+    clave: str,
+    datos: BaseModel,
+    operacion,
+    modelo_respuesta,
+    codigo_estado: int = 200,
+):
+    """Ejecuta `operacion()` una sola vez por (usuario, ruta, clave).
+
+    Sin clave ejecuta la operación y retorna su resultado tal cual. Con clave
+    retorna siempre un `JSONResponse` con el cuerpo serializado con
+    `modelo_respuesta`, sea de la primera ejecución o de la respuesta guardada.
+    """
+    if clave is None:
+        return operacion()
+
+    firma = huella(datos)
+    ahora = datetime.utcnow()
+    fila = idempotencia_repo.obtener(db, usuario_id, ruta, clave)
+    if fila is not None and fila.expira_en <= ahora:
+        idempotencia_repo.eliminar(db, usuario_id, ruta, clave)
+        fila = None
+    if fila is None:
+        expira_en = ahora + timedelta(hours=IDEMPOTENCIA_TTL_HORAS)
+        if idempotencia_repo.reclamar(db, usuario_id, ruta, clave, firma, expira_en):
+            return _procesar(db, usuario_id, ruta, clave, operacion, modelo_respuesta, codigo_estado)
+        # Otra petición con la misma clave la registró entre la lectura y el INSERT
+        fila = idempotencia_repo.obtener(db, usuario_id, ruta, clave)
+        if fila is None:
+            raise HTTPException(status_code=409, detail="La petición original falló; puede reintentar")
+
+    if fila.huella != firma:
+        raise HTTPException(status_code=422, detail="La Idempotency-Key ya se usó con otro cuerpo de petición")
+    if fila.estado != "completada":
+        fila = _esperar(db, usuario_id, ruta, clave)
+    return _respuesta(fila.codigo_estado, json.loads(fila.respuesta), repetida=True)
+
+
+def purgar_vencidas(fabrica_sesiones) -> None:
+    """Tarea periódica: borra las claves caducadas (ver `app/core/tareas.py`)."""
+    with fabrica_sesiones() as db:
+        idempotencia_repo.eliminar_vencidas(db, datetime.utcnow())
@@ -0,0 +1,127 @@
+"""Importación masiva de vuelos desde CSV o NDJSON (solo admin).
+
+El archivo se lee en streaming (ver `app/core/importacion.py`) y las filas
+válidas se escriben por lotes de `VUELOS_IMPORTACION_LOTE`: una consulta IN
+para detectar ids ya existentes, un INSERT multi-fila (COPY en PostgreSQL),
+la actualización del calendario de tarifas y un commit por lote.
+
+Un lote que falla al guardarse se revierte entero y sus filas se reportan
+como error; los lotes anteriores quedan importados.
+"""
+
+import os
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.importacion import LectorFilas, formato_desde_content_type
+from app.dto.vuelo_dto import VueloCreate
+from app.repositories import vuelo_repo, tarifa_diaria_repo
+from app.services import vuelo_service
+
+VUELOS_IMPORTACION_LOTE = int(os.getenv("VUELOS_IMPORTACION_LOTE", "1000"))
+
+
+def _mensaje_validacion(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc']) or 'fila'}: {e['msg']}" for e in error.errors()
+    )
+
+
+class ImportadorVuelos:
+    """Acumula filas validadas y las guarda por lotes en la sesión `db`."""
+
+    def __init__(self, db: Session, lote: int = None):
+        self.db = db
+        self.lote = lote or VUELOS_IMPORTACION_LOTE
+        self.total = 0
+        self.importados = 0
+        self.errores: list[dict] = []
+        self._pendientes: list[tuple[int, VueloCreate]] = []
+        self._ids_vistos: set[int] = set()
+
+    def agregar(self, filas) -> None:
+        for linea, datos in filas:
+            self.total += 1
+            if isinstance(datos, str):
+                self._error(linea, datos)
+                continue
+            try:
+                vuelo = VueloCreate(**datos)
+            except ValidationError as e:
+                self._error(linea, _mensaje_validacion(e))
+                continue
+            if vuelo.id in self._ids_vistos:
+                self._error(linea, f"Id {vuelo.id} repetido en el archivo")
+                continue
+            self._ids_vistos.add(vuelo.id)
+            self._pendientes.append((linea, vuelo))
+            if len(self._pendientes) >= self.lote:
+                self._guardar()
+
+    def terminar(self) -> dict:
+        self._guardar()
+        if self.importados:
+            vuelo_service.invalidar_catalogo()
+        return {
+            "total": self.total,
+            "importados": self.importados,
+            "errores": sorted(self.errores, key=lambda e: e["linea"]),
+        }
+
+    def _error(self, linea: int, mensaje: str) -> None:
+        self.errores.append({"linea": linea, "error": mensaje})
+
+    def _guardar(self) -> None:
+        pendientes, self._pendientes = self._pendientes, []
+        if not pendientes:
+            return
+
+        existentes = vuelo_repo.ids_existentes(self.db, [v.id for _, v in pendientes])
+        filas = []
+        for linea, vuelo in pendientes:
+            if vuelo.id in existentes:
+                self._error(linea, "Ya existe un vuelo con este código.")
+                continue
+            filas.append(vuelo.dict())
+        if not filas:
+            return
+
+        try:
+            # insertar_lote completa origen_id/destino_id en cada fila
+            vuelo_repo.insertar_lote(self.db, filas)
+            tarifa_diaria_repo.acumular(self.db, tarifa_diaria_repo.agrupar_por_dia(filas))
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            for linea, vuelo in pendientes:
+                if vuelo.id not in existentes:
+                    self._error(linea, "No se pudo guardar el lote de esta fila")
+            return
+        self.importados += len(filas)
+
+
+async def importar_vuelos(db: Session, content_type: str, trozos) -> dict:
+    """Importa los vuelos de un cuerpo en streaming (`trozos`: iterable asíncrono de bytes).
+
+    El trabajo con la BD (síncrono) se ejecuta en el pool de hilos para no
+    bloquear el event loop mientras llega el resto del archivo.
+    """
+    formato = formato_desde_content_type(content_type)
+    if formato is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Formato no soportado. Use text/csv o application/x-ndjson",
+        )
+
+    lector = LectorFilas(formato)
+    importador = ImportadorVuelos(db)
+    async for trozo in trozos:
+        filas = lector.alimentar(trozo)
+        if filas:
+            await run_in_threadpool(importador.agregar, filas)
+    await run_in_threadpool(importador.agregar, lector.terminar())
+    return await run_in_threadpool(importador.terminar)
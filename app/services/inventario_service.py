@@ -0,0 +1,84 @@
+"""Existencias limitadas de servicios por vuelo.
+
+Un admin fija la capacidad de los servicios limitados de cada vuelo (`PUT
+/vuelos/{id}/servicios`); el resto no tiene límite. Al agregar servicios a
+una reserva se descuentan con un único UPDATE condicional, en la misma
+transacción que el INSERT, y se devuelven al quitarlos o cancelar la
+reserva. El menú del vuelo con sus existencias es una sola consulta.
+"""
+
+from collections import Counter
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.inventario_servicio import InventarioServicio
+from app.repositories import inventario_repo, servicio_repo
+from app.services import vuelo_service
+from app.dto.inventario_dto import InventarioServicioCreate
+
+
+def cantidades(pares) -> dict:
+    """Suma las cantidades por servicio: {servicio_id: cantidad}."""
+    total = Counter()
+    for servicio_id, cantidad in pares:
+        total[servicio_id] += cantidad or 0
+    return dict(total)
+
+
+def menu(db: Session, vuelo_id: int):
+    vuelo_service.obtener_vuelo(db, vuelo_id)  # 404 si no existe (normalmente desde la caché)
+    return [
+        {"servicio_id": f.id, "nombre": f.nombre, "precio": float(f.precio),
+         "capacidad": f.capacidad, "disponibles": f.disponibles}
+        for f in inventario_repo.menu(db, vuelo_id)
+    ]
+
+
+def configurar(db: Session, vuelo_id: int, items: list[InventarioServicioCreate]):
+    """Define los servicios limitados de un vuelo (solo admin).
+
+    Las existencias descuentan lo ya vendido en reservas del vuelo.
+    """
+    vuelo_service.obtener_vuelo(db, vuelo_id)
+    ids = [i.servicio_id for i in items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Servicio repetido en el inventario")
+    faltantes = sorted(set(ids) - servicio_repo.precios(db).keys())
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Servicio no encontrado: {', '.join(map(str, faltantes))}")
+
+    vendidos = inventario_repo.vendidos(db, vuelo_id)
+    nuevo = [
+        InventarioServicio(
+            vuelo_id=vuelo_id,
+            servicio_id=i.servicio_id,
+            capacidad=i.capacidad,
+            disponibles=max(i.capacidad - vendidos.get(i.servicio_id, 0), 0),
+        )
+        for i in items
+    ]
+    inventario_repo.reemplazar(db, vuelo_id, nuevo)
+    db.commit()
+    return nuevo
+
+
+def descontar(db: Session, vuelo_id: int, pedido: dict):
+    """Descuenta `pedido` ({servicio_id: cantidad}) en la transacción actual (sin commit).
+
+    Lanza 400 si algún servicio limitado no alcanza; el llamador hace rollback.
+    """
+    descontados = inventario_repo.descontar(db, vuelo_id, pedido)
+    # Solo en el camino de error se distingue "sin límite" de "agotado"
+    restantes = set(pedido) - descontados
+    agotados = sorted(inventario_repo.con_inventario(db, vuelo_id, restantes)) if restantes else []
+    if agotados:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No hay existencias suficientes del servicio {', '.join(map(str, agotados))} en este vuelo",
+        )
+
+
+def liberar(db: Session, vuelo_id: int, devuelto: dict):
+    """Devuelve existencias en la transacción actual (sin commit)."""
+    inventario_repo.liberar(db, vuelo_id, devuelto)
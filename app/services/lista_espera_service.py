@@ -0,0 +1,148 @@
+"""Lista de espera de vuelos agotados.
+
+Un usuario que no encuentra asiento se apunta en la cola FIFO del vuelo y
+la clase. Cuando una cancelación (o una retención que vence o se libera)
+deja un asiento libre, `promover` saca la cabeza de la cola en la misma
+transacción y le crea la reserva con ese asiento, sin devolverlo a la venta:
+`asientos_disponibles`, el cupo de la clase y el mapa no cambian. El usuario
+recibe una notificación. El total se cotiza al apuntarse (informativo) y
+de nuevo al promover, con los precios de ese momento.
+"""
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.tarifas import CLASES, normalizar_clase
+from app.repositories import lista_espera_repo, notificacion_repo, reserva_repo, tarifa_repo, vuelo_repo
+from app.services import cotizacion_service
+from app.models.usuario import Usuario
+from app.dto.lista_espera_dto import ListaEsperaCreate
+from app.dto.notificacion_dto import NotificacionCreate
+from app.dto.reserva_dto import ReservaCreate
+
+
+def _con_posicion(db: Session, entrada):
+    entrada.posicion = lista_espera_repo.posicion(db, entrada)
+    return entrada
+
+
+def _hay_asientos(db: Session, vuelo, clase: str) -> bool:
+    if vuelo.asientos_disponibles <= 0:
+        return False
+    cupos = {t.clase: t.disponibles for t in tarifa_repo.listar_tarifas(db, vuelo.id)}
+    return not cupos or cupos.get(clase, 0) > 0
+
+
+def unirse(db: Session, datos: ListaEsperaCreate, usuario_id: int):
+    """Apunta al usuario al final de la cola del vuelo y la clase."""
+    clase = normalizar_clase(datos.clase)
+    if not clase:
+        raise HTTPException(status_code=400, detail=f"Clase inválida. Valores permitidos: {', '.join(CLASES)}")
+    vuelo = vuelo_repo.obtener_vuelo(db, datos.vuelo_id)
+    if not vuelo:
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    if _hay_asientos(db, vuelo, clase):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Hay asientos disponibles: reserva directamente")
+
+    total = cotizacion_service.tarifa(cotizacion_service.precios(db, datos.vuelo_id), clase)
+    try:
+        entrada = lista_espera_repo.crear(db, datos.vuelo_id, usuario_id, clase, total)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya estás en la lista de espera de este vuelo")
+    return _con_posicion(db, entrada)
+
+
+def listar(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    return lista_espera_repo.listar_de_usuario(db, usuario_id, limit, cursor)
+
+
+def _obtener_propia(db: Session, entrada_id: int, current_user: Usuario):
+    entrada = lista_espera_repo.obtener(db, entrada_id)
+    if not entrada:
+        raise HTTPException(status_code=404, detail="Entrada de lista de espera no encontrada")
+    if current_user.rol != "admin" and entrada.usuario_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos sobre esta entrada")
+    return entrada
+
+
+def obtener(db: Session, entrada_id: int, current_user: Usuario):
+    return _con_posicion(db, _obtener_propia(db, entrada_id, current_user))
+
+
+def abandonar(db: Session, entrada_id: int, current_user: Usuario):
+    _obtener_propia(db, entrada_id, current_user)
+    if not lista_espera_repo.eliminar(db, entrada_id):
+        # Promovida entre la lectura y el borrado
+        raise HTTPException(status_code=404, detail="Entrada de lista de espera no encontrada")
+    return {"message": f"Saliste de la lista de espera ({entrada_id})"}
+
+
+def promover(db: Session, vuelo_id: int, clase: str, asiento) -> bool:
+    """Entrega un asiento recién liberado a la cabeza de la cola (sin commit).
+
+    Retorna False si nadie espera en esa clase; el llamador devuelve entonces
+    el asiento a la venta como siempre. Si el vuelo ya no vende esa clase, la
+    cola entera queda sin efecto: se vacía avisando a los usuarios, sin hacer
+    fallar la cancelación o liberación que llamó.
+    """
+    clase = normalizar_clase(clase)
+    if not clase:
+        return False
+    entrada = lista_espera_repo.tomar_primera(db, vuelo_id, clase)
+    if entrada is None:
+        return False
+
+    try:
+        total = cotizacion_service.tarifa(cotizacion_service.precios(db, vuelo_id), entrada.clase)
+    except HTTPException:
+        entradas = [entrada, *lista_espera_repo.eliminar_de_vuelos(db, [vuelo_id], clase)]
+        _avisar_salida(db, entradas, "Lista de espera cerrada",
+                       "El vuelo {vuelo_id} ya no vende la clase {clase}: saliste de su lista de espera.")
+        return False
+    reserva = reserva_repo.crear_reserva(
+        db,
+        ReservaCreate(vuelo_id=vuelo_id, clase=entrada.clase, asiento=asiento, total=total),
+        entrada.usuario_id,
+        commit=False,
+    )
+    asiento_txt = f", asiento {asiento}" if asiento else ""
+    notificacion_repo.crear_notificacion(db, NotificacionCreate(
+        usuario_id=entrada.usuario_id,
+        titulo="Asiento asignado desde la lista de espera",
+        mensaje=f"Se liberó un asiento en el vuelo {vuelo_id}: tu reserva {reserva.id}{asiento_txt} está pendiente de pago.",
+        tipo="lista_espera",
+    ), commit=False)
+    return True
+
+
+def _avisar_salida(db: Session, entradas, titulo: str, mensaje: str) -> None:
+    # `mensaje` se completa con el vuelo y la clase de cada entrada
+    notificacion_repo.crear_notificaciones(db, [
+        NotificacionCreate(
+            usuario_id=e.usuario_id,
+            titulo=titulo,
+            mensaje=mensaje.format(vuelo_id=e.vuelo_id, clase=e.clase),
+            tipo="lista_espera",
+        )
+        for e in entradas
+    ])
+
+
+def cancelar_vuelo(db: Session, vuelo_id: int) -> int:
+    """Saca a todos de la cola de un vuelo que se va a eliminar y les avisa (sin commit).
+
+    Retorna cuántas entradas había.
+    """
+    entradas = lista_espera_repo.eliminar_de_vuelos(db, [vuelo_id])
+    _avisar_salida(db, entradas, "Vuelo cancelado", "El vuelo {vuelo_id} fue cancelado: saliste de su lista de espera.")
+    return len(entradas)
+
+
+def cerrar_colas(db: Session, vuelo_ids) -> int:
+    """Saca a todos de las colas de vuelos que ya salieron (al archivarlos) y les avisa (sin commit)."""
+    entradas = lista_espera_repo.eliminar_de_vuelos(db, vuelo_ids)
+    _avisar_salida(db, entradas, "Lista de espera cerrada",
+                   "El vuelo {vuelo_id} ya salió sin que se liberara un asiento: saliste de su lista de espera.")
+    return len(entradas)
@@ -0,0 +1,138 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.mapa_asientos import (
+    obtener_disposicion,
+    bitmap_a_entero,
+    entero_a_bitmap,
+    esta_ocupado,
+)
+from app.repositories import mapa_asientos_repo, vuelo_repo
+from app.dto.mapa_asientos_dto import MapaAsientosCreate, MapaAsientosRead
+
+
+def _a_dto(mapa) -> MapaAsientosRead:
+    disposicion = obtener_disposicion(mapa.filas, mapa.disposicion)
+    ocupados = bitmap_a_entero(mapa.ocupados)
+    return MapaAsientosRead(
+        vuelo_id=mapa.vuelo_id,
+        filas=mapa.filas,
+        disposicion=mapa.disposicion,
+        capacidad=disposicion.capacidad,
+        libres=disposicion.capacidad - bin(ocupados).count("1"),
+        ocupados=disposicion.codigos_ocupados(ocupados),
+    )
+
+
+def configurar_mapa(db: Session, vuelo_id: int, datos: MapaAsientosCreate):
+    """Crea o reemplaza el mapa de asientos de un vuelo (solo admin).
+
+    Los asientos de las reservas ya existentes se marcan como ocupados.
+    """
+    if not vuelo_repo.obtener_vuelo(db, vuelo_id):
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    try:
+        disposicion = obtener_disposicion(datos.filas, datos.disposicion)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    ocupados = 0
+    for asiento in mapa_asientos_repo.asientos_reservados(db, vuelo_id):
+        try:
+            ocupados |= 1 << disposicion.indice(asiento)
+        except ValueError:
+            continue  # asiento de texto libre anterior al mapa
+
+    mapa = mapa_asientos_repo.guardar_mapa(
+        db, vuelo_id, datos.filas, datos.disposicion,
+        entero_a_bitmap(ocupados, disposicion.bytes_bitmap)
+    )
+    return _a_dto(mapa)
+
+
+def obtener_mapa(db: Session, vuelo_id: int):
+    mapa = mapa_asientos_repo.obtener_mapa(db, vuelo_id)
+    if not mapa:
+        raise HTTPException(status_code=404, detail="El vuelo no tiene mapa de asientos")
+    return _a_dto(mapa)
+
+
+def ocupar_asiento(db: Session, vuelo_id: int, asiento: Optional[str] = None,
+                   preferencia: Optional[str] = None) -> Optional[str]:
+    """Marca un asiento como ocupado dentro de la transacción actual (sin commit).
+
+    - Si el vuelo no tiene mapa, devuelve `asiento` tal cual (texto libre).
+    - Si se indica `asiento`, comprueba el conflicto en O(1) y lanza 409 si está ocupado.
+    - Si no, asigna el siguiente libre, priorizando `preferencia` (ventana/pasillo).
+
+    Retorna el código normalizado del asiento asignado.
+    """
+    return ocupar_asientos(db, vuelo_id, [(asiento, preferencia)])[0]
+
+
+def ocupar_asientos(db: Session, vuelo_id: int,
+                    pedidos: list[tuple[Optional[str], Optional[str]]]) -> list[Optional[str]]:
+    """Como `ocupar_asiento` para varios pasajeros con una sola lectura y escritura del mapa.
+
+    `pedidos` son pares (asiento, preferencia). Los asientos pedidos explícitamente se
+    reservan antes de asignar los libres, así la asignación automática no los ocupa.
+    Retorna los códigos en el mismo orden que `pedidos`.
+    """
+    mapa = mapa_asientos_repo.obtener_mapa(db, vuelo_id, bloquear=True)
+    if not mapa:
+        return [asiento for asiento, _ in pedidos]
+
+    disposicion = obtener_disposicion(mapa.filas, mapa.disposicion)
+    ocupados = bitmap_a_entero(mapa.ocupados)
+    indices = [None] * len(pedidos)
+
+    for i, (asiento, _) in enumerate(pedidos):
+        if not asiento:
+            continue
+        try:
+            indice = disposicion.indice(asiento)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Asiento inválido para este vuelo")
+        if esta_ocupado(ocupados, indice):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="El asiento ya está ocupado")
+        ocupados |= 1 << indice
+        indices[i] = indice
+
+    for i, (asiento, preferencia) in enumerate(pedidos):
+        if asiento:
+            continue
+        indice = disposicion.siguiente_libre(ocupados, preferencia)
+        if indice is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No quedan asientos libres en el mapa")
+        ocupados |= 1 << indice
+        indices[i] = indice
+
+    mapa.ocupados = entero_a_bitmap(ocupados, disposicion.bytes_bitmap)
+    db.flush()
+    return [disposicion.codigo(indice) for indice in indices]
+
+
+def liberar_asiento(db: Session, vuelo_id: int, asiento: Optional[str]):
+    """Libera un asiento en el mapa dentro de la transacción actual (sin commit)."""
+    liberar_asientos(db, vuelo_id, [asiento])
+
+
+def liberar_asientos(db: Session, vuelo_id: int, asientos: list[Optional[str]]):
+    """Libera varios asientos del mismo vuelo con una sola escritura del mapa (sin commit)."""
+    asientos = [a for a in asientos if a]
+    if not asientos:
+        return
+    mapa = mapa_asientos_repo.obtener_mapa(db, vuelo_id, bloquear=True)
+    if not mapa:
+        return
+
+    disposicion = obtener_disposicion(mapa.filas, mapa.disposicion)
+    ocupados = bitmap_a_entero(mapa.ocupados)
+    for asiento in asientos:
+        try:
+            ocupados &= ~(1 << disposicion.indice(asiento))
+        except ValueError:
+            continue  # asiento de texto libre anterior al mapa
+
+    mapa.ocupados = entero_a_bitmap(ocupados, disposicion.bytes_bitmap)
+    db.flush()
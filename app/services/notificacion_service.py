@@ -6,12 +6,12 @@ from app.dto.notificacion_dto import NotificacionCreate
 from app.models.usuario import Usuario
 
 
-def listar_notificaciones(db: Session, current_user: Usuario):
-    return notificacion_repo.listar_notificaciones(db, current_user.id)
+def listar_notificaciones(db: Session, current_user: Usuario, limit: int = None, cursor: str = None):
+    return notificacion_repo.listar_notificaciones(db, current_user.id, limit, cursor)
 
 
-def listar_no_leidas(db: Session, current_user: Usuario):
-    return notificacion_repo.listar_no_leidas(db, current_user.id)
+def listar_no_leidas(db: Session, current_user: Usuario, limit: int = None, cursor: str = None):
+    return notificacion_repo.listar_no_leidas(db, current_user.id, limit, cursor)
 
 
 def obtener_notificacion(db: Session, notificacion_id: int, current_user: Usuario):
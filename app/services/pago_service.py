@@ -49,5 +49,5 @@ def obtener_pago_de_reserva(db: Session, reserva_id: int, current_user: Usuario)
     return pago
 
 
-def listar_pagos_usuario(db: Session, usuario_id: int):
-    return pago_repo.listar_pagos_por_usuario(db, usuario_id)
+def listar_pagos_usuario(db: Session, usuario_id: int, limit: int = None, cursor: str = None):
+    return pago_repo.listar_pagos_por_usuario(db, usuario_id, limit, cursor)
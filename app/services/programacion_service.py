@@ -0,0 +1,128 @@
+"""Programaciones de vuelos recurrentes y su materialización en `vuelos`.
+
+Una programación (ruta, días de la semana, hora, duración, precio,
+capacidad y rango de fechas) genera una fila de `Vuelo` por cada día que
+corresponde. La generación es incremental: parte de
+`materializado_hasta` y solo inserta los días posteriores, por lotes de
+`PROGRAMACION_LOTE` con `vuelo_repo.insertar_lote`, sin releer los vuelos
+ya generados. La restricción única (programacion_id, salida) garantiza que
+un reintento nunca duplique un vuelo.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.aeropuertos import clave_aeropuerto
+from app.repositories import programacion_repo, vuelo_repo, tarifa_diaria_repo
+from app.services import vuelo_service
+from app.dto.programacion_dto import ProgramacionCreate, ProgramacionExtender
+
+PROGRAMACION_LOTE = int(os.getenv("PROGRAMACION_LOTE", "1000"))
+
+
+def _dias(programacion, inicio: date, fin: date):
+    semana = {int(d) for d in programacion.dias_semana}
+    dia = inicio
+    while dia <= fin:
+        if dia.weekday() in semana:
+            yield dia
+        dia += timedelta(days=1)
+
+
+def materializar(db: Session, programacion, hasta: date) -> int:
+    """Genera los vuelos de los días aún no materializados hasta `hasta` (sin commit).
+
+    Nunca crea vuelos en días ya pasados. Retorna el número de vuelos insertados.
+    """
+    inicio = max(programacion.desde, datetime.utcnow().date())
+    if programacion.materializado_hasta is not None:
+        inicio = max(inicio, programacion.materializado_hasta + timedelta(days=1))
+    fin = min(hasta, programacion.hasta)
+    if inicio > fin:
+        return 0
+
+    siguiente_id = vuelo_repo.siguiente_id(db)
+    lote, total = [], 0
+    for dia in _dias(programacion, inicio, fin):
+        salida = datetime.combine(dia, programacion.hora_salida)
+        lote.append({
+            "id": siguiente_id + total, "origen": programacion.origen, "destino": programacion.destino,
+            "salida": salida, "llegada": salida + timedelta(hours=programacion.duracion),
+            "duracion": programacion.duracion, "precio_base": programacion.precio_base,
+            "asientos_disponibles": programacion.capacidad, "programacion_id": programacion.id,
+        })
+        total += 1
+        if len(lote) >= PROGRAMACION_LOTE:
+            _guardar(db, lote)
+            lote = []
+    if lote:
+        _guardar(db, lote)
+    programacion.materializado_hasta = fin
+    return total
+
+
+def _guardar(db: Session, filas: list[dict]) -> None:
+    # insertar_lote completa origen_id/destino_id en cada fila
+    vuelo_repo.insertar_lote(db, filas)
+    tarifa_diaria_repo.acumular(db, tarifa_diaria_repo.agrupar_por_dia(filas))
+
+
+def _confirmar(db: Session, programacion, creados: int) -> dict:
+    try:
+        db.commit()
+    except IntegrityError:
+        # Otra generación simultánea tomó los mismos ids de vuelo
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Conflicto al generar los vuelos, intente de nuevo")
+    if creados:
+        vuelo_service.invalidar_catalogo()
+    return {"programacion": programacion, "vuelos_creados": creados}
+
+
+def listar_programaciones(db: Session, limit: int = None, cursor: str = None):
+    return programacion_repo.listar_programaciones(db, limit, cursor)
+
+
+def obtener_programacion(db: Session, programacion_id: int):
+    programacion = programacion_repo.obtener_programacion(db, programacion_id)
+    if not programacion:
+        raise HTTPException(status_code=404, detail="Programación no encontrada")
+    return programacion
+
+
+def crear_programacion(db: Session, datos: ProgramacionCreate) -> dict:
+    """Registra la programación y genera todos sus vuelos en una transacción."""
+    if datos.hasta < datos.desde:
+        raise HTTPException(status_code=400, detail="La fecha final debe ser posterior a la inicial")
+    if clave_aeropuerto(datos.origen) == clave_aeropuerto(datos.destino):
+        raise HTTPException(status_code=400, detail="El origen y el destino deben ser distintos")
+
+    valores = datos.dict()
+    valores["dias_semana"] = "".join(str(d) for d in datos.dias_semana)
+    try:
+        programacion = programacion_repo.crear_programacion(db, valores)
+        creados = materializar(db, programacion, programacion.hasta)
+    except Exception:
+        db.rollback()
+        raise
+    return _confirmar(db, programacion, creados)
+
+
+def extender_programacion(db: Session, programacion_id: int, datos: ProgramacionExtender) -> dict:
+    """Amplía el rango de la programación y genera solo los días nuevos."""
+    try:
+        programacion = programacion_repo.obtener_programacion(db, programacion_id, bloquear=True)
+        if not programacion:
+            raise HTTPException(status_code=404, detail="Programación no encontrada")
+        if datos.hasta < programacion.hasta:
+            raise HTTPException(status_code=400, detail="Solo se puede extender la fecha final")
+        programacion.hasta = datos.hasta
+        creados = materializar(db, programacion, datos.hasta)
+    except Exception:
+        db.rollback()
+        raise
+    return _confirmar(db, programacion, creados)
@@ -1,17 +1,50 @@
+from datetime import datetime
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.repositories import reserva_repo, reserva_servicio_repo
+from app.core import concurrencia
+from app.repositories import reserva_repo, reserva_servicio_repo, vuelo_repo
+from app.services import (
+    vuelo_service, mapa_asientos_service, tarifa_service, lista_espera_service, cotizacion_service, inventario_service,
+)
 from app.models.vuelo import Vuelo
 from app.models.usuario import Usuario
-from app.models.reserva_servicio import ReservaServicio
-from app.dto.reserva_dto import ReservaCreate, ReservaUpdate
+from app.models.reserva import Reserva
+from app.dto.reserva_dto import ReservaCreate, ReservaGrupoCreate, ReservaUpdate
+from app.dto.cotizacion_dto import CotizacionCreate
+from app.dto.reserva_servicio_dto import ReservaServiciosLote
 
 
-def listar_reservas(db: Session, usuario_id: int = None):
+def listar_reservas(db: Session, usuario_id: int = None, limit: int = None, cursor: str = None):
     """Lista reservas (todas si es admin o solo las del usuario autenticado)."""
     if usuario_id:
-        return reserva_repo.listar_reservas(db, usuario_id)
-    return reserva_repo.listar_reservas(db)
+        return reserva_repo.listar_reservas(db, usuario_id, limit=limit, cursor=cursor)
+    return reserva_repo.listar_reservas(db, limit=limit, cursor=cursor)
+
+
+def buscar_reservas(
+    db: Session,
+    estado: str = None,
+    desde: datetime = None,
+    hasta: datetime = None,
+    vuelo_id: int = None,
+    usuario_id: int = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    """Búsqueda de administración por estado, rango de fecha_reserva, vuelo y usuario."""
+    if desde and hasta and desde > hasta:
+        raise HTTPException(status_code=400, detail="El rango de fechas de reserva no es válido")
+    return reserva_repo.buscar_reservas(
+        db,
+        estado=estado.strip().lower() if estado else None,
+        desde=desde,
+        hasta=hasta,
+        vuelo_id=vuelo_id,
+        usuario_id=usuario_id,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 def obtener_reserva(db: Session, reserva_id: int, current_user: Usuario):
@@ -30,29 +63,118 @@ def obtener_reserva(db: Session, reserva_id: int, current_user: Usuario):
 
 
 def crear_reserva(db: Session, datos: ReservaCreate, usuario_id: int):
-    """Crea una nueva reserva y reduce los asientos disponibles."""
-    vuelo = db.query(Vuelo).filter(Vuelo.id == datos.vuelo_id).first()
-    if not vuelo:
-        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
-    if vuelo.asientos_disponibles <= 0:
+    """Crea una nueva reserva y reduce los asientos disponibles.
+
+    El descuento del asiento (UPDATE condicional) y el INSERT de la reserva
+    van en una sola transacción con un único commit. El total es la tarifa
+    de la clase cotizada en el servidor, no el que envía el cliente.
+    """
+    total = cotizacion_service.tarifa(cotizacion_service.precios(db, datos.vuelo_id), datos.clase)
+    if not vuelo_repo.descontar_asientos(db, datos.vuelo_id):
+        db.rollback()
+        # Solo en el camino de error se distingue "no existe" de "lleno"
+        if not vuelo_repo.obtener_vuelo(db, datos.vuelo_id):
+            raise HTTPException(status_code=404, detail="Vuelo no encontrado")
         raise HTTPException(status_code=400, detail="No hay asientos disponibles")
 
-    nueva = reserva_repo.crear_reserva(db, datos, usuario_id)
-    vuelo.asientos_disponibles -= 1
-    db.commit()
+    try:
+        tarifa_service.descontar_cupo(db, datos.vuelo_id, datos.clase)
+        asiento = mapa_asientos_service.ocupar_asiento(
+            db, datos.vuelo_id, datos.asiento, datos.preferencia_asiento
+        )
+        nueva = reserva_repo.crear_reserva(
+            db, datos.copy(update={"asiento": asiento, "total": total}), usuario_id, commit=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    vuelo_service.invalidar_cache_vuelo(datos.vuelo_id)
     return nueva
 
 
-def actualizar_reserva(db: Session, reserva_id: int, datos: ReservaUpdate, current_user: Usuario):
-    """Permite modificar una reserva solo si pertenece al usuario o es admin."""
+def crear_reserva_grupo(db: Session, datos: ReservaGrupoCreate, usuario_id: int):
+    """Reserva un asiento por pasajero en el mismo vuelo, todo o nada.
+
+    Un solo UPDATE condicional descuenta los N asientos (y otro el cupo de la
+    clase), el mapa se lee y escribe una vez y las reservas se insertan en un
+    INSERT de varias filas; si algo falla no queda ninguna reserva.
+    """
+    total = cotizacion_service.tarifa(cotizacion_service.precios(db, datos.vuelo_id), datos.clase)
+    cantidad = len(datos.pasajeros)
+    if not vuelo_repo.descontar_asientos(db, datos.vuelo_id, cantidad):
+        db.rollback()
+        if not vuelo_repo.obtener_vuelo(db, datos.vuelo_id):
+            raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+        raise HTTPException(status_code=400, detail=f"No hay {cantidad} asientos disponibles")
+
+    try:
+        tarifa_service.descontar_cupo(db, datos.vuelo_id, datos.clase, cantidad)
+        asientos = mapa_asientos_service.ocupar_asientos(
+            db, datos.vuelo_id, [(p.asiento, p.preferencia_asiento) for p in datos.pasajeros]
+        )
+        reservas = reserva_repo.crear_reservas_lote(db, usuario_id, [
+            {"vuelo_id": datos.vuelo_id, "clase": datos.clase, "asiento": asiento, "total": total}
+            for asiento in asientos
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    vuelo_service.invalidar_cache_vuelo(datos.vuelo_id)
+    return {"reservas": reservas}
+
+
+def actualizar_reserva(db: Session, reserva_id: int, datos: ReservaUpdate, current_user: Usuario,
+                       version: int = None):
+    """Permite modificar una reserva solo si pertenece al usuario o es admin.
+
+    Con `version` (If-Match) responde 412 si la reserva cambió desde que el
+    cliente la leyó. Aun sin ella, el UPDATE se condiciona a la versión
+    cargada aquí: los cupos y el mapa se ajustan a partir de esa lectura.
+    Un cambio de clase vuelve a cotizar el asiento; los servicios se conservan.
+    """
     reserva = reserva_repo.obtener_reserva(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva no encontrada")
 
     if current_user.rol != "admin" and reserva.usuario_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permisos para modificar esta reserva")
-
-    reserva = reserva_repo.actualizar_reserva(db, reserva_id, datos)
+    if version is not None and reserva.version != version:
+        raise concurrencia.precondicion_fallida()
+
+    cambios = datos.dict(exclude_unset=True)
+    nueva_clase = cambios.get("clase")
+    total = None
+    if nueva_clase and tarifa_service.normalizar_clase(nueva_clase) != tarifa_service.normalizar_clase(reserva.clase):
+        # Tarifa de la nueva clase más los servicios ya agregados (400 si el vuelo no la vende)
+        total = round(
+            cotizacion_service.tarifa(cotizacion_service.precios(db, reserva.vuelo_id), nueva_clase)
+            + sum(float(rs.subtotal or 0) for rs in reserva.servicios_reserva),
+            2,
+        )
+        try:
+            tarifa_service.descontar_cupo(db, reserva.vuelo_id, nueva_clase)
+            tarifa_service.liberar_cupo(db, reserva.vuelo_id, reserva.clase)
+        except Exception:
+            db.rollback()
+            raise
+
+    nuevo_asiento = cambios.get("asiento")
+    if nuevo_asiento and nuevo_asiento != reserva.asiento:
+        try:
+            nuevo_asiento = mapa_asientos_service.ocupar_asiento(db, reserva.vuelo_id, nuevo_asiento)
+            mapa_asientos_service.liberar_asiento(db, reserva.vuelo_id, reserva.asiento)
+        except Exception:
+            db.rollback()
+            raise
+        datos = datos.copy(update={"asiento": nuevo_asiento})
+
+    with concurrencia.escritura_condicional(db, version):
+        actualizada = reserva_repo.actualizar_reserva(db, reserva_id, datos, reserva.version, total=total)
+    if not actualizada:
+        raise HTTPException(status_code=404, detail="Reserva no encontrada")
+    # La reserva cargada arriba ya tiene los valores nuevos (y sus servicios)
     return reserva
 
 
@@ -71,7 +193,7 @@ def confirmar_reserva(db: Session, reserva_id: int):
 
 
 def eliminar_reserva(db: Session, reserva_id: int, current_user: Usuario):
-    """Elimina una reserva y libera un asiento si corresponde."""
+    """Elimina una reserva y libera su asiento, o lo entrega a la lista de espera."""
     reserva = reserva_repo.obtener_reserva(db, reserva_id)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva no encontrada")
@@ -79,15 +201,31 @@ def eliminar_reserva(db: Session, reserva_id: int, current_user: Usuario):
     if current_user.rol != "admin" and reserva.usuario_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permisos para eliminar esta reserva")
 
-    vuelo = reserva.vuelo
-    if vuelo:
-        vuelo.asientos_disponibles += 1
-
-    db.delete(reserva)
-    db.commit()
+    vuelo_id = reserva.vuelo_id
+    try:
+        # El asiento pasa directamente al primero de la lista de espera, si lo hay
+        if not lista_espera_service.promover(db, vuelo_id, reserva.clase, reserva.asiento):
+            vuelo_repo.liberar_asientos(db, vuelo_id)
+            mapa_asientos_service.liberar_asiento(db, vuelo_id, reserva.asiento)
+            tarifa_service.liberar_cupo(db, vuelo_id, reserva.clase)
+        # Los servicios vuelven al inventario del vuelo aunque el asiento se promueva
+        inventario_service.liberar(db, vuelo_id, inventario_service.cantidades(
+            (rs.servicio_id, rs.cantidad) for rs in reserva.servicios_reserva
+        ))
+        db.delete(reserva)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    vuelo_service.invalidar_cache_vuelo(vuelo_id)
 
     return {"message": f"Reserva {reserva_id} eliminada correctamente"}
 
+def cotizar(db: Session, datos: CotizacionCreate):
+    """Cotiza un asiento y sus servicios sin reservar (ver cotizacion_service)."""
+    return cotizacion_service.cotizar(db, datos.vuelo_id, datos.clase, datos.servicios)
+
+
 def agregar_servicio_a_reserva(db, reserva_id: int, servicio_id: int, cantidad: int, current_user):
     reserva = reserva_repo.obtener_reserva(db, reserva_id)
     if not reserva:
@@ -96,12 +234,24 @@ def agregar_servicio_a_reserva(db, reserva_id: int, servicio_id: int, cantidad:
     if reserva.usuario_id != current_user.id and current_user.rol != "admin":
         raise HTTPException(status_code=403, detail="No autorizado")
 
-    agregado = reserva_servicio_repo.agregar_servicio(
-        db, reserva_id, servicio_id, cantidad
-    )
+    if cantidad < 1:
+        raise HTTPException(status_code=400, detail="La cantidad debe ser al menos 1")
 
-    if not agregado:
+    # Precio vigente en la BD (404 si el servicio no existe), como en el lote; el
+    # total de la reserva se actualiza en la misma transacción que el INSERT
+    precio = cotizacion_service.precios_servicios(db, [servicio_id], vigentes=True)[servicio_id]
+    try:
+        inventario_service.descontar(db, reserva.vuelo_id, {servicio_id: cantidad})
+        agregado = reserva_servicio_repo.agregar_servicio(
+            db, reserva_id, servicio_id, cantidad, round(precio * cantidad, 2)
+        )
+    except IntegrityError:
+        # Un servicio borrado entre el SELECT y el INSERT
+        db.rollback()
         raise HTTPException(status_code=404, detail="Servicio no encontrado")
+    except Exception:
+        db.rollback()
+        raise
 
     return agregado
 
@@ -125,14 +275,75 @@ def eliminar_servicio_de_reserva(db, reserva_id: int, servicio_id: int, current_
     if reserva.usuario_id != current_user.id and current_user.rol != "admin":
         raise HTTPException(status_code=403, detail="No autorizado")
 
-    servicio_en_reserva = db.query(ReservaServicio).filter(
-        ReservaServicio.servicio_id == servicio_id
-    ).first()
+    try:
+        quitados = reserva_servicio_repo.quitar_servicios(db, reserva_id, [servicio_id])
+        if not quitados:
+            raise HTTPException(status_code=404, detail="Servicio no encontrado en la reserva")
+        reserva_repo.ajustar_total(db, reserva_id, -sum(float(f.subtotal or 0) for f in quitados))
+        inventario_service.liberar(db, reserva.vuelo_id, inventario_service.cantidades(
+            (f.servicio_id, f.cantidad) for f in quitados
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # El DELETE en bloque no pasa por la colección ya cargada
+    db.expire(reserva, ["servicios_reserva"])
 
-    if not servicio_en_reserva:
-        raise HTTPException(status_code=404, detail="Servicio no encontrado en la reserva")
+    return {"message": f"Servicio {servicio_id} eliminado de la reserva {reserva_id} correctamente"}
 
-    db.delete(servicio_en_reserva)
-    db.commit()
 
-    return {"message": f"Servicio {servicio_id} eliminado de la reserva {reserva_id} correctamente"}
+def actualizar_servicios_de_reserva(db: Session, reserva_id: int, datos: ReservaServiciosLote, current_user: Usuario):
+    """Quita y agrega varios servicios de una reserva en una sola transacción.
+
+    Los precios de los servicios a agregar se leen con un único SELECT ... IN
+    (no del catálogo cacheado: un servicio recién borrado daría un error de
+    clave foránea), las bajas son un DELETE ... RETURNING limitado a la
+    reserva, las altas un INSERT de varias filas y el total se ajusta con un
+    único UPDATE. Las existencias de los servicios limitados se devuelven y
+    descuentan con un UPDATE cada una (ver inventario_service). Si un servicio
+    a quitar no está en la reserva o uno a agregar no existe, no se aplica nada.
+    """
+    reserva = db.get(Reserva, reserva_id)
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva no encontrada")
+    if reserva.usuario_id != current_user.id and current_user.rol != "admin":
+        raise HTTPException(status_code=403, detail="No autorizado")
+
+    precios = cotizacion_service.precios_servicios(db, [s.servicio_id for s in datos.agregar], vigentes=True)
+    altas = [
+        {"servicio_id": s.servicio_id, "cantidad": s.cantidad, "subtotal": round(precios[s.servicio_id] * s.cantidad, 2)}
+        for s in datos.agregar
+    ]
+
+    try:
+        importe = sum(f["subtotal"] for f in altas)
+        if datos.quitar:
+            quitados = reserva_servicio_repo.quitar_servicios(db, reserva_id, datos.quitar)
+            faltantes = sorted(set(datos.quitar) - {f.servicio_id for f in quitados})
+            if faltantes:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Servicio no encontrado en la reserva: {', '.join(map(str, faltantes))}",
+                )
+            importe -= sum(float(f.subtotal or 0) for f in quitados)
+            inventario_service.liberar(db, reserva.vuelo_id, inventario_service.cantidades(
+                (f.servicio_id, f.cantidad) for f in quitados
+            ))
+        inventario_service.descontar(db, reserva.vuelo_id, inventario_service.cantidades(
+            (s.servicio_id, s.cantidad) for s in datos.agregar
+        ))
+        reserva_servicio_repo.agregar_servicios_lote(db, reserva_id, altas)
+        reserva_repo.ajustar_total(db, reserva_id, importe)
+        db.commit()
+    except IntegrityError:
+        # Un servicio borrado entre el SELECT y el INSERT
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Servicio no encontrado")
+    except Exception:
+        db.rollback()
+        raise
+
+    # Las escrituras en bloque no pasan por la colección si ya estaba cargada
+    db.expire(reserva, ["servicios_reserva"])
+    return reserva_repo.obtener_reserva(db, reserva_id)
@@ -0,0 +1,165 @@
+"""Retenciones temporales de asientos.
+
+Mientras el usuario paga, `POST /retenciones/` aparta un asiento durante
+`RETENCION_MINUTOS`: se descuenta de `asientos_disponibles`, del cupo de la
+clase y del mapa igual que una reserva, pero sin crearla. La retención se
+convierte en reserva (sin volver a descontar) o se libera devolviendo el
+asiento, que antes se ofrece a la lista de espera del vuelo.
+
+Las vencidas las devuelve un barrido periódico cada
+`RETENCION_BARRIDO_INTERVALO` segundos: recorre solo el rango del índice de
+`expira_en` y las libera por lotes de `RETENCION_LOTE`, agrupando los
+contadores por vuelo y clase.
+"""
+
+import logging
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.repositories import retencion_repo, reserva_repo, vuelo_repo
+from app.services import vuelo_service, mapa_asientos_service, tarifa_service, lista_espera_service, cotizacion_service
+from app.models.usuario import Usuario
+from app.dto.reserva_dto import ReservaCreate
+from app.dto.retencion_dto import RetencionCreate, RetencionConfirmar
+
+RETENCION_MINUTOS = int(os.getenv("RETENCION_MINUTOS", "10"))
+RETENCION_LOTE = int(os.getenv("RETENCION_LOTE", "500"))
+# Segundos entre barridos de retenciones vencidas; 0 lo desactiva
+RETENCION_BARRIDO_INTERVALO = float(os.getenv("RETENCION_BARRIDO_INTERVALO", "30"))
+
+logger = logging.getLogger(__name__)
+
+
+def crear_retencion(db: Session, datos: RetencionCreate, usuario_id: int):
+    """Aparta un asiento durante `datos.minutos` (o RETENCION_MINUTOS).
+
+    Mismo descuento que `reserva_service.crear_reserva`, en una transacción.
+    """
+    if not vuelo_repo.descontar_asientos(db, datos.vuelo_id):
+        db.rollback()
+        if not vuelo_repo.obtener_vuelo(db, datos.vuelo_id):
+            raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+        raise HTTPException(status_code=400, detail="No hay asientos disponibles")
+
+    try:
+        tarifa_service.descontar_cupo(db, datos.vuelo_id, datos.clase)
+        asiento = mapa_asientos_service.ocupar_asiento(
+            db, datos.vuelo_id, datos.asiento, datos.preferencia_asiento
+        )
+        expira_en = datetime.utcnow() + timedelta(minutes=datos.minutos or RETENCION_MINUTOS)
+        retencion = retencion_repo.crear(db, usuario_id, datos.vuelo_id, datos.clase, asiento, expira_en)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    vuelo_service.invalidar_cache_vuelo(datos.vuelo_id)
+    return retencion
+
+
+def _comprobar_permiso(db: Session, retencion_id: int, current_user: Usuario):
+    retencion = retencion_repo.obtener(db, retencion_id)
+    if not retencion:
+        raise HTTPException(status_code=404, detail="Retención no encontrada")
+    if current_user.rol != "admin" and retencion.usuario_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos sobre esta retención")
+
+
+def _devolver(db: Session, filas) -> set[int]:
+    """Devuelve los asientos de las retenciones ya tomadas, agrupados por vuelo (sin commit).
+
+    Cada asiento se ofrece antes a la lista de espera; solo los que nadie
+    espera vuelven a la venta.
+    """
+    libres = [f for f in filas if not lista_espera_service.promover(db, f.vuelo_id, f.clase, f.asiento)]
+    por_vuelo = Counter(f.vuelo_id for f in libres)
+    por_clase = Counter((f.vuelo_id, f.clase) for f in libres)
+    asientos = defaultdict(list)
+    for f in libres:
+        asientos[f.vuelo_id].append(f.asiento)
+
+    for vuelo_id, cantidad in por_vuelo.items():
+        vuelo_repo.liberar_asientos(db, vuelo_id, cantidad)
+        mapa_asientos_service.liberar_asientos(db, vuelo_id, asientos[vuelo_id])
+    for (vuelo_id, clase), cantidad in por_clase.items():
+        tarifa_service.liberar_cupo(db, vuelo_id, clase, cantidad)
+    return {f.vuelo_id for f in filas}
+
+
+def confirmar_retencion(db: Session, retencion_id: int, datos: RetencionConfirmar, current_user: Usuario):
+    """Convierte la retención en una reserva con el asiento ya apartado.
+
+    Lanza 410 si venció (y devuelve el asiento en ese momento).
+    """
+    _comprobar_permiso(db, retencion_id, current_user)
+
+    fila = retencion_repo.tomar(db, retencion_id, vigente_en=datetime.utcnow())
+    if fila is None:
+        # Vencida sin barrer todavía, o tomada por otra petición
+        vencida = retencion_repo.tomar(db, retencion_id)
+        if vencida is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Retención no encontrada")
+        _devolver(db, [vencida])
+        db.commit()
+        vuelo_service.invalidar_cache_vuelo(vencida.vuelo_id)
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="La retención ha vencido")
+
+    try:
+        total = cotizacion_service.tarifa(cotizacion_service.precios(db, fila.vuelo_id), fila.clase)
+        reserva = reserva_repo.crear_reserva(
+            db,
+            ReservaCreate(vuelo_id=fila.vuelo_id, clase=fila.clase, asiento=fila.asiento, total=total),
+            fila.usuario_id,
+            commit=False,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return reserva
+
+
+def liberar_retencion(db: Session, retencion_id: int, current_user: Usuario):
+    """Cancela la retención y devuelve el asiento a la venta (o a la lista de espera)."""
+    _comprobar_permiso(db, retencion_id, current_user)
+
+    fila = retencion_repo.tomar(db, retencion_id)
+    if fila is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Retención no encontrada")
+    _devolver(db, [fila])
+    db.commit()
+    vuelo_service.invalidar_cache_vuelo(fila.vuelo_id)
+    return {"message": f"Retención {retencion_id} liberada correctamente"}
+
+
+def barrer_vencidas(db: Session, ahora: datetime = None, lote: int = None) -> int:
+    """Libera todas las retenciones vencidas, un lote por transacción."""
+    ahora = ahora or datetime.utcnow()
+    lote = lote or RETENCION_LOTE
+    liberadas = 0
+    while True:
+        try:
+            filas = retencion_repo.tomar_vencidas(db, ahora, lote)
+            vuelos = _devolver(db, filas)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for vuelo_id in vuelos:
+            vuelo_service.invalidar_cache_vuelo(vuelo_id)
+        liberadas += len(filas)
+        if len(filas) < lote:
+            return liberadas
+
+
+def pasada_barrido(fabrica_sesiones) -> None:
+    """Una pasada del trabajo periódico (ver `app/core/tareas.py`)."""
+    with fabrica_sesiones() as db:
+        liberadas = barrer_vencidas(db)
+    if liberadas:
+        logger.info("Liberadas %s retenciones de asiento vencidas", liberadas)
@@ -1,10 +1,12 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from app.core import concurrencia
 from app.repositories import servicio_repo
+from app.services import cotizacion_service
 from app.dto.servicio_dto import ServicioCreate, ServicioUpdate
 
-def listar_servicios(db: Session):
-    return servicio_repo.listar_servicios(db)
+def listar_servicios(db: Session, limit: int = None, cursor: str = None):
+    return servicio_repo.listar_servicios(db, limit, cursor)
 
 def obtener_servicio(db: Session, servicio_id: int):
     servicio = servicio_repo.obtener_servicio(db, servicio_id)
@@ -25,16 +27,21 @@ def crear_servicio(db: Session, datos: ServicioCreate):
         )
 
     # 2) Crear el servicio normalmente
-    return servicio_repo.crear_servicio(db, datos)
+    servicio = servicio_repo.crear_servicio(db, datos)
+    cotizacion_service.invalidar_servicios()
+    return servicio
 
-def actualizar_servicio(db: Session, servicio_id: int, datos: ServicioUpdate):
-    servicio = servicio_repo.actualizar_servicio(db, servicio_id, datos)
+def actualizar_servicio(db: Session, servicio_id: int, datos: ServicioUpdate, version: int = None):
+    with concurrencia.escritura_condicional(db, version):
+        servicio = servicio_repo.actualizar_servicio(db, servicio_id, datos, version)
     if not servicio:
         raise HTTPException(status_code=404, detail="Servicio no encontrado")
+    cotizacion_service.invalidar_servicios()
     return servicio
 
 def eliminar_servicio(db: Session, servicio_id: int):
     servicio = servicio_repo.eliminar_servicio(db, servicio_id)
     if not servicio:
         raise HTTPException(status_code=404, detail="Servicio no encontrado")
+    cotizacion_service.invalidar_servicios()
     return {"message": f"Servicio {servicio_id} eliminado correctamente"}
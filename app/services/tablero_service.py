@@ -0,0 +1,139 @@
+"""Tableros de salidas y llegadas por aeropuerto servidos desde memoria.
+
+Para cada aeropuerto se mantienen dos listas ordenadas por hora: salidas
+[(salida, id)] y llegadas [(llegada, id)]. "Los próximos N desde ahora" es
+una bisección más un recorte de N elementos, sin consultar la BD.
+
+El ETag de una respuesta es un hash de los vuelos devueltos (id, horas y
+ruta): no depende del proceso que responde, así que una pantalla que repite
+la consulta sin cambios recibe un 304 aunque la atienda otro worker o el
+tablero se haya recargado.
+
+Igual que el índice de conexiones, se carga con la primera consulta, se
+actualiza de forma incremental desde `vuelo_service` y se recarga completo
+cada `TABLERO_TTL` segundos para recoger cambios de otros workers.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.repositories import vuelo_repo, aeropuerto_repo
+
+TABLERO_TTL = float(os.getenv("TABLERO_TTL", "300"))
+
+SALIDAS = "salidas"
+LLEGADAS = "llegadas"
+
+
+class TableroAeropuertos:
+    """Índices aeropuerto_id → [(hora, vuelo_id)] de salidas y de llegadas."""
+
+    def __init__(self):
+        self._listas: dict[str, dict[int, list[tuple[datetime, int]]]] = {SALIDAS: {}, LLEGADAS: {}}
+        self._vuelos: dict[int, dict] = {}
+        self._cargado_en: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @property
+    def vigente(self) -> bool:
+        return self._cargado_en is not None and time.monotonic() - self._cargado_en < TABLERO_TTL
+
+    def cargar(self, vuelos) -> None:
+        with self._lock:
+            self._listas = {SALIDAS: {}, LLEGADAS: {}}
+            self._vuelos = {}
+            for v in vuelos:
+                self._agregar(v, ordenado=False)
+            for por_aeropuerto in self._listas.values():
+                for lista in por_aeropuerto.values():
+                    lista.sort()
+            self._cargado_en = time.monotonic()
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._listas = {SALIDAS: {}, LLEGADAS: {}}
+            self._vuelos = {}
+            self._cargado_en = None
+
+    def vuelo_modificado(self, vuelo_id: int, vuelo=None) -> None:
+        with self._lock:
+            if self._cargado_en is None:
+                return  # se cargará completo en la próxima consulta
+            self._quitar(vuelo_id)
+            if vuelo is not None:
+                self._agregar(vuelo)
+
+    def _agregar(self, v, ordenado: bool = True) -> None:
+        self._vuelos[v.id] = {
+            "vuelo_id": v.id, "origen": v.origen, "destino": v.destino,
+            "origen_id": v.origen_id, "destino_id": v.destino_id,
+            "salida": v.salida, "llegada": v.llegada,
+        }
+        for tipo, aeropuerto_id, hora in ((SALIDAS, v.origen_id, v.salida), (LLEGADAS, v.destino_id, v.llegada)):
+            lista = self._listas[tipo].setdefault(aeropuerto_id, [])
+            if ordenado:
+                insort(lista, (hora, v.id))
+            else:
+                lista.append((hora, v.id))
+
+    def _quitar(self, vuelo_id: int) -> None:
+        v = self._vuelos.pop(vuelo_id, None)
+        if v is None:
+            return
+        for tipo, aeropuerto_id, hora in (
+            (SALIDAS, v["origen_id"], v["salida"]), (LLEGADAS, v["destino_id"], v["llegada"])
+        ):
+            lista = self._listas[tipo].get(aeropuerto_id, [])
+            i = bisect_left(lista, (hora, vuelo_id))
+            if i < len(lista) and lista[i] == (hora, vuelo_id):
+                del lista[i]
+
+    def tiene(self, aeropuerto_id: int) -> bool:
+        return any(aeropuerto_id in por_aeropuerto for por_aeropuerto in self._listas.values())
+
+    def proximos(self, tipo: str, aeropuerto_id: int, desde: datetime, limite: int) -> tuple[list[dict], str]:
+        """Los `limite` vuelos siguientes a `desde` y el ETag de esa respuesta."""
+        with self._lock:
+            lista = self._listas[tipo].get(aeropuerto_id, [])
+            i = bisect_left(lista, (desde, -1))
+            items = [self._vuelos[vuelo_id] for _, vuelo_id in lista[i:i + limite]]
+        contenido = [
+            (v["vuelo_id"], v["salida"].isoformat(), v["llegada"].isoformat(), v["origen"], v["destino"])
+            for v in items
+        ]
+        firma = hashlib.blake2b(repr((tipo, aeropuerto_id, contenido)).encode(), digest_size=8).hexdigest()
+        return items, f'W/"{firma}"'
+
+
+tablero = TableroAeropuertos()
+
+
+def _asegurar_tablero(db: Session) -> None:
+    if not tablero.vigente:
+        # Los vuelos que salieron hace más de un día ya no aparecen ni en llegadas
+        tablero.cargar(vuelo_repo.listar_tramos_futuros(db, datetime.utcnow() - timedelta(days=1)))
+
+
+def vuelo_modificado(vuelo_id: int, vuelo=None) -> None:
+    """Refleja en los tableros el alta/cambio (`vuelo`) o la baja (`vuelo=None`) de un vuelo."""
+    tablero.vuelo_modificado(vuelo_id, vuelo)
+
+
+def proximos(db: Session, tipo: str, aeropuerto_id: int, limit: int = 10, ahora: datetime = None):
+    """Próximas salidas o llegadas de un aeropuerto: (items, etag).
+
+    Solo consulta la BD para cargar el tablero o, si el aeropuerto no tiene
+    vuelos en él, para distinguir "sin vuelos" de "no existe".
+    """
+    _asegurar_tablero(db)
+    if not tablero.tiene(aeropuerto_id) and not aeropuerto_repo.obtener_aeropuerto(db, aeropuerto_id):
+        raise HTTPException(status_code=404, detail="Aeropuerto no encontrado")
+    return tablero.proximos(tipo, aeropuerto_id, ahora or datetime.utcnow(), limit)
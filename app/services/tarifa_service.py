@@ -0,0 +1,76 @@
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.tarifas import CLASES, normalizar_clase
+from app.models.tarifa_clase import TarifaClase
+from app.repositories import tarifa_repo, vuelo_repo, tarifa_diaria_repo
+from app.services import vuelo_service, cotizacion_service
+from app.dto.tarifa_dto import TarifaClaseCreate
+
+
+def listar_tarifas(db: Session, vuelo_id: int):
+    return tarifa_repo.listar_tarifas(db, vuelo_id)
+
+
+def configurar_tarifas(db: Session, vuelo_id: int, tarifas: list[TarifaClaseCreate]):
+    """Define los cupos por clase de un vuelo (solo admin).
+
+    Los cupos disponibles descuentan las reservas ya existentes de cada clase
+    y `asientos_disponibles` del vuelo pasa a ser la suma de los cupos.
+    """
+    vuelo = vuelo_repo.obtener_vuelo(db, vuelo_id)
+    if not vuelo:
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+
+    normalizadas = [normalizar_clase(t.clase) for t in tarifas]
+    if None in normalizadas:
+        raise HTTPException(status_code=400, detail=f"Clase inválida. Valores permitidos: {', '.join(CLASES)}")
+    if len(set(normalizadas)) != len(normalizadas):
+        raise HTTPException(status_code=400, detail="Clase repetida en las tarifas")
+
+    vendidos = {}
+    for clase, total in tarifa_repo.reservas_por_clase(db, vuelo_id).items():
+        clave = normalizar_clase(clase)
+        vendidos[clave] = vendidos.get(clave, 0) + total
+
+    nuevas = [
+        TarifaClase(
+            vuelo_id=vuelo_id,
+            clase=clase,
+            capacidad=t.capacidad,
+            disponibles=max(t.capacidad - vendidos.get(clase, 0), 0),
+            multiplicador=t.multiplicador,
+        )
+        for clase, t in zip(normalizadas, tarifas)
+    ]
+    tarifa_repo.reemplazar_tarifas(db, vuelo_id, nuevas)
+    vuelo.asientos_disponibles = sum(t.disponibles for t in nuevas)
+    tarifa_diaria_repo.recalcular_vuelo(db, vuelo)
+    db.commit()
+    vuelo_service.invalidar_cache_vuelo(vuelo_id)
+    cotizacion_service.invalidar_vuelo(vuelo_id)
+    return nuevas
+
+
+def descontar_cupo(db: Session, vuelo_id: int, clase: str, cantidad: int = 1) -> Optional[str]:
+    """Descuenta `cantidad` del cupo de la clase en la transacción actual (sin commit).
+
+    Retorna la clase normalizada, o None si el vuelo no tiene tarifas por clase
+    (en ese caso solo cuenta `asientos_disponibles`).
+    """
+    normalizada = normalizar_clase(clase)
+    if normalizada and tarifa_repo.descontar_cupo(db, vuelo_id, normalizada, cantidad):
+        return normalizada
+    # Camino de error o vuelo sin cupos por clase
+    if not tarifa_repo.tiene_tarifas(db, vuelo_id):
+        return None
+    if not normalizada:
+        raise HTTPException(status_code=400, detail=f"Clase inválida. Valores permitidos: {', '.join(CLASES)}")
+    raise HTTPException(status_code=400, detail=f"No hay asientos disponibles en clase {normalizada}")
+
+
+def liberar_cupo(db: Session, vuelo_id: int, clase: str, cantidad: int = 1):
+    """Devuelve `cantidad` al cupo de la clase en la transacción actual (sin commit)."""
+    normalizada = normalizar_clase(clase)
+    if normalizada:
+        tarifa_repo.liberar_cupo(db, vuelo_id, normalizada, cantidad)
@@ -16,8 +16,8 @@ def registrar_usuario(db: Session, usuario: UsuarioCreate):
     return usuario_repo.crear_usuario(db, usuario)
 
 # === Listar todos los usuarios (solo admin) ===
-def listar_usuarios(db: Session):
-    return usuario_repo.listar_usuarios(db)
+def listar_usuarios(db: Session, limit: int = None, cursor: str = None):
+    return usuario_repo.listar_usuarios(db, limit, cursor)
 
 # === Obtener un usuario por ID ===
 def obtener_usuario_por_id(db: Session, id: int):
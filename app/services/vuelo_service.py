@@ -1,34 +1,219 @@
+import logging
+import os
+from datetime import date, datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from app.repositories import vuelo_repo
-from app.dto.vuelo_dto import VueloCreate, VueloUpdate
+from app.core import concurrencia
+from app.core.cache import CacheTTL
+from app.core.paginacion import ResultadoPaginado, decodificar_cursor
+from app.core.tarifas import CLASES, normalizar_clase
+from app.repositories import vuelo_repo, tarifa_diaria_repo, aeropuerto_repo
+from app.services import conexion_service, autocompletado_service, tablero_service, cotizacion_service, lista_espera_service
+from app.dto.vuelo_dto import VueloCreate, VueloUpdate, VueloPatch, VueloRead
 
-def listar_vuelos(db: Session):
-    return vuelo_repo.listar_vuelos(db)
+# === Caché del catálogo ===
+# Los vuelos se leen mucho más de lo que cambian: se cachean como DTOs
+# (instantáneas independientes de la sesión) por id y por página de listado.
+VUELOS_CACHE_TTL = float(os.getenv("VUELOS_CACHE_TTL", "60"))
+VUELOS_CACHE_MAX = int(os.getenv("VUELOS_CACHE_MAX", "2048"))
+
+_cache_vuelos = CacheTTL("vuelos", maxsize=VUELOS_CACHE_MAX, ttl=VUELOS_CACHE_TTL)
+# Valor: (id_desde_exclusivo, id_hasta_inclusivo, página). Un límite None es abierto.
+_cache_catalogo = CacheTTL("catalogo_vuelos", maxsize=256, ttl=VUELOS_CACHE_TTL)
+
+# Las reservas solo recalculan tarifas_diarias cuando un vuelo se agota o
+# vuelve a la venta; los asientos del calendario se ponen al día cada
+# CALENDARIO_REFRESCO_INTERVALO segundos (0 = desactivado).
+CALENDARIO_REFRESCO_INTERVALO = float(os.getenv("CALENDARIO_REFRESCO_INTERVALO", "60"))
+
+logger = logging.getLogger(__name__)
+
+
+def _listado_cacheado(db: Session, tipo, consulta, limit: int, cursor: str):
+    clave = (tipo, limit, cursor)
+    entrada = _cache_catalogo.obtener(clave)
+    if entrada is not None:
+        return entrada[2]
+
+    version = _cache_catalogo.version
+    resultado = consulta(db, limit, cursor)
+    pagina = ResultadoPaginado([VueloRead.model_validate(v) for v in resultado], resultado.next_cursor)
+    # Con paginación keyset una página solo depende de los ids de su rango,
+    # así que basta con invalidar las páginas cuyo rango contiene el vuelo cambiado.
+    desde = decodificar_cursor(cursor, [vuelo_repo.Vuelo.id])[0] if cursor else None
+    hasta = pagina[-1].id if pagina.next_cursor else None
+    _cache_catalogo.guardar(clave, (desde, hasta, pagina), version=version)
+    return pagina
+
+
+def invalidar_cache_vuelo(vuelo_id: int):
+    """Descarta de la caché el vuelo y las páginas del catálogo que lo contienen."""
+    _cache_vuelos.invalidar(vuelo_id)
+    _cache_catalogo.invalidar_donde(
+        lambda _, v: (v[0] is None or v[0] < vuelo_id) and (v[1] is None or vuelo_id <= v[1])
+    )
+
+
+def _propagar_cambio(vuelo_id: int, vuelo=None):
+    """Refleja un alta/cambio (`vuelo`) o baja (`vuelo=None`) en las estructuras en memoria."""
+    invalidar_cache_vuelo(vuelo_id)
+    cotizacion_service.invalidar_vuelo(vuelo_id)
+    conexion_service.vuelo_modificado(vuelo_id, vuelo)
+    tablero_service.vuelo_modificado(vuelo_id, vuelo)
+    if vuelo is not None:
+        autocompletado_service.vuelo_modificado(vuelo)
+
+
+def invalidar_catalogo():
+    """Tras un alta masiva: descarta todas las páginas del catálogo y fuerza
+    la recarga de los índices en memoria en la próxima búsqueda."""
+    _cache_catalogo.limpiar()
+    cotizacion_service.limpiar_cache()
+    conexion_service.indice.limpiar()
+    tablero_service.tablero.limpiar()
+    autocompletado_service.marcar_obsoleto()
+
+
+def limpiar_cache():
+    _cache_vuelos.limpiar()
+    _cache_catalogo.limpiar()
+
+
+def listar_vuelos(db: Session, limit: int = None, cursor: str = None):
+    return _listado_cacheado(db, "listar", vuelo_repo.listar_vuelos, limit, cursor)
 
 def obtener_vuelo(db: Session, vuelo_id: int):
+    cacheado = _cache_vuelos.obtener(vuelo_id)
+    if cacheado is not None:
+        return cacheado
+
+    version = _cache_vuelos.version
     vuelo = vuelo_repo.obtener_vuelo(db, vuelo_id)
     if not vuelo:
         raise HTTPException(status_code=404, detail="Vuelo no encontrado")
-    return vuelo
+    dto = VueloRead.model_validate(vuelo)
+    _cache_vuelos.guardar(vuelo_id, dto, version=version)
+    return dto
 
-def vuelos_disponibles(db: Session):
-    return vuelo_repo.buscar_vuelos_disponibles(db)
+def obtener_vuelo_vigente(db: Session, vuelo_id: int):
+    """Como `obtener_vuelo`, pero con la versión leída de la BD (una consulta por PK).
 
-def crear_vuelo(db: Session, datos: VueloCreate):
-    existente = db.query(vuelo_repo.Vuelo).filter(vuelo_repo.Vuelo.id == datos.id).first()
-    if existente:
+    Para el GET que emite el ETag: otro worker puede haber cambiado el vuelo
+    sin invalidar esta caché, y un ETag viejo haría fallar el If-Match siguiente.
+    """
+    version = vuelo_repo.version_actual(db, vuelo_id)
+    if version is None:
+        _cache_vuelos.invalidar(vuelo_id)
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    cacheado = _cache_vuelos.obtener(vuelo_id)
+    if cacheado is not None and cacheado.version == version:
+        return cacheado
+    _cache_vuelos.invalidar(vuelo_id)
+    return obtener_vuelo(db, vuelo_id)
+
+def vuelos_disponibles(db: Session, limit: int = None, cursor: str = None, clase: str = None):
+    if clase is None:
+        return _listado_cacheado(db, "disponibles", vuelo_repo.buscar_vuelos_disponibles, limit, cursor)
+
+    normalizada = normalizar_clase(clase)
+    if not normalizada:
+        raise HTTPException(status_code=400, detail=f"Clase inválida. Valores permitidos: {', '.join(CLASES)}")
+    return _listado_cacheado(
+        db,
+        ("disponibles", normalizada),
+        lambda db, limit, cursor: vuelo_repo.buscar_vuelos_disponibles(db, limit, cursor, clase=normalizada),
+        limit,
+        cursor,
+    )
+
+def buscar_vuelos(
+    db: Session,
+    origen: str = None,
+    destino: str = None,
+    salida_desde: datetime = None,
+    salida_hasta: datetime = None,
+    asientos_min: int = None,
+    precio_max: float = None,
+    limit: int = None,
+    cursor: str = None,
+):
+    if salida_desde and salida_hasta and salida_desde > salida_hasta:
+        raise HTTPException(status_code=400, detail="El rango de fechas de salida no es válido")
+    # "bog", "BOG" y "Bogotá (BOG)" se resuelven al mismo aeropuerto
+    ids = aeropuerto_repo.buscar_ids(db, [t for t in (origen, destino) if t is not None])
+    if (origen is not None and origen not in ids) or (destino is not None and destino not in ids):
+        return ResultadoPaginado([], None)
+    return vuelo_repo.buscar_vuelos(
+        db,
+        origen_id=ids.get(origen),
+        destino_id=ids.get(destino),
+        salida_desde=salida_desde,
+        salida_hasta=salida_hasta,
+        asientos_min=asientos_min,
+        precio_max=precio_max,
+        limit=limit,
+        cursor=cursor,
+    )
+
+def calendario_tarifas(db: Session, origen: str, destino: str, anio: int, mes: int):
+    """Precio mínimo, asientos y número de vuelos por día de un mes para una ruta.
+
+    Lee el resumen `tarifas_diarias`; los días sin vuelos no aparecen.
+    """
+    if not 1 <= mes <= 12:
+        raise HTTPException(status_code=400, detail="Mes inválido")
+    ids = aeropuerto_repo.buscar_ids(db, [origen, destino])
+    if origen not in ids or destino not in ids:
+        return []
+    desde = date(anio, mes, 1)
+    hasta = date(anio + 1, 1, 1) if mes == 12 else date(anio, mes + 1, 1)
+    return tarifa_diaria_repo.listar_rango(db, ids[origen], ids[destino], desde, hasta)
+
+def pasada_calendario(fabrica_sesiones) -> None:
+    """Una pasada del trabajo periódico (ver `app/core/tareas.py`)."""
+    with fabrica_sesiones() as db:
+        actualizados = tarifa_diaria_repo.refrescar_asientos(db, datetime.utcnow().date())
+    if actualizados:
+        logger.info("Calendario de tarifas: asientos actualizados en %s días", actualizados)
+
+def _validar_id_libre(db: Session, vuelo_id: int):
+    # Un id archivado tampoco se puede reutilizar
+    if vuelo_repo.ids_existentes(db, [vuelo_id]):
         raise HTTPException(status_code=400, detail="Ya existe un vuelo con este código.")
-    return vuelo_repo.crear_vuelo(db, datos)
 
-def actualizar_vuelo(db: Session, vuelo_id: int, datos: VueloUpdate):
-    vuelo = vuelo_repo.actualizar_vuelo(db, vuelo_id, datos)
+def crear_vuelo(db: Session, datos: VueloCreate):
+    _validar_id_libre(db, datos.id)
+    vuelo = vuelo_repo.crear_vuelo(db, datos)
+    _propagar_cambio(vuelo.id, vuelo)
+    return vuelo
+
+def actualizar_vuelo(db: Session, vuelo_id: int, datos: VueloUpdate, version: int = None):
+    """Reemplaza el vuelo; con `version` (If-Match) solo si sigue siendo la actual (412 si no)."""
+    if datos.id != vuelo_id:
+        _validar_id_libre(db, datos.id)
+    with concurrencia.escritura_condicional(db, version):
+        vuelo = vuelo_repo.actualizar_vuelo(db, vuelo_id, datos, version)
+    if not vuelo:
+        raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    if vuelo.id != vuelo_id:
+        _propagar_cambio(vuelo_id)
+    _propagar_cambio(vuelo.id, vuelo)
+    return vuelo
+
+def parchear_vuelo(db: Session, vuelo_id: int, datos: VueloPatch, version: int = None):
+    """Actualiza solo los campos enviados con una única sentencia UPDATE."""
+    with concurrencia.escritura_condicional(db, version):
+        vuelo = vuelo_repo.parchear_vuelo(db, vuelo_id, datos, version)
     if not vuelo:
         raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    _propagar_cambio(vuelo_id, vuelo)
     return vuelo
 
 def eliminar_vuelo(db: Session, vuelo_id: int):
+    # La cola de espera se vacía (avisando a cada usuario) en la misma transacción
+    lista_espera_service.cancelar_vuelo(db, vuelo_id)
     vuelo = vuelo_repo.eliminar_vuelo(db, vuelo_id)
     if not vuelo:
         raise HTTPException(status_code=404, detail="Vuelo no encontrado")
+    _propagar_cambio(vuelo_id)
     return {"message": f"Vuelo con id {vuelo_id} eliminado correctamente"}
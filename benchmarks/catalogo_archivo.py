@@ -0,0 +1,117 @@
+"""Latencia de las consultas del catálogo antes y después de archivar.
+
+Genera una BD SQLite en disco con N vuelos (por defecto 2 millones) cuya
+salida se reparte entre dos años atrás y dos meses adelante, mide las
+consultas calientes del catálogo, archiva los vuelos salidos con
+`archivo_service.archivar_vuelos_salidos` y vuelve a medir.
+
+Uso:
+    python -m benchmarks.catalogo_archivo [--vuelos 2000000] [--bd /tmp/catalogo.db]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.aeropuerto import Aeropuerto
+from app.models.vuelo import Vuelo
+import app.main  # noqa: F401  (registra todos los modelos en Base.metadata)
+from app.repositories import vuelo_repo
+from app.services import archivo_service
+
+CODIGOS = ["BOG", "MDE", "CLO", "CTG", "BAQ", "PEI", "SMR", "BGA", "ADZ", "CUC", "IBG", "MTR"]
+DIAS_PASADO, DIAS_FUTURO = 730, 60
+BLOQUE = 50_000
+
+
+def poblar(engine, n: int, ahora: datetime) -> None:
+    with engine.begin() as conexion:
+        conexion.execute(insert(Aeropuerto), [{"clave": c, "codigo": c, "ciudad": c} for c in CODIGOS])
+        aeropuertos = list(range(1, len(CODIGOS) + 1))
+        inicio = ahora - timedelta(days=DIAS_PASADO)
+        paso = timedelta(days=DIAS_PASADO + DIAS_FUTURO) / n
+        rnd = random.Random(7)
+        for desde in range(0, n, BLOQUE):
+            filas = []
+            for i in range(desde, min(desde + BLOQUE, n)):
+                # Ids crecientes con la fecha, como al programar temporadas
+                salida = inicio + paso * i
+                o, d = rnd.sample(aeropuertos, 2)
+                filas.append({
+                    "id": i + 1, "origen": CODIGOS[o - 1], "destino": CODIGOS[d - 1],
+                    "origen_id": o, "destino_id": d, "salida": salida,
+                    "llegada": salida + timedelta(hours=1), "duracion": 1.0,
+                    "precio_base": rnd.uniform(80, 400), "asientos_disponibles": rnd.choice([0, 5, 40, 120]),
+                })
+            conexion.execute(insert(Vuelo), filas)
+
+
+def medir(nombre: str, consulta, repeticiones: int = 20) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        consulta()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    mediana = statistics.median(tiempos)
+    print(f"  {nombre:<40} p50 {mediana:9.2f} ms   max {max(tiempos):9.2f} ms")
+    return mediana
+
+
+def consultas(db, ahora: datetime) -> dict:
+    return {
+        "listar_vuelos (1ª página)": lambda: vuelo_repo.listar_vuelos(db, 50),
+        "vuelos disponibles (1ª página)": lambda: vuelo_repo.buscar_vuelos_disponibles(db, 50),
+        "buscar por fecha desde ahora": lambda: vuelo_repo.buscar_vuelos(db, salida_desde=ahora, limit=50),
+        "buscar por ruta desde ahora": lambda: vuelo_repo.buscar_vuelos(db, 1, 2, salida_desde=ahora, limit=50),
+        "buscar precio_max sin ruta": lambda: vuelo_repo.buscar_vuelos(db, precio_max=81, limit=50),
+        "tramos futuros (índice conexiones)": lambda: vuelo_repo.listar_tramos_futuros(db, ahora),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vuelos", type=int, default=2_000_000)
+    parser.add_argument("--bd", default="/tmp/flyblue_catalogo.db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.bd):
+        os.remove(args.bd)
+    engine = create_engine(f"sqlite:///{args.bd}")
+    Base.metadata.create_all(engine)
+    ahora = datetime.utcnow()
+
+    inicio = time.perf_counter()
+    poblar(engine, args.vuelos, ahora)
+    print(f"{args.vuelos:,} vuelos generados en {time.perf_counter() - inicio:.1f} s")
+
+    Sesion = sessionmaker(bind=engine)
+    resultados = {}
+    with Sesion() as db:
+        print("Antes de archivar:")
+        for nombre, consulta in consultas(db, ahora).items():
+            resultados[nombre] = [medir(nombre, consulta)]
+        db.rollback()
+
+        inicio = time.perf_counter()
+        archivado = archivo_service.archivar_vuelos_salidos(db, ahora, lote=10_000)
+        print(f"Archivados {archivado['vuelos']:,} vuelos en {time.perf_counter() - inicio:.1f} s")
+        db.execute(text("ANALYZE"))
+
+        print("Después de archivar:")
+        for nombre, consulta in consultas(db, ahora).items():
+            resultados[nombre].append(medir(nombre, consulta))
+
+    print("Resumen (p50 ms): antes -> después")
+    for nombre, (antes, despues) in resultados.items():
+        print(f"  {nombre:<40} {antes:9.2f} -> {despues:9.2f}  (x{antes / despues:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Reserva de un grupo: N llamadas a `crear_reserva` frente a `crear_reserva_grupo`.
+
+Crea una BD SQLite en disco con un vuelo con mapa de asientos y cupos por
+clase, y mide para varios tamaños de grupo el tiempo y el número de
+sentencias SQL de reservar pasajero a pasajero (como hace hoy el cliente con
+`POST /reservas/`) frente a una sola reserva de grupo.
+
+Uso:
+    python -m benchmarks.reserva_grupo [--repeticiones 200] [--bd /tmp/reserva_grupo.db]
+"""
+
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete, event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.mapa_asientos import MapaAsientos
+from app.models.reserva import Reserva
+from app.models.tarifa_clase import TarifaClase
+from app.models.usuario import Usuario
+from app.models.vuelo import Vuelo
+import app.main  # noqa: F401  (registra todos los modelos en Base.metadata)
+from app.dto.mapa_asientos_dto import MapaAsientosCreate
+from app.dto.reserva_dto import ReservaCreate, ReservaGrupoCreate
+from app.dto.tarifa_dto import TarifaClaseCreate
+from app.services import mapa_asientos_service, reserva_service, tarifa_service
+
+TAMANOS = (2, 5, 9)
+CAPACIDAD = 180
+
+
+def preparar(Sesion) -> None:
+    with Sesion() as db:
+        salida = datetime.utcnow() + timedelta(days=30)
+        db.add(Usuario(id=1, nombre="Bench", email="bench@flyblue.test", contrasena="x"))
+        db.add(Vuelo(
+            id=1, origen="BOG", destino="MDE", salida=salida, llegada=salida + timedelta(hours=1),
+            duracion=1.0, precio_base=200.0, asientos_disponibles=CAPACIDAD,
+        ))
+        db.commit()
+        mapa_asientos_service.configurar_mapa(db, 1, MapaAsientosCreate(filas=30, disposicion="ABC-DEF"))
+        tarifa_service.configurar_tarifas(db, 1, [TarifaClaseCreate(clase="economica", capacidad=CAPACIDAD)])
+
+
+def reiniciar(db) -> None:
+    """Deja el vuelo vacío entre repeticiones (fuera de la medición)."""
+    db.execute(delete(Reserva))
+    db.execute(update(Vuelo).values(asientos_disponibles=CAPACIDAD))
+    db.execute(update(TarifaClase).values(disponibles=CAPACIDAD))
+    db.execute(update(MapaAsientos).values(ocupados=bytes(len(db.get(MapaAsientos, 1).ocupados))))
+    db.commit()
+
+
+def individual(db, n: int) -> None:
+    for _ in range(n):
+        datos = ReservaCreate(vuelo_id=1, clase="economica", total=200.0, preferencia_asiento="ventana")
+        reserva = reserva_service.crear_reserva(db, datos, 1)
+        reserva.id  # la respuesta del endpoint lee la reserva tras el commit
+
+
+def grupo(db, n: int) -> None:
+    datos = ReservaGrupoCreate(
+        vuelo_id=1, clase="economica",
+        pasajeros=[{"preferencia_asiento": "ventana", "total": 200.0} for _ in range(n)],
+    )
+    reserva_service.crear_reserva_grupo(db, datos, 1)
+
+
+def medir(engine, Sesion, forma, n: int, repeticiones: int) -> tuple[float, int]:
+    tiempos, sentencias = [], []
+    contar = lambda *a: sentencias.append(a[2])
+    with Sesion() as db:
+        for _ in range(repeticiones):
+            reiniciar(db)
+            sentencias.clear()
+            event.listen(engine, "before_cursor_execute", contar)
+            inicio = time.perf_counter()
+            forma(db, n)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            event.remove(engine, "before_cursor_execute", contar)
+    return statistics.median(tiempos), len(sentencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--bd", default="/tmp/flyblue_reserva_grupo.db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.bd):
+        os.remove(args.bd)
+    engine = create_engine(f"sqlite:///{args.bd}")
+    Base.metadata.create_all(engine)
+    Sesion = sessionmaker(bind=engine)
+    preparar(Sesion)
+
+    print(f"{'pasajeros':>9}  {'individual':>22}  {'grupo':>22}  {'mejora':>7}")
+    for n in TAMANOS:
+        t_ind, q_ind = medir(engine, Sesion, individual, n, args.repeticiones)
+        t_grp, q_grp = medir(engine, Sesion, grupo, n, args.repeticiones)
+        print(f"{n:>9}  {t_ind:8.2f} ms {q_ind:4d} sentencias  {t_grp:8.2f} ms {q_grp:4d} sentencias  x{t_ind / t_grp:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ PyTest las inyecta automáticamente en las funciones de test.
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 from app.db.database import Base, get_db
@@ -41,7 +42,9 @@ def db_engine():
     engine = create_engine(
         "sqlite:///:memory:",  # Base de datos en RAM (súper rápido)
         connect_args={"check_same_thread": False},
-        poolclass=None  # Desactivar pool de conexiones para tests
+        # Una sola conexión compartida: los endpoints síncronos corren en otro hilo
+        # y, con una conexión por hilo, verían otra BD en memoria (vacía)
+        poolclass=StaticPool
     )
     
     # Habilitar foreign keys en SQLite (importante para relaciones)
@@ -115,6 +118,24 @@ def client(db_session, db_engine):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def limpiar_estado_en_memoria():
+    """
+    Vacía las estructuras en memoria del proceso (cachés, índices) antes de cada test.
+
+    Cada test usa una BD nueva; sin esto, un vuelo cacheado en un test anterior
+    con el mismo id aparecería en el siguiente.
+    """
+    from app.services import vuelo_service, conexion_service, autocompletado_service, tablero_service, cotizacion_service
+
+    vuelo_service.limpiar_cache()
+    cotizacion_service.limpiar_cache()
+    conexion_service.indice.limpiar()
+    autocompletado_service.indice.limpiar()
+    tablero_service.tablero.limpiar()
+    yield
+
+
 # ========== DATOS DE PRUEBA ==========
 @pytest.fixture
 def usuario_cliente_data():
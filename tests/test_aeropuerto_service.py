@@ -0,0 +1,191 @@
+# tests/test_aeropuerto_service.py
+"""
+Pruebas unitarias para los aeropuertos normalizados (tabla aeropuertos).
+
+Valida:
+- Normalización del texto de origen/destino a una clave (código IATA o nombre)
+- Palabras de tres letras como código solo si ya existe en la tabla
+- Asignación automática de origen_id/destino_id al guardar vuelos
+- Búsquedas insensibles a mayúsculas y al formato del texto
+- Migración de una BD con el esquema anterior (solo texto)
+- Alta y actualización de aeropuertos por la API
+"""
+
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.aeropuertos import clave_aeropuerto, ciudad_aeropuerto, codigo_iata
+from app.db import migraciones
+from app.models.aeropuerto import Aeropuerto
+from app.models.vuelo import Vuelo
+from app.services import aeropuerto_service, vuelo_service
+from app.dto.aeropuerto_dto import AeropuertoCreate, AeropuertoUpdate
+from app.dto.vuelo_dto import VueloPatch
+
+
+def _datos_vuelo(id_, origen, destino, dia=5):
+    salida = datetime(2030, 3, dia, 8)
+    return {
+        "id": id_, "origen": origen, "destino": destino, "salida": salida,
+        "llegada": salida.replace(hour=10), "duracion": 2.0,
+        "precio_base": 100.0, "asientos_disponibles": 10,
+    }
+
+
+# ========== PRUEBAS DE NORMALIZACIÓN ==========
+
+def test_clave_aeropuerto():
+    """
+    Verifica que el código IATA prevalezca y que sin código se use el nombre sin tildes.
+    """
+    assert clave_aeropuerto("Bogotá (BOG)") == "BOG"
+    assert clave_aeropuerto("bog") == "BOG"
+    assert clave_aeropuerto(" Ibagué ( ibg ) ") == "IBG"
+    assert clave_aeropuerto("  medellín  centro ") == "MEDELLIN CENTRO"
+    assert ciudad_aeropuerto("Ibagué (IBG)") == "Ibagué"
+    assert ciudad_aeropuerto("Ica") == "Ica"
+    assert codigo_iata("Ica") is None
+
+
+# ========== PRUEBAS DE ASIGNACIÓN EN VUELOS ==========
+
+def test_vuelos_comparten_aeropuerto(db_session, create_vuelo):
+    """
+    Verifica que distintos textos del mismo aeropuerto apunten al mismo id.
+    """
+    v1 = create_vuelo(_datos_vuelo(1, "Bogotá (BOG)", "MDE"))
+    v2 = create_vuelo(_datos_vuelo(2, "bog", "Medellín (MDE)"))
+
+    assert v1.origen_id == v2.origen_id
+    assert v1.destino_id == v2.destino_id
+    assert db_session.query(Aeropuerto).count() == 2
+    assert db_session.get(Aeropuerto, v1.origen_id).ciudad == "Bogotá"
+
+
+def test_tres_letras_solo_es_codigo_si_existe(db_session, create_vuelo):
+    """
+    Verifica que "Ica" sin aeropuerto ICA se guarde como nombre y que "bog"
+    apunte al aeropuerto BOG ya registrado.
+    """
+    bog = aeropuerto_service.crear_aeropuerto(db_session, AeropuertoCreate(codigo="BOG", ciudad="Bogotá"))
+    vuelo = create_vuelo(_datos_vuelo(1, "Ica", "bog"))
+
+    ica = db_session.get(Aeropuerto, vuelo.origen_id)
+    assert (ica.codigo, ica.ciudad) == (None, "Ica")
+    assert vuelo.destino_id == bog.id
+    assert db_session.query(Aeropuerto).count() == 2
+
+
+def test_cambiar_origen_reasigna_aeropuerto(db_session, create_vuelo):
+    """
+    Verifica que al cambiar el texto de origen (ORM o PATCH) cambie el id.
+    """
+    vuelo = create_vuelo(_datos_vuelo(1, "BOG", "MDE"))
+
+    vuelo.origen = "Cali (CLO)"
+    db_session.commit()
+    clo = vuelo.origen_id
+    assert db_session.get(Aeropuerto, clo).codigo == "CLO"
+
+    fila = vuelo_service.parchear_vuelo(db_session, 1, VueloPatch(origen="ctg"))
+    assert fila.origen_id not in (clo, vuelo.destino_id)
+
+
+def test_buscar_vuelos_insensible_al_formato(db_session, create_vuelo):
+    """
+    Verifica que la búsqueda por ruta acepte el código en cualquier formato.
+    """
+    create_vuelo(_datos_vuelo(1, "Bogotá (BOG)", "MDE"))
+    create_vuelo(_datos_vuelo(2, "BOG", "CTG"))
+
+    assert [v.id for v in vuelo_service.buscar_vuelos(db_session, origen="bog", destino="medellín (mde)")] == [1]
+    assert [v.id for v in vuelo_service.buscar_vuelos(db_session, origen="BOG")] == [1, 2]
+    assert list(vuelo_service.buscar_vuelos(db_session, origen="XXX")) == []
+
+
+# ========== PRUEBAS DE MIGRACIÓN ==========
+
+def test_migracion_desde_esquema_de_texto(tmp_path):
+    """
+    Verifica que una BD con vuelos solo de texto reciba las columnas, los ids,
+    el índice sobre claves enteras y que repetir la migración no cambie nada.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'antigua.db'}")
+    with engine.begin() as conexion:
+        conexion.execute(text(
+            "CREATE TABLE vuelos (id INTEGER PRIMARY KEY, origen VARCHAR(100) NOT NULL, "
+            "destino VARCHAR(100) NOT NULL, salida DATETIME NOT NULL, llegada DATETIME NOT NULL, "
+            "duracion FLOAT NOT NULL, precio_base FLOAT NOT NULL, asientos_disponibles INTEGER NOT NULL)"
+        ))
+        conexion.execute(text("CREATE INDEX ix_vuelos_ruta_salida ON vuelos (origen, destino, salida)"))
+        conexion.execute(text(
+            "INSERT INTO vuelos VALUES "
+            "(1, 'Bogotá (BOG)', 'MDE', '2030-03-05 08:00:00', '2030-03-05 09:00:00', 1, 100, 10), "
+            "(2, 'bog', 'Cali', '2030-03-05 08:00:00', '2030-03-05 09:00:00', 1, 100, 10)"
+        ))
+        conexion.execute(text(
+            "CREATE TABLE tarifas_diarias (origen VARCHAR(100), destino VARCHAR(100), dia DATE, "
+            "precio_min FLOAT, asientos INTEGER, vuelos INTEGER, PRIMARY KEY (origen, destino, dia))"
+        ))
+        conexion.execute(text(
+            "CREATE TABLE reserva_servicio (id INTEGER PRIMARY KEY, reserva_id INTEGER NOT NULL, "
+            "servicio_id INTEGER NOT NULL, cantidad INTEGER, subtotal NUMERIC(10, 2))"
+        ))
+        conexion.execute(text(
+            "CREATE TABLE reservas (id INTEGER PRIMARY KEY, usuario_id INTEGER NOT NULL, vuelo_id INTEGER NOT NULL, "
+            "fecha_reserva DATETIME, estado VARCHAR(20), clase VARCHAR(20), asiento VARCHAR(10), total FLOAT NOT NULL)"
+        ))
+    Aeropuerto.__table__.create(engine)
+
+    migraciones.aplicar(engine)
+    migraciones.aplicar(engine)
+
+    with engine.connect() as conexion:
+        filas = conexion.execute(text("SELECT id, origen_id, destino_id FROM vuelos ORDER BY id")).all()
+        claves = dict(conexion.execute(text("SELECT id, clave FROM aeropuertos")).all())
+    assert filas[0].origen_id == filas[1].origen_id
+    assert {claves[f.destino_id] for f in filas} == {"MDE", "CALI"}
+    assert len(claves) == 3
+
+    inspector = inspect(engine)
+    indices = {i["name"]: i["column_names"] for i in inspector.get_indexes("vuelos")}
+    assert indices["ix_vuelos_ruta_salida"] == ["origen_id", "destino_id", "salida"]
+    assert indices["uq_vuelos_programacion_salida"] == ["programacion_id", "salida"]
+    assert "origen_id" in {c["name"] for c in inspector.get_columns("tarifas_diarias")}
+    assert "ix_reserva_servicio_reserva_id" in {i["name"] for i in inspector.get_indexes("reserva_servicio")}
+    assert "version" in {c["name"] for c in inspector.get_columns("vuelos")}
+    indices_reservas = {i["name"]: i["column_names"] for i in inspector.get_indexes("reservas")}
+    assert indices_reservas["ix_reservas_estado_fecha_reserva"] == ["estado", "fecha_reserva"]
+    assert {"ix_reservas_vuelo_id", "ix_reservas_usuario_id"} <= indices_reservas.keys()
+    engine.dispose()
+
+
+# ========== PRUEBAS DE ADMINISTRACIÓN ==========
+
+def test_crear_y_actualizar_aeropuerto(db_session):
+    """
+    Verifica el alta por código IATA, el rechazo de duplicados y la actualización.
+    """
+    aeropuerto = aeropuerto_service.crear_aeropuerto(db_session, AeropuertoCreate(codigo="mad", ciudad="Madrid"))
+    assert (aeropuerto.clave, aeropuerto.codigo) == ("MAD", "MAD")
+
+    with pytest.raises(HTTPException) as exc_info:
+        aeropuerto_service.crear_aeropuerto(db_session, AeropuertoCreate(codigo="MAD", ciudad="Madrid"))
+    assert exc_info.value.status_code == 400
+
+    actualizado = aeropuerto_service.actualizar_aeropuerto(db_session, aeropuerto.id, AeropuertoUpdate(pais="España"))
+    assert actualizado.pais == "España"
+
+
+def test_endpoint_listar_aeropuertos(client, create_vuelo):
+    """
+    Verifica que GET /aeropuertos/ devuelva los aeropuertos creados desde los vuelos.
+    """
+    create_vuelo(_datos_vuelo(1, "Ibagué (IBG)", "BOG"))
+
+    response = client.get("/aeropuertos/")
+
+    assert response.status_code == 200
+    assert {a["clave"] for a in response.json()["items"]} == {"IBG", "BOG"}
@@ -0,0 +1,202 @@
+# tests/test_archivo_service.py
+"""
+Pruebas unitarias para el archivado de vuelos salidos (services/archivo_service.py).
+
+Valida:
+- Traslado de vuelos salidos y sus reservas (con servicios y pago) a las tablas de archivo
+- Limpieza de las filas dependientes en las tablas activas y del calendario de tarifas
+- Procesamiento por lotes e idempotencia de pasadas repetidas
+- Consultas históricas por ruta, por id y de reservas por usuario
+- Exclusión de vuelos ya salidos del listado de disponibles
+- Rechazo de ids archivados al crear, importar o cambiar el id de un vuelo
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.models.vuelo import Vuelo
+from app.models.reserva import Reserva
+from app.models.reserva_servicio import ReservaServicio
+from app.models.servicio import Servicio
+from app.models.pago import Pago
+from app.models.tarifa_clase import TarifaClase
+from app.models.tarifa_diaria import TarifaDiaria
+from app.models.archivo import VueloArchivo, ReservaArchivo
+from app.services import archivo_service, vuelo_service
+from app.services.importacion_service import ImportadorVuelos
+from app.dto.vuelo_dto import VueloCreate, VueloUpdate
+
+AHORA = datetime(2030, 6, 1, 12)
+
+
+def _vuelo(id_, dias, origen="BOG", destino="MDE"):
+    salida = AHORA + timedelta(days=dias)
+    return {
+        "id": id_, "origen": origen, "destino": destino, "salida": salida,
+        "llegada": salida + timedelta(hours=1), "duracion": 1.0,
+        "precio_base": 100.0, "asientos_disponibles": 10,
+    }
+
+
+@pytest.fixture
+def reserva_completa(db_session, create_usuario, usuario_cliente_data):
+    """Reserva de un vuelo salido hace 3 días con un servicio, un pago y tarifas de clase."""
+    usuario = create_usuario(usuario_cliente_data)
+    db_session.add(Vuelo(**_vuelo(1, -3)))
+    db_session.add(TarifaClase(vuelo_id=1, clase="economica", capacidad=10, disponibles=9))
+    servicio = Servicio(nombre="Maleta", precio=30)
+    db_session.add(servicio)
+    db_session.flush()
+    reserva = Reserva(usuario_id=usuario.id, vuelo_id=1, estado="confirmada", clase="economica", asiento="1A", total=130.0)
+    reserva.servicios_reserva.append(ReservaServicio(servicio_id=servicio.id, cantidad=1, subtotal=30))
+    db_session.add(reserva)
+    db_session.flush()
+    db_session.add(Pago(reserva_id=reserva.id, metodo="tarjeta", monto=130, estado="completado"))
+    db_session.commit()
+    return reserva.id
+
+
+# ========== PRUEBAS DE ARCHIVADO ==========
+
+def test_archivar_mueve_vuelo_y_reservas(db_session, create_vuelo, reserva_completa):
+    """
+    Verifica que el vuelo salido y su reserva pasen al archivo con servicios y pago,
+    y que los vuelos futuros o recientes sigan en las tablas activas.
+    """
+    create_vuelo(_vuelo(2, 3))
+    create_vuelo(_vuelo(3, -0.5))  # dentro de la retención
+
+    resultado = archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+
+    assert (resultado["vuelos"], resultado["reservas"]) == (1, 1)
+    assert [v.id for v in db_session.query(Vuelo).order_by(Vuelo.id)] == [2, 3]
+    assert db_session.query(Reserva).count() == 0
+    assert db_session.query(Pago).count() == 0
+    assert db_session.query(ReservaServicio).count() == 0
+    assert db_session.query(TarifaClase).count() == 0
+
+    archivada = db_session.get(ReservaArchivo, reserva_completa)
+    assert archivada.vuelo_id == 1 and archivada.total == 130.0
+    assert archivada.detalle["servicios"] == [{"servicio_id": 1, "cantidad": 1, "subtotal": 30.0}]
+    assert archivada.detalle["pago"]["monto"] == 130.0
+    assert db_session.get(VueloArchivo, 1).origen_id == db_session.get(Vuelo, 2).origen_id
+
+
+def test_archivar_por_lotes_e_idempotente(db_session, create_vuelo):
+    """
+    Verifica que varios lotes archiven todo y que una segunda pasada no haga nada.
+    """
+    for i in range(1, 6):
+        create_vuelo(_vuelo(i, -2 - i))
+
+    assert archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA, lote=2)["vuelos"] == 5
+    assert archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA, lote=2)["vuelos"] == 0
+    assert db_session.query(VueloArchivo).count() == 5
+    assert db_session.query(Vuelo).count() == 0
+
+
+def test_archivar_recalcula_el_calendario(db_session):
+    """
+    Verifica que el calendario deje de mostrar los vuelos archivados: el día sin
+    vuelos activos desaparece y el que conserva alguno se recalcula.
+    """
+    for id_, dias, precio in ((1, -3, 100.0), (2, -1.2, 50.0), (3, -0.8, 200.0)):
+        vuelo_service.crear_vuelo(db_session, VueloCreate(**_vuelo(id_, dias) | {"precio_base": precio}))
+
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+
+    db_session.expire_all()
+    resumen = [(f.dia.isoformat(), f.precio_min, f.vuelos) for f in db_session.query(TarifaDiaria)]
+    assert resumen == [("2030-05-31", 200.0, 1)]
+
+
+def test_ids_archivados_no_se_reutilizan(db_session, create_vuelo):
+    """
+    Verifica que crear, importar o renombrar un vuelo con un id archivado se
+    rechace, y que el archivado siga funcionando después.
+    """
+    create_vuelo(_vuelo(1, -3))
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+    create_vuelo(_vuelo(2, -2))
+
+    for intento in (
+        lambda: vuelo_service.crear_vuelo(db_session, VueloCreate(**_vuelo(1, -1))),
+        lambda: vuelo_service.actualizar_vuelo(db_session, 2, VueloUpdate(**_vuelo(1, -2))),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            intento()
+        assert exc_info.value.status_code == 400
+
+    importador = ImportadorVuelos(db_session)
+    importador.agregar([(2, _vuelo(1, -2)), (3, _vuelo(3, -2))])
+    resultado = importador.terminar()
+    assert resultado["importados"] == 1
+    assert resultado["errores"] == [{"linea": 2, "error": "Ya existe un vuelo con este código."}]
+
+    assert archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)["vuelos"] == 2
+    assert sorted(v.id for v in db_session.query(VueloArchivo)) == [1, 2, 3]
+
+
+def test_vuelo_archivado_sale_de_la_cache(db_session, create_vuelo):
+    """
+    Verifica que un vuelo cacheado deje de servirse tras archivarlo.
+    """
+    create_vuelo(_vuelo(1, -3))
+    assert vuelo_service.obtener_vuelo(db_session, 1).id == 1
+
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.obtener_vuelo(db_session, 1)
+    assert exc_info.value.status_code == 404
+
+
+def test_disponibles_excluye_vuelos_salidos(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que los vuelos ya salidos, aunque no archivados, no se ofrezcan como disponibles.
+    """
+    create_vuelo(vuelo_data)
+    create_vuelo(_vuelo(1, -3) | {"salida": datetime.utcnow() - timedelta(hours=2)})
+
+    assert [v.id for v in vuelo_service.vuelos_disponibles(db_session)] == [vuelo_data["id"]]
+
+
+# ========== PRUEBAS DE LECTURA HISTÓRICA ==========
+
+def test_consultas_historicas(db_session, create_vuelo, reserva_completa, usuario_cliente_data):
+    """
+    Verifica la búsqueda de vuelos archivados por ruta, por id y las reservas por usuario.
+    """
+    create_vuelo(_vuelo(2, -4, "CLO", "CTG"))
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+
+    assert [v.id for v in archivo_service.listar_vuelos_historicos(db_session)] == [2, 1]
+    assert [v.id for v in archivo_service.listar_vuelos_historicos(db_session, origen="bog")] == [1]
+    assert list(archivo_service.listar_vuelos_historicos(db_session, origen="XXX")) == []
+    assert archivo_service.obtener_vuelo_historico(db_session, 2).destino == "CTG"
+    with pytest.raises(HTTPException) as exc_info:
+        archivo_service.obtener_vuelo_historico(db_session, 99)
+    assert exc_info.value.status_code == 404
+
+    reservas = archivo_service.listar_reservas_historicas(db_session, usuario_cliente_data["id"])
+    assert [r.id for r in reservas] == [reserva_completa]
+    assert list(archivo_service.listar_reservas_historicas(db_session, 1)) == []
+
+
+def test_endpoint_historico(client, db_session, create_vuelo, get_auth_headers):
+    """
+    Verifica GET /vuelos/historico y GET /reservas/historico.
+    """
+    headers = get_auth_headers()
+    create_vuelo(_vuelo(1, -3))
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=AHORA)
+    assert db_session.query(VueloArchivo).count() == 1
+
+    response = client.get("/vuelos/historico", params={"origen": "BOG"})
+    assert response.status_code == 200
+    assert [v["id"] for v in response.json()["items"]] == [1]
+
+    response = client.get("/reservas/historico", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
@@ -0,0 +1,91 @@
+# tests/test_autocompletado_service.py
+"""
+Pruebas unitarias para el autocompletado de aeropuertos (services/autocompletado_service.py).
+
+Valida:
+- Coincidencia por prefijo del código, de la ciudad y de cada palabra
+- Insensibilidad a tildes y mayúsculas
+- Respuestas sin consultas a la BD una vez cargado el índice
+- Recarga cuando aparece un aeropuerto nuevo
+"""
+
+from datetime import datetime
+from sqlalchemy import event
+
+from app.services import autocompletado_service, vuelo_service
+from app.dto.vuelo_dto import VueloCreate
+
+
+def _vuelo(id_, origen, destino):
+    salida = datetime(2030, 3, 5, 8)
+    return VueloCreate(
+        id=id_, origen=origen, destino=destino, salida=salida, llegada=salida.replace(hour=10),
+        duracion=2.0, precio_base=100.0, asientos_disponibles=10,
+    )
+
+
+def _codigos(db_session, q, limit=10):
+    return [a["clave"] for a in autocompletado_service.autocompletar(db_session, q, limit)]
+
+
+# ========== PRUEBAS DE BÚSQUEDA ==========
+
+def test_autocompletar_por_prefijo_sin_tildes(db_session):
+    """
+    Verifica coincidencias por código, ciudad y palabra, sin importar tildes ni mayúsculas.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "Bogotá (BOG)", "Medellín (MDE)"))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, "San Andrés (ADZ)", "Montería (MTR)"))
+
+    assert _codigos(db_session, "bo") == ["BOG"]
+    assert _codigos(db_session, "MEDELLIN") == ["MDE"]
+    assert _codigos(db_session, "andre") == ["ADZ"]
+    assert sorted(_codigos(db_session, "m")) == ["MDE", "MTR"]
+    assert _codigos(db_session, "m", limit=1) in (["MDE"], ["MTR"])
+    assert _codigos(db_session, "xyz") == []
+    assert _codigos(db_session, "   ") == []
+
+
+def test_autocompletar_no_consulta_la_bd_por_pulsacion(db_session, db_engine):
+    """
+    Verifica que, cargado el índice, las pulsaciones siguientes no ejecuten SQL.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "Cali (CLO)", "Cartagena (CTG)"))
+    autocompletado_service.autocompletar(db_session, "c")
+
+    sentencias = []
+    event.listen(db_engine, "before_cursor_execute", lambda *a: sentencias.append(a[2]))
+    for q in ("c", "ca", "car", "cart"):
+        autocompletado_service.autocompletar(db_session, q)
+
+    assert sentencias == []
+    assert _codigos(db_session, "cart") == ["CTG"]
+
+
+# ========== PRUEBAS DE RECARGA ==========
+
+def test_aeropuerto_nuevo_recarga_indice(db_session):
+    """
+    Verifica que un vuelo con un aeropuerto desconocido haga visible el nuevo término,
+    y que uno con aeropuertos ya conocidos no invalide el índice.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "BOG", "MDE"))
+    assert _codigos(db_session, "p") == []
+
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, "MDE", "BOG"))
+    assert autocompletado_service.indice.vigente
+
+    vuelo_service.crear_vuelo(db_session, _vuelo(3, "Pereira (PEI)", "BOG"))
+    assert _codigos(db_session, "p") == ["PEI"]
+
+
+def test_endpoint_autocompletar(client, db_session):
+    """
+    Verifica la respuesta de GET /aeropuertos/autocompletar.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "Ibagué (IBG)", "BOG"))
+
+    response = client.get("/aeropuertos/autocompletar", params={"q": "ibague"})
+
+    assert response.status_code == 200
+    assert [(a["codigo"], a["ciudad"]) for a in response.json()] == [("IBG", "Ibagué")]
@@ -0,0 +1,88 @@
+# tests/test_cache.py
+"""
+Pruebas unitarias para la caché en memoria (core/cache.py).
+
+Valida:
+- Aciertos y fallos
+- Expiración por TTL
+- Desalojo LRU al superar la capacidad
+- Descarte de valores leídos antes de una invalidación
+"""
+
+from app.core.cache import CacheTTL
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_obtener_y_guardar():
+    """
+    Verifica que un valor guardado se recupere y que una clave ausente devuelva el defecto.
+    """
+    cache = CacheTTL("prueba", maxsize=10, ttl=60)
+    cache.guardar("a", 1)
+
+    assert cache.obtener("a") == 1
+    assert cache.obtener("b") is None
+    assert cache.obtener("b", "defecto") == "defecto"
+
+
+def test_expiracion_por_ttl():
+    """
+    Verifica que una entrada deje de devolverse al cumplirse su TTL.
+    """
+    reloj = RelojFalso()
+    cache = CacheTTL("prueba", maxsize=10, ttl=5, reloj=reloj)
+    cache.guardar("a", 1)
+
+    reloj.ahora = 4.9
+    assert cache.obtener("a") == 1
+
+    reloj.ahora = 5.0
+    assert cache.obtener("a") is None
+    assert len(cache) == 0
+
+
+def test_desalojo_lru():
+    """
+    Verifica que al superar maxsize se desaloje la entrada usada hace más tiempo.
+    """
+    cache = CacheTTL("prueba", maxsize=2, ttl=60)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obtener("a")  # "a" pasa a ser la más reciente
+    cache.guardar("c", 3)
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == 1
+    assert cache.obtener("c") == 3
+
+
+def test_guardar_descarta_valor_obsoleto():
+    """
+    Verifica que un valor leído antes de una invalidación no se guarde después.
+    """
+    cache = CacheTTL("prueba", maxsize=10, ttl=60)
+    version = cache.version
+    cache.invalidar("a")  # escritura concurrente mientras se leía la BD
+    cache.guardar("a", "viejo", version=version)
+
+    assert cache.obtener("a") is None
+
+
+def test_invalidar_donde():
+    """
+    Verifica que invalidar_donde() elimine solo las entradas que cumplen el predicado.
+    """
+    cache = CacheTTL("prueba", maxsize=10, ttl=60)
+    for i in range(5):
+        cache.guardar(i, i * 10)
+
+    cache.invalidar_donde(lambda clave, valor: valor >= 30)
+
+    assert [cache.obtener(i) for i in range(5)] == [0, 10, 20, None, None]
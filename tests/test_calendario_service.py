@@ -0,0 +1,190 @@
+# tests/test_calendario_service.py
+"""
+Pruebas unitarias para el calendario de tarifas (tabla tarifas_diarias).
+
+Valida:
+- Resumen por ruta y día al crear vuelos (precio mínimo, asientos, vuelos)
+- Recalculo del día anterior y del nuevo al mover un vuelo
+- Eliminación del día cuando se borra su último vuelo
+- Reservas que no escriben el resumen y pasada periódica de asientos
+- Recalculo del día cuando un vuelo se agota o vuelve a la venta
+- Lectura de un mes completo por la ruta HTTP
+"""
+
+import pytest
+from contextlib import nullcontext
+from datetime import date, datetime
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.repositories import tarifa_diaria_repo
+from app.services import vuelo_service, reserva_service
+from app.dto.vuelo_dto import VueloCreate, VueloUpdate
+from app.dto.reserva_dto import ReservaCreate
+
+
+def _vuelo(id, dia, precio, asientos=10, origen="BOG", destino="MDE", hora=8):
+    salida = datetime(2030, 3, dia, hora)
+    return VueloCreate(
+        id=id, origen=origen, destino=destino, salida=salida,
+        llegada=salida.replace(hour=hora + 1), duracion=1.0,
+        precio_base=precio, asientos_disponibles=asientos,
+    )
+
+
+def _dias(db_session, mes=3):
+    return {
+        t.dia: (t.precio_min, t.asientos, t.vuelos)
+        for t in vuelo_service.calendario_tarifas(db_session, "BOG", "MDE", 2030, mes)
+    }
+
+
+# ========== PRUEBAS DE MANTENIMIENTO DEL RESUMEN ==========
+
+def test_crear_vuelos_actualiza_calendario(db_session):
+    """
+    Verifica que cada día agrupe sus vuelos con el precio mínimo y la suma de asientos,
+    sin mezclar otras rutas.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 300.0, asientos=10))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, 5, 200.0, asientos=20, hora=15))
+    vuelo_service.crear_vuelo(db_session, _vuelo(3, 6, 250.0))
+    vuelo_service.crear_vuelo(db_session, _vuelo(4, 5, 50.0, destino="CTG"))
+
+    assert _dias(db_session) == {
+        date(2030, 3, 5): (200.0, 30, 2),
+        date(2030, 3, 6): (250.0, 10, 1),
+    }
+
+
+def test_actualizar_vuelo_recalcula_dia_anterior_y_nuevo(db_session):
+    """
+    Verifica que mover un vuelo de día recalcule ambos grupos y que el día
+    que queda sin vuelos desaparezca del calendario.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 300.0))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, 6, 250.0))
+
+    vuelo_service.actualizar_vuelo(db_session, 1, VueloUpdate(**_vuelo(1, 6, 180.0).dict()))
+
+    assert _dias(db_session) == {date(2030, 3, 6): (180.0, 20, 2)}
+
+
+def test_eliminar_vuelo_actualiza_calendario(db_session):
+    """
+    Verifica que al eliminar el vuelo más barato el mínimo pase al siguiente.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 100.0))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, 5, 400.0, hora=18))
+
+    vuelo_service.eliminar_vuelo(db_session, 1)
+
+    assert _dias(db_session) == {date(2030, 3, 5): (400.0, 10, 1)}
+
+
+def test_reservar_no_escribe_el_calendario(db_session, db_engine, create_usuario, usuario_cliente_data):
+    """
+    Verifica que una reserva que no agota el vuelo no toque tarifas_diarias
+    y que la pasada periódica ponga al día los asientos.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 100.0, asientos=3))
+    usuario = create_usuario(usuario_cliente_data)
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    reserva = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=1, clase="economica", asiento=None, total=100.0), usuario.id
+    )
+    event.remove(db_engine, "before_cursor_execute", registrar)
+    assert not [s for s in sentencias if "tarifas_diarias" in s]
+    assert _dias(db_session)[date(2030, 3, 5)][1] == 3
+
+    assert tarifa_diaria_repo.refrescar_asientos(db_session, date(2030, 3, 1)) == 1
+    assert _dias(db_session)[date(2030, 3, 5)][1] == 2
+    assert tarifa_diaria_repo.refrescar_asientos(db_session, date(2030, 3, 1)) == 0
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, usuario)
+    vuelo_service.pasada_calendario(lambda: nullcontext(db_session))
+    assert _dias(db_session)[date(2030, 3, 5)][1] == 3
+
+
+def test_agotar_y_reabrir_vuelo_recalcula_el_dia(db_session, create_usuario, usuario_cliente_data):
+    """
+    Verifica que al agotarse el vuelo más barato el precio mínimo pase al
+    siguiente con asientos, y que vuelva al cancelar.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 100.0, asientos=1))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, 5, 150.0, asientos=4, hora=12))
+    usuario = create_usuario(usuario_cliente_data)
+
+    reserva = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=1, clase="economica", asiento=None, total=100.0), usuario.id
+    )
+    assert _dias(db_session)[date(2030, 3, 5)] == (150.0, 4, 2)
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, usuario)
+    assert _dias(db_session)[date(2030, 3, 5)] == (100.0, 5, 2)
+
+
+def test_dia_agotado_conserva_el_precio_minimo(db_session, create_usuario, usuario_cliente_data):
+    """
+    Verifica que un día sin asientos siga en el calendario con el menor precio
+    de sus vuelos y 0 asientos.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 100.0, asientos=1))
+    usuario = create_usuario(usuario_cliente_data)
+
+    reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=1, clase="economica", asiento=None, total=100.0), usuario.id
+    )
+    assert _dias(db_session)[date(2030, 3, 5)] == (100.0, 0, 1)
+
+
+# ========== PRUEBAS DE CONSULTA ==========
+
+def test_calendario_limita_al_mes(db_session):
+    """
+    Verifica que solo se devuelvan los días del mes pedido, incluido el cambio de año.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 31, 100.0))
+    vuelo_service.crear_vuelo(db_session, VueloCreate(
+        id=2, origen="BOG", destino="MDE", salida=datetime(2030, 12, 31, 8),
+        llegada=datetime(2030, 12, 31, 9), duracion=1.0, precio_base=90.0, asientos_disponibles=5,
+    ))
+
+    assert list(_dias(db_session, mes=3)) == [date(2030, 3, 31)]
+    assert list(_dias(db_session, mes=4)) == []
+    assert [t.dia for t in vuelo_service.calendario_tarifas(db_session, "BOG", "MDE", 2030, 12)] == [date(2030, 12, 31)]
+
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.calendario_tarifas(db_session, "BOG", "MDE", 2030, 13)
+    assert exc_info.value.status_code == 400
+
+
+def test_ruta_calendario(client, db_session):
+    """
+    Verifica la respuesta de GET /vuelos/calendario.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, 5, 300.0))
+
+    response = client.get("/vuelos/calendario", params={"origen": "BOG", "destino": "MDE", "anio": 2030, "mes": 3})
+
+    assert response.status_code == 200
+    assert response.json() == [{"dia": "2030-03-05", "precio_min": 300.0, "asientos": 10, "vuelos": 1}]
+
+
+def test_reconstruir_desde_vuelos_existentes(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica la carga inicial del resumen para vuelos creados sin pasar por vuelo_repo.
+    """
+
+    create_vuelo(vuelo_data)
+    create_vuelo({**vuelo_data, "id": 101, "precio_base": 90000.0})
+    assert tarifa_diaria_repo.esta_vacio(db_session)
+
+    assert tarifa_diaria_repo.reconstruir(db_session) == 1
+
+    dia = vuelo_data["salida"]
+    [fila] = vuelo_service.calendario_tarifas(db_session, vuelo_data["origen"], vuelo_data["destino"], dia.year, dia.month)
+    assert (fila.dia, fila.precio_min, fila.asientos, fila.vuelos) == (dia.date(), 90000.0, 100, 2)
@@ -0,0 +1,201 @@
+# tests/test_concurrencia.py
+"""
+Pruebas del control de concurrencia optimista (core/concurrencia.py).
+
+Valida:
+- ETag en GET/PUT de vuelos, reservas y servicios
+- ETag del GET de vuelos vigente aunque el vuelo esté en la caché
+- PUT con If-Match vigente aplicado; con If-Match obsoleto, 412 sin cambios
+- Reservas y cancelaciones cambian la versión del vuelo (el contador de asientos no se pisa)
+- Cambio concurrente entre la lectura y la escritura detectado en el UPDATE
+- Formato de If-Match
+"""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.db.database import Base
+from app.core.concurrencia import version_esperada
+from app.models.vuelo import Vuelo
+from app.models.tarifa_clase import TarifaClase
+from app.services import vuelo_service
+from app.dto.vuelo_dto import VueloUpdate, VueloPatch
+
+
+def _json_vuelo(vuelo_data, **cambios):
+    datos = {k: (v.isoformat() if hasattr(v, "isoformat") else v) for k, v in vuelo_data.items()}
+    datos.update(cambios)
+    return datos
+
+
+# ========== PRUEBAS DE VUELOS ==========
+
+def test_put_vuelo_con_if_match(client, create_vuelo, vuelo_data, get_auth_headers, usuario_admin_data):
+    """
+    Verifica que el PUT con el ETag vigente se aplique y devuelva el nuevo,
+    y que repetirlo con el ETag viejo responda 412 sin pisar el cambio.
+    """
+    create_vuelo(vuelo_data)
+    headers = get_auth_headers(usuario_admin_data)
+
+    response = client.get(f"/vuelos/{vuelo_data['id']}")
+    assert response.headers["ETag"] == '"1"'
+
+    primera = client.put(f"/vuelos/{vuelo_data['id']}", json=_json_vuelo(vuelo_data, precio_base=200000.0),
+                         headers={**headers, "If-Match": '"1"'})
+    assert primera.status_code == 200
+    assert primera.headers["ETag"] == '"2"'
+    assert primera.json()["version"] == 2
+
+    segunda = client.put(f"/vuelos/{vuelo_data['id']}", json=_json_vuelo(vuelo_data, precio_base=1.0),
+                         headers={**headers, "If-Match": '"1"'})
+    assert segunda.status_code == 412
+    assert client.get(f"/vuelos/{vuelo_data['id']}").json()["precio_base"] == 200000.0
+
+
+def test_get_vuelo_cacheado_con_etag_vigente(client, db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que un cambio hecho por otro worker (sin invalidar esta caché)
+    se refleje de inmediato en el ETag y en el cuerpo del GET.
+    """
+    create_vuelo(vuelo_data)
+    url = f"/vuelos/{vuelo_data['id']}"
+    assert client.get(url).headers["ETag"] == '"1"'
+
+    db_session.execute(
+        update(Vuelo).where(Vuelo.id == vuelo_data["id"]).values(precio_base=1.0, version=Vuelo.version + 1)
+    )
+    db_session.commit()
+
+    response = client.get(url)
+    assert response.headers["ETag"] == '"2"'
+    assert response.json()["precio_base"] == 1.0
+
+
+def test_reserva_cambia_version_del_vuelo(client, db_session, create_vuelo, vuelo_data, reserva_data,
+                                          get_auth_headers, usuario_admin_data):
+    """
+    Verifica que un PUT preparado antes de una reserva no sobrescriba el contador de asientos.
+    """
+    create_vuelo(vuelo_data)
+    etag = client.get(f"/vuelos/{vuelo_data['id']}").headers["ETag"]
+
+    assert client.post("/reservas/", json=reserva_data, headers=get_auth_headers()).status_code == 201
+
+    response = client.put(f"/vuelos/{vuelo_data['id']}", json=_json_vuelo(vuelo_data),
+                          headers={**get_auth_headers(usuario_admin_data), "If-Match": etag})
+    assert response.status_code == 412
+    db_session.expire_all()
+    assert db_session.get(Vuelo, vuelo_data["id"]).asientos_disponibles == vuelo_data["asientos_disponibles"] - 1
+
+
+def test_patch_vuelo_con_if_match(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que el PATCH incremente la versión y rechace una versión obsoleta.
+    """
+    create_vuelo(vuelo_data)
+
+    fila = vuelo_service.parchear_vuelo(db_session, vuelo_data["id"], VueloPatch(precio_base=10.0), version=1)
+    assert fila.version == 2
+
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.parchear_vuelo(db_session, vuelo_data["id"], VueloPatch(precio_base=20.0), version=1)
+    assert exc_info.value.status_code == 412
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.parchear_vuelo(db_session, 999, VueloPatch(precio_base=20.0), version=1)
+    assert exc_info.value.status_code == 404
+
+
+def test_cambio_entre_lectura_y_escritura(tmp_path, vuelo_data):
+    """
+    Verifica que si otra sesión modifica el vuelo después de leerlo, el UPDATE
+    (WHERE version = leída) no se aplique: 412 con If-Match, StaleDataError (409) sin él.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'versiones.db'}")
+    Base.metadata.create_all(engine)
+    Sesion = sessionmaker(bind=engine)
+    with Sesion() as db:
+        db.add(Vuelo(**vuelo_data))
+        db.commit()
+
+    datos = VueloUpdate(**{**vuelo_data, "precio_base": 1.0})
+    with Sesion() as lectora, Sesion() as otra:
+        for con_if_match, esperado in ((True, HTTPException), (False, StaleDataError)):
+            # Lectura: el vuelo queda en el mapa de identidad con la versión leída
+            leido = lectora.get(Vuelo, vuelo_data["id"])
+            version = leido.version if con_if_match else None
+            vuelo_service.parchear_vuelo(otra, vuelo_data["id"], VueloPatch(precio_base=5.0))
+
+            with pytest.raises(esperado) as exc_info:
+                vuelo_service.actualizar_vuelo(lectora, vuelo_data["id"], datos, version)
+            if esperado is HTTPException:
+                assert exc_info.value.status_code == 412
+            else:
+                lectora.rollback()
+
+    with Sesion() as db:
+        vuelo = db.get(Vuelo, vuelo_data["id"])
+        assert (vuelo.precio_base, vuelo.version) == (5.0, 3)
+    engine.dispose()
+
+
+# ========== PRUEBAS DE RESERVAS Y SERVICIOS ==========
+
+def test_put_reserva_obsoleta_no_toca_cupos(client, db_session, create_vuelo, vuelo_data, reserva_data,
+                                           get_auth_headers):
+    """
+    Verifica que un PUT de reserva con If-Match obsoleto responda 412 antes de mover cupos.
+    """
+    create_vuelo(vuelo_data)
+    db_session.add_all([
+        TarifaClase(vuelo_id=vuelo_data["id"], clase="economica", capacidad=10, disponibles=10),
+        TarifaClase(vuelo_id=vuelo_data["id"], clase="ejecutiva", capacidad=5, disponibles=5),
+    ])
+    db_session.commit()
+    headers = get_auth_headers()
+    reserva_id = client.post("/reservas/", json=reserva_data, headers=headers).json()["id"]
+    etag = client.get(f"/reservas/{reserva_id}", headers=headers).headers["ETag"]
+
+    response = client.put(f"/reservas/{reserva_id}", json={"estado": "confirmada"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+    response = client.put(f"/reservas/{reserva_id}", json={"clase": "ejecutiva"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    db_session.expire_all()
+    cupos = {t.clase: t.disponibles for t in db_session.query(TarifaClase)}
+    assert cupos == {"economica": 9, "ejecutiva": 5}
+
+
+def test_put_servicio_con_if_match(client, create_servicio, get_auth_headers, usuario_admin_data):
+    """
+    Verifica el ETag del servicio y el 412 con una versión obsoleta.
+    """
+    servicio = create_servicio({"nombre": "Wifi", "precio": 20.0})
+    headers = get_auth_headers(usuario_admin_data)
+    assert client.get(f"/servicios/{servicio.id}").headers["ETag"] == '"1"'
+
+    response = client.put(f"/servicios/{servicio.id}", json={"precio": 25.0}, headers={**headers, "If-Match": '"1"'})
+    assert (response.status_code, response.headers["ETag"]) == (200, '"2"')
+
+    response = client.put(f"/servicios/{servicio.id}", json={"precio": 30.0}, headers={**headers, "If-Match": '"1"'})
+    assert response.status_code == 412
+    assert client.get(f"/servicios/{servicio.id}").json()["precio"] == 25.0
+
+
+# ========== PRUEBAS DE FORMATO ==========
+
+def test_formato_if_match():
+    """
+    Verifica la lectura de If-Match: ausente o `*` no condicionan; un valor ajeno es 412.
+    """
+    assert version_esperada(None) is None
+    assert version_esperada("*") is None
+    assert version_esperada(' "7" ') == 7
+    for valor in ('W/"7"', "7", '"abc"'):
+        with pytest.raises(HTTPException) as exc_info:
+            version_esperada(valor)
+        assert exc_info.value.status_code == 412
@@ -0,0 +1,115 @@
+# tests/test_conexion_service.py
+"""
+Pruebas unitarias para la búsqueda de conexiones (services/conexion_service.py).
+
+Valida:
+- Itinerarios directos y con escalas ordenados por hora de llegada
+- Ventanas de escala mínima y máxima
+- Exclusión de tramos sin asientos
+- Actualización incremental del índice al crear y eliminar vuelos
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.services import conexion_service, vuelo_service
+from app.dto.vuelo_dto import VueloCreate
+
+DIA = (datetime.utcnow() + timedelta(days=20)).date()
+
+
+def _hora(h, m=0, dias=0):
+    return datetime.combine(DIA, datetime.min.time()) + timedelta(days=dias, hours=h, minutes=m)
+
+
+def _vuelo(id_, origen, destino, salida, llegada, precio=100.0, asientos=10):
+    return {
+        "id": id_, "origen": origen, "destino": destino,
+        "salida": salida, "llegada": llegada,
+        "duracion": (llegada - salida).total_seconds() / 3600,
+        "precio_base": precio, "asientos_disponibles": asientos
+    }
+
+
+@pytest.fixture
+def red_de_vuelos(create_vuelo):
+    for datos in (
+        _vuelo(1, "BOG", "MIA", _hora(8), _hora(12)),
+        _vuelo(2, "MIA", "MAD", _hora(12, 30), _hora(22)),        # escala de 30 min: muy corta
+        _vuelo(3, "MIA", "MAD", _hora(14), _hora(23, 30)),        # escala de 2 h
+        _vuelo(4, "BOG", "MAD", _hora(9), _hora(20), precio=900.0),
+        _vuelo(5, "BOG", "PTY", _hora(6), _hora(7, 30)),
+        _vuelo(6, "PTY", "MAD", _hora(10), _hora(21)),
+        _vuelo(7, "MIA", "MAD", _hora(12, dias=1), _hora(23, dias=1)),  # escala de 24 h: muy larga
+    ):
+        create_vuelo(datos)
+
+
+# ========== PRUEBAS DE BÚSQUEDA ==========
+
+def test_conexiones_ordenadas_por_llegada(db_session, red_de_vuelos):
+    """
+    Verifica que se devuelvan directo y escalas, del que llega antes al que llega después,
+    respetando las ventanas de escala.
+    """
+    itinerarios = conexion_service.buscar_conexiones(db_session, "BOG", "MAD", DIA)
+
+    assert [[t["id"] for t in it["tramos"]] for it in itinerarios] == [[4], [5, 6], [1, 3]]
+    assert [it["escalas"] for it in itinerarios] == [0, 1, 1]
+    assert itinerarios[2]["precio_total"] == 200.0
+
+
+def test_conexiones_escala_minima_configurable(db_session, red_de_vuelos):
+    """
+    Verifica que reducir la escala mínima habilite la conexión de 30 minutos.
+    """
+    itinerarios = conexion_service.buscar_conexiones(db_session, "BOG", "MAD", DIA, escala_min=20, max_tramos=2)
+
+    rutas = [[t["id"] for t in it["tramos"]] for it in itinerarios]
+    assert [1, 2] in rutas
+    assert rutas.index([1, 2]) < rutas.index([1, 3])
+
+
+def test_conexiones_sin_asientos_se_excluyen(db_session, red_de_vuelos):
+    """
+    Verifica que un itinerario con un tramo lleno no se devuelva.
+    """
+    from app.models.vuelo import Vuelo
+
+    db_session.get(Vuelo, 6).asientos_disponibles = 0
+    db_session.commit()
+
+    itinerarios = conexion_service.buscar_conexiones(db_session, "BOG", "MAD", DIA)
+
+    assert [[t["id"] for t in it["tramos"]] for it in itinerarios] == [[4], [1, 3]]
+
+
+def test_conexiones_parametros_invalidos(db_session):
+    """
+    Verifica que origen igual a destino o escalas invertidas lancen 400.
+    """
+    for kwargs in ({"origen": "BOG", "destino": "BOG"},
+                   {"origen": "BOG", "destino": "MAD", "escala_min": 500, "escala_max": 60}):
+        with pytest.raises(HTTPException) as exc_info:
+            conexion_service.buscar_conexiones(db_session, fecha=DIA, **kwargs)
+        assert exc_info.value.status_code == 400
+
+
+# ========== PRUEBAS DE ACTUALIZACIÓN INCREMENTAL ==========
+
+def test_indice_se_actualiza_al_crear_y_eliminar(db_session, red_de_vuelos):
+    """
+    Verifica que, con el índice ya cargado, los vuelos creados y eliminados por
+    vuelo_service se reflejen sin recargarlo.
+    """
+    conexion_service.buscar_conexiones(db_session, "BOG", "MAD", DIA)
+    assert conexion_service.indice.vigente
+
+    nuevo = _vuelo(8, "BOG", "MAD", _hora(7), _hora(18))
+    vuelo_service.crear_vuelo(db_session, VueloCreate(**nuevo))
+    vuelo_service.eliminar_vuelo(db_session, 4)
+
+    itinerarios = conexion_service.buscar_conexiones(db_session, "BOG", "MAD", DIA)
+
+    assert [[t["id"] for t in it["tramos"]] for it in itinerarios] == [[8], [5, 6], [1, 3]]
@@ -0,0 +1,204 @@
+# tests/test_cotizacion_service.py
+"""
+Pruebas unitarias para la cotización en el servidor (services/cotizacion_service.py).
+
+Valida:
+- Total = precio_base × multiplicador de la clase + precio × cantidad de cada servicio
+- Cotizar un carrito con la instantánea en caché no ejecuta consultas
+- Invalidación de la instantánea al cambiar tarifas o servicios
+- Catálogo de servicios cacheado una sola vez para todos los vuelos
+- Reservas creadas con el total calculado en el servidor, no el del cliente
+- Reserva.total actualizado al agregar y quitar servicios y al cambiar de clase
+- Endpoint POST /reservas/cotizar
+"""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.reserva import Reserva
+from app.services import cotizacion_service, reserva_service, servicio_service, tarifa_service
+from app.dto.reserva_dto import ReservaCreate
+from app.dto.reserva_servicio_dto import ReservaServicioCreate
+from app.dto.servicio_dto import ServicioUpdate
+from app.dto.tarifa_dto import TarifaClaseCreate
+
+
+@pytest.fixture
+def vuelo_con_tarifas(db_session, create_vuelo, vuelo_data):
+    """Vuelo de precio_base 150000 con económica (×1) y ejecutiva (×2.5)."""
+    vuelo = create_vuelo(vuelo_data)
+    tarifa_service.configurar_tarifas(db_session, vuelo.id, [
+        TarifaClaseCreate(clase="económica", capacidad=20),
+        TarifaClaseCreate(clase="ejecutiva", capacidad=5, multiplicador=2.5),
+    ])
+    return vuelo
+
+
+def _carrito(*pares):
+    return [ReservaServicioCreate(servicio_id=s, cantidad=c) for s, c in pares]
+
+
+# ========== PRUEBAS DE COTIZACIÓN ==========
+
+def test_cotizar_clase_y_servicios(db_session, vuelo_con_tarifas, create_servicio):
+    """
+    Verifica la tarifa por clase, los subtotales y los errores de clase, servicio y vuelo.
+    """
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    comida = create_servicio({"nombre": "Comida", "precio": 12500.5})
+
+    cotizacion = cotizacion_service.cotizar(
+        db_session, vuelo_con_tarifas.id, "Business", _carrito((maleta.id, 2), (comida.id, 1))
+    )
+    assert cotizacion["tarifa"] == 375000.0
+    assert [l["subtotal"] for l in cotizacion["servicios"]] == [60000.0, 12500.5]
+    assert cotizacion["total"] == 447500.5
+
+    casos = [(vuelo_con_tarifas.id, "primera", [], 400), (vuelo_con_tarifas.id, "premium", [], 400),
+             (vuelo_con_tarifas.id, "economica", _carrito((999, 1)), 404), (999, "economica", [], 404)]
+    for vuelo_id, clase, servicios, codigo in casos:
+        with pytest.raises(HTTPException) as exc_info:
+            cotizacion_service.cotizar(db_session, vuelo_id, clase, servicios)
+        assert exc_info.value.status_code == codigo
+
+
+def test_cotizar_carrito_sin_consultas(db_session, db_engine, vuelo_con_tarifas, create_servicio):
+    """
+    Verifica que, con la instantánea y el catálogo en caché, cotizar un carrito
+    de varios servicios no ejecute ninguna consulta.
+    """
+    servicios = [create_servicio({"nombre": f"S{i}", "precio": 1000 * i}) for i in range(1, 9)]
+    carrito = _carrito(*[(s.id, 1) for s in servicios])
+    cotizacion_service.cotizar(db_session, vuelo_con_tarifas.id, "economica", carrito[:1])
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    cotizacion = cotizacion_service.cotizar(db_session, vuelo_con_tarifas.id, "economica", carrito)
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    assert sentencias == []
+    assert cotizacion["total"] == 150000.0 + 36000.0
+
+
+def test_cambios_de_precio_invalidan_la_instantanea(db_session, vuelo_con_tarifas, create_servicio):
+    """
+    Verifica que nuevas tarifas por clase y nuevos precios de servicios se reflejen de inmediato.
+    """
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    assert cotizacion_service.cotizar(db_session, vuelo_con_tarifas.id, "ejecutiva", _carrito((maleta.id, 1)))["total"] == 405000.0
+
+    tarifa_service.configurar_tarifas(db_session, vuelo_con_tarifas.id, [
+        TarifaClaseCreate(clase="ejecutiva", capacidad=5, multiplicador=2.0),
+    ])
+    servicio_service.actualizar_servicio(db_session, maleta.id, ServicioUpdate(precio=40000))
+
+    assert cotizacion_service.cotizar(db_session, vuelo_con_tarifas.id, "ejecutiva", _carrito((maleta.id, 1)))["total"] == 340000.0
+
+
+def test_catalogo_de_servicios_compartido(db_session, db_engine, create_vuelo, vuelo_data, vuelo_con_tarifas,
+                                         create_servicio):
+    """
+    Verifica que el catálogo de servicios se lea una vez para todos los vuelos y
+    que cambiar un servicio no descarte las instantáneas de los vuelos.
+    """
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    otro = create_vuelo({**vuelo_data, "id": vuelo_data["id"] + 1})
+    cotizacion_service.cotizar(db_session, vuelo_con_tarifas.id, "economica", _carrito((maleta.id, 1)))
+
+    def consultas(vuelo_id):
+        sentencias = []
+        registrar = lambda *a: sentencias.append(a[2])
+        event.listen(db_engine, "before_cursor_execute", registrar)
+        cotizacion = cotizacion_service.cotizar(db_session, vuelo_id, "economica", _carrito((maleta.id, 1)))
+        event.remove(db_engine, "before_cursor_execute", registrar)
+        return cotizacion, [s for s in sentencias if "FROM servicios" in s]
+
+    cotizacion, de_servicios = consultas(otro.id)
+    assert (cotizacion["total"], de_servicios) == (180000.0, [])
+
+    servicio_service.actualizar_servicio(db_session, maleta.id, ServicioUpdate(precio=40000))
+    cotizacion, de_servicios = consultas(vuelo_con_tarifas.id)
+    assert cotizacion["total"] == 190000.0
+    assert len(de_servicios) == 1
+
+
+# ========== PRUEBAS DE TOTALES DE RESERVA ==========
+
+def test_reserva_con_total_del_servidor(db_session, create_usuario, usuario_cliente_data, vuelo_con_tarifas):
+    """
+    Verifica que el total enviado por el cliente se ignore y se use la tarifa de la clase.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    datos = ReservaCreate(vuelo_id=vuelo_con_tarifas.id, clase="ejecutiva", asiento="1A", total=1.0)
+
+    reserva = reserva_service.crear_reserva(db_session, datos, usuario.id)
+
+    assert reserva.total == 375000.0
+
+
+def test_total_al_agregar_y_quitar_servicios(db_session, create_usuario, usuario_cliente_data, vuelo_con_tarifas,
+                                            create_servicio):
+    """
+    Verifica que Reserva.total sume el subtotal de cada servicio agregado y lo reste al quitarlo.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    reserva = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=vuelo_con_tarifas.id, clase="economica", asiento="1A"), usuario.id
+    )
+
+    agregado = reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, maleta.id, 2, usuario)
+    assert float(agregado.subtotal) == 60000.0
+    assert db_session.get(Reserva, reserva.id).total == 210000.0
+
+    reserva_service.eliminar_servicio_de_reserva(db_session, reserva.id, maleta.id, usuario)
+    assert db_session.get(Reserva, reserva.id).total == 150000.0
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, 999, 1, usuario)
+    assert exc_info.value.status_code == 404
+    assert db_session.get(Reserva, reserva.id).total == 150000.0
+
+
+def test_cambio_de_clase_recotiza_el_total(client, db_session, vuelo_con_tarifas, create_servicio, get_auth_headers):
+    """
+    Verifica que pasar de económica a ejecutiva por PUT cobre la nueva tarifa
+    conservando los servicios, y que una clase que el vuelo no vende no cambie nada.
+    """
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    headers = get_auth_headers()
+    reserva_id = client.post("/reservas/", headers=headers, json={
+        "vuelo_id": vuelo_con_tarifas.id, "clase": "económica", "asiento": "1A", "total": 1.0
+    }).json()["id"]
+    client.post(f"/reservas/{reserva_id}/servicios", headers=headers, json={"agregar": [{"servicio_id": maleta.id}]})
+
+    response = client.put(f"/reservas/{reserva_id}", json={"clase": "ejecutiva"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 375000.0 + 30000.0
+
+    response = client.put(f"/reservas/{reserva_id}", json={"clase": "primera"}, headers=headers)
+    assert response.status_code == 400
+    db_session.expire_all()
+    reserva = db_session.get(Reserva, reserva_id)
+    assert (reserva.clase, reserva.total) == ("ejecutiva", 405000.0)
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoint_cotizar(client, vuelo_con_tarifas, create_servicio, get_auth_headers):
+    """
+    Verifica POST /reservas/cotizar con servicios y la validación de la cantidad.
+    """
+    wifi = create_servicio({"nombre": "Wifi", "precio": 20000})
+    headers = get_auth_headers()
+    cuerpo = {"vuelo_id": vuelo_con_tarifas.id, "clase": "económica", "servicios": [{"servicio_id": wifi.id, "cantidad": 3}]}
+
+    response = client.post("/reservas/cotizar", json=cuerpo, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 210000.0
+    assert response.json()["servicios"][0]["precio_unitario"] == 20000.0
+
+    cuerpo["servicios"][0]["cantidad"] = 0
+    assert client.post("/reservas/cotizar", json=cuerpo, headers=headers).status_code == 422
@@ -0,0 +1,232 @@
+# tests/test_idempotencia_service.py
+"""
+Pruebas unitarias para las claves de idempotencia (services/idempotencia_service.py).
+
+Valida:
+- Un reintento con la misma clave devuelve la respuesta guardada sin repetir la operación
+- Rechazo de una clave reutilizada con otro cuerpo
+- Errores 4xx guardados y errores del servidor que liberan la clave
+- Fallo tras confirmar la operación: la clave se conserva y el reintento no la repite
+- Caducidad de las claves y purga de las vencidas
+- Duplicados concurrentes que esperan a la primera petición
+- POST /reservas/ y POST /pagos/ con la cabecera Idempotency-Key
+"""
+
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.idempotencia import ClaveIdempotencia
+from app.models.reserva import Reserva
+from app.models.pago import Pago
+from app.repositories import idempotencia_repo
+from app.services import idempotencia_service
+
+
+class Datos(BaseModel):
+    valor: int
+
+
+class Resultado(BaseModel):
+    id: int
+    valor: int
+
+
+class Operacion:
+    """Operación de prueba que cuenta sus ejecuciones."""
+
+    def __init__(self, error=None, pausa=0.0):
+        self.llamadas = 0
+        self.error = error
+        self.pausa = pausa
+
+    def __call__(self, valor=1):
+        self.llamadas += 1
+        time.sleep(self.pausa)
+        if self.error:
+            raise self.error
+        return {"id": self.llamadas, "valor": valor}
+
+
+def _ejecutar(db, operacion, clave="k1", valor=1, usuario_id=1):
+    return idempotencia_service.ejecutar(
+        db, usuario_id, "POST /prueba/", clave, Datos(valor=valor), lambda: operacion(valor), Resultado, 201
+    )
+
+
+# ========== PRUEBAS DE REPETICIÓN ==========
+
+def test_reintento_devuelve_respuesta_guardada(db_session):
+    """
+    Verifica que la operación se ejecute una vez y el reintento reciba el mismo cuerpo.
+    """
+    operacion = Operacion()
+
+    primera = _ejecutar(db_session, operacion)
+    segunda = _ejecutar(db_session, operacion)
+
+    assert operacion.llamadas == 1
+    assert (primera.status_code, primera.body) == (segunda.status_code, segunda.body) == (201, b'{"id":1,"valor":1}')
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in primera.headers
+
+
+def test_claves_distintas_o_sin_clave(db_session):
+    """
+    Verifica que otra clave u otro usuario ejecuten de nuevo, y que sin clave no se guarde nada.
+    """
+    operacion = Operacion()
+
+    _ejecutar(db_session, operacion, clave="k1")
+    _ejecutar(db_session, operacion, clave="k2")
+    _ejecutar(db_session, operacion, clave="k1", usuario_id=2)
+    assert _ejecutar(db_session, operacion, clave=None) == {"id": 4, "valor": 1}
+
+    assert operacion.llamadas == 4
+    assert db_session.query(ClaveIdempotencia).count() == 3
+
+
+def test_clave_con_otro_cuerpo(db_session):
+    """
+    Verifica 422 al reutilizar la clave con otro cuerpo de petición.
+    """
+    _ejecutar(db_session, Operacion(), valor=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        _ejecutar(db_session, Operacion(), valor=2)
+    assert exc_info.value.status_code == 422
+
+
+# ========== PRUEBAS DE ERRORES ==========
+
+def test_error_4xx_se_guarda(db_session):
+    """
+    Verifica que un 400 se propague la primera vez y se repita sin ejecutar la operación.
+    """
+    operacion = Operacion(error=HTTPException(status_code=400, detail="No hay asientos disponibles"))
+
+    with pytest.raises(HTTPException):
+        _ejecutar(db_session, operacion)
+    repetida = _ejecutar(db_session, operacion)
+
+    assert operacion.llamadas == 1
+    assert repetida.status_code == 400
+    assert repetida.body == b'{"detail":"No hay asientos disponibles"}'
+
+
+def test_error_inesperado_libera_la_clave(db_session):
+    """
+    Verifica que tras un error del servidor el reintento vuelva a ejecutar la operación.
+    """
+    with pytest.raises(RuntimeError):
+        _ejecutar(db_session, Operacion(error=RuntimeError("caída")))
+    assert db_session.query(ClaveIdempotencia).count() == 0
+
+    operacion = Operacion()
+    assert _ejecutar(db_session, operacion).status_code == 201
+    assert operacion.llamadas == 1
+
+
+def test_fallo_tras_confirmar_no_repite_la_operacion(db_session):
+    """
+    Verifica que si la respuesta no se puede serializar después de aplicar la
+    operación, el reintento con la misma clave no la ejecute otra vez.
+    """
+    from pydantic import ValidationError
+
+    class ResultadoInvalido(BaseModel):
+        id: int
+        faltante: str
+
+    operacion = Operacion()
+    ejecutar = lambda: idempotencia_service.ejecutar(
+        db_session, 1, "POST /prueba/", "k1", Datos(valor=1), lambda: operacion(1), ResultadoInvalido, 201
+    )
+
+    with pytest.raises(ValidationError):
+        ejecutar()
+    repetida = ejecutar()
+
+    assert operacion.llamadas == 1
+    assert repetida.status_code == 500
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+
+
+def test_clave_caducada_y_purga(db_session):
+    """
+    Verifica que una clave caducada permita ejecutar de nuevo y que la purga borre las vencidas.
+    """
+    operacion = Operacion()
+    _ejecutar(db_session, operacion)
+    db_session.query(ClaveIdempotencia).update({"expira_en": datetime.utcnow() - timedelta(seconds=1)})
+    db_session.commit()
+
+    _ejecutar(db_session, operacion)
+    assert operacion.llamadas == 2
+
+    assert idempotencia_repo.eliminar_vencidas(db_session, datetime.utcnow() + timedelta(days=2)) == 1
+    assert db_session.query(ClaveIdempotencia).count() == 0
+
+
+# ========== PRUEBAS DE CONCURRENCIA ==========
+
+def test_duplicados_concurrentes_esperan(tmp_path):
+    """
+    Verifica que varias peticiones simultáneas con la misma clave ejecuten la operación
+    una sola vez y todas reciban la misma respuesta.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'idempotencia.db'}", connect_args={"timeout": 10})
+    ClaveIdempotencia.__table__.create(engine)
+    Sesion = sessionmaker(bind=engine)
+    operacion = Operacion(pausa=0.3)
+    respuestas, errores = [], []
+
+    def peticion():
+        with Sesion() as db:
+            try:
+                respuestas.append(_ejecutar(db, operacion))
+            except Exception as e:
+                errores.append(e)
+
+    hilos = [threading.Thread(target=peticion) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    engine.dispose()
+
+    assert errores == []
+    assert operacion.llamadas == 1
+    assert {(r.status_code, r.body) for r in respuestas} == {(201, b'{"id":1,"valor":1}')}
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoint_reserva_y_pago_idempotentes(client, db_session, create_vuelo, vuelo_data, reserva_data, get_auth_headers):
+    """
+    Verifica que repetir POST /reservas/ y POST /pagos/ con la misma clave no duplique
+    la reserva, el descuento de asientos ni el pago.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    headers = {**get_auth_headers(), "Idempotency-Key": "reserva-1"}
+
+    primera = client.post("/reservas/", json=reserva_data, headers=headers)
+    segunda = client.post("/reservas/", json=reserva_data, headers=headers)
+
+    assert primera.status_code == segunda.status_code == 201
+    assert primera.json() == segunda.json()
+    assert db_session.query(Reserva).count() == 1
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == vuelo_data["asientos_disponibles"] - 1
+
+    pago = {"reserva_id": primera.json()["id"], "monto": reserva_data["total"]}
+    headers["Idempotency-Key"] = "pago-1"
+    respuestas = [client.post("/pagos/", json=pago, headers=headers) for _ in range(2)]
+    assert [r.status_code for r in respuestas] == [200, 200]
+    assert respuestas[0].json() == respuestas[1].json()
+    assert db_session.query(Pago).count() == 1
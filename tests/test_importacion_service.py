@@ -0,0 +1,165 @@
+# tests/test_importacion_service.py
+"""
+Pruebas unitarias para la importación masiva de vuelos (services/importacion_service.py).
+
+Valida:
+- Lectura incremental de CSV y NDJSON con trozos cortados a mitad de línea
+- Reporte de errores por fila (validación, ids repetidos o ya existentes)
+- Escritura por lotes y actualización del calendario de tarifas
+- Rechazo de formatos no soportados
+- Ruta HTTP protegida para administradores
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import date
+from fastapi import HTTPException
+
+from app.core.importacion import LectorFilas, CSV, NDJSON
+from app.models.vuelo import Vuelo
+from app.services import importacion_service, vuelo_service
+
+CABECERA = "id,origen,destino,salida,llegada,duracion,precio_base,asientos_disponibles\n"
+
+
+def _fila_csv(id, precio=100.0, dia=5):
+    return f"{id},BOG,MDE,2030-03-{dia:02d}T08:00:00,2030-03-{dia:02d}T09:00:00,1.0,{precio},10\n"
+
+
+@pytest.fixture(autouse=True)
+def sin_pool_de_hilos(monkeypatch):
+    """
+    La BD en memoria de las pruebas es una conexión por hilo: el trabajo que el
+    servicio manda al pool de hilos se ejecuta aquí en el mismo hilo.
+    """
+    async def _en_linea(funcion, *args):
+        return funcion(*args)
+
+    monkeypatch.setattr(importacion_service, "run_in_threadpool", _en_linea)
+
+
+async def _trozos(contenido: bytes, tamano=7):
+    for i in range(0, len(contenido), tamano):
+        yield contenido[i:i + tamano]
+
+
+def _importar(db_session, contenido: str, content_type="text/csv"):
+    return asyncio.run(importacion_service.importar_vuelos(db_session, content_type, _trozos(contenido.encode())))
+
+
+# ========== PRUEBAS DEL LECTOR ==========
+
+def test_lector_csv_une_lineas_partidas():
+    """
+    Verifica que una línea repartida en varios trozos (y con caracteres multibyte)
+    se entregue completa.
+    """
+    lector = LectorFilas(CSV)
+    contenido = "id,origen\r\n1,Bogotá\r\n\n2,Medellín".encode()
+
+    filas = []
+    for i in range(0, len(contenido), 3):
+        filas += lector.alimentar(contenido[i:i + 3])
+    filas += lector.terminar()
+
+    assert filas == [(2, {"id": "1", "origen": "Bogotá"}), (4, {"id": "2", "origen": "Medellín"})]
+
+
+def test_lector_reporta_lineas_invalidas():
+    """
+    Verifica que las líneas mal formadas se devuelvan como mensaje de error.
+    """
+    csv = LectorFilas(CSV)
+    assert csv.alimentar(b"id,origen\n1,BOG,extra\n") == [(2, "Se esperaban 2 columnas y hay 3")]
+
+    ndjson = LectorFilas(NDJSON)
+    filas = ndjson.alimentar(b'{"id": 1}\n[1]\n{roto\n')
+    assert filas[0] == (1, {"id": 1})
+    assert filas[1] == (2, "Se esperaba un objeto JSON")
+    assert filas[2][1].startswith("JSON inválido")
+
+
+# ========== PRUEBAS DE IMPORTACIÓN ==========
+
+def test_importar_csv_por_lotes(db_session, monkeypatch):
+    """
+    Verifica que se importen todas las filas válidas en varios lotes y que el
+    calendario de tarifas refleje los vuelos importados.
+    """
+    monkeypatch.setattr(importacion_service, "VUELOS_IMPORTACION_LOTE", 4)
+    contenido = CABECERA + "".join(_fila_csv(i, precio=100.0 + i) for i in range(1, 11))
+
+    informe = _importar(db_session, contenido)
+
+    assert informe == {"total": 10, "importados": 10, "errores": []}
+    assert db_session.query(Vuelo).count() == 10
+    [dia] = vuelo_service.calendario_tarifas(db_session, "BOG", "MDE", 2030, 3)
+    assert (dia.dia, dia.precio_min, dia.asientos, dia.vuelos) == (date(2030, 3, 5), 101.0, 100, 10)
+
+
+def test_importar_reporta_errores_por_fila(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que las filas inválidas, repetidas o ya existentes se reporten con
+    su número de línea sin impedir la importación del resto.
+    """
+    create_vuelo({**vuelo_data, "id": 3})
+    contenido = CABECERA + _fila_csv(1) + _fila_csv(1) + "2,BOG,MDE,mañana,x,1,abc,10\n" + _fila_csv(3) + _fila_csv(4)
+
+    informe = _importar(db_session, contenido)
+
+    assert informe["total"] == 5
+    assert informe["importados"] == 2
+    errores = {e["linea"]: e["error"] for e in informe["errores"]}
+    assert set(errores) == {3, 4, 5}
+    assert "repetido" in errores[3]
+    assert "salida" in errores[4] and "precio_base" in errores[4]
+    assert errores[5] == "Ya existe un vuelo con este código."
+
+
+def test_importar_ndjson_suma_al_calendario_existente(db_session):
+    """
+    Verifica la importación NDJSON y que el resumen se combine con vuelos creados antes.
+    """
+    from app.dto.vuelo_dto import VueloCreate
+
+    vuelo_service.crear_vuelo(db_session, VueloCreate(
+        id=1, origen="BOG", destino="MDE", salida="2030-03-05T06:00:00", llegada="2030-03-05T07:00:00",
+        duracion=1.0, precio_base=80.0, asientos_disponibles=5,
+    ))
+    lineas = [
+        {"id": 2, "origen": "BOG", "destino": "MDE", "salida": "2030-03-05T10:00:00",
+         "llegada": "2030-03-05T11:00:00", "duracion": 1.0, "precio_base": 60.0, "asientos_disponibles": 7},
+    ]
+    contenido = "\n".join(json.dumps(l) for l in lineas) + "\n"
+
+    informe = _importar(db_session, contenido, "application/x-ndjson; charset=utf-8")
+
+    assert informe["importados"] == 1
+    [dia] = vuelo_service.calendario_tarifas(db_session, "BOG", "MDE", 2030, 3)
+    assert (dia.precio_min, dia.asientos, dia.vuelos) == (60.0, 12, 2)
+
+
+def test_importar_formato_no_soportado(db_session):
+    """
+    Verifica que un Content-Type distinto de CSV/NDJSON se rechace con 415.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        _importar(db_session, "{}", "application/json")
+    assert exc_info.value.status_code == 415
+
+
+def test_ruta_importar_requiere_admin(client, get_auth_headers, usuario_admin_data):
+    """
+    Verifica que un cliente no pueda importar y un admin sí.
+    """
+    contenido = CABECERA + _fila_csv(1)
+
+    response = client.post("/vuelos/importar", content=contenido,
+                           headers={**get_auth_headers(), "Content-Type": "text/csv"})
+    assert response.status_code == 403
+
+    response = client.post("/vuelos/importar", content=contenido,
+                           headers={**get_auth_headers(usuario_admin_data), "Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"total": 1, "importados": 1, "errores": []}
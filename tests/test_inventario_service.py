@@ -0,0 +1,239 @@
+# tests/test_inventario_service.py
+"""
+Pruebas unitarias para las existencias de servicios por vuelo (services/inventario_service.py).
+
+Valida:
+- Menú del vuelo con existencias en una sola consulta
+- Descuento atómico al agregar servicios (uno o en lote) y rechazo sin existencias
+- Devolución al quitar servicios y al cancelar la reserva
+- Configuración descontando lo ya vendido
+- Agregados concurrentes que no venden más de la capacidad
+- Endpoints /vuelos/{id}/servicios
+"""
+
+import threading
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.vuelo import Vuelo
+from app.models.usuario import Usuario
+from app.models.servicio import Servicio
+from app.models.reserva import Reserva
+from app.models.reserva_servicio import ReservaServicio
+from app.models.inventario_servicio import InventarioServicio
+from app.services import inventario_service, reserva_service, vuelo_service
+from app.dto.inventario_dto import InventarioServicioCreate
+from app.dto.reserva_dto import ReservaCreate
+from app.dto.reserva_servicio_dto import ReservaServiciosLote
+
+
+@pytest.fixture
+def vuelo_con_inventario(db_session, create_usuario, create_vuelo, create_servicio, usuario_cliente_data, vuelo_data):
+    """Vuelo con comida (3) y sala VIP (1) limitadas, wifi sin límite y una reserva del cliente."""
+    usuario = create_usuario(usuario_cliente_data)
+    vuelo = create_vuelo(vuelo_data)
+    comida = create_servicio({"nombre": "Comida", "precio": 25000})
+    sala = create_servicio({"nombre": "Sala VIP", "precio": 90000})
+    wifi = create_servicio({"nombre": "Wifi", "precio": 20000})
+    inventario_service.configurar(db_session, vuelo.id, [
+        InventarioServicioCreate(servicio_id=comida.id, capacidad=3),
+        InventarioServicioCreate(servicio_id=sala.id, capacidad=1),
+    ])
+    reserva = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=vuelo.id, clase="económica", asiento="12A"), usuario.id
+    )
+    return usuario, vuelo, reserva, (comida, sala, wifi)
+
+
+def _disponibles(db_session, vuelo_id):
+    db_session.expire_all()
+    return {i.servicio_id: i.disponibles for i in db_session.query(InventarioServicio).filter_by(vuelo_id=vuelo_id)}
+
+
+def _lote(agregar=(), quitar=()):
+    return ReservaServiciosLote(agregar=[{"servicio_id": s, "cantidad": c} for s, c in agregar], quitar=list(quitar))
+
+
+# ========== PRUEBAS DE MENÚ ==========
+
+def test_menu_en_una_consulta(db_session, db_engine, vuelo_con_inventario):
+    """
+    Verifica que el menú traiga todo el catálogo con sus existencias en una consulta.
+    """
+    _, vuelo, _, (comida, sala, wifi) = vuelo_con_inventario
+    vuelo_service.obtener_vuelo(db_session, vuelo.id)  # el vuelo ya está en la caché
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    menu = inventario_service.menu(db_session, vuelo.id)
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    assert len(sentencias) == 1
+    assert [(m["servicio_id"], m["disponibles"]) for m in menu] == [(comida.id, 3), (sala.id, 1), (wifi.id, None)]
+
+
+# ========== PRUEBAS DE DESCUENTO ==========
+
+def test_agregar_descuenta_y_rechaza_sin_existencias(db_session, vuelo_con_inventario):
+    """
+    Verifica el descuento al agregar, el 400 sin existencias sin cambiar nada
+    y que los servicios sin límite no se controlen.
+    """
+    usuario, vuelo, reserva, (comida, _, wifi) = vuelo_con_inventario
+
+    reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, comida.id, 2, usuario)
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, comida.id, 2, usuario)
+    assert exc_info.value.status_code == 400
+    reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, wifi.id, 10, usuario)
+
+    assert _disponibles(db_session, vuelo.id)[comida.id] == 1
+    assert db_session.get(Reserva, reserva.id).total == 150000.0 + 50000.0 + 200000.0
+
+
+def test_lote_descuenta_todo_o_nada(db_session, db_engine, vuelo_con_inventario):
+    """
+    Verifica que un lote descuente todos sus servicios en una sentencia y que,
+    si uno se agota, no se descuente ninguno.
+    """
+    usuario, vuelo, reserva, (comida, sala, _) = vuelo_con_inventario
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.actualizar_servicios_de_reserva(
+            db_session, reserva.id, _lote(agregar=[(comida.id, 1), (sala.id, 2)]), usuario
+        )
+    assert exc_info.value.status_code == 400
+    assert _disponibles(db_session, vuelo.id) == {comida.id: 3, sala.id: 1}
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    reserva_service.actualizar_servicios_de_reserva(
+        db_session, reserva.id, _lote(agregar=[(comida.id, 1), (sala.id, 1), (comida.id, 1)]), usuario
+    )
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    assert len([s for s in sentencias if s.startswith("UPDATE inventario_servicios")]) == 1
+    assert _disponibles(db_session, vuelo.id) == {comida.id: 1, sala.id: 0}
+
+
+# ========== PRUEBAS DE DEVOLUCIÓN ==========
+
+def test_quitar_y_cancelar_devuelven_existencias(db_session, vuelo_con_inventario):
+    """
+    Verifica que quitar un servicio y cancelar la reserva devuelvan sus existencias.
+    """
+    usuario, vuelo, reserva, (comida, sala, _) = vuelo_con_inventario
+    reserva_service.actualizar_servicios_de_reserva(
+        db_session, reserva.id, _lote(agregar=[(comida.id, 2), (sala.id, 1)]), usuario
+    )
+
+    reserva_service.eliminar_servicio_de_reserva(db_session, reserva.id, sala.id, usuario)
+    assert _disponibles(db_session, vuelo.id) == {comida.id: 1, sala.id: 1}
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, usuario)
+    assert _disponibles(db_session, vuelo.id) == {comida.id: 3, sala.id: 1}
+
+
+# ========== PRUEBAS DE CONFIGURACIÓN ==========
+
+def test_configurar_descuenta_lo_vendido(db_session, vuelo_con_inventario):
+    """
+    Verifica que reconfigurar descuente lo ya vendido y rechace servicios repetidos o inexistentes.
+    """
+    usuario, vuelo, reserva, (comida, _, _) = vuelo_con_inventario
+    reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, comida.id, 2, usuario)
+
+    inventario_service.configurar(db_session, vuelo.id, [InventarioServicioCreate(servicio_id=comida.id, capacidad=5)])
+    assert _disponibles(db_session, vuelo.id) == {comida.id: 3}
+
+    casos = [([comida.id, comida.id], 400), ([999], 404)]
+    for ids, codigo in casos:
+        with pytest.raises(HTTPException) as exc_info:
+            inventario_service.configurar(
+                db_session, vuelo.id, [InventarioServicioCreate(servicio_id=i, capacidad=1) for i in ids]
+            )
+        assert exc_info.value.status_code == codigo
+
+
+# ========== PRUEBAS DE CONCURRENCIA ==========
+
+def test_agregados_concurrentes_no_sobrevenden(tmp_path):
+    """
+    Verifica que varias peticiones simultáneas por el último stock de un servicio
+    vendan exactamente la capacidad.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'inventario.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    Sesion = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    peticiones, capacidad = 8, 3
+
+    with Sesion() as db:
+        salida = datetime.utcnow() + timedelta(days=3)
+        db.add(Vuelo(id=900, origen="BOG", destino="MIA", salida=salida, llegada=salida + timedelta(hours=4),
+                     duracion=4.0, precio_base=300.0, asientos_disponibles=peticiones))
+        db.add(Servicio(id=1, nombre="Comida", precio=10))
+        db.add_all([Usuario(id=100 + i, nombre=f"U{i}", email=f"u{i}@test.com", contrasena="x", rol="cliente")
+                    for i in range(peticiones)])
+        db.commit()
+        inventario_service.configurar(db, 900, [InventarioServicioCreate(servicio_id=1, capacidad=capacidad)])
+        reservas = [
+            reserva_service.crear_reserva(db, ReservaCreate(vuelo_id=900, clase="economica", asiento=f"{i}A"), 100 + i).id
+            for i in range(peticiones)
+        ]
+
+    barrera = threading.Barrier(peticiones)
+    resultados = []
+
+    def agregar(reserva_id, usuario_id):
+        with Sesion() as db:
+            usuario = db.get(Usuario, usuario_id)
+            barrera.wait()
+            try:
+                reserva_service.agregar_servicio_a_reserva(db, reserva_id, 1, 1, usuario)
+                resultados.append(200)
+            except HTTPException as exc:
+                resultados.append(exc.status_code)
+
+    hilos = [threading.Thread(target=agregar, args=(r, 100 + i)) for i, r in enumerate(reservas)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    with Sesion() as db:
+        vendidos = db.query(ReservaServicio).count()
+        disponibles = db.query(InventarioServicio).one().disponibles
+    engine.dispose()
+
+    assert sorted(resultados) == [200] * capacidad + [400] * (peticiones - capacidad)
+    assert (vendidos, disponibles) == (capacidad, 0)
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoints_inventario(client, create_vuelo, create_servicio, vuelo_data, get_auth_headers, usuario_admin_data):
+    """
+    Verifica PUT (solo admin) y GET de /vuelos/{id}/servicios.
+    """
+    create_vuelo(vuelo_data)
+    comida = create_servicio({"nombre": "Comida", "precio": 25000})
+    url = f"/vuelos/{vuelo_data['id']}/servicios"
+    cuerpo = [{"servicio_id": comida.id, "capacidad": 4}]
+
+    assert client.put(url, json=cuerpo, headers=get_auth_headers()).status_code == 403
+    response = client.put(url, json=cuerpo, headers=get_auth_headers(usuario_admin_data))
+    assert response.status_code == 200
+    assert response.json() == [{"servicio_id": comida.id, "capacidad": 4, "disponibles": 4}]
+
+    menu = client.get(url).json()
+    assert [(m["nombre"], m["disponibles"]) for m in menu] == [("Comida", 4)]
+    assert client.get("/vuelos/999/servicios").status_code == 404
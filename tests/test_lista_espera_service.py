@@ -0,0 +1,301 @@
+# tests/test_lista_espera_service.py
+"""
+Pruebas unitarias para la lista de espera de vuelos agotados (services/lista_espera_service.py).
+
+Valida:
+- Alta en la cola solo si el vuelo o la clase están agotados, y posición FIFO
+- Promoción de la cabeza al cancelar una reserva, en la misma transacción y con notificación
+- Asiento devuelto a la venta cuando nadie espera en esa clase o el vuelo ya no la vende
+- Promoción al vencer una retención de asiento
+- Cola vaciada y usuarios avisados al eliminar o archivar el vuelo
+- Cancelaciones concurrentes que promueven entradas distintas
+- Endpoints /lista-espera
+"""
+
+import threading
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.vuelo import Vuelo
+from app.models.reserva import Reserva
+from app.models.usuario import Usuario
+from app.models.notificacion import Notificacion
+from app.models.lista_espera import EntradaListaEspera
+from app.models.tarifa_clase import TarifaClase
+from app.services import (
+    archivo_service, cotizacion_service, lista_espera_service, reserva_service, retencion_service, vuelo_service,
+)
+from app.dto.lista_espera_dto import ListaEsperaCreate
+from app.dto.reserva_dto import ReservaCreate
+from app.dto.retencion_dto import RetencionCreate
+
+
+def _usuarios(db_session, n, desde=10):
+    usuarios = [
+        Usuario(id=desde + i, nombre=f"U{i}", email=f"u{desde + i}@test.com", contrasena="x", rol="cliente")
+        for i in range(n)
+    ]
+    db_session.add_all(usuarios)
+    db_session.commit()
+    return usuarios
+
+
+@pytest.fixture
+def vuelo_lleno(db_session, create_vuelo, vuelo_data):
+    """Vuelo con un único asiento, ya reservado (12A, económica) por el primer usuario."""
+    vuelo = create_vuelo({**vuelo_data, "asientos_disponibles": 1})
+    titular = _usuarios(db_session, 1, desde=1)[0]
+    datos = ReservaCreate(vuelo_id=vuelo.id, clase="económica", asiento="12A", total=150000.0)
+    reserva = reserva_service.crear_reserva(db_session, datos, titular.id)
+    return vuelo, titular, reserva
+
+
+def _unirse(db_session, usuario, vuelo_id, clase="Economy", total=99.0):
+    return lista_espera_service.unirse(db_session, ListaEsperaCreate(vuelo_id=vuelo_id, clase=clase, total=total), usuario.id)
+
+
+# ========== PRUEBAS DE ALTA ==========
+
+def test_unirse_a_la_cola(db_session, create_vuelo, vuelo_data, vuelo_lleno):
+    """
+    Verifica la posición FIFO y los rechazos: vuelo con asientos, clase inválida,
+    vuelo inexistente y usuario repetido.
+    """
+    vuelo, _, _ = vuelo_lleno
+    a, b = _usuarios(db_session, 2)
+
+    assert _unirse(db_session, a, vuelo.id).posicion == 1
+    entrada_b = _unirse(db_session, b, vuelo.id)
+    assert (entrada_b.posicion, entrada_b.clase) == (2, "economica")
+
+    con_asientos = create_vuelo({**vuelo_data, "id": 101})
+    casos = [(a, con_asientos.id, "economica", 409), (a, vuelo.id, "premium", 400),
+             (a, 999, "economica", 404), (a, vuelo.id, "economica", 409)]
+    for usuario, vuelo_id, clase, codigo in casos:
+        with pytest.raises(HTTPException) as exc_info:
+            _unirse(db_session, usuario, vuelo_id, clase)
+        assert exc_info.value.status_code == codigo
+
+
+# ========== PRUEBAS DE PROMOCIÓN ==========
+
+def test_cancelar_promueve_cabeza_de_la_cola(db_session, vuelo_lleno):
+    """
+    Verifica que al cancelar, el primero en la cola reciba la reserva con el mismo asiento
+    y una notificación, sin que el asiento vuelva a la venta.
+    """
+    vuelo, titular, reserva = vuelo_lleno
+    a, b = _usuarios(db_session, 2)
+    _unirse(db_session, a, vuelo.id)
+    entrada_b = _unirse(db_session, b, vuelo.id)
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, titular)
+
+    promovida = db_session.query(Reserva).one()
+    # El total se cotiza al promover (precio_base del vuelo), no el enviado al apuntarse
+    assert (promovida.usuario_id, promovida.asiento, promovida.total) == (a.id, "12A", vuelo.precio_base)
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 0
+    notificacion = db_session.query(Notificacion).one()
+    assert (notificacion.usuario_id, notificacion.tipo) == (a.id, "lista_espera")
+    assert lista_espera_service.obtener(db_session, entrada_b.id, b).posicion == 1
+
+
+def test_cancelar_sin_espera_en_la_clase_libera_asiento(db_session, vuelo_lleno):
+    """
+    Verifica que si solo esperan en otra clase el asiento se devuelva a la venta.
+    """
+    vuelo, titular, reserva = vuelo_lleno
+    a = _usuarios(db_session, 1)[0]
+    _unirse(db_session, a, vuelo.id, clase="ejecutiva")
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, titular)
+
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 1
+    assert db_session.query(Reserva).count() == 0
+    assert db_session.query(EntradaListaEspera).count() == 1
+
+
+def test_cancelar_con_clase_que_ya_no_se_vende(db_session, vuelo_lleno):
+    """
+    Verifica que si el vuelo dejó de vender la clase de la cola, la cancelación
+    no falle: el asiento vuelve a la venta y la cola se vacía avisando a cada usuario.
+    """
+    vuelo, titular, reserva = vuelo_lleno
+    esperando = _usuarios(db_session, 2)
+    for usuario in esperando:
+        _unirse(db_session, usuario, vuelo.id)
+    db_session.add(TarifaClase(vuelo_id=vuelo.id, clase="ejecutiva", capacidad=5, disponibles=5, multiplicador=2.0))
+    db_session.commit()
+    cotizacion_service.invalidar_vuelo(vuelo.id)
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, titular)
+
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 1
+    assert db_session.query(Reserva).count() == 0
+    assert db_session.query(EntradaListaEspera).count() == 0
+    avisos = db_session.query(Notificacion).order_by(Notificacion.usuario_id).all()
+    assert [(n.usuario_id, n.titulo) for n in avisos] == [(u.id, "Lista de espera cerrada") for u in esperando]
+
+
+def test_retencion_vencida_promueve(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que el barrido de retenciones entregue el asiento a la lista de espera.
+    """
+    vuelo = create_vuelo({**vuelo_data, "asientos_disponibles": 1})
+    dueno, espera = _usuarios(db_session, 2)
+    retencion = retencion_service.crear_retencion(
+        db_session, RetencionCreate(vuelo_id=vuelo.id, clase="económica", asiento="3C"), dueno.id
+    )
+    _unirse(db_session, espera, vuelo.id)
+    retencion.expira_en = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+    assert retencion_service.barrer_vencidas(db_session) == 1
+
+    promovida = db_session.query(Reserva).one()
+    assert (promovida.usuario_id, promovida.asiento) == (espera.id, "3C")
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 0
+
+
+def test_promocion_es_una_sentencia_sobre_la_cola(db_session, db_engine, vuelo_lleno):
+    """
+    Verifica que tomar la cabeza sea un único DELETE, sin leer la cola completa.
+    """
+    vuelo, titular, reserva = vuelo_lleno
+    for usuario in _usuarios(db_session, 5):
+        _unirse(db_session, usuario, vuelo.id)
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    reserva_service.eliminar_reserva(db_session, reserva.id, titular)
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    sobre_cola = [s for s in sentencias if "lista_espera" in s]
+    assert len(sobre_cola) == 1 and sobre_cola[0].startswith("DELETE FROM lista_espera")
+
+
+# ========== PRUEBAS DE ELIMINACIÓN DEL VUELO ==========
+
+def test_eliminar_vuelo_vacia_la_cola_y_avisa(db_session, vuelo_lleno):
+    """
+    Verifica que eliminar un vuelo con usuarios en espera borre sus entradas
+    y notifique a cada uno, en lugar de fallar por la clave foránea.
+    """
+    vuelo, _, _ = vuelo_lleno
+    esperando = _usuarios(db_session, 2)
+    for usuario in esperando:
+        _unirse(db_session, usuario, vuelo.id)
+
+    vuelo_service.eliminar_vuelo(db_session, vuelo.id)
+
+    assert db_session.query(EntradaListaEspera).count() == 0
+    avisos = db_session.query(Notificacion).order_by(Notificacion.usuario_id).all()
+    assert [(n.usuario_id, n.titulo) for n in avisos] == [(u.id, "Vuelo cancelado") for u in esperando]
+
+
+def test_archivar_vuelo_vacia_la_cola_y_avisa(db_session, vuelo_lleno):
+    """
+    Verifica que archivar un vuelo salido con usuarios en espera les avise al sacarlos de la cola.
+    """
+    vuelo, _, _ = vuelo_lleno
+    usuario = _usuarios(db_session, 1)[0]
+    _unirse(db_session, usuario, vuelo.id)
+
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=vuelo.salida + timedelta(days=2))
+
+    assert db_session.query(EntradaListaEspera).count() == 0
+    aviso = db_session.query(Notificacion).one()
+    assert (aviso.usuario_id, aviso.titulo) == (usuario.id, "Lista de espera cerrada")
+
+
+# ========== PRUEBAS DE CONCURRENCIA ==========
+
+def test_cancelaciones_concurrentes_promueven_entradas_distintas(tmp_path):
+    """
+    Verifica que varias cancelaciones simultáneas del mismo vuelo promuevan cada una
+    a un usuario distinto de la cola, sin perder ni duplicar asientos.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'lista_espera.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    Sesion = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    cancelaciones, en_espera = 4, 6
+
+    with Sesion() as db:
+        salida = datetime.utcnow() + timedelta(days=3)
+        db.add(Vuelo(id=900, origen="BOG", destino="MIA", salida=salida, llegada=salida + timedelta(hours=4),
+                     duracion=4.0, precio_base=300.0, asientos_disponibles=cancelaciones))
+        db.commit()
+        titulares = _usuarios(db, cancelaciones, desde=100)
+        reservas = [
+            reserva_service.crear_reserva(db, ReservaCreate(vuelo_id=900, clase="economica", asiento=f"{i}A", total=1.0), u.id).id
+            for i, u in enumerate(titulares, start=1)
+        ]
+        esperando = _usuarios(db, en_espera, desde=200)
+        for usuario in esperando:
+            _unirse(db, usuario, 900)
+
+    barrera = threading.Barrier(cancelaciones)
+    errores = []
+
+    def cancelar(reserva_id, titular_id):
+        with Sesion() as db:
+            titular = db.get(Usuario, titular_id)
+            barrera.wait()
+            try:
+                reserva_service.eliminar_reserva(db, reserva_id, titular)
+            except Exception as exc:  # pragma: no cover - cualquier error invalida la prueba
+                errores.append(exc)
+
+    hilos = [threading.Thread(target=cancelar, args=(r, u.id)) for r, u in zip(reservas, titulares)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    with Sesion() as db:
+        promovidos = sorted(r.usuario_id for r in db.query(Reserva))
+        restantes = [e.usuario_id for e in db.query(EntradaListaEspera).order_by(EntradaListaEspera.id)]
+        asientos = db.get(Vuelo, 900).asientos_disponibles
+    engine.dispose()
+
+    assert errores == []
+    assert promovidos == [u.id for u in esperando[:cancelaciones]]
+    assert restantes == [u.id for u in esperando[cancelaciones:]]
+    assert asientos == 0
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoints_lista_espera(client, db_session, vuelo_lleno, get_auth_headers, usuario_cliente_data,
+                                usuario_admin_data):
+    """
+    Verifica alta, consulta y promoción al cancelar por la API, con la notificación al usuario.
+    """
+    vuelo, _, reserva = vuelo_lleno
+    headers = get_auth_headers()
+
+    response = client.post("/lista-espera/", json={"vuelo_id": vuelo.id, "clase": "económica", "total": 80.0}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["posicion"] == 1
+    assert [e["vuelo_id"] for e in client.get("/lista-espera/", headers=headers).json()["items"]] == [vuelo.id]
+
+    response = client.delete(f"/reservas/{reserva.id}", headers=get_auth_headers(usuario_admin_data))
+    assert response.status_code == 200
+
+    assert client.get("/lista-espera/", headers=headers).json()["items"] == []
+    notificaciones = client.get("/notificaciones/", headers=headers).json()["items"]
+    assert [n["tipo"] for n in notificaciones] == ["lista_espera"]
+    db_session.expire_all()
+    assert db_session.query(Reserva).one().usuario_id == usuario_cliente_data["id"]
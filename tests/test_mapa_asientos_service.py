@@ -0,0 +1,145 @@
+# tests/test_mapa_asientos_service.py
+"""
+Pruebas unitarias para el mapa de asientos (services/mapa_asientos_service.py
+y core/mapa_asientos.py).
+
+Valida:
+- Geometría de cabina: índices, tipos de asiento (ventana/pasillo)
+- Configuración del mapa marcando reservas existentes
+- Conflicto de asiento al reservar (409)
+- Asignación automática por preferencia
+- Liberación del asiento al eliminar la reserva
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.mapa_asientos import DisposicionCabina, VENTANA, PASILLO, CENTRO
+from app.services import mapa_asientos_service, reserva_service
+from app.dto.mapa_asientos_dto import MapaAsientosCreate
+from app.dto.reserva_dto import ReservaCreate, ReservaUpdate
+
+
+# ========== PRUEBAS DE GEOMETRÍA ==========
+
+def test_disposicion_tipos_de_asiento():
+    """
+    Verifica la clasificación ventana/pasillo/centro de una cabina "ABC-DEF".
+    """
+    cabina = DisposicionCabina(30, "ABC-DEF")
+
+    assert cabina.capacidad == 180
+    assert cabina.bytes_bitmap == 23
+    assert cabina.tipos == {
+        "A": VENTANA, "B": CENTRO, "C": PASILLO,
+        "D": PASILLO, "E": CENTRO, "F": VENTANA
+    }
+    assert cabina.codigo(cabina.indice("12c")) == "12C"
+
+
+def test_disposicion_asiento_invalido():
+    """
+    Verifica que filas o letras fuera de la cabina se rechacen.
+    """
+    cabina = DisposicionCabina(10, "AB-CD")
+
+    for asiento in ("11A", "0A", "3E", "A3", ""):
+        with pytest.raises(ValueError):
+            cabina.indice(asiento)
+
+
+def test_siguiente_libre_por_preferencia():
+    """
+    Verifica que siguiente_libre() respete la preferencia y recurra a cualquier
+    asiento cuando ya no quedan de ese tipo.
+    """
+    cabina = DisposicionCabina(1, "AB-CD")
+    ocupados = 1 << cabina.indice("1A")
+
+    assert cabina.codigo(cabina.siguiente_libre(ocupados, VENTANA)) == "1D"
+    assert cabina.codigo(cabina.siguiente_libre(ocupados, PASILLO)) == "1B"
+
+    ocupados |= 1 << cabina.indice("1D")
+    assert cabina.codigo(cabina.siguiente_libre(ocupados, VENTANA)) == "1B"
+
+
+# ========== PRUEBAS DEL SERVICIO ==========
+
+@pytest.fixture
+def vuelo_con_mapa(db_session, create_vuelo, vuelo_data):
+    vuelo = create_vuelo(vuelo_data)
+    mapa_asientos_service.configurar_mapa(db_session, vuelo.id, MapaAsientosCreate(filas=10, disposicion="AB-CD"))
+    return vuelo
+
+
+def test_configurar_mapa_marca_reservas_existentes(db_session, create_vuelo, create_usuario, create_reserva,
+                                                   vuelo_data, usuario_cliente_data):
+    """
+    Verifica que al configurar el mapa se marquen los asientos ya reservados.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+    create_reserva({"usuario_id": usuario.id, "vuelo_id": vuelo.id, "clase": "económica", "asiento": "3C", "total": 1.0})
+    create_reserva({"usuario_id": usuario.id, "vuelo_id": vuelo.id, "clase": "económica", "asiento": "pasillo", "total": 1.0})
+
+    mapa = mapa_asientos_service.configurar_mapa(db_session, vuelo.id, MapaAsientosCreate(filas=10, disposicion="AB-CD"))
+
+    assert mapa.capacidad == 40
+    assert mapa.ocupados == ["3C"]
+    assert mapa.libres == 39
+
+
+def test_reservar_asiento_ocupado_conflicto(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que reservar un asiento ya ocupado lance 409 y no consuma cupo.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    datos = ReservaCreate(vuelo_id=vuelo_con_mapa.id, clase="económica", asiento="2B", total=1.0)
+    reserva_service.crear_reserva(db_session, datos, usuario.id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.crear_reserva(db_session, datos, usuario.id)
+
+    assert exc_info.value.status_code == 409
+    db_session.refresh(vuelo_con_mapa)
+    assert vuelo_con_mapa.asientos_disponibles == 49
+
+
+def test_reservar_asigna_siguiente_ventana(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que sin asiento explícito se asigne el siguiente libre del tipo preferido.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+
+    asignados = [
+        reserva_service.crear_reserva(
+            db_session,
+            ReservaCreate(vuelo_id=vuelo_con_mapa.id, clase="económica", total=1.0, preferencia_asiento="ventana"),
+            usuario.id
+        ).asiento
+        for _ in range(3)
+    ]
+
+    assert asignados == ["1A", "1D", "2A"]
+    assert mapa_asientos_service.obtener_mapa(db_session, vuelo_con_mapa.id).ocupados == ["1A", "1D", "2A"]
+
+
+def test_cambiar_asiento_y_eliminar_libera(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que cambiar de asiento mueva el bit y que eliminar la reserva lo libere.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    reserva = reserva_service.crear_reserva(
+        db_session,
+        ReservaCreate(vuelo_id=vuelo_con_mapa.id, clase="económica", asiento="5a", total=1.0),
+        usuario.id
+    )
+    assert reserva.asiento == "5A"
+
+    reserva_service.actualizar_reserva(db_session, reserva.id, ReservaUpdate(asiento="6D"), usuario)
+    assert mapa_asientos_service.obtener_mapa(db_session, vuelo_con_mapa.id).ocupados == ["6D"]
+
+    reserva_service.eliminar_reserva(db_session, reserva.id, usuario)
+    mapa = mapa_asientos_service.obtener_mapa(db_session, vuelo_con_mapa.id)
+    assert mapa.ocupados == []
+    assert mapa.libres == 40
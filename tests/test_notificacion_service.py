@@ -6,6 +6,7 @@ Valida:
 - Envío de notificaciones (creación)
 - Listado general
 - Obtención por ID
+- Paginación por cursor (más recientes primero) sobre el índice (usuario_id, fecha, id)
 """
 
 import pytest
@@ -15,6 +16,7 @@ from app.services import notificacion_service
 from app.dto.notificacion_dto import NotificacionCreate
 from app.models.notificacion import Notificacion
 from types import SimpleNamespace
+from sqlalchemy import text
 
 
 
@@ -59,6 +61,47 @@ def test_enviar_notificacion_usuario_inexistente(db_session):
 
 # ========== PRUEBAS DE LISTADO ==========
 
+def test_listar_notificaciones_paginado_mas_recientes_primero(db_session, create_notificacion):
+    """
+    Verifica que la paginación por cursor recorra de la más reciente a la más antigua,
+    desempatando por id cuando dos notificaciones comparten fecha.
+    """
+    from datetime import datetime
+
+    creadas = [
+        create_notificacion({"usuario_id": 1, "titulo": f"N{i}", "mensaje": "X"})
+        for i in range(5)
+    ]
+    misma_fecha = datetime(2030, 1, 1, 12, 0, 0)
+    for notif in creadas:
+        notif.fecha = misma_fecha
+    db_session.commit()
+
+    usuario = SimpleNamespace(id=1)
+    primera = notificacion_service.listar_notificaciones(db_session, usuario, limit=2)
+    segunda = notificacion_service.listar_notificaciones(db_session, usuario, limit=2, cursor=primera.next_cursor)
+    tercera = notificacion_service.listar_notificaciones(db_session, usuario, limit=2, cursor=segunda.next_cursor)
+
+    ids = [n.id for n in primera + segunda + tercera]
+    assert ids == sorted((n.id for n in creadas), reverse=True)
+    assert tercera.next_cursor is None
+
+
+def test_pagina_de_notificaciones_usa_el_indice(db_session):
+    """
+    Verifica que una página siguiente se lea del índice (usuario_id, fecha, id)
+    sin ordenar todas las notificaciones del usuario.
+    """
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM notificaciones WHERE usuario_id = 1 "
+        "AND (fecha, id) < ('2030-01-01 00:00:00', 10) ORDER BY fecha DESC, id DESC LIMIT 11"
+    )).all()
+
+    detalles = [fila[-1] for fila in plan]
+    assert any("ix_notificaciones_usuario_fecha_id" in d for d in detalles)
+    assert not any("TEMP B-TREE" in d for d in detalles)
+
+
 def test_listar_notificaciones(db_session, create_notificacion):
     """
     Verifica que listar_notificaciones() retorne todas las notificaciones.
@@ -0,0 +1,180 @@
+# tests/test_programacion_service.py
+"""
+Pruebas unitarias para las programaciones de vuelos recurrentes (services/programacion_service.py).
+
+Valida:
+- Generación de un vuelo por cada día de la semana programado
+- Extensión incremental: solo se insertan los días nuevos
+- Idempotencia y restricción única (programacion_id, salida)
+- Días pasados omitidos e ids que no chocan con vuelos archivados
+- Validaciones y endpoints de administración
+"""
+
+import pytest
+from datetime import date, datetime, time, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.models.vuelo import Vuelo
+from app.models.archivo import VueloArchivo
+from app.repositories import tarifa_diaria_repo, aeropuerto_repo
+from app.services import programacion_service, vuelo_service
+from app.dto.programacion_dto import ProgramacionCreate, ProgramacionExtender
+
+LUNES = date(2030, 3, 4)
+
+
+def _programacion(**cambios):
+    datos = {
+        "origen": "BOG", "destino": "MDE", "dias_semana": [0, 2, 4], "hora_salida": time(7, 30),
+        "duracion": 1.5, "precio_base": 200.0, "capacidad": 120,
+        "desde": LUNES, "hasta": LUNES + timedelta(days=13),
+    }
+    datos.update(cambios)
+    return ProgramacionCreate(**datos)
+
+
+def _salidas(db_session):
+    return [v.salida for v in db_session.query(Vuelo).order_by(Vuelo.salida)]
+
+
+# ========== PRUEBAS DE GENERACIÓN ==========
+
+def test_crear_programacion_genera_vuelos(db_session):
+    """
+    Verifica un vuelo por lunes, miércoles y viernes de dos semanas, con sus datos y el calendario.
+    """
+    resultado = programacion_service.crear_programacion(db_session, _programacion())
+    programacion = resultado["programacion"]
+
+    assert resultado["vuelos_creados"] == 6
+    assert programacion.materializado_hasta == LUNES + timedelta(days=13)
+    assert [s.date() for s in _salidas(db_session)] == [LUNES + timedelta(days=d) for d in (0, 2, 4, 7, 9, 11)]
+
+    vuelo = db_session.query(Vuelo).order_by(Vuelo.salida).first()
+    assert vuelo.salida == datetime(2030, 3, 4, 7, 30)
+    assert vuelo.llegada == datetime(2030, 3, 4, 9, 0)
+    assert (vuelo.asientos_disponibles, vuelo.programacion_id) == (120, programacion.id)
+
+    ids = aeropuerto_repo.buscar_ids(db_session, ["BOG", "MDE"])
+    dias = tarifa_diaria_repo.listar_rango(db_session, ids["BOG"], ids["MDE"], LUNES, LUNES + timedelta(days=14))
+    assert [(d.dia, d.vuelos, d.asientos) for d in dias][0] == (LUNES, 1, 120)
+    assert len(dias) == 6
+
+
+def test_dias_pasados_no_se_generan(db_session):
+    """
+    Verifica que una programación que empezó en el pasado solo genere vuelos desde hoy (UTC).
+    """
+    hoy = datetime.utcnow().date()
+    programacion_service.crear_programacion(db_session, _programacion(
+        dias_semana=list(range(7)), desde=hoy - timedelta(days=5), hasta=hoy + timedelta(days=2)
+    ))
+
+    assert [s.date() for s in _salidas(db_session)] == [hoy + timedelta(days=d) for d in range(3)]
+
+
+def test_ids_no_reutilizan_vuelos_archivados(db_session, create_vuelo):
+    """
+    Verifica que los ids generados sigan al mayor id activo o archivado.
+    """
+    db_session.add(VueloArchivo(
+        id=500, origen="BOG", destino="MDE", origen_id=1, destino_id=2, salida=datetime(2020, 1, 1),
+        llegada=datetime(2020, 1, 1, 1), duracion=1.0, precio_base=1.0, asientos_disponibles=0,
+    ))
+    db_session.commit()
+
+    programacion_service.crear_programacion(db_session, _programacion(hasta=LUNES))
+
+    assert [v.id for v in db_session.query(Vuelo)] == [501]
+
+
+# ========== PRUEBAS DE EXTENSIÓN ==========
+
+def test_extender_inserta_solo_dias_nuevos(db_session, db_engine):
+    """
+    Verifica que extender una semana inserte solo sus 3 vuelos en un INSERT,
+    sin consultar los vuelos ya generados, y que repetir la extensión no haga nada.
+    """
+    programacion = programacion_service.crear_programacion(db_session, _programacion())["programacion"]
+    nuevo_fin = LUNES + timedelta(days=20)
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    resultado = programacion_service.extender_programacion(db_session, programacion.id, ProgramacionExtender(hasta=nuevo_fin))
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    assert resultado["vuelos_creados"] == 3
+    assert resultado["programacion"].materializado_hasta == nuevo_fin
+    assert len([s for s in sentencias if s.startswith("INSERT INTO vuelos")]) == 1
+    assert not [s for s in sentencias if "FROM vuelos" in s and "WHERE" in s]
+    assert len(_salidas(db_session)) == 9
+
+    repetido = programacion_service.extender_programacion(db_session, programacion.id, ProgramacionExtender(hasta=nuevo_fin))
+    assert repetido["vuelos_creados"] == 0
+    assert len(_salidas(db_session)) == 9
+
+
+def test_restriccion_unica_por_programacion_y_salida(db_session):
+    """
+    Verifica que la BD rechace un segundo vuelo de la misma programación a la misma hora.
+    """
+    programacion = programacion_service.crear_programacion(db_session, _programacion(hasta=LUNES))["programacion"]
+    existente = db_session.query(Vuelo).one()
+
+    db_session.add(Vuelo(
+        id=existente.id + 1, origen="BOG", destino="MDE", salida=existente.salida, llegada=existente.llegada,
+        duracion=1.5, precio_base=200.0, asientos_disponibles=120, programacion_id=programacion.id,
+    ))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+def test_validaciones(db_session):
+    """
+    Verifica 400 por rango inválido, ruta circular o acortar la programación, y 404 si no existe.
+    """
+    casos = [_programacion(hasta=LUNES - timedelta(days=1)), _programacion(destino="Bogotá (BOG)")]
+    for datos in casos:
+        with pytest.raises(HTTPException) as exc_info:
+            programacion_service.crear_programacion(db_session, datos)
+        assert exc_info.value.status_code == 400
+
+    programacion = programacion_service.crear_programacion(db_session, _programacion())["programacion"]
+    with pytest.raises(HTTPException) as exc_info:
+        programacion_service.extender_programacion(db_session, programacion.id, ProgramacionExtender(hasta=LUNES))
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException) as exc_info:
+        programacion_service.extender_programacion(db_session, 99, ProgramacionExtender(hasta=LUNES))
+    assert exc_info.value.status_code == 404
+    with pytest.raises(ValueError):
+        _programacion(dias_semana=[7])
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoints_programaciones(client, db_session, get_auth_headers, usuario_admin_data):
+    """
+    Verifica alta, extensión y consulta por la API, y que los vuelos aparezcan en la búsqueda.
+    """
+    headers = get_auth_headers(usuario_admin_data)
+    cuerpo = _programacion().model_dump(mode="json")
+
+    response = client.post("/programaciones/", json=cuerpo, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["vuelos_creados"] == 6
+    assert response.json()["programacion"]["dias_semana"] == [0, 2, 4]
+    programacion_id = response.json()["programacion"]["id"]
+    assert len(_salidas(db_session)) == 6
+
+    response = client.post(f"/programaciones/{programacion_id}/extender", json={"hasta": "2030-03-24"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["vuelos_creados"] == 3
+    assert len(_salidas(db_session)) == 9
+
+    response = client.get(f"/programaciones/{programacion_id}", headers=headers)
+    assert response.json()["materializado_hasta"] == "2030-03-24"
+    assert len(vuelo_service.buscar_vuelos(db_session, origen="BOG", destino="MDE")) == 9
@@ -8,17 +8,23 @@ Valida:
 - Creación de reservas y decremento de asientos disponibles
 - Validación de vuelo existente antes de reservar
 - Validación de disponibilidad de asientos
-- Listado de reservas (por usuario y admin)
+- Listado de reservas (por usuario y admin) con número de consultas constante
+- Búsqueda de administración por estado, rango de fecha, vuelo y usuario sobre índices
 - Actualización de reservas
 - Confirmación de reservas (solo admin)
 - Eliminación de reservas y restauración de asientos
+- Reserva de grupo: un descuento de N asientos, un INSERT y todo o nada
+- Servicios en lote: mismas sentencias para 1 que para N, todo o nada, bajas limitadas a la reserva
+- 404 (no 500) al agregar un servicio borrado que la caché de precios aún incluye
+- Ausencia de sobreventa con reservas concurrentes
 """
 
 import pytest
 from fastapi import HTTPException
 
 from app.services import reserva_service
-from app.dto.reserva_dto import ReservaCreate, ReservaUpdate
+from app.dto.reserva_dto import ReservaCreate, ReservaUpdate, ReservaGrupoCreate
+from app.dto.reserva_servicio_dto import ReservaServiciosLote
 from app.models.vuelo import Vuelo
 from app.models.reserva import Reserva
 
@@ -229,6 +235,129 @@ def test_listar_reservas_como_cliente(db_session, create_usuario, create_vuelo,
     assert reservas_cliente1[0].usuario_id == cliente1.id
 
 
+def test_listar_reservas_consultas_constantes(client, db_session, db_engine, create_vuelo, create_servicio,
+                                             vuelo_data, get_auth_headers, usuario_admin_data):
+    """
+    Verifica que GET /reservas/ ejecute las mismas consultas con 3 que con 40 reservas
+    con servicios: los servicios se cargan en bloque por página, no uno por reserva.
+    """
+    from sqlalchemy import event
+    from app.models.reserva_servicio import ReservaServicio
+
+    headers = get_auth_headers(usuario_admin_data)
+    vuelo = create_vuelo(vuelo_data)
+    servicio = create_servicio({"nombre": "Maleta", "precio": 30.0})
+
+    def agregar_reservas(n):
+        for _ in range(n):
+            reserva = Reserva(usuario_id=usuario_admin_data["id"], vuelo_id=vuelo.id, clase="económica",
+                              asiento="1A", total=100.0)
+            reserva.servicios_reserva.append(ReservaServicio(servicio_id=servicio.id, cantidad=1, subtotal=30))
+            db_session.add(reserva)
+        db_session.commit()
+
+    def consultas_del_listado():
+        db_session.expire_all()  # el cliente comparte la sesión: nada precargado
+        sentencias = []
+        registrar = lambda *a: sentencias.append(a[2])
+        event.listen(db_engine, "before_cursor_execute", registrar)
+        response = client.get("/reservas/", params={"limit": 200}, headers=headers)
+        event.remove(db_engine, "before_cursor_execute", registrar)
+        assert response.status_code == 200
+        assert all(len(r["servicios_reserva"]) == 1 for r in response.json()["items"])
+        return len(response.json()["items"]), len(sentencias)
+
+    agregar_reservas(3)
+    pocas = consultas_del_listado()
+    agregar_reservas(37)
+    muchas = consultas_del_listado()
+
+    assert (pocas[0], muchas[0]) == (3, 40)
+    assert pocas[1] == muchas[1]
+
+
+# ========== PRUEBAS DE BÚSQUEDA (SOLO ADMIN) ==========
+
+def test_buscar_reservas_por_filtros(db_session, create_usuario, create_vuelo, usuario_cliente_data, vuelo_data):
+    """
+    Verifica los filtros por estado, rango de fecha_reserva, vuelo y usuario,
+    el orden por fecha y el rango inválido.
+    """
+    from datetime import datetime, timedelta
+
+    cliente = create_usuario(usuario_cliente_data)
+    vuelo = create_vuelo(vuelo_data)
+    otro_vuelo = create_vuelo({**vuelo_data, "id": 101})
+    ahora = datetime.utcnow()
+    casos = [
+        ("pendiente", ahora - timedelta(minutes=10), vuelo.id),
+        ("pendiente", ahora - timedelta(minutes=30), otro_vuelo.id),
+        ("pendiente", ahora - timedelta(hours=3), vuelo.id),
+        ("confirmada", ahora - timedelta(minutes=5), vuelo.id),
+    ]
+    reservas = [
+        Reserva(usuario_id=cliente.id, vuelo_id=vuelo_id, estado=estado, fecha_reserva=fecha,
+                clase="económica", asiento="1A", total=100.0)
+        for estado, fecha, vuelo_id in casos
+    ]
+    db_session.add_all(reservas)
+    db_session.commit()
+
+    ultima_hora = reserva_service.buscar_reservas(db_session, estado="Pendiente", desde=ahora - timedelta(hours=1))
+    assert [r.id for r in ultima_hora] == [reservas[1].id, reservas[0].id]
+
+    del_vuelo = reserva_service.buscar_reservas(db_session, vuelo_id=vuelo.id, usuario_id=cliente.id)
+    assert [r.id for r in del_vuelo] == [reservas[2].id, reservas[0].id, reservas[3].id]
+    assert reserva_service.buscar_reservas(db_session, usuario_id=999) == []
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.buscar_reservas(db_session, desde=ahora, hasta=ahora - timedelta(hours=1))
+    assert exc_info.value.status_code == 400
+
+
+def test_buscar_reservas_usa_indices(db_session, db_engine):
+    """
+    Verifica que "pendientes de la última hora" sea un recorrido por rango del índice
+    (estado, fecha_reserva) ya ordenado, y que los filtros por vuelo y usuario usen sus índices.
+    """
+    from datetime import datetime, timedelta
+    from sqlalchemy import event
+
+    def plan(**filtros):
+        # Plan de la sentencia que emite realmente la búsqueda
+        sentencias = []
+        registrar = lambda *a: sentencias.append((a[2], a[3]))
+        event.listen(db_engine, "before_cursor_execute", registrar)
+        reserva_service.buscar_reservas(db_session, limit=50, **filtros)
+        event.remove(db_engine, "before_cursor_execute", registrar)
+        sql, parametros = sentencias[0]
+        with db_engine.connect() as conexion:
+            filas = conexion.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parametros).all()
+        return " ".join(fila[-1] for fila in filas)
+
+    ultima_hora = plan(estado="pendiente", desde=datetime.utcnow() - timedelta(hours=1))
+    assert "ix_reservas_estado_fecha_reserva (estado=? AND fecha_reserva>?)" in ultima_hora
+    assert "TEMP B-TREE" not in ultima_hora
+    assert "ix_reservas_vuelo_id" in plan(vuelo_id=1)
+    assert "ix_reservas_usuario_id" in plan(usuario_id=1)
+
+
+def test_endpoint_buscar_reservas_solo_admin(client, create_vuelo, vuelo_data, reserva_data, get_auth_headers,
+                                            usuario_admin_data):
+    """
+    Verifica GET /reservas/buscar: filtra por estado y vuelo y queda vedado a clientes.
+    """
+    create_vuelo(vuelo_data)
+    headers_cliente = get_auth_headers()
+    assert client.post("/reservas/", json=reserva_data, headers=headers_cliente).status_code == 201
+
+    params = {"estado": "pendiente", "vuelo_id": vuelo_data["id"]}
+    response = client.get("/reservas/buscar", params=params, headers=get_auth_headers(usuario_admin_data))
+    assert response.status_code == 200
+    assert [r["estado"] for r in response.json()["items"]] == ["pendiente"]
+    assert client.get("/reservas/buscar", params=params, headers=headers_cliente).status_code == 403
+
+
 # ========== PRUEBAS DE OBTENCIÓN POR ID ==========
 
 def test_obtener_reserva_existente(db_session, create_usuario, create_vuelo, usuario_cliente_data, vuelo_data):
@@ -459,4 +588,320 @@ def test_eliminar_multiples_reservas_restaura_correctamente(db_session, create_u
     reserva_service.eliminar_reserva(db_session, reserva2.id, usuario2)
     
     db_session.refresh(vuelo)
-    assert vuelo.asientos_disponibles == asientos_iniciales  # Todos los asientos restaurados
\ No newline at end of file
+    assert vuelo.asientos_disponibles == asientos_iniciales  # Todos los asientos restaurados
+
+
+# ========== PRUEBAS DE SERVICIOS EN LOTE ==========
+
+@pytest.fixture
+def reserva_con_catalogo(db_session, create_usuario, create_vuelo, create_servicio, usuario_cliente_data, vuelo_data):
+    """Reserva de 150000 de un cliente y un catálogo de 8 servicios (precio 1000 × i)."""
+    usuario = create_usuario(usuario_cliente_data)
+    vuelo = create_vuelo(vuelo_data)
+    servicios = [create_servicio({"nombre": f"S{i}", "precio": 1000 * i}) for i in range(1, 9)]
+    reserva = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=vuelo.id, clase="económica", asiento="12A"), usuario.id
+    )
+    return usuario, reserva, servicios
+
+
+def _lote(agregar=(), quitar=()):
+    return ReservaServiciosLote(
+        agregar=[{"servicio_id": s, "cantidad": c} for s, c in agregar], quitar=list(quitar)
+    )
+
+
+def test_servicios_en_lote_sentencias_constantes(db_session, db_engine, reserva_con_catalogo):
+    """
+    Verifica que quitar uno y agregar 1 u 8 servicios ejecute las mismas sentencias
+    (un DELETE, un INSERT de varias filas y un commit) y que el total quede actualizado.
+    """
+    from sqlalchemy import event
+
+    usuario, reserva, servicios = reserva_con_catalogo
+
+    def sentencias(lote):
+        registradas = []
+        registrar = lambda *a: registradas.append(a[2])
+        event.listen(db_engine, "before_cursor_execute", registrar)
+        resultado = reserva_service.actualizar_servicios_de_reserva(db_session, reserva.id, lote, usuario)
+        event.remove(db_engine, "before_cursor_execute", registrar)
+        return resultado, registradas
+
+    reserva_service.actualizar_servicios_de_reserva(db_session, reserva.id, _lote(agregar=[(servicios[0].id, 1)]), usuario)
+    _, una = sentencias(_lote(agregar=[(servicios[1].id, 1)], quitar=[servicios[0].id]))
+    resultado, ocho = sentencias(_lote(agregar=[(s.id, 2) for s in servicios], quitar=[servicios[1].id]))
+
+    assert len(una) == len(ocho)
+    assert len([s for s in ocho if s.startswith("INSERT INTO reserva_servicio")]) == 1
+    assert len(resultado.servicios_reserva) == 8
+    assert resultado.total == 150000.0 + 2 * 36000.0
+
+
+def test_servicios_en_lote_todo_o_nada(db_session, reserva_con_catalogo):
+    """
+    Verifica que un servicio a quitar ausente de la reserva, o uno a agregar
+    inexistente, respondan 404 sin aplicar el resto del lote.
+    """
+    usuario, reserva, servicios = reserva_con_catalogo
+    reserva_service.actualizar_servicios_de_reserva(db_session, reserva.id, _lote(agregar=[(servicios[0].id, 1)]), usuario)
+
+    for lote in (_lote(agregar=[(servicios[1].id, 1)], quitar=[servicios[0].id, servicios[2].id]),
+                 _lote(agregar=[(999, 1)], quitar=[servicios[0].id])):
+        with pytest.raises(HTTPException) as exc_info:
+            reserva_service.actualizar_servicios_de_reserva(db_session, reserva.id, lote, usuario)
+        assert exc_info.value.status_code == 404
+
+    reserva = db_session.get(Reserva, reserva.id)
+    assert [rs.servicio_id for rs in reserva.servicios_reserva] == [servicios[0].id]
+    assert reserva.total == 151000.0
+
+
+def test_agregar_servicio_borrado_con_precios_en_cache(db_session, reserva_con_catalogo):
+    """
+    Verifica que agregar un servicio que otro worker ya borró responda 404, en
+    lote y de a uno, aunque la instantánea de precios cacheada aún lo incluya.
+    """
+    from sqlalchemy import delete
+    from app.models.servicio import Servicio
+    from app.services import cotizacion_service
+
+    usuario, reserva, servicios = reserva_con_catalogo
+    borrado = servicios[-1].id
+    cotizacion_service.precios(db_session, reserva.vuelo_id)
+    db_session.execute(delete(Servicio).where(Servicio.id == borrado))
+    db_session.commit()
+
+    for agregar in (
+        lambda: reserva_service.actualizar_servicios_de_reserva(
+            db_session, reserva.id, _lote(agregar=[(servicios[0].id, 1), (borrado, 1)]), usuario
+        ),
+        lambda: reserva_service.agregar_servicio_a_reserva(db_session, reserva.id, borrado, 1, usuario),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            agregar()
+        assert exc_info.value.status_code == 404
+
+    db_session.expire_all()
+    reserva = db_session.get(Reserva, reserva.id)
+    assert (reserva.servicios_reserva, reserva.total) == ([], 150000.0)
+
+
+def test_eliminar_servicio_solo_de_su_reserva(db_session, create_usuario, reserva_con_catalogo):
+    """
+    Verifica que quitar un servicio de una reserva no borre el mismo servicio
+    en la reserva de otro usuario.
+    """
+    usuario, reserva, servicios = reserva_con_catalogo
+    otro = create_usuario({"id": 22222222, "nombre": "Otro", "email": "otro@test.com",
+                           "contrasena": "pass123", "rol": "cliente"})
+    ajena = reserva_service.crear_reserva(
+        db_session, ReservaCreate(vuelo_id=reserva.vuelo_id, clase="económica", asiento="12B"), otro.id
+    )
+    lote = _lote(agregar=[(servicios[0].id, 1)])
+    reserva_service.actualizar_servicios_de_reserva(db_session, ajena.id, lote, otro)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.eliminar_servicio_de_reserva(db_session, reserva.id, servicios[0].id, usuario)
+    assert exc_info.value.status_code == 404
+
+    reserva_service.actualizar_servicios_de_reserva(db_session, reserva.id, lote, usuario)
+    reserva_service.eliminar_servicio_de_reserva(db_session, reserva.id, servicios[0].id, usuario)
+    assert db_session.get(Reserva, reserva.id).servicios_reserva == []
+    assert len(db_session.get(Reserva, ajena.id).servicios_reserva) == 1
+
+
+def test_endpoint_servicios_en_lote(client, create_vuelo, create_servicio, vuelo_data, reserva_data, get_auth_headers):
+    """
+    Verifica POST /reservas/{id}/servicios: devuelve la reserva con sus servicios y el total.
+    """
+    create_vuelo(vuelo_data)
+    wifi = create_servicio({"nombre": "Wifi", "precio": 20000})
+    maleta = create_servicio({"nombre": "Maleta", "precio": 30000})
+    headers = get_auth_headers()
+    reserva_id = client.post("/reservas/", json=reserva_data, headers=headers).json()["id"]
+
+    response = client.post(f"/reservas/{reserva_id}/servicios", headers=headers, json={
+        "agregar": [{"servicio_id": wifi.id}, {"servicio_id": maleta.id, "cantidad": 2}]
+    })
+    assert response.status_code == 200
+    assert sorted(s["servicio_id"] for s in response.json()["servicios_reserva"]) == [wifi.id, maleta.id]
+    assert response.json()["total"] == 150000.0 + 80000.0
+
+
+# ========== PRUEBAS DE RESERVA DE GRUPO ==========
+
+def _grupo(vuelo_id, *asientos, clase="económica"):
+    return ReservaGrupoCreate(
+        vuelo_id=vuelo_id, clase=clase,
+        pasajeros=[{"asiento": a, "preferencia_asiento": "ventana", "total": 150000.0} for a in asientos],
+    )
+
+
+def test_reserva_grupo_en_una_transaccion(db_session, db_engine, create_usuario, create_vuelo,
+                                          usuario_cliente_data, vuelo_data):
+    """
+    Verifica que un grupo de 5 descuente los asientos, el cupo y el mapa una sola vez
+    y cree las reservas con un único INSERT, respetando los asientos pedidos.
+    """
+    from sqlalchemy import event
+    from app.dto.mapa_asientos_dto import MapaAsientosCreate
+    from app.dto.tarifa_dto import TarifaClaseCreate
+    from app.models.tarifa_clase import TarifaClase
+    from app.services import mapa_asientos_service, tarifa_service
+
+    usuario = create_usuario(usuario_cliente_data)
+    vuelo = create_vuelo(vuelo_data)
+    mapa_asientos_service.configurar_mapa(db_session, vuelo.id, MapaAsientosCreate(filas=10, disposicion="AB-CD"))
+    tarifa_service.configurar_tarifas(db_session, vuelo.id, [TarifaClaseCreate(clase="económica", capacidad=20)])
+
+    sentencias = []
+    registrar = lambda *a: sentencias.append(a[2])
+    event.listen(db_engine, "before_cursor_execute", registrar)
+    resultado = reserva_service.crear_reserva_grupo(db_session, _grupo(vuelo.id, None, "1D", None, None, None), usuario.id)
+    event.remove(db_engine, "before_cursor_execute", registrar)
+
+    reservas = resultado["reservas"]
+    assert [r.asiento for r in reservas] == ["1A", "1D", "2A", "2D", "3A"]
+    assert {r.usuario_id for r in reservas} == {usuario.id}
+    assert len([s for s in sentencias if s.startswith("INSERT INTO reservas")]) == 1
+    assert len([s for s in sentencias if s.startswith("UPDATE vuelos")]) == 1
+
+    db_session.expire_all()
+    assert db_session.get(Vuelo, vuelo.id).asientos_disponibles == 15
+    assert db_session.query(TarifaClase).one().disponibles == 15
+    assert db_session.query(Reserva).count() == 5
+
+
+def test_reserva_grupo_todo_o_nada(db_session, create_usuario, create_vuelo, usuario_cliente_data, vuelo_data):
+    """
+    Verifica que si falta un asiento o uno pedido está ocupado no se cree ninguna reserva
+    ni se descuenten asientos.
+    """
+    from app.dto.mapa_asientos_dto import MapaAsientosCreate
+    from app.services import mapa_asientos_service
+
+    usuario = create_usuario(usuario_cliente_data)
+    vuelo = create_vuelo({**vuelo_data, "asientos_disponibles": 3})
+    mapa_asientos_service.configurar_mapa(db_session, vuelo.id, MapaAsientosCreate(filas=10, disposicion="AB-CD"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.crear_reserva_grupo(db_session, _grupo(vuelo.id, None, None, None, None), usuario.id)
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.crear_reserva_grupo(db_session, _grupo(vuelo.id, "1A", "1A"), usuario.id)
+    assert exc_info.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc_info:
+        reserva_service.crear_reserva_grupo(db_session, _grupo(999, None), usuario.id)
+    assert exc_info.value.status_code == 404
+
+    db_session.expire_all()
+    assert db_session.get(Vuelo, vuelo.id).asientos_disponibles == 3
+    assert db_session.query(Reserva).count() == 0
+    assert mapa_asientos_service.obtener_mapa(db_session, vuelo.id).ocupados == []
+
+
+def test_endpoint_reserva_grupo(client, create_vuelo, vuelo_data, get_auth_headers):
+    """
+    Verifica POST /reservas/grupo y el límite de pasajeros.
+    """
+    create_vuelo(vuelo_data)
+    headers = get_auth_headers()
+    cuerpo = {"vuelo_id": vuelo_data["id"], "clase": "económica",
+              "pasajeros": [{"asiento": f"{i}A", "total": 150000.0} for i in range(1, 4)]}
+
+    response = client.post("/reservas/grupo", json=cuerpo, headers=headers)
+    assert response.status_code == 201
+    assert [r["asiento"] for r in response.json()["reservas"]] == ["1A", "2A", "3A"]
+
+    response = client.post("/reservas/grupo", json={**cuerpo, "pasajeros": []}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_endpoint_reserva_grupo_sin_asientos(client, create_vuelo, vuelo_data, get_auth_headers):
+    """
+    Verifica POST /reservas/grupo sin asientos en un vuelo sin mapa: las reservas
+    se devuelven con `asiento` nulo (sin error al serializar la respuesta).
+    """
+    create_vuelo(vuelo_data)
+    cuerpo = {"vuelo_id": vuelo_data["id"], "clase": "económica", "pasajeros": [{}, {}]}
+
+    response = client.post("/reservas/grupo", json=cuerpo, headers=get_auth_headers())
+
+    assert response.status_code == 201
+    assert [r["asiento"] for r in response.json()["reservas"]] == [None, None]
+
+
+# ========== PRUEBAS DE CONCURRENCIA ==========
+
+def test_reservas_concurrentes_no_sobrevenden(tmp_path):
+    """
+    ⚠️ CRÍTICO: Muchos hilos reservan a la vez el mismo vuelo con pocos asientos.
+
+    Cada hilo usa su propia sesión sobre una BD SQLite en archivo (compartida
+    entre conexiones). Solo deben confirmarse tantas reservas como asientos,
+    y el contador nunca debe quedar negativo.
+    """
+    import threading
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import Base
+    from app.models.usuario import Usuario
+
+    asientos = 7
+    hilos = 40
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrencia.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    with SessionLocal() as db:
+        salida = datetime.utcnow() + timedelta(days=3)
+        db.add(Vuelo(
+            id=900, origen="Bogotá (BOG)", destino="Miami (MIA)",
+            salida=salida, llegada=salida + timedelta(hours=4),
+            duracion=4.0, precio_base=300000.0, asientos_disponibles=asientos
+        ))
+        db.add_all([
+            Usuario(id=1000 + i, nombre=f"U{i}", email=f"u{i}@test.com", contrasena="x")
+            for i in range(hilos)
+        ])
+        db.commit()
+
+    barrera = threading.Barrier(hilos)
+    exitos, rechazos, errores = [], [], []
+
+    def reservar(i):
+        with SessionLocal() as db:
+            barrera.wait()
+            try:
+                datos = ReservaCreate(vuelo_id=900, clase="económica", asiento=None, total=300000.0)
+                exitos.append(reserva_service.crear_reserva(db, datos, 1000 + i).id)
+            except HTTPException as exc:
+                rechazos.append(exc.status_code)
+            except Exception as exc:  # pragma: no cover - cualquier otro error invalida la prueba
+                errores.append(exc)
+
+    threads = [threading.Thread(target=reservar, args=(i,)) for i in range(hilos)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with SessionLocal() as db:
+        vuelo = db.get(Vuelo, 900)
+        total_reservas = db.query(Reserva).filter(Reserva.vuelo_id == 900).count()
+
+    engine.dispose()
+
+    assert errores == []
+    assert len(exitos) == asientos
+    assert rechazos == [400] * (hilos - asientos)
+    assert total_reservas == asientos
+    assert vuelo.asientos_disponibles == 0
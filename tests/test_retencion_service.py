@@ -0,0 +1,221 @@
+# tests/test_retencion_service.py
+"""
+Pruebas unitarias para las retenciones temporales de asientos (services/retencion_service.py).
+
+Valida:
+- Descuento de asientos, cupo de clase y mapa al retener
+- Conversión en reserva sin volver a descontar
+- Liberación manual y permisos
+- Retención vencida al confirmar (410)
+- Barrido por lotes de las vencidas usando el índice de expira_en
+- Borrado de las retenciones al archivar o eliminar su vuelo
+- Endpoints /retenciones
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.models.vuelo import Vuelo
+from app.models.reserva import Reserva
+from app.models.tarifa_clase import TarifaClase
+from app.models.usuario import Usuario
+from app.models.retencion_asiento import RetencionAsiento
+from app.services import retencion_service, mapa_asientos_service, tarifa_service, archivo_service, vuelo_service
+from app.dto.retencion_dto import RetencionCreate, RetencionConfirmar
+from app.dto.mapa_asientos_dto import MapaAsientosCreate
+from app.dto.tarifa_dto import TarifaClaseCreate
+
+
+@pytest.fixture
+def vuelo_con_mapa(db_session, create_vuelo, vuelo_data):
+    """Vuelo de 50 asientos con mapa y cupo de 20 en económica."""
+    vuelo = create_vuelo(vuelo_data)
+    mapa_asientos_service.configurar_mapa(db_session, vuelo.id, MapaAsientosCreate(filas=10, disposicion="AB-CD"))
+    tarifa_service.configurar_tarifas(db_session, vuelo.id, [TarifaClaseCreate(clase="económica", capacidad=20)])
+    return vuelo
+
+
+def _estado(db_session, vuelo_id):
+    """(asientos disponibles, cupo económica, asientos ocupados en el mapa)."""
+    db_session.expire_all()
+    return (
+        db_session.get(Vuelo, vuelo_id).asientos_disponibles,
+        db_session.query(TarifaClase).filter(TarifaClase.vuelo_id == vuelo_id).one().disponibles,
+        mapa_asientos_service.obtener_mapa(db_session, vuelo_id).ocupados,
+    )
+
+
+def _retener(db_session, usuario, vuelo_id, asiento=None, **cambios):
+    datos = RetencionCreate(vuelo_id=vuelo_id, clase="económica", asiento=asiento, **cambios)
+    return retencion_service.crear_retencion(db_session, datos, usuario.id)
+
+
+def _vencer(db_session, *retenciones):
+    for retencion in retenciones:
+        retencion.expira_en = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+
+# ========== PRUEBAS DE RETENCIÓN ==========
+
+def test_retener_descuenta_asiento(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que retener descuente el asiento del vuelo, del cupo y del mapa sin crear reserva.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+
+    retencion = _retener(db_session, usuario, vuelo_con_mapa.id, "3B", minutos=5)
+
+    assert retencion.asiento == "3B"
+    assert timedelta(minutes=4) < retencion.expira_en - datetime.utcnow() <= timedelta(minutes=5)
+    assert _estado(db_session, vuelo_con_mapa.id) == (19, 19, ["3B"])
+    assert db_session.query(Reserva).count() == 0
+
+    with pytest.raises(HTTPException) as exc_info:
+        _retener(db_session, usuario, vuelo_con_mapa.id, "3B")
+    assert exc_info.value.status_code == 409
+
+
+def test_confirmar_crea_reserva_sin_descontar_otra_vez(db_session, create_usuario, usuario_cliente_data,
+                                                      vuelo_con_mapa):
+    """
+    Verifica que la reserva conserve el asiento retenido y los contadores no cambien.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    retencion = _retener(db_session, usuario, vuelo_con_mapa.id, "1A")
+
+    reserva = retencion_service.confirmar_retencion(db_session, retencion.id, RetencionConfirmar(total=150000.0), usuario)
+
+    assert (reserva.usuario_id, reserva.asiento, reserva.total) == (usuario.id, "1A", 150000.0)
+    assert _estado(db_session, vuelo_con_mapa.id) == (19, 19, ["1A"])
+    assert db_session.query(RetencionAsiento).count() == 0
+
+    with pytest.raises(HTTPException) as exc_info:
+        retencion_service.confirmar_retencion(db_session, retencion.id, RetencionConfirmar(total=1.0), usuario)
+    assert exc_info.value.status_code == 404
+
+
+def test_liberar_devuelve_asiento_y_permisos(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que solo el dueño (o un admin) libere la retención y que el asiento vuelva a la venta.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    otro = Usuario(id=7, nombre="Otro", email="otro@test.com", contrasena="x", rol="cliente")
+    db_session.add(otro)
+    db_session.commit()
+    retencion = _retener(db_session, usuario, vuelo_con_mapa.id, "2C")
+
+    with pytest.raises(HTTPException) as exc_info:
+        retencion_service.liberar_retencion(db_session, retencion.id, otro)
+    assert exc_info.value.status_code == 403
+
+    retencion_service.liberar_retencion(db_session, retencion.id, usuario)
+    assert _estado(db_session, vuelo_con_mapa.id) == (20, 20, [])
+
+    with pytest.raises(HTTPException) as exc_info:
+        retencion_service.liberar_retencion(db_session, retencion.id, usuario)
+    assert exc_info.value.status_code == 404
+
+
+def test_confirmar_retencion_vencida(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica 410 al confirmar una retención vencida aún sin barrer, y que el asiento se libere.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    retencion = _retener(db_session, usuario, vuelo_con_mapa.id, "4D")
+    _vencer(db_session, retencion)
+
+    with pytest.raises(HTTPException) as exc_info:
+        retencion_service.confirmar_retencion(db_session, retencion.id, RetencionConfirmar(total=1.0), usuario)
+    assert exc_info.value.status_code == 410
+    assert _estado(db_session, vuelo_con_mapa.id) == (20, 20, [])
+    assert db_session.query(Reserva).count() == 0
+
+
+# ========== PRUEBAS DE BARRIDO ==========
+
+def test_barrido_libera_solo_vencidas_por_lotes(db_session, create_usuario, create_vuelo, usuario_cliente_data,
+                                               vuelo_data, vuelo_con_mapa):
+    """
+    Verifica que el barrido devuelva en bloque los asientos de las vencidas de varios vuelos
+    y deje intactas las vigentes.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    otro_vuelo = create_vuelo({**vuelo_data, "id": 101})
+    vencidas = [_retener(db_session, usuario, vuelo_con_mapa.id, a) for a in ("1A", "1B", "1C")]
+    vencidas.append(_retener(db_session, usuario, otro_vuelo.id))
+    vigente = _retener(db_session, usuario, vuelo_con_mapa.id, "5A")
+    _vencer(db_session, *vencidas)
+
+    assert retencion_service.barrer_vencidas(db_session, lote=2) == 4
+    assert retencion_service.barrer_vencidas(db_session) == 0
+
+    assert _estado(db_session, vuelo_con_mapa.id) == (19, 19, ["5A"])
+    assert db_session.get(Vuelo, otro_vuelo.id).asientos_disponibles == vuelo_data["asientos_disponibles"]
+    assert [r.id for r in db_session.query(RetencionAsiento)] == [vigente.id]
+
+
+def test_barrido_usa_indice_de_vencimiento(db_session):
+    """
+    Verifica que la búsqueda de vencidas recorra el índice de expira_en y no toda la tabla.
+    """
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM retenciones_asiento "
+        "WHERE expira_en <= :ahora ORDER BY expira_en LIMIT 10"
+    ), {"ahora": datetime.utcnow()}).all()
+
+    assert any("ix_retenciones_asiento_expira_en" in fila[-1] for fila in plan)
+
+
+def test_archivar_vuelo_borra_sus_retenciones(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que archivar un vuelo salido elimine también sus retenciones.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    _retener(db_session, usuario, vuelo_con_mapa.id)
+
+    archivo_service.archivar_vuelos_salidos(db_session, ahora=vuelo_con_mapa.salida + timedelta(days=2))
+
+    assert db_session.query(RetencionAsiento).count() == 0
+
+
+def test_eliminar_vuelo_borra_sus_retenciones(db_session, create_usuario, usuario_cliente_data, vuelo_con_mapa):
+    """
+    Verifica que eliminar un vuelo con una retención activa la borre en vez de fallar.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    _retener(db_session, usuario, vuelo_con_mapa.id)
+
+    vuelo_service.eliminar_vuelo(db_session, vuelo_con_mapa.id)
+
+    assert db_session.query(RetencionAsiento).count() == 0
+    assert db_session.get(Vuelo, vuelo_con_mapa.id) is None
+
+
+# ========== PRUEBAS DE ENDPOINTS ==========
+
+def test_endpoints_retenciones(client, db_session, create_vuelo, vuelo_data, get_auth_headers):
+    """
+    Verifica retener, confirmar y liberar por la API.
+    """
+    create_vuelo(vuelo_data)
+    headers = get_auth_headers()
+    cuerpo = {"vuelo_id": vuelo_data["id"], "clase": "económica", "asiento": "12A"}
+
+    response = client.post("/retenciones/", json=cuerpo, headers=headers)
+    assert response.status_code == 201
+    retencion_id = response.json()["id"]
+
+    response = client.post(f"/retenciones/{retencion_id}/confirmar", json={"total": 150000.0}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["asiento"] == "12A"
+
+    response = client.post("/retenciones/", json={**cuerpo, "minutos": 60}, headers=headers)
+    assert response.status_code == 422
+
+    retencion_id = client.post("/retenciones/", json=cuerpo, headers=headers).json()["id"]
+    assert client.delete(f"/retenciones/{retencion_id}", headers=headers).status_code == 200
+    db_session.expire_all()
+    assert db_session.get(Vuelo, vuelo_data["id"]).asientos_disponibles == vuelo_data["asientos_disponibles"] - 1
@@ -132,6 +132,19 @@ def test_actualizar_servicio_exitoso(db_session, create_servicio):
     assert actualizado.precio == 18000.0
 
 
+def test_actualizar_servicio_parcial(db_session, create_servicio):
+    """
+    Verifica que solo cambien los campos enviados.
+    """
+    servicio = create_servicio({"nombre": "Wifi", "descripcion": "Internet", "precio": 20000.0})
+
+    actualizado = servicio_service.actualizar_servicio(db_session, servicio.id, ServicioUpdate(precio=25000.0))
+
+    assert actualizado.precio == 25000.0
+    assert actualizado.nombre == "Wifi"
+    assert actualizado.descripcion == "Internet"
+
+
 def test_actualizar_servicio_inexistente(db_session):
     """
     Verifica que actualizar un servicio inexistente lance excepción.
@@ -0,0 +1,149 @@
+# tests/test_tablero_service.py
+"""
+Pruebas unitarias para los tableros de salidas y llegadas (services/tablero_service.py).
+
+Valida:
+- Próximos vuelos ordenados por hora a partir de un instante dado
+- Actualización incremental al crear, modificar y eliminar vuelos
+- ETag estable mientras no cambie el tablero (también tras recargarlo) y distinto cuando cambia
+- Respuesta 304 a GET condicional con If-None-Match (lista de ETags o `*`)
+- 404 para aeropuertos inexistentes
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.services import tablero_service, vuelo_service
+from app.dto.vuelo_dto import VueloCreate, VueloPatch
+from app.repositories import aeropuerto_repo
+
+AHORA = datetime(2030, 3, 5, 6)
+
+
+def _vuelo(id_, origen, destino, hora):
+    salida = AHORA.replace(hour=hora)
+    return VueloCreate(
+        id=id_, origen=origen, destino=destino, salida=salida, llegada=salida + timedelta(hours=1),
+        duracion=1.0, precio_base=100.0, asientos_disponibles=10,
+    )
+
+
+def _id(db_session, texto):
+    return aeropuerto_repo.buscar_ids(db_session, [texto])[texto]
+
+
+def _ids(db_session, tipo, aeropuerto, limit=10, ahora=AHORA):
+    items, _ = tablero_service.proximos(db_session, tipo, _id(db_session, aeropuerto), limit, ahora)
+    return [v["vuelo_id"] for v in items]
+
+
+# ========== PRUEBAS DE CONSULTA ==========
+
+def test_proximas_salidas_y_llegadas_ordenadas(db_session):
+    """
+    Verifica el orden por hora, el recorte a `limit` y que se omitan los vuelos pasados.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "BOG", "MDE", 12))
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, "BOG", "CLO", 8))
+    vuelo_service.crear_vuelo(db_session, _vuelo(3, "BOG", "CTG", 10))
+    vuelo_service.crear_vuelo(db_session, _vuelo(4, "CLO", "BOG", 7))
+
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == [2, 3, 1]
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG", limit=2) == [2, 3]
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG", ahora=AHORA.replace(hour=9)) == [3, 1]
+    assert _ids(db_session, tablero_service.LLEGADAS, "BOG") == [4]
+    assert _ids(db_session, tablero_service.LLEGADAS, "MDE") == [1]
+
+
+def test_aeropuerto_inexistente(db_session):
+    """
+    Verifica 404 para un id desconocido y lista vacía para un aeropuerto sin vuelos.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "BOG", "MDE", 12))
+
+    with pytest.raises(HTTPException) as exc_info:
+        tablero_service.proximos(db_session, tablero_service.SALIDAS, 999)
+    assert exc_info.value.status_code == 404
+    assert _ids(db_session, tablero_service.SALIDAS, "MDE") == []
+
+
+# ========== PRUEBAS DE ACTUALIZACIÓN INCREMENTAL ==========
+
+def test_cambios_de_vuelos_se_reflejan_sin_recargar(db_session):
+    """
+    Verifica que altas, cambios de hora/origen y bajas actualicen el tablero ya cargado.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "BOG", "MDE", 12))
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == [1]
+
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, "BOG", "CLO", 9))
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == [2, 1]
+
+    vuelo_service.parchear_vuelo(db_session, 2, VueloPatch(salida=AHORA.replace(hour=14)))
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == [1, 2]
+
+    vuelo_service.parchear_vuelo(db_session, 1, VueloPatch(origen="CTG"))
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == [2]
+    assert _ids(db_session, tablero_service.SALIDAS, "CTG") == [1]
+
+    vuelo_service.eliminar_vuelo(db_session, 2)
+    assert _ids(db_session, tablero_service.SALIDAS, "BOG") == []
+    assert tablero_service.tablero.vigente
+
+
+# ========== PRUEBAS DE ETAG ==========
+
+def test_etag_cambia_solo_si_cambia_el_tablero(db_session):
+    """
+    Verifica que el ETag se repita sin cambios y cambie al modificar un vuelo del aeropuerto,
+    aunque la lista de ids devuelta sea la misma.
+    """
+    vuelo_service.crear_vuelo(db_session, _vuelo(1, "BOG", "MDE", 12))
+    bog = _id(db_session, "BOG")
+
+    _, etag = tablero_service.proximos(db_session, tablero_service.SALIDAS, bog, ahora=AHORA)
+    _, repetido = tablero_service.proximos(db_session, tablero_service.SALIDAS, bog, ahora=AHORA)
+    assert etag == repetido
+
+    vuelo_service.crear_vuelo(db_session, _vuelo(2, "CLO", "CTG", 9))
+    _, otro_aeropuerto = tablero_service.proximos(db_session, tablero_service.SALIDAS, bog, ahora=AHORA)
+    assert otro_aeropuerto == etag
+
+    # Otro worker (o una recarga) con los mismos vuelos emite el mismo ETag
+    tablero_service.tablero.limpiar()
+    _, recargado = tablero_service.proximos(db_session, tablero_service.SALIDAS, bog, ahora=AHORA)
+    assert recargado == etag
+
+    vuelo_service.parchear_vuelo(db_session, 1, VueloPatch(salida=AHORA.replace(hour=13)))
+    _, cambiado = tablero_service.proximos(db_session, tablero_service.SALIDAS, bog, ahora=AHORA)
+    assert cambiado != etag
+
+
+def test_endpoint_tablero_get_condicional(client, db_session):
+    """
+    Verifica ETag en GET /aeropuertos/{id}/salidas y 304 al repetir con If-None-Match.
+    """
+    salida = datetime.utcnow() + timedelta(days=1)
+    vuelo_service.crear_vuelo(db_session, VueloCreate(
+        id=1, origen="BOG", destino="MDE", salida=salida, llegada=salida + timedelta(hours=1),
+        duracion=1.0, precio_base=100.0, asientos_disponibles=10,
+    ))
+    url = f"/aeropuertos/{_id(db_session, 'BOG')}/salidas"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [v["vuelo_id"] for v in response.json()] == [1]
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    for cabecera in (f'"otro", {etag}', "*"):
+        assert client.get(url, headers={"If-None-Match": cabecera}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"otro"'}).status_code == 200
+
+    vuelo_service.eliminar_vuelo(db_session, 1)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,160 @@
+# tests/test_tarifa_service.py
+"""
+Pruebas unitarias para los cupos por clase (services/tarifa_service.py).
+
+Valida:
+- Normalización de clases ("económica", "Business", ...)
+- Configuración de cupos descontando reservas existentes
+- Descuento atómico del cupo de la clase al reservar
+- Rechazo cuando la clase se agota aunque queden asientos en otras
+- Liberación del cupo al eliminar la reserva
+- Filtro de vuelos disponibles por clase
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.core.tarifas import normalizar_clase
+from app.services import tarifa_service, reserva_service, vuelo_service
+from app.dto.tarifa_dto import TarifaClaseCreate
+from app.dto.reserva_dto import ReservaCreate
+
+
+def _tarifas(economica=10, ejecutiva=2):
+    return [
+        TarifaClaseCreate(clase="económica", capacidad=economica),
+        TarifaClaseCreate(clase="ejecutiva", capacidad=ejecutiva, multiplicador=2.0),
+    ]
+
+
+def _reservar(db_session, usuario_id, vuelo_id, clase):
+    datos = ReservaCreate(vuelo_id=vuelo_id, clase=clase, asiento=None, total=1.0)
+    return reserva_service.crear_reserva(db_session, datos, usuario_id)
+
+
+# ========== PRUEBAS DE NORMALIZACIÓN ==========
+
+def test_normalizar_clase():
+    """
+    Verifica que se acepten tildes, mayúsculas y sinónimos en inglés.
+    """
+    assert normalizar_clase("Económica") == "economica"
+    assert normalizar_clase(" business ") == "ejecutiva"
+    assert normalizar_clase("First") == "primera"
+    assert normalizar_clase("premium") is None
+    assert normalizar_clase(None) is None
+
+
+# ========== PRUEBAS DE CONFIGURACIÓN ==========
+
+def test_configurar_tarifas_descuenta_reservas_existentes(db_session, create_vuelo, create_usuario, create_reserva,
+                                                          vuelo_data, usuario_cliente_data):
+    """
+    Verifica que los cupos disponibles descuenten las reservas previas y que
+    asientos_disponibles pase a ser la suma de los cupos.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+    create_reserva({"usuario_id": usuario.id, "vuelo_id": vuelo.id, "clase": "Ejecutiva", "asiento": "1A", "total": 1.0})
+
+    tarifas = tarifa_service.configurar_tarifas(db_session, vuelo.id, _tarifas())
+
+    assert {t.clase: t.disponibles for t in tarifas} == {"economica": 10, "ejecutiva": 1}
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 11
+
+
+def test_configurar_tarifas_clase_invalida(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que una clase desconocida lance HTTPException 400.
+    """
+    vuelo = create_vuelo(vuelo_data)
+
+    with pytest.raises(HTTPException) as exc_info:
+        tarifa_service.configurar_tarifas(db_session, vuelo.id, [TarifaClaseCreate(clase="premium", capacidad=5)])
+
+    assert exc_info.value.status_code == 400
+
+
+# ========== PRUEBAS DE RESERVA POR CLASE ==========
+
+def test_reserva_descuenta_cupo_de_su_clase(db_session, create_vuelo, create_usuario, vuelo_data, usuario_cliente_data):
+    """
+    Verifica que reservar en ejecutiva descuente ese cupo y el total del vuelo,
+    y que al agotarse la clase se rechace aunque queden asientos económicos.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+    tarifa_service.configurar_tarifas(db_session, vuelo.id, _tarifas(ejecutiva=1))
+
+    _reservar(db_session, usuario.id, vuelo.id, "Business")
+
+    with pytest.raises(HTTPException) as exc_info:
+        _reservar(db_session, usuario.id, vuelo.id, "ejecutiva")
+    assert exc_info.value.status_code == 400
+    assert "ejecutiva" in exc_info.value.detail
+
+    _reservar(db_session, usuario.id, vuelo.id, "económica")
+
+    cupos = {t.clase: t.disponibles for t in tarifa_service.listar_tarifas(db_session, vuelo.id)}
+    assert cupos == {"economica": 9, "ejecutiva": 0}
+    db_session.refresh(vuelo)
+    assert vuelo.asientos_disponibles == 9
+
+
+def test_eliminar_reserva_libera_cupo(db_session, create_vuelo, create_usuario, vuelo_data, usuario_cliente_data):
+    """
+    Verifica que eliminar la reserva devuelva el cupo a su clase.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+    tarifa_service.configurar_tarifas(db_session, vuelo.id, _tarifas(ejecutiva=1))
+
+    reserva = _reservar(db_session, usuario.id, vuelo.id, "ejecutiva")
+    reserva_service.eliminar_reserva(db_session, reserva.id, usuario)
+
+    cupos = {t.clase: t.disponibles for t in tarifa_service.listar_tarifas(db_session, vuelo.id)}
+    assert cupos["ejecutiva"] == 1
+
+
+def test_vuelo_sin_tarifas_acepta_cualquier_clase(db_session, create_vuelo, create_usuario, vuelo_data, usuario_cliente_data):
+    """
+    Verifica que los vuelos sin cupos por clase mantengan el comportamiento anterior.
+    """
+    vuelo = create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+
+    reserva = _reservar(db_session, usuario.id, vuelo.id, "premium plus")
+
+    assert reserva.clase == "premium plus"
+
+
+# ========== PRUEBAS DE DISPONIBILIDAD POR CLASE ==========
+
+def test_vuelos_disponibles_por_clase(db_session, create_vuelo, create_usuario, usuario_cliente_data):
+    """
+    Verifica que /vuelos/disponibles?clase=ejecutiva devuelva solo vuelos con cupo en esa clase.
+    """
+    usuario = create_usuario(usuario_cliente_data)
+    salida = datetime.utcnow() + timedelta(days=4)
+    for id_ in (701, 702, 703):
+        create_vuelo({
+            "id": id_, "origen": "Bogotá (BOG)", "destino": "Miami (MIA)",
+            "salida": salida, "llegada": salida + timedelta(hours=4),
+            "duracion": 4.0, "precio_base": 300000.0, "asientos_disponibles": 10
+        })
+    tarifa_service.configurar_tarifas(db_session, 701, _tarifas(ejecutiva=1))
+    tarifa_service.configurar_tarifas(db_session, 702, _tarifas(ejecutiva=0))
+    # 703 no tiene cupos por clase
+
+    assert [v.id for v in vuelo_service.vuelos_disponibles(db_session, clase="business")] == [701]
+
+    _reservar(db_session, usuario.id, 701, "ejecutiva")
+
+    assert vuelo_service.vuelos_disponibles(db_session, clase="ejecutiva") == []
+    assert [v.id for v in vuelo_service.vuelos_disponibles(db_session)] == [701, 702, 703]
+
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.vuelos_disponibles(db_session, clase="premium")
+    assert exc_info.value.status_code == 400
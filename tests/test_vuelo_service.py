@@ -7,7 +7,10 @@ Valida:
 - Validación de códigos duplicados
 - Listado de vuelos
 - Filtrado de vuelos disponibles
-- Actualización de datos de vuelos
+- Búsqueda filtrada por ruta, fechas, asientos y precio
+- Paginación por cursor (keyset) de los listados
+- Caché del catálogo e invalidación al cambiar vuelos o asientos
+- Actualización de datos de vuelos (completa y parcial con PATCH)
 - Eliminación de vuelos
 """
 
@@ -16,7 +19,7 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException
 
 from app.services import vuelo_service
-from app.dto.vuelo_dto import VueloCreate, VueloUpdate
+from app.dto.vuelo_dto import VueloCreate, VueloUpdate, VueloPatch
 
 
 # ========== PRUEBAS DE CREACIÓN ==========
@@ -145,6 +148,136 @@ def test_listar_vuelos_con_datos(db_session, create_vuelo, vuelo_data):
     assert any(v.id == vuelo2.id for v in vuelos)
 
 
+# ========== PRUEBAS DE PAGINACIÓN ==========
+
+def _crear_vuelos_en_serie(create_vuelo, cantidad):
+    salida = datetime.utcnow() + timedelta(days=3)
+    for i in range(cantidad):
+        create_vuelo({
+            "id": 600 + i,
+            "origen": "Ibagué (IBG)",
+            "destino": "Medellín (MDE)",
+            "salida": salida + timedelta(hours=i),
+            "llegada": salida + timedelta(hours=i + 1),
+            "duracion": 1.0,
+            "precio_base": 100000.0,
+            "asientos_disponibles": 10
+        })
+
+
+def test_listar_vuelos_paginado_recorre_todas_las_paginas(db_session, create_vuelo):
+    """
+    Verifica que recorrer las páginas con next_cursor entregue cada vuelo una sola vez.
+    """
+    _crear_vuelos_en_serie(create_vuelo, 7)
+
+    vistos = []
+    cursor = None
+    paginas = 0
+    while True:
+        pagina = vuelo_service.listar_vuelos(db_session, limit=3, cursor=cursor)
+        vistos.extend(v.id for v in pagina)
+        paginas += 1
+        cursor = pagina.next_cursor
+        if cursor is None:
+            break
+
+    assert paginas == 3
+    assert vistos == list(range(600, 607))
+
+
+def test_buscar_vuelos_paginado_por_salida(db_session, create_vuelo):
+    """
+    Verifica que la búsqueda pagine respetando el orden por fecha de salida.
+    """
+    _crear_vuelos_en_serie(create_vuelo, 5)
+
+    primera = vuelo_service.buscar_vuelos(db_session, origen="Ibagué (IBG)", limit=2)
+    segunda = vuelo_service.buscar_vuelos(db_session, origen="Ibagué (IBG)", limit=2, cursor=primera.next_cursor)
+
+    assert [v.id for v in primera] == [600, 601]
+    assert [v.id for v in segunda] == [602, 603]
+    assert segunda.next_cursor is not None
+
+
+def test_listar_vuelos_cursor_invalido(db_session):
+    """
+    Verifica que un cursor corrupto lance HTTPException 400.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.listar_vuelos(db_session, limit=10, cursor="no-es-un-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_endpoint_listar_vuelos_devuelve_pagina(client, create_vuelo):
+    """
+    Verifica el contrato HTTP: items + next_cursor, y que limit quede acotado.
+    """
+    _crear_vuelos_en_serie(create_vuelo, 3)
+
+    response = client.get("/vuelos/", params={"limit": 2})
+    assert response.status_code == 200
+    cuerpo = response.json()
+    assert [v["id"] for v in cuerpo["items"]] == [600, 601]
+
+    response = client.get("/vuelos/", params={"limit": 2, "cursor": cuerpo["next_cursor"]})
+    cuerpo = response.json()
+    assert [v["id"] for v in cuerpo["items"]] == [602]
+    assert cuerpo["next_cursor"] is None
+
+    assert client.get("/vuelos/", params={"limit": 100000}).status_code == 422
+
+
+# ========== PRUEBAS DE CACHÉ ==========
+
+def test_obtener_vuelo_usa_cache(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que la segunda lectura de un vuelo se sirva desde la caché.
+    """
+    create_vuelo(vuelo_data)
+
+    primera = vuelo_service.obtener_vuelo(db_session, vuelo_data["id"])
+    segunda = vuelo_service.obtener_vuelo(db_session, vuelo_data["id"])
+
+    assert segunda is primera
+
+
+def test_reserva_invalida_cache_del_vuelo(db_session, create_vuelo, create_usuario, vuelo_data, usuario_cliente_data):
+    """
+    Verifica que crear una reserva invalide el vuelo cacheado (cambian los asientos).
+    """
+    from app.services import reserva_service
+    from app.dto.reserva_dto import ReservaCreate
+
+    create_vuelo(vuelo_data)
+    usuario = create_usuario(usuario_cliente_data)
+    assert vuelo_service.obtener_vuelo(db_session, vuelo_data["id"]).asientos_disponibles == 50
+
+    datos = ReservaCreate(vuelo_id=vuelo_data["id"], clase="económica", asiento="12A", total=150000.0)
+    reserva_service.crear_reserva(db_session, datos, usuario.id)
+
+    assert vuelo_service.obtener_vuelo(db_session, vuelo_data["id"]).asientos_disponibles == 49
+
+
+def test_invalidacion_solo_afecta_pagina_del_vuelo(db_session, create_vuelo):
+    """
+    Verifica que actualizar un vuelo invalide solo la página del catálogo que lo contiene.
+    """
+    _crear_vuelos_en_serie(create_vuelo, 7)
+
+    pagina1 = vuelo_service.listar_vuelos(db_session, limit=3)
+    pagina2 = vuelo_service.listar_vuelos(db_session, limit=3, cursor=pagina1.next_cursor)
+
+    vuelo = vuelo_service.obtener_vuelo(db_session, 604)
+    vuelo_service.actualizar_vuelo(db_session, 604, VueloUpdate(**{**vuelo.dict(), "precio_base": 1.0}))
+
+    assert vuelo_service.listar_vuelos(db_session, limit=3) is pagina1
+    nueva_pagina2 = vuelo_service.listar_vuelos(db_session, limit=3, cursor=pagina1.next_cursor)
+    assert nueva_pagina2 is not pagina2
+    assert [v.precio_base for v in nueva_pagina2 if v.id == 604] == [1.0]
+
+
 # ========== PRUEBAS DE OBTENCIÓN POR ID ==========
 
 def test_obtener_vuelo_existente(db_session, create_vuelo, vuelo_data):
@@ -240,6 +373,74 @@ def test_vuelos_disponibles_ninguno(db_session, create_vuelo):
     assert vuelos_disponibles == []
 
 
+# ========== PRUEBAS DE BÚSQUEDA ==========
+
+def _crear_catalogo_busqueda(create_vuelo):
+    base = datetime.utcnow() + timedelta(days=10)
+    vuelos = [
+        (401, "Bogotá (BOG)", "Miami (MIA)", base, 300000.0, 20),
+        (402, "Bogotá (BOG)", "Miami (MIA)", base + timedelta(days=1), 450000.0, 5),
+        (403, "Bogotá (BOG)", "Miami (MIA)", base + timedelta(days=5), 280000.0, 0),
+        (404, "Bogotá (BOG)", "Madrid (MAD)", base, 900000.0, 40),
+        (405, "Cali (CLO)", "Miami (MIA)", base, 350000.0, 30),
+    ]
+    for id_, origen, destino, salida, precio, asientos in vuelos:
+        create_vuelo({
+            "id": id_,
+            "origen": origen,
+            "destino": destino,
+            "salida": salida,
+            "llegada": salida + timedelta(hours=4),
+            "duracion": 4.0,
+            "precio_base": precio,
+            "asientos_disponibles": asientos
+        })
+    return base
+
+
+def test_buscar_vuelos_por_ruta(db_session, create_vuelo):
+    """
+    Verifica que buscar_vuelos() filtre por origen y destino y ordene por salida.
+    """
+    _crear_catalogo_busqueda(create_vuelo)
+
+    vuelos = vuelo_service.buscar_vuelos(db_session, origen="Bogotá (BOG)", destino="Miami (MIA)")
+
+    assert [v.id for v in vuelos] == [401, 402, 403]
+
+
+def test_buscar_vuelos_combinando_filtros(db_session, create_vuelo):
+    """
+    Verifica que buscar_vuelos() combine rango de salida, asientos mínimos y precio máximo.
+    """
+    base = _crear_catalogo_busqueda(create_vuelo)
+
+    vuelos = vuelo_service.buscar_vuelos(
+        db_session,
+        origen="Bogotá (BOG)",
+        destino="Miami (MIA)",
+        salida_desde=base - timedelta(hours=1),
+        salida_hasta=base + timedelta(days=6),
+        asientos_min=1,
+        precio_max=400000.0
+    )
+
+    # 402 supera el precio máximo y 403 no tiene asientos
+    assert [v.id for v in vuelos] == [401]
+
+
+def test_buscar_vuelos_rango_invalido(db_session):
+    """
+    Verifica que un rango de salida invertido lance HTTPException 400.
+    """
+    ahora = datetime.utcnow()
+
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.buscar_vuelos(db_session, salida_desde=ahora, salida_hasta=ahora - timedelta(days=1))
+
+    assert exc_info.value.status_code == 400
+
+
 # ========== PRUEBAS DE ACTUALIZACIÓN ==========
 
 def test_actualizar_vuelo_exitoso(db_session, create_vuelo, vuelo_data):
@@ -290,6 +491,68 @@ def test_actualizar_vuelo_inexistente(db_session):
     assert exc_info.value.status_code == 404
 
 
+def test_parchear_vuelo_una_sola_sentencia(db_session, db_engine, create_vuelo, vuelo_data):
+    """
+    Verifica que PATCH de solo el precio sea un único UPDATE con esa columna
+    (sin SELECT previo del vuelo) y que el resto de campos no cambie.
+    """
+    from sqlalchemy import event
+
+    create_vuelo(vuelo_data)
+    sentencias = []
+    event.listen(db_engine, "before_cursor_execute", lambda *a: sentencias.append(a[2]))
+
+    vuelo = vuelo_service.parchear_vuelo(db_session, vuelo_data["id"], VueloPatch(precio_base=99.0))
+
+    assert vuelo.precio_base == 99.0
+    assert vuelo.asientos_disponibles == vuelo_data["asientos_disponibles"]
+    assert vuelo.origen == vuelo_data["origen"]
+    sobre_vuelo = [s for s in sentencias if "vuelos.id =" in s]
+    assert len(sobre_vuelo) == 1
+    assert sobre_vuelo[0].startswith("UPDATE vuelos SET precio_base=")
+    assert vuelo_service.obtener_vuelo(db_session, vuelo_data["id"]).precio_base == 99.0
+
+
+def test_parchear_vuelo_cambio_de_dia_actualiza_calendario(db_session, create_vuelo, vuelo_data):
+    """
+    Verifica que mover la salida con PATCH recalcule el día anterior y el nuevo.
+    """
+    vuelo_service.crear_vuelo(db_session, VueloCreate(**vuelo_data))
+    nueva_salida = vuelo_data["salida"] + timedelta(days=3)
+
+    vuelo_service.parchear_vuelo(db_session, vuelo_data["id"], VueloPatch(salida=nueva_salida))
+
+    dias = {
+        t.dia
+        for mes in {(vuelo_data["salida"].year, vuelo_data["salida"].month), (nueva_salida.year, nueva_salida.month)}
+        for t in vuelo_service.calendario_tarifas(db_session, vuelo_data["origen"], vuelo_data["destino"], *mes)
+    }
+    assert dias == {nueva_salida.date()}
+
+
+def test_parchear_vuelo_inexistente(db_session):
+    """
+    Verifica que PATCH sobre un vuelo inexistente lance 404.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        vuelo_service.parchear_vuelo(db_session, 9999, VueloPatch(precio_base=1.0))
+    assert exc_info.value.status_code == 404
+
+
+def test_endpoint_parchear_vuelo(client, create_vuelo, vuelo_data, get_auth_headers, usuario_admin_data):
+    """
+    Verifica que PATCH /vuelos/{id} acepte un cuerpo parcial.
+    """
+    create_vuelo(vuelo_data)
+
+    response = client.patch(f"/vuelos/{vuelo_data['id']}", json={"asientos_disponibles": 7},
+                            headers=get_auth_headers(usuario_admin_data))
+
+    assert response.status_code == 200
+    assert response.json()["asientos_disponibles"] == 7
+    assert response.json()["precio_base"] == vuelo_data["precio_base"]
+
+
 # ========== PRUEBAS DE ELIMINACIÓN ==========
 
 def test_eliminar_vuelo_existente(db_session, create_vuelo, vuelo_data):